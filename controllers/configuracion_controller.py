@@ -1,3 +1,4 @@
+import logging
 import sys
 import os
 from typing import Dict, Any, Optional, TYPE_CHECKING
@@ -6,14 +7,19 @@ from tkinter import messagebox # Se puede usar para confirmaciones/mensajes de e
 
 # sys.path.append(os.path.join(os.path.dirname(__file__))) 
 
+log = logging.getLogger(__name__)
+
 # Se importa el modelo real (asumiendo que está disponible)
 try:
     from models.configuracion_model import ConfiguracionModel
 except ImportError:
     # Fallback o manejo de error si el modelo no está en el path
-    print("Error: No se pudo importar ConfiguracionModel.")
+    log.critical("No se pudo importar ConfiguracionModel.")
     sys.exit(1)
 
+from models.perfilador import perfilador
+from models import sesion
+
 # Se usa TYPE_CHECKING para evitar dependencias circulares en tiempo de ejecución
 if TYPE_CHECKING:
     # Importar el tipo de la vista solo para anotaciones de tipo
@@ -26,6 +32,11 @@ class ConfiguracionControlador:
     Contiene la lógica de negocio y validación.
     """
 
+    # Sentencias mostradas en la pestaña de diagnóstico
+    LIMITE_DIAGNOSTICO = 20
+    # Permiso (rol_permiso.modulo) necesario para modificar roles y usuarios
+    MODULO = "configuracion"
+
     def __init__(self):
         # El controlador crea una instancia del modelo.
         self.modelo = ConfiguracionModel()
@@ -61,26 +72,55 @@ class ConfiguracionControlador:
         """Carga los datos iniciales (roles y usuarios) en la vista."""
         if self.vista:
             try:
+                # El modelo ya devuelve listas de diccionarios
                 roles = self.modelo.obtener_todos_los_roles()
-                # Convertir los objetos Row a diccionarios para la vista si es necesario
-                roles_dict = [dict(r) for r in roles]
-                
                 usuarios = self.modelo.obtener_todos_los_usuarios()
-                # Convertir los objetos Row a diccionarios para la vista si es necesario
-                usuarios_dict = [dict(u) for u in usuarios]
                 
                 # Delegar la presentación de datos a la Vista
-                self.vista._cargar_roles(roles_dict)
-                self.vista._cargar_usuarios(usuarios_dict)
+                self.vista._cargar_roles(roles)
+                self.vista._cargar_usuarios(usuarios)
+                self.cargar_diagnostico()
                 self.vista.display_message("✅ Datos de Configuración cargados.", is_success=True)
             except Exception as e:
                 self.vista.display_message(f"❌ Error al cargar datos iniciales: {e}", is_success=False)
-                print(f"Error: {e}")
+                log.exception("Error en ConfiguracionControlador: %s", e)
+
+    # ======================================================================
+    # DIAGNÓSTICO (perfilado de consultas, ver models/perfilador.py)
+    # ======================================================================
+
+    def cargar_diagnostico(self):
+        """Envía a la vista los totales, las sentencias que más pesan y las consultas lentas."""
+        if not self.vista:
+            return
+        estado = perfilador.estado()
+        sentencias = perfilador.resumen(limite=self.LIMITE_DIAGNOSTICO, orden="total")
+        lentas = perfilador.consultas_lentas()
+        self.vista._cargar_diagnostico(estado, sentencias, lentas)
+
+    def obtener_plan(self, sql: str) -> str:
+        """EXPLAIN QUERY PLAN de una sentencia medida, como texto."""
+        return "\n".join(perfilador.explicar(sql)) or "(sin plan)"
+
+    def handle_reiniciar_diagnostico(self):
+        """Descarta las mediciones acumuladas y vuelve a mostrar la pestaña vacía."""
+        perfilador.reiniciar()
+        self.cargar_diagnostico()
+        if self.vista:
+            self.vista.display_message("✅ Estadísticas de consultas reiniciadas.", is_success=True)
 
     # ======================================================================
     # HANDLERS DE ROLES
     # ======================================================================
 
+    def _autorizado(self) -> bool:
+        """Verifica contra la sesión en memoria que el usuario puede administrar."""
+        if sesion.puede(self.MODULO):
+            return True
+        if self.vista:
+            self.vista.display_message("❌ Error: Su usuario no tiene permiso para esta operación.", is_success=False)
+        return False
+
     def _validar_rol_data(self, data: Dict[str, str]) -> bool:
         """Validación de negocio del lado del Controlador."""
         if not data.get('nombre') or not data.get('descripcion'):
@@ -91,10 +131,11 @@ class ConfiguracionControlador:
 
     def handle_crear_rol(self, data: Dict[str, str]):
         """Maneja la solicitud de creación de un rol."""
+        if not self._autorizado(): return
         if not self._validar_rol_data(data): return
         
         # Lógica de negocio/Modelo
-        rol_id = self.modelo.insertar_rol(data['nombre'], data['descripcion'])
+        rol_id = self.modelo.insertar_rol(data['nombre'], data['descripcion'], data.get('permisos'))
         
         if self.vista:
             if rol_id is not None:
@@ -106,13 +147,23 @@ class ConfiguracionControlador:
 
     def handle_guardar_rol(self, data: Dict[str, Any]):
         """Maneja la solicitud de modificación de un rol."""
+        if not self._autorizado(): return
         if not self._validar_rol_data(data) or data.get('id') is None: 
             if self.vista: self.vista.display_message("❌ Error: ID de rol inválido o datos incompletos.", is_success=False)
             return
 
         rol_id = data['id']
-        
-        if self.modelo.modificar_rol(rol_id, data['nombre'], data['descripcion']):
+        permisos = data.get('permisos')
+        if permisos is not None and not self._conserva_administracion(rol_id, permisos):
+            if self.vista:
+                self.vista.display_message("❌ Error: No puede quitar a su propio rol el acceso a Configuración.", is_success=False)
+            return
+
+        guardado = self.modelo.modificar_rol(rol_id, data['nombre'], data['descripcion'])
+        if guardado and permisos is not None:
+            guardado = self.modelo.asignar_permisos_rol(rol_id, permisos)
+
+        if guardado:
             if self.vista:
                 self.vista.display_message(f"✅ Rol '{data['nombre']}' guardado.", is_success=True)
                 self.vista._limpiar_campos_rol(clear_selection=True)
@@ -121,8 +172,31 @@ class ConfiguracionControlador:
             if self.vista:
                 self.vista.display_message(f"❌ Error: No se pudo guardar el rol (posiblemente nombre duplicado).", is_success=False)
 
+    def modulos_permisibles(self) -> Dict[str, str]:
+        """Módulos que se pueden conceder a un rol: {clave: nombre en pantalla}."""
+        return dict(sesion.MODULOS)
+
+    def permisos_por_defecto(self):
+        """Módulos marcados al crear un rol nuevo."""
+        return sesion.PERMISOS_POR_DEFECTO
+
+    def obtener_permisos_rol(self, rol_id: int):
+        """Módulos que concede el rol, para el editor de permisos."""
+        return self.modelo.obtener_permisos_rol(rol_id)
+
+    def _conserva_administracion(self, rol_id: int, permisos) -> bool:
+        """Evita que un administrador se quite a sí mismo el acceso a este módulo."""
+        if sesion.TODOS in permisos or self.MODULO in permisos:
+            return True
+        actual = sesion.actual()
+        if actual is None:
+            return True
+        nombre = next((r['nombre'] for r in self.modelo.obtener_todos_los_roles() if r['id'] == rol_id), None)
+        return nombre not in actual.roles
+
     def handle_eliminar_rol(self, rol_id: int, nombre_rol: str):
         """Maneja la solicitud de eliminación de un rol."""
+        if not self._autorizado(): return
         if not rol_id:
             if self.vista: self.vista.display_message("❌ Error: ID de rol inválido para eliminar.", is_success=False)
             return
@@ -173,6 +247,7 @@ class ConfiguracionControlador:
 
     def handle_crear_usuario(self, data: Dict[str, Any]):
         """Maneja la solicitud de creación de un usuario."""
+        if not self._autorizado(): return
         datos_para_modelo = self._prepare_usuario_data({'rol_str': data['rol_str'], **data})
 
         if not self._validar_usuario_data(datos_para_modelo): return
@@ -190,10 +265,11 @@ class ConfiguracionControlador:
         except Exception as e:
             if self.vista:
                 self.vista.display_message(f"❌ Error al crear usuario: {e}.", is_success=False)
-            print(f"Error: {e}")
+            log.exception("Error en ConfiguracionControlador: %s", e)
 
     def handle_guardar_usuario(self, data: Dict[str, Any]):
         """Maneja la solicitud de modificación de un usuario."""
+        if not self._autorizado(): return
         if data.get('id') is None:
             if self.vista: self.vista.display_message("❌ Error: ID de usuario inválido.", is_success=False)
             return
@@ -218,10 +294,11 @@ class ConfiguracionControlador:
         except Exception as e:
             if self.vista:
                 self.vista.display_message(f"❌ Error al modificar usuario: {e}.", is_success=False)
-            print(f"Error: {e}")
+            log.exception("Error en ConfiguracionControlador: %s", e)
 
     def handle_eliminar_usuario(self, persona_id: int, nombre_usuario: str):
         """Maneja la solicitud de eliminación de un usuario."""
+        if not self._autorizado(): return
         if not persona_id:
             if self.vista: self.vista.display_message("❌ Error: ID de usuario inválido para eliminar.", is_success=False)
             return
@@ -1,8 +1,12 @@
+import logging
 import sys
 import os
 from models.denuncia_model import DenunciaModel 
+from controllers.ejecutor_tareas import EjecutorSincrono
 from typing import Dict, List, Optional
 
+log = logging.getLogger(__name__)
+
 class DenunciaController:
     """
     Controlador para gestionar la creación, consulta y ciclo de vida (seguimiento, cierre) 
@@ -15,10 +19,12 @@ class DenunciaController:
     def __init__(self):
         self.model = DenunciaModel()
         self.view = None 
+        # MenuApp lo reemplaza por su EjecutorTareas (hilos en segundo plano)
+        self.ejecutor = EjecutorSincrono()
         
     def set_view(self, view_instance):
         self.view = view_instance
-        print(f"Vista asignada al controlador: {self.view.__class__.__name__}")
+        log.debug("Vista asignada al controlador: %s", self.view.__class__.__name__)
         
 # ----------------------------------------------------------------------
 # Métodos de Manejo de Eventos 
@@ -26,43 +32,60 @@ class DenunciaController:
 
     def load_initial_data(self):
         """Método solicitado por la vista para cargar los datos iniciales al mostrar el frame."""
-        print("Cargando datos iniciales de denuncias...")
-        listado = self.actualizar_tabla() 
+        # La vista no tiene listado que llenar: las denuncias se consultan al buscar
+        log.debug("Vista de denuncias mostrada; sin datos iniciales que cargar")
 
     def handle_crear_denuncia(self, titulo, denunciante, estado, descripcion):
         """Maneja el evento de creación. Usa la firma simplificada de la vista (Simulación de creación)."""
-        print(f"Intento de creación de denuncia: Título='{titulo}', Denunciante='{denunciante}', Estado='{estado}'")
+        log.debug("Intento de creación de denuncia: título=%r, denunciante=%r, estado=%r", titulo, denunciante, estado)
         if hasattr(self.view, 'display_message'):
              self.view.display_message("⚠️ El formulario simplificado no contiene todos los campos (e.g., Consejero ID, Fecha Hechos, Denunciantes, NNA Involucrados). Se necesita un formulario extendido para registrar la denuncia completa.", is_success=False)
 
     def handle_buscar_denuncia(self, termino_busqueda: str):
         """Maneja el evento de búsqueda (por ID o texto)."""
-        print(f"Buscando denuncias por término: '{termino_busqueda}'")
-        
+        log.debug("Buscando denuncias por término: %r", termino_busqueda)
+
+        # La consulta corre en segundo plano; una búsqueda nueva cancela la anterior
+        self.ejecutor.enviar(
+            self._buscar_denuncia, termino_busqueda,
+            al_terminar=self._mostrar_resultado_busqueda,
+            al_fallar=lambda e: self.view.display_message(f"❌ Error al buscar denuncias: {e}", is_success=False),
+            clave="buscar_denuncia",
+            vista=self.view
+        )
+
+    def _buscar_denuncia(self, termino_busqueda: str) -> tuple:
+        """Trabajo de la búsqueda (sin tocar la vista): ('detalle', dict) o ('listado', list)."""
         try:
             denuncia_id = int(termino_busqueda)
             detalles = self.obtener_detalles_denuncia(denuncia_id)
             if detalles and hasattr(self.view, '_establecer_datos_formulario'):
                  # Simulación del campo 'denunciante' para la vista simplificada
                  detalles['denunciante'] = 'Denunciante de Ejemplo (Simulación)'
-                 self.view._establecer_datos_formulario(detalles)
-                 self.view.display_message(f"Denuncia ID {denuncia_id} cargada exitosamente.", is_success=True)
-                 return
+                 return 'detalle', detalles
         except ValueError:
             # Búsqueda por texto (no ID)
             pass
             
         datos_busqueda = {'texto': termino_busqueda, 'estado': 'Todos'} 
-        listado = self.actualizar_tabla(datos_busqueda)
-        
+        return 'listado', self.actualizar_tabla(datos_busqueda)
+
+    def _mostrar_resultado_busqueda(self, resultado: tuple):
+        """Aplica en la vista el resultado de _buscar_denuncia (hilo de Tk)."""
+        tipo, datos = resultado
+        if tipo == 'detalle':
+            self.view._establecer_datos_formulario(datos)
+            self.view.display_message(f"Denuncia ID {datos['id']} cargada exitosamente.", is_success=True)
+            return
+
         if hasattr(self.view, 'display_message'):
-             self.view.display_message(f"Búsqueda finalizada. {len(listado)} resultados encontrados.", is_success=True)
+             self.view.display_message(f"Búsqueda finalizada. {len(datos)} resultados encontrados.", is_success=True)
 
     def handle_modificar_denuncia(self, denuncia_id: int, titulo: str, denunciante: str, estado: str, descripcion: str):
         """
         Maneja el evento de modificación. Actualiza la descripción y el estado.
         """
-        print(f"Intento de modificación para Denuncia ID {denuncia_id}.")
+        log.debug("Intento de modificación para Denuncia ID %s", denuncia_id)
         
         try:
             denuncia_id = int(denuncia_id)
@@ -85,7 +108,7 @@ class DenunciaController:
         """
         [CORRECCIÓN CLAVE] Maneja el evento de eliminación llamando al modelo.
         """
-        print(f"Intento de eliminación para Denuncia ID {denuncia_id}.")
+        log.debug("Intento de eliminación para Denuncia ID %s", denuncia_id)
         
         try:
             denuncia_id = int(denuncia_id)
@@ -113,14 +136,18 @@ class DenunciaController:
             
         texto_busqueda = datos_busqueda.get('texto', '').strip()
         filtro_estado = datos_busqueda.get('estado', 'Todos')
+        limite = datos_busqueda.get('limite')
+        desplazamiento = datos_busqueda.get('desplazamiento', 0)
         
         try:
             return self.model.obtener_listado_denuncias_filtrado(
                 texto_busqueda=texto_busqueda, 
-                estado=filtro_estado
+                estado=filtro_estado,
+                limite=limite,
+                desplazamiento=desplazamiento
             )
         except Exception as e:
-            print(f"Error al obtener listado de denuncias: {e}")
+            log.error("Error al obtener listado de denuncias: %s", e)
             return []
             
     def obtener_detalles_denuncia(self, denuncia_id: int) -> Optional[Dict]:
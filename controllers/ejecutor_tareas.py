@@ -0,0 +1,211 @@
+import logging
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+log = logging.getLogger(__name__)
+
+class Tarea:
+    """Trabajo enviado a un ejecutor. Se puede cancelar mientras esté pendiente."""
+
+    def __init__(self, clave: Optional[str] = None, vista=None,
+                 al_terminar: Optional[Callable[[Any], None]] = None,
+                 al_fallar: Optional[Callable[[Exception], None]] = None):
+        self.clave = clave
+        self.vista = vista
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self._cancelada = threading.Event()
+
+    def cancelar(self):
+        """
+        Marca la tarea como cancelada: si aún no empezó no se ejecuta y, si ya
+        está en curso, su resultado se descarta (no llega a la vista).
+        """
+        self._cancelada.set()
+
+    @property
+    def cancelada(self) -> bool:
+        return self._cancelada.is_set()
+
+
+class EjecutorTareas:
+    """
+    Ejecuta el trabajo de los modelos en hilos para no congelar la ventana.
+
+    El resultado vuelve al hilo de Tk con after(): los callbacks al_terminar y
+    al_fallar se ejecutan en el hilo principal y pueden tocar la vista. Una
+    tarea con 'clave' reemplaza a la anterior con la misma clave (p. ej. una
+    búsqueda nueva cancela la que seguía en curso). Cuando una vista pasa a
+    tener tareas pendientes, o deja de tenerlas, se llama a su
+    marcar_ocupada(bool) si la tiene (ver views/vista_ocupable.py).
+
+    Uso desde un controlador:
+        self.ejecutor.enviar(self.model.obtener_por_id, nna_id,
+                             al_terminar=self._mostrar_nna, clave="cargar_nna",
+                             vista=self.vista)
+    """
+
+    MAX_HILOS = 4
+    INTERVALO_SONDEO_MS = 30  # Frecuencia con la que Tk revisa resultados pendientes
+
+    def __init__(self, raiz, max_hilos: int = None):
+        self.raiz = raiz
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos or self.MAX_HILOS,
+                                        thread_name_prefix="tarea")
+        self._resultados = queue.Queue()  # Hilos -> Tk
+        self._vigentes: Dict[str, Tarea] = {}
+        self._ocupadas: Dict[int, int] = {}  # id(vista) -> tareas pendientes
+        self._pendientes = 0
+        self._sondeo = None
+        self._cerrado = False
+
+    def enviar(self, funcion: Callable, *args, al_terminar: Callable[[Any], None] = None,
+               al_fallar: Callable[[Exception], None] = None, clave: str = None,
+               vista=None, **kwargs) -> Tarea:
+        """Programa funcion(*args, **kwargs) en segundo plano. Llamar desde el hilo de Tk."""
+        tarea = Tarea(clave, vista, al_terminar, al_fallar)
+        if self._cerrado:
+            tarea.cancelar()
+            return tarea
+
+        if clave is not None:
+            anterior = self._vigentes.get(clave)
+            if anterior is not None:
+                anterior.cancelar()
+            self._vigentes[clave] = tarea
+
+        self._pendientes += 1
+        self._marcar_ocupada(vista, +1)
+        self._pool.submit(self._ejecutar, tarea, funcion, args, kwargs)
+        self._asegurar_sondeo()
+        return tarea
+
+    def cancelar(self, clave: str):
+        """Cancela la tarea vigente con esa clave, si existe."""
+        tarea = self._vigentes.get(clave)
+        if tarea is not None:
+            tarea.cancelar()
+
+    def pendientes(self, vista) -> int:
+        """Tareas enviadas con esa vista cuyo resultado aún no se entregó."""
+        return self._ocupadas.get(id(vista), 0)
+
+    def cerrar(self):
+        """Cancela lo pendiente y detiene los hilos (al cerrar la aplicación)."""
+        self._cerrado = True
+        for tarea in self._vigentes.values():
+            tarea.cancelar()
+        if self._sondeo is not None:
+            try:
+                self.raiz.after_cancel(self._sondeo)
+            except tk.TclError:
+                pass
+            self._sondeo = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _ejecutar(self, tarea: Tarea, funcion: Callable, args: tuple, kwargs: dict):
+        """Corre en un hilo del pool: nunca toca widgets."""
+        if tarea.cancelada:
+            self._resultados.put((tarea, None, None))
+            return
+        try:
+            self._resultados.put((tarea, funcion(*args, **kwargs), None))
+        except Exception as e:
+            self._resultados.put((tarea, None, e))
+
+    def _asegurar_sondeo(self):
+        if self._sondeo is None:
+            self._sondeo = self.raiz.after(self.INTERVALO_SONDEO_MS, self._procesar_resultados)
+
+    def _procesar_resultados(self):
+        """Corre en el hilo de Tk: entrega los resultados listos a sus callbacks."""
+        self._sondeo = None
+        while True:
+            try:
+                tarea, resultado, error = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            self._pendientes -= 1
+            if tarea.clave is not None and self._vigentes.get(tarea.clave) is tarea:
+                del self._vigentes[tarea.clave]
+            self._marcar_ocupada(tarea.vista, -1)
+
+            if tarea.cancelada or self._cerrado:
+                continue
+            try:
+                if error is not None:
+                    if tarea.al_fallar:
+                        tarea.al_fallar(error)
+                    else:
+                        log.error("Error en tarea en segundo plano: %s", error, exc_info=error)
+                elif tarea.al_terminar:
+                    tarea.al_terminar(resultado)
+            except Exception as e:
+                # Un fallo en la vista no debe detener el resto de resultados
+                log.exception("Error al entregar el resultado de la tarea: %s", e)
+
+        if self._pendientes > 0 and not self._cerrado:
+            self._asegurar_sondeo()
+
+    def _marcar_ocupada(self, vista, delta: int):
+        """Activa o retira el indicador de ocupado de la vista y de la ventana."""
+        if vista is not None:
+            clave = id(vista)
+            antes = self._ocupadas.get(clave, 0)
+            despues = antes + delta
+            if despues > 0:
+                self._ocupadas[clave] = despues
+            else:
+                self._ocupadas.pop(clave, None)
+            if (antes == 0) != (despues <= 0) and hasattr(vista, "marcar_ocupada"):
+                try:
+                    vista.marcar_ocupada(despues > 0)
+                except tk.TclError:
+                    pass  # La vista ya fue destruida
+
+        try:
+            self.raiz.configure(cursor="watch" if self._pendientes > 0 else "")
+        except tk.TclError:
+            pass
+
+
+class EjecutorSincrono:
+    """
+    Misma interfaz que EjecutorTareas, pero ejecuta en el acto y en el mismo
+    hilo. Es el valor por defecto de los controladores cuando no hay MenuApp
+    (p. ej. al usar una vista por separado).
+    """
+
+    def enviar(self, funcion: Callable, *args, al_terminar: Callable[[Any], None] = None,
+               al_fallar: Callable[[Exception], None] = None, clave: str = None,
+               vista=None, **kwargs) -> Tarea:
+        tarea = Tarea(clave, vista, al_terminar, al_fallar)
+        try:
+            resultado = funcion(*args, **kwargs)
+        except Exception as e:
+            if al_fallar:
+                al_fallar(e)
+            else:
+                log.exception("Error en tarea: %s", e)
+            return tarea
+        if al_terminar:
+            al_terminar(resultado)
+        return tarea
+
+    def cancelar(self, clave: str):
+        pass
+
+    def pendientes(self, vista) -> int:
+        return 0
+
+    def cerrar(self):
+        pass
@@ -1,48 +1,81 @@
 # controllers/login_controllers.py
 
-# Asegúrate de que esta importación exista para que el controlador pueda interactuar con la vista.
-from views.funcion_vista_login import LoginView 
-# Asumiendo que el modelo se usa para la lógica de negocio/base de datos
-# from models.login_model import LoginModel 
-from tkinter import messagebox 
+import logging
+from tkinter import messagebox
+
+from controllers.ejecutor_tareas import EjecutorTareas
+from models.login_models import UserModel
+from models import sesion
+
+log = logging.getLogger(__name__)
 
 class LoginController:
     """Controlador que maneja la lógica de negocio para la ventana de Login."""
 
+    # Un solo hilo: cada verificación de contraseña ocupa ~16 MiB (scrypt)
+    HILOS_KDF = 1
+
     # El constructor debe aceptar los argumentos pasados desde main.py
     def __init__(self, login_view, success_callback):
         self.login_view = login_view  # Guardamos la instancia de la Vista
         self.success_callback = success_callback  # Guardamos la función a llamar tras el éxito
-        # self.model = LoginModel() # Si usas un modelo
+        self.model = UserModel()
+        # El hash de la contraseña tarda a propósito: se calcula fuera del hilo
+        # de Tk para que la ventana siga respondiendo
+        self.ejecutor = EjecutorTareas(login_view, max_hilos=self.HILOS_KDF)
+        self.ejecutor.enviar(self.model.importar_usuarios_json)
 
     def handle_login(self, usuario, password):
         """Procesa la solicitud de inicio de sesión."""
-        
-        # 1. Lógica de autenticación (Ejemplo: llamar al Modelo)
-        # role = self.model.authenticate(usuario, password)
-        role = "admin" # Sustituir con lógica real
-        
-        if role:
-            messagebox.showinfo("Éxito", f"Bienvenido, {usuario} ({role}).")
-            
-            # 2. Cerrar la ventana de Login
-            self.login_view.destroy()
-            
-            # 3. Llamar a la función de menú principal con el rol
-            self.success_callback(role)
-        else:
+        self.ejecutor.enviar(
+            self.model.authenticate, usuario, password,
+            al_terminar=lambda resultado: self._login_terminado(usuario, resultado),
+            al_fallar=self._login_fallido,
+            clave="login", vista=self.login_view,
+        )
+
+    def _login_terminado(self, usuario, resultado):
+        if not resultado:
             messagebox.showerror("Error", "Usuario o contraseña incorrectos.")
+            return
+
+        # Persona, cargo, roles y permisos quedan en memoria para toda la sesión
+        role = sesion.iniciar(resultado).rol
+        log.info("Inicio de sesión de '%s' (%s)", usuario, role)
+        messagebox.showinfo("Éxito", f"Bienvenido, {usuario} ({role}).")
+
+        # Cerrar la ventana de Login y abrir el menú principal con el rol
+        self.ejecutor.cerrar()
+        self.login_view.destroy()
+        self.success_callback(role)
+
+    def _login_fallido(self, error):
+        log.error("Error al autenticar: %s", error)
+        messagebox.showerror("Error", "No se pudo verificar el usuario. Intente de nuevo.")
+
+    def handle_registration(self, username, password, role="Usuario", al_terminar=None):
+        """
+        Registra el usuario con el Modelo. Con al_terminar(ok, mensaje) el
+        registro corre en segundo plano; sin él se ejecuta en el acto y
+        devuelve True/False.
+        """
+        if al_terminar is None:
+            return self._registrar(username, password, role)[0]
+
+        self.ejecutor.enviar(
+            self._registrar, username, password, role,
+            al_terminar=lambda resultado: al_terminar(*resultado),
+            clave="registro", vista=self.login_view,
+        )
+        return None
 
-    # MÉTODO AÑADIDO para manejar el registro
-    def handle_registration(self, username, password, role="user"):
-        """Maneja el intento de registro, usa el Modelo para añadir el usuario."""
-        if self.model.users.get(username):
-            return False # Usuario ya existe
-        
+    def _registrar(self, username, password, role):
+        """Corre en el hilo del ejecutor: devuelve (ok, mensaje)."""
         try:
             self.model.add_user(username, password, role)
-            return True
+            return True, f"Usuario '{username}' registrado correctamente."
+        except ValueError as e:
+            return False, str(e)
         except Exception as e:
-            # En una aplicación real, se manejaría un error de base de datos aquí.
-            print(f"Error al registrar usuario: {e}") 
-            return False
\ No newline at end of file
+            log.error("Error al registrar usuario: %s", e)
+            return False, "Hubo un error al guardar el usuario."
@@ -4,6 +4,7 @@ from typing import Dict, List, Optional
 import datetime
 # La importación debe ser relativa al entorno de ejecución (ej. models.matricula_model)
 from models.matricula_model import MatriculaModel
+from controllers.ejecutor_tareas import EjecutorSincrono
 
 class MatriculaControlador:
     """Controlador para gestionar las operaciones de Matrículas"""
@@ -11,28 +12,50 @@ class MatriculaControlador:
     def __init__(self):
         self.model = MatriculaModel()
         self.vista = None
+        # MenuApp lo reemplaza por su EjecutorTareas (hilos en segundo plano)
+        self.ejecutor = EjecutorSincrono()
 
     def set_view(self, view_instance):
         """Establece la instancia de la vista para que el controlador pueda interactuar con ella."""
         self.vista = view_instance
 
     def load_initial_data(self):
-        """Carga inicial de datos al mostrar la vista (NNA, Unidades y Grados)."""
+        """
+        Carga inicial de datos al mostrar la vista. Solo los grados: los NNA y
+        las unidades se buscan a medida que se escribe (buscar_nna/buscar_unidades).
+        """
         if not self.vista: return
         
         try:
-            # Obtener datos del modelo
-            nna_list = self.model.obtener_nna()
-            unidad_list = self.model.obtener_unidades_educativas()
             grados_list = self.model.listar_grados()
             
             # Pasar datos a la vista
-            self.vista._cargar_comboboxes(nna_list, unidad_list, grados_list)
-            self.vista.display_message("Seleccione un NNA y una Unidad Educativa. 🎓", is_success=True)
+            self.vista._cargar_grados(grados_list)
+            self.vista.display_message("Busque un NNA y una Unidad Educativa. 🎓", is_success=True)
             
         except Exception as e:
             self.vista.display_message(f"❌ Error al cargar datos iniciales: {str(e)}", is_success=False)
 
+    # --- BÚSQUEDAS DE LOS SELECTORES (typeahead) ---
+
+    def buscar_nna(self, texto: str, al_resultado):
+        """Sugerencias de NNA para lo escrito; al_resultado recibe [{id, nombre_completo}]."""
+        self._buscar_sugerencias("sugerencias_nna", self.model.buscar_nna, texto, al_resultado)
+
+    def buscar_unidades(self, texto: str, al_resultado):
+        """Sugerencias de unidades educativas; al_resultado recibe [{id, nombre}]."""
+        self._buscar_sugerencias("sugerencias_unidad", self.model.buscar_unidades_educativas, texto, al_resultado)
+
+    def _buscar_sugerencias(self, clave: str, buscar, texto: str, al_resultado):
+        # Con 'clave', una búsqueda nueva cancela la anterior que siga en curso.
+        # No se pasa la vista: las sugerencias no deben bloquear los botones.
+        self.ejecutor.enviar(
+            buscar, texto,
+            al_terminar=al_resultado,
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error al buscar: {str(e)}", is_success=False),
+            clave=clave
+        )
+
     # --- MÉTODOS DE MANEJO DE EVENTOS (Handle Methods) ---
 
     def _validar_datos_comunes(self, data: Dict) -> bool:
@@ -3,6 +3,7 @@ import os
 from typing import Dict, List, Optional
 import datetime
 from models.nna_model import NNAModel
+from controllers.ejecutor_tareas import EjecutorSincrono
     
 class NNAControlador:
     """Controlador para gestionar las operaciones de NNA"""
@@ -10,6 +11,8 @@ class NNAControlador:
     def __init__(self):
         self.model = NNAModel()
         self.vista = None
+        # MenuApp lo reemplaza por su EjecutorTareas (hilos en segundo plano)
+        self.ejecutor = EjecutorSincrono()
 
     def set_view(self, view_instance):
         """Establece la instancia de la vista para que el controlador pueda interactuar con ella."""
@@ -45,35 +48,41 @@ class NNAControlador:
         """Maneja la creación y actualiza la vista."""
         if not self.vista or not self._validar_datos(data): return
         
-        try:
-            resultado = self.model.crear_nna(data)
-            
+        def al_terminar(resultado):
             if resultado.get("status") == "success":
                 self.vista.display_message(f"✅ NNA '{data['primer_nombre']} {data['primer_apellido']}' creado.", is_success=True)
                 self.vista.limpiar_entradas()
             else:
                 # El modelo maneja el mensaje de error de formato/BD
                 self.vista.display_message(f"❌ Error al crear NNA: {resultado.get('error', 'Desconocido')}", is_success=False)
-                
-        except Exception as e:
-            self.vista.display_message(f"❌ Error interno al crear NNA: {str(e)}", is_success=False)
+
+        self.ejecutor.enviar(
+            self.model.crear_nna, data,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error interno al crear NNA: {str(e)}", is_success=False),
+            vista=self.vista
+        )
 
     def handle_cargar_nna_por_id(self, nna_id: int):
         """Busca un NNA por ID y carga sus datos en la vista."""
         if not self.vista: return
             
-        try:
-            resultado = self.model.obtener_por_id(nna_id) 
-            
+        def al_terminar(resultado):
             if resultado:
                 self.vista.display_message(f"✅ NNA '{resultado['primer_nombre']} {resultado['primer_apellido']}' cargado.", is_success=True)
                 self.vista._establecer_datos_formulario(resultado)
             else:
                 self.vista.display_message(f"❌ No se encontró NNA con ID: {nna_id}", is_success=False)
                 self.vista.limpiar_entradas(clean_search=False)
-                
-        except Exception as e:
-            self.vista.display_message(f"❌ Error al cargar NNA: {str(e)}", is_success=False)
+
+        # Una búsqueda nueva reemplaza a la anterior si todavía no terminó
+        self.ejecutor.enviar(
+            self.model.obtener_por_id, nna_id,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error al cargar NNA: {str(e)}", is_success=False),
+            clave="cargar_nna",
+            vista=self.vista
+        )
 
 
     def handle_actualizar_nna(self, data: Dict):
@@ -81,22 +90,24 @@ class NNAControlador:
         nna_id = data.get('id')
         if not self.vista or not nna_id or not self._validar_datos(data): return
         
-        try:
-            # CORRECCIÓN: Clonar data y eliminar 'id'. Se pasa el diccionario limpio al modelo.
-            update_data = {k: v for k, v in data.items() if k != 'id'}
-            
-            # CORRECCIÓN: Llamar al modelo pasando el diccionario 'update_data' directamente como el segundo argumento
-            resultado = self.model.actualizar_nna(nna_id, update_data)
-            
+        # CORRECCIÓN: Clonar data y eliminar 'id'. Se pasa el diccionario limpio al modelo.
+        update_data = {k: v for k, v in data.items() if k != 'id'}
+
+        def al_terminar(resultado):
             if resultado.get("status") == "success":
                 self.vista.display_message(f"✅ NNA ID {nna_id} actualizado.", is_success=True)
                 self.vista.limpiar_entradas()
             else:
                 # El modelo maneja el mensaje de error de formato/BD
                 self.vista.display_message(f"❌ Error al actualizar NNA: {resultado.get('error', 'Desconocido')}", is_success=False)
-                
-        except Exception as e:
-            self.vista.display_message(f"❌ Error interno al actualizar NNA: {str(e)}", is_success=False)
+
+        # CORRECCIÓN: Llamar al modelo pasando el diccionario 'update_data' directamente como el segundo argumento
+        self.ejecutor.enviar(
+            self.model.actualizar_nna, nna_id, update_data,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error interno al actualizar NNA: {str(e)}", is_success=False),
+            vista=self.vista
+        )
 
     def handle_eliminar_nna(self, nna_id: int):
         """Maneja la eliminación y actualiza la vista."""
@@ -104,14 +115,16 @@ class NNAControlador:
             self.vista.display_message("❌ ID del NNA es obligatorio para eliminar.", is_success=False)
             return
 
-        try:
-            resultado = self.model.eliminar_nna(nna_id)
-            
+        def al_terminar(resultado):
             if resultado.get("status") == "success":
                 self.vista.display_message(f"✅ NNA ID {nna_id} eliminado correctamente", is_success=True)
                 self.vista.limpiar_entradas()
             else:
                 self.vista.display_message(f"❌ Error al eliminar NNA: {resultado.get('message', 'Desconocido')}", is_success=False)
-                
-        except Exception as e:
-            self.vista.display_message(f"❌ Error interno al eliminar NNA: {str(e)}", is_success=False)
\ No newline at end of file
+
+        self.ejecutor.enviar(
+            self.model.eliminar_nna, nna_id,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error interno al eliminar NNA: {str(e)}", is_success=False),
+            vista=self.vista
+        )
\ No newline at end of file
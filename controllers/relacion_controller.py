@@ -1,9 +1,12 @@
 # controllers/relacion_controller.py
 
+import logging
 from models.relacion_model import RelacionNNAFamiliarModel
 from models.nna_model import NNAModel 
 from models.familiar_model import FamiliarModel 
 
+log = logging.getLogger(__name__)
+
 class RelacionNNAFamiliarController:
     """
     Controlador para gestionar la creación y consulta de vínculos entre NNA y familiares.
@@ -22,7 +25,7 @@ class RelacionNNAFamiliarController:
             parentescos = self.model.obtener_parentescos()
             return parentescos
         except Exception as e:
-            print(f"[ERROR_CTRL] No se pudieron cargar los parentescos: {e}")
+            log.error("No se pudieron cargar los parentescos: %s", e)
             return []
 
     def crear_nueva_relacion(self, nna_id, familiar_id, parentesco_id, convive_str):
@@ -68,5 +71,5 @@ class RelacionNNAFamiliarController:
         except ValueError:
             return []
         except Exception as e:
-            print(f"[ERROR_CTRL] Error al listar relaciones para NNA {nna_id}: {e}")
+            log.error("Error al listar relaciones para NNA %s: %s", nna_id, e)
             return []
\ No newline at end of file
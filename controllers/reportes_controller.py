@@ -2,40 +2,12 @@ import sys
 import os
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import pandas as pd
-
-# ----------------------------------------------------------------------
-# MOCKS (TEMPORAL)
-# ----------------------------------------------------------------------
-class MockReportesModel:
-    """Simulación del modelo de base de datos para reportes."""
-    def obtener_datos_nna(self):
-        return [
-            {'id': 1, 'nombre': 'Ana', 'genero': 'Femenino', 'edad': 10, 'alerta_activa': True},
-            {'id': 2, 'nombre': 'Luis', 'genero': 'Masculino', 'edad': 12, 'alerta_activa': False},
-            {'id': 3, 'nombre': 'Sofía', 'genero': 'Femenino', 'edad': 8, 'alerta_activa': True},
-            {'id': 4, 'nombre': 'Pedro', 'genero': 'Masculino', 'edad': 15, 'alerta_activa': True},
-        ]
-    def obtener_datos_alertas(self):
-        return [
-            {'id': 101, 'nna_id': 1, 'estado': 'Abierto', 'tipo': 'Abandono'},
-            {'id': 102, 'nna_id': 3, 'estado': 'Abierto', 'tipo': 'Maltrato'},
-            {'id': 103, 'nna_id': 4, 'estado': 'Cerrado', 'tipo': 'Riesgo'},
-        ]
-    def obtener_total_nna(self): return len(self.obtener_datos_nna())
-    def obtener_alertas_activas_count(self): return len([a for a in self.obtener_datos_alertas() if a['estado'] == 'Abierto'])
-
-class MockExportadorService:
-    """Simulación del servicio de exportación."""
-    def exportar_csv(self, data, filename):
-        return {"status": "success", "message": f"Datos exportados a CSV: {filename}.csv"}
-
-# Asumiendo que el modelo real existe si no hay excepción
-try:
-    from models.reportes_model import ReportesModel, ExportadorService
-except ImportError:
-    ReportesModel = MockReportesModel
-    ExportadorService = MockExportadorService
+
+from controllers.ejecutor_tareas import EjecutorSincrono
+from models.reportes_model import ReportesModel, ExportadorService
+
+# Destino de las exportaciones cuando la vista no indica un archivo
+DIRECTORIO_EXPORTACION = "exportaciones"
 
 
 class ReportesControlador:
@@ -45,39 +17,75 @@ class ReportesControlador:
         self.vista = None
         self.model = ReportesModel()
         self.exportador = ExportadorService()
+        # MenuApp lo reemplaza por su EjecutorTareas (hilos en segundo plano)
+        self.ejecutor = EjecutorSincrono()
         
         # Definición de reportes disponibles para la vista
         self.reportes_disponibles = {
             "NNA_GENERAL": "Reporte General de NNA",
             "ALERTAS_ACTIVAS": "Alertas Activas y Estado",
             "NNA_POR_GENERO": "NNA por Género (Gráfico)",
+            "NNA_POR_EDAD": "NNA por Rango de Edad",
+            "DENUNCIAS_POR_ESTADO": "Denuncias Abiertas y Cerradas",
+            "DENUNCIAS_POR_MES": "Denuncias por Mes",
+            "DENUNCIAS_POR_CONSEJERO": "Denuncias por Consejero",
+            "MATRICULAS_POR_UNIDAD": "Matrículas por Unidad Educativa",
+            "SEGUIMIENTOS_POR_EXPEDIENTE": "Seguimientos por Expediente",
+        }
+        # Reportes de conteo resueltos en SQL: clave -> (método del modelo, columnas, admite fechas).
+        # Los métodos devuelven {grupo: total} o directamente la lista de filas.
+        self.reportes_agregados = {
+            "NNA_POR_EDAD": ("contar_nna_por_rango_edad", ["rango_edad", "total"], False),
+            "DENUNCIAS_POR_ESTADO": ("contar_denuncias_por_estado", ["estado", "total"], True),
+            "DENUNCIAS_POR_MES": ("contar_denuncias_abiertas_por_mes", ["mes", "abiertas", "cerradas"], True),
+            "DENUNCIAS_POR_CONSEJERO": ("contar_denuncias_por_consejero", ["consejero", "total"], True),
+            "MATRICULAS_POR_UNIDAD": ("contar_matriculas_por_unidad", ["unidad_educativa", "total"], False),
+            "SEGUIMIENTOS_POR_EXPEDIENTE": ("contar_seguimientos_por_expediente",
+                                            ["expediente_id", "total", "ultima_fecha"], False),
         }
         self.data_cache: Dict[str, List[Dict]] = {} # Cache para datos del último reporte generado
+        # Exportador según la extensión del archivo elegido
+        self.exportadores = {
+            ".csv": ExportadorService.exportar_csv_streaming,
+            ".xlsx": ExportadorService.exportar_excel_streaming,
+            ".pdf": lambda datos, ruta, columnas=None: ExportadorService.exportar_a_pdf(
+                datos, ruta, titulo=self.reportes_disponibles.get(self.ultimo_reporte, "Reporte"),
+                columnas=columnas),
+        }
+        self.ultimo_reporte: Optional[str] = None
         
     def set_view(self, view_instance):
         """Establece la instancia de la vista."""
         self.vista = view_instance
 
+    def liberar(self):
+        """Llamado por MenuApp al desalojar la vista: descarta los reportes en caché."""
+        self.data_cache.clear()
+
     def load_initial_data(self):
         """Llama a la vista para cargar los reportes disponibles y las estadísticas iniciales."""
         if not self.vista: return
 
         self.vista._cargar_reportes_disponibles(self.reportes_disponibles)
         
-        try:
-            # 1. Obtener estadísticas de resumen
-            stats = self._obtener_estadisticas_resumen()
+        def al_terminar(stats):
             self.vista.display_stats(stats)
-            
             self.vista.display_message("Datos iniciales y estadísticas cargados. Seleccione un reporte.", is_success=True)
 
-        except Exception as e:
-            self.vista.display_message(f"❌ Error al cargar datos iniciales: {str(e)}", is_success=False)
+        # 1. Obtener estadísticas de resumen (conteos en SQL, fuera del hilo de Tk)
+        self.ejecutor.enviar(
+            self._obtener_estadisticas_resumen,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error al cargar datos iniciales: {str(e)}", is_success=False),
+            clave="estadisticas",
+            vista=self.vista
+        )
 
     def _obtener_estadisticas_resumen(self) -> Dict:
-        """Calcula y devuelve las estadísticas de resumen."""
-        total_nna = self.model.obtener_total_nna()
-        alertas_activas = self.model.obtener_alertas_activas_count()
+        """Calcula y devuelve las estadísticas de resumen (lecturas de las tablas de resumen)."""
+        total_nna = self.model.contar_nna()
+        # Alertas activas = denuncias que siguen abiertas (Pendiente)
+        alertas_activas = self.model.contar_denuncias_abiertas()
         
         return {
             'total_nna': total_nna,
@@ -86,70 +94,111 @@ class ReportesControlador:
         }
 
     def _obtener_datos_genero_count(self) -> Dict[str, int]:
-        """Prepara los datos para el gráfico de NNA por género."""
-        nna_data = self.model.obtener_datos_nna()
-        genero_counts = {}
-        for nna in nna_data:
-            genero = nna.get('genero', 'Desconocido')
-            genero_counts[genero] = genero_counts.get(genero, 0) + 1
-        return genero_counts
-
-    def handle_generar_reporte(self, reporte_key: str):
+        """Prepara los datos para el gráfico de NNA por género (GROUP BY en la BD)."""
+        return self.model.contar_nna_por_genero()
+
+    def handle_generar_reporte(self, reporte_key: str, filtros: Optional[Dict] = None):
         """Maneja la generación y visualización de un reporte específico."""
         if not self.vista: return
 
+        # La vista envía el nombre visible del reporte; se admite también la clave
+        reporte_key = next((k for k, v in self.reportes_disponibles.items() if v == reporte_key), reporte_key)
+
+        if reporte_key not in self.reportes_disponibles:
+            self.vista.display_message("❌ Tipo de reporte no reconocido.", False)
+            self.vista.display_results([], [], "Resultados")
+            return # Salir si el reporte no es válido
+
+        # Las consultas corren en segundo plano; un reporte nuevo reemplaza al anterior
+        self.ejecutor.enviar(
+            self._obtener_datos_reporte, reporte_key, filtros or {},
+            al_terminar=lambda data: self._mostrar_reporte(reporte_key, data),
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error al generar reporte: {str(e)}", is_success=False),
+            clave="generar_reporte",
+            vista=self.vista
+        )
+
+    def _obtener_datos_reporte(self, reporte_key: str, filtros: Dict):
+        """Trabajo de consulta del reporte (se ejecuta fuera del hilo de Tk)."""
+        if reporte_key in self.reportes_agregados:
+            metodo, columnas, admite_fechas = self.reportes_agregados[reporte_key]
+            argumentos = {}
+            if admite_fechas:
+                argumentos = {'desde': filtros.get('desde'), 'hasta': filtros.get('hasta')}
+            conteos = getattr(self.model, metodo)(**argumentos)
+            if isinstance(conteos, dict):
+                return [{columnas[0]: grupo, columnas[1]: total} for grupo, total in conteos.items()]
+            return conteos
+        if reporte_key == "NNA_GENERAL":
+            return self.model.obtener_datos_nna()
+        if reporte_key == "ALERTAS_ACTIVAS":
+            return self.model.obtener_datos_alertas(solo_abiertas=True)
+        # Para gráficos, el controlador prepara los datos resumidos
+        return self._obtener_datos_genero_count()
+
+    def _mostrar_reporte(self, reporte_key: str, data):
+        """Entrega a la vista los datos del reporte (hilo de Tk)."""
+        self.ultimo_reporte = reporte_key
         try:
             if reporte_key == "NNA_GENERAL":
-                data = self.model.obtener_datos_nna()
                 self.data_cache["NNA_GENERAL"] = data
                 # La vista recibe los datos, las columnas para la tabla, y el título
                 self.vista.display_results(data, ["id", "nombre", "genero", "edad", "alerta_activa"], "Reporte General de NNA")
                 self.vista._plot_chart(None, None) # Limpiar gráfico
                 
             elif reporte_key == "ALERTAS_ACTIVAS":
-                data = [a for a in self.model.obtener_datos_alertas() if a['estado'] == 'Abierto']
                 self.data_cache["ALERTAS_ACTIVAS"] = data
                 self.vista.display_results(data, ["id", "nna_id", "tipo", "estado"], "Alertas Activas")
                 self.vista._plot_chart(None, None) # Limpiar gráfico
                 
+            elif reporte_key in self.reportes_agregados:
+                self.data_cache[reporte_key] = data
+                columnas = self.reportes_agregados[reporte_key][1]
+                self.vista.display_results(data, columnas, self.reportes_disponibles[reporte_key])
+                self.vista._plot_chart(None, None) # Limpiar gráfico
+
             elif reporte_key == "NNA_POR_GENERO":
-                # Para gráficos, el controlador prepara los datos resumidos
-                data = self._obtener_datos_genero_count()
                 self.data_cache["NNA_POR_GENERO"] = [] # No exportable como tabla simple
                 self.vista.display_results([], [], "Conteo de NNA por Género: Gráfico Generado")
                 # La vista recibe el tipo de gráfico y los datos
                 self.vista._plot_chart("bar_genero", data)
-                
-            else:
-                self.vista.display_message("❌ Tipo de reporte no reconocido.", False)
-                self.vista.display_results([], [], "Resultados")
-                return # Salir si el reporte no es válido
 
             self.vista.display_message(f"✅ Reporte '{self.reportes_disponibles.get(reporte_key)}' generado.", True)
 
         except Exception as e:
             self.vista.display_message(f"❌ Error al generar reporte: {str(e)}", is_success=False)
 
-    def handle_exportar_reporte(self, reporte_key: str):
-        """Maneja la exportación del reporte actualmente en caché (solo para datos de tabla)."""
+    def handle_exportar_reporte(self, data: List[Dict], columns: List[str], ruta: Optional[str] = None):
+        """
+        Exporta las filas del reporte mostrado al archivo 'ruta'; el formato sale
+        de la extensión (.csv, .xlsx o .pdf). Sin ruta se escribe un CSV en
+        DIRECTORIO_EXPORTACION.
+        """
         if not self.vista: return
-        
-        data_to_export = self.data_cache.get(reporte_key)
-        
-        if not data_to_export:
-            self.vista.display_message("❌ No hay datos en caché para exportar. Genere el reporte primero.", False)
+
+        if not data:
+            self.vista.display_message("❌ No hay datos para exportar. Genere el reporte primero.", False)
             return
 
-        try:
-            # Simulación de la exportación con un nombre de archivo
-            filename = f"Reporte_{reporte_key}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            resultado = self.exportador.exportar_csv(data_to_export, filename)
-            
-            if resultado.get("status") == "success":
-                self.vista.display_message(f"✅ Exportación exitosa: {resultado['message']}", True)
-            else:
-                self.vista.display_message(f"❌ Error de exportación: {resultado.get('message', 'Desconocido')}", False)
+        if not ruta:
+            ruta = os.path.join(DIRECTORIO_EXPORTACION,
+                                f"Reporte_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        exportar = self.exportadores.get(os.path.splitext(ruta)[1].lower())
+        if exportar is None:
+            self.vista.display_message("❌ Formato no soportado. Use .csv, .xlsx o .pdf.", False)
+            return
 
-        except Exception as e:
-            self.vista.display_message(f"❌ Error interno al exportar: {str(e)}", is_success=False)
\ No newline at end of file
+        def al_terminar(exportado):
+            if exportado:
+                self.vista.display_message(f"✅ Exportación exitosa: {ruta}", True)
+            else:
+                self.vista.display_message("❌ Error de exportación (ver logs/proyecto.log).", False)
+
+        # Escribir el archivo no debe congelar la ventana; los exportadores escriben por lotes
+        self.ejecutor.enviar(
+            exportar, data, ruta, columnas=list(columns) or None,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: self.vista.display_message(f"❌ Error interno al exportar: {str(e)}", is_success=False),
+            clave="exportar_reporte",
+            vista=self.vista
+        )
@@ -1,7 +1,10 @@
 # controllers/tercero_controller.py
 
+import logging
 from models.tercero_model import TerceroModel
 
+log = logging.getLogger(__name__)
+
 class TerceroController:
     """
     Controlador para gestionar la creación y consulta de Terceros.
@@ -70,5 +73,5 @@ class TerceroController:
             terceros = self.model.obtener_terceros()
             return terceros
         except Exception as e:
-            print(f"[ERROR_CTRL] Error al listar terceros: {e}")
+            log.error("Error al listar terceros: %s", e)
             return []
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 import sys
 import os
 from typing import List, Dict, Any, Optional
@@ -6,6 +7,8 @@ from typing import List, Dict, Any, Optional
 # Importación del Modelo Real
 # ----------------------------------------------------------------------
 
+log = logging.getLogger(__name__)
+
 # Añadir el directorio superior y el directorio actual al path para las importaciones
 current_dir = os.path.dirname(os.path.abspath(__file__))
 # Si 'models' no estuviera en el mismo nivel, se necesitaría un ajuste de path.
@@ -19,7 +22,7 @@ try:
     from models.unidad_educativa_model import UnidadEducativaModel
 except ImportError:
     # Esto solo debería ocurrir en un entorno de ejecución específico.
-    print("Error: No se pudo importar UnidadEducativaModel. Asegúrese de que 'unidad_educativa_model.py' y 'database_connector.py' estén disponibles.")
+    log.critical("No se pudo importar UnidadEducativaModel. Asegúrese de que 'unidad_educativa_model.py' y 'database_connector.py' estén disponibles.")
     # Si la importación falla, se podría usar un mock, pero el objetivo es usar el real.
     sys.exit(1) # Detener si no se puede inicializar el modelo.
 
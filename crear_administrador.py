@@ -0,0 +1,51 @@
+"""
+Crea un usuario con el rol Administrador (el primero de una instalación nueva).
+
+El registro desde la ventana de login asigna siempre el rol Usuario, así que
+nadie puede hacerse administrador registrándose primero en una base de datos
+vacía. El administrador inicial se crea con este script, desde una consola con
+acceso al archivo de la base de datos; los demás roles se asignan después en
+Configuración. Aplica antes las migraciones pendientes (el rol Administrador lo
+crea la migración 1) y pide la contraseña por consola, sin eco.
+
+Uso:
+    python crear_administrador.py admin
+    python crear_administrador.py admin --base-datos /ruta/Proyecto_ultima.db
+"""
+import argparse
+import getpass
+import sys
+
+from models.database_connector import Database
+from models.db_setup import CreateDatabase
+from models.login_models import UserModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("usuario", help="nombre de usuario del administrador")
+    parser.add_argument("--base-datos", help="archivo SQLite (por defecto, models/Proyecto_ultima.db)")
+    args = parser.parse_args()
+
+    if args.base_datos:
+        Database().database_path = args.base_datos
+    CreateDatabase(args.base_datos)
+
+    password = getpass.getpass("Contraseña: ")
+    if not password:
+        print("La contraseña no puede estar vacía.")
+        sys.exit(1)
+    if password != getpass.getpass("Repita la contraseña: "):
+        print("Las contraseñas no coinciden.")
+        sys.exit(1)
+
+    try:
+        persona_id = UserModel().add_user(args.usuario, password, UserModel.ROL_ADMINISTRADOR)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    print(f"Administrador '{args.usuario}' creado (persona {persona_id}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ import warnings
 # Importamos el controlador aquí (antes de la Vista)
 from controllers.login_controllers import LoginController 
 from views.funcion_vista_login import LoginView 
-from views.menu import main as start_menu_app # Importamos la función 'main' de menu.py
+from models.db_setup import CreateDatabase
+from models.bitacora import configurar_logging
 
 
 try:
@@ -20,9 +21,24 @@ except NameError:
 # Función de Orquestación (Corregida)
 # ----------------------------------------------------------------------
 
+def start_menu_app(role=None):
+    """
+    Abre el menú principal. views.menu (y todo lo que arrastra) se importa
+    recién aquí, tras el login: la ventana de login no espera por esos imports.
+    """
+    from views.menu import main as menu_main
+    menu_main(role)
+
+
 def start_login_process():
     """Inicializa y ejecuta el proceso de Login, conectando la Vista con el Controlador."""
     
+    # Registro de eventos no bloqueante (consola + logs/proyecto.log)
+    configurar_logging()
+
+    # 0. Verificar el esquema (tablas, catálogo e índices de búsqueda)
+    CreateDatabase()
+
     # 1. Crear una INSTANCIA de la Vista (sin pasarle el controlador aún)
     login_view = LoginView()
     controller_instance = LoginController(
@@ -0,0 +1,206 @@
+"""
+Mide lo que cuesta abrir cada módulo del menú por primera vez.
+
+Cada medición corre en un proceso nuevo (imports en frío) sobre una copia de
+la base de datos, así el resultado es el que vería el usuario en su primer clic
+sin precarga: importar la vista y el controlador e instanciar el controlador
+con sus modelos. Es el trabajo que views/precarga_vistas.py adelanta tras el
+login; la construcción de los widgets no se incluye porque necesita pantalla
+(la aplicación la registra en logs/proyecto.log: "cargado en frío en ... ms").
+
+Con --importtime mide en cambio los imports del camino login -> menú con
+"python -X importtime": lo que se importa antes de mostrar el login (import
+main) y lo que se agrega al abrir el menú (import views.menu). Falla (código
+de salida 1) si alguna fase supera su presupuesto o si arrastra una de las
+DEPENDENCIAS_DIFERIDAS, que deben cargarse solo al pedir un reporte, un
+gráfico o una exportación (ver models/dependencias.py).
+
+Uso:
+    python medir_arranque.py                     # todos los módulos
+    python medir_arranque.py gestion_nna reportes
+    python medir_arranque.py --repeticiones 5
+    python medir_arranque.py --importtime [--presupuesto-login 500 --presupuesto-menu 300]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+BASE_DATOS = os.path.join(RAIZ, "models", "Proyecto_ultima.db")
+
+# Se ejecuta en el proceso hijo: argv = [módulo, ruta de la base de datos]
+CODIGO_MEDICION = r"""
+import json, sys, time, importlib
+inicio = time.perf_counter()
+from models.database_connector import Database
+Database().database_path = sys.argv[2]
+from views.menu import MODULE_PATHS
+base_ms = (time.perf_counter() - inicio) * 1000
+
+info = MODULE_PATHS[sys.argv[1]]
+inicio = time.perf_counter()
+importlib.import_module(info["view_module"])
+controlador = None
+if info.get("controller_module"):
+    controlador = getattr(importlib.import_module(info["controller_module"]), info["controller_class"])
+importar_ms = (time.perf_counter() - inicio) * 1000
+
+inicio = time.perf_counter()
+if controlador is not None:
+    controlador()
+controlador_ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({"base_ms": base_ms, "importar_ms": importar_ms, "controlador_ms": controlador_ms}))
+"""
+
+
+# Fases del arranque para --importtime: (nombre, código, presupuesto por defecto en ms)
+MARCA_FASE = "--fase--"
+FASES = (
+    ("login", "import main", 500),
+    ("menu", "import views.menu", 300),
+)
+# No deben importarse al arrancar (PIL no está: customtkinter ya lo importa)
+DEPENDENCIAS_DIFERIDAS = ("pandas", "matplotlib", "reportlab", "openpyxl", "xlsxwriter")
+
+
+def _entorno():
+    entorno = dict(os.environ)
+    rutas = [RAIZ, os.path.join(RAIZ, "views"), os.path.join(RAIZ, "models")]
+    entorno["PYTHONPATH"] = os.pathsep.join(rutas + [entorno.get("PYTHONPATH", "")])
+    entorno["PROYECTO_LOG_NIVEL"] = "ERROR"
+    return entorno
+
+
+def _ejecutar(argumentos, entorno):
+    resultado = subprocess.run([sys.executable] + argumentos, cwd=RAIZ, env=entorno,
+                               capture_output=True, text=True)
+    if resultado.returncode != 0:
+        raise RuntimeError(resultado.stderr.strip().splitlines()[-1] if resultado.stderr else "error")
+    return resultado.stdout
+
+
+def preparar_base_datos(directorio: str) -> str:
+    """Copia la base de datos y le aplica las migraciones (fuera de la medición)."""
+    ruta = os.path.join(directorio, "medicion.db")
+    shutil.copyfile(BASE_DATOS, ruta)
+    _ejecutar(["-c", "import sys; from models.db_setup import CreateDatabase; CreateDatabase(sys.argv[1])",
+               ruta], _entorno())
+    return ruta
+
+
+def medir_modulo(modulo: str, ruta_db: str, repeticiones: int) -> dict:
+    """Mediana de 'repeticiones' aperturas en frío del módulo."""
+    muestras = [json.loads(_ejecutar(["-c", CODIGO_MEDICION, modulo, ruta_db], _entorno()).splitlines()[-1])
+                for _ in range(repeticiones)]
+    return {clave: statistics.median(m[clave] for m in muestras) for clave in muestras[0]}
+
+
+def _leer_importtime(salida: str) -> dict:
+    """
+    Separa la salida de -X importtime por fases. Por fase: tiempo total (suma
+    de los imports de primer nivel, en ms), paquetes raíz importados y los
+    imports de primer nivel más costosos.
+    """
+    fases, actual = {}, None
+    for linea in salida.splitlines():
+        if linea.startswith(MARCA_FASE):
+            actual = fases.setdefault(linea[len(MARCA_FASE):].strip(),
+                                      {"total_ms": 0.0, "paquetes": set(), "costosos": []})
+            continue
+        if actual is None or not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        paquete = nombre.strip()
+        actual["paquetes"].add(paquete.split(".")[0])
+        if not nombre.startswith("  "):  # Primer nivel: el acumulado ya incluye a sus hijos
+            ms = int(acumulado) / 1000
+            actual["total_ms"] += ms
+            actual["costosos"].append((ms, paquete))
+    return fases
+
+
+def medir_importtime(repeticiones: int, presupuestos: dict) -> bool:
+    """Mide las FASES con -X importtime; devuelve False si alguna falla su control."""
+    codigo = "import sys\n" + "".join(
+        f"sys.stderr.write({MARCA_FASE + nombre!r} + '\\n')\n{sentencia}\n"
+        for nombre, sentencia, _ in FASES)
+    entorno = _entorno()
+    entorno.pop("PYTHONDONTWRITEBYTECODE", None)
+    _ejecutar(["-c", codigo], entorno)  # Compila los .pyc: se mide la carga, no la compilación
+
+    muestras = []
+    for _ in range(repeticiones):
+        resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                                   env=entorno, capture_output=True, text=True)
+        if resultado.returncode != 0:
+            raise RuntimeError(resultado.stderr.strip().splitlines()[-1])
+        muestras.append(_leer_importtime(resultado.stderr))
+
+    correcto = True
+    for nombre, _, _ in FASES:
+        total = statistics.median(m[nombre]["total_ms"] for m in muestras)
+        fase = muestras[-1][nombre]
+        presupuesto = presupuestos[nombre]
+        diferidas = sorted(p for p in fase["paquetes"] if p in DEPENDENCIAS_DIFERIDAS)
+        estado = "OK" if total <= presupuesto and not diferidas else "FALLA"
+        correcto = correcto and estado == "OK"
+        print(f"Fase {nombre}: {total:.0f} ms (presupuesto {presupuesto} ms) {estado}")
+        for ms, paquete in sorted(fase["costosos"], reverse=True)[:8]:
+            print(f"    {ms:>8.1f} ms  {paquete}")
+        if diferidas:
+            print(f"    importa dependencias diferidas: {', '.join(diferidas)}")
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modulos", nargs="*", help="claves de MODULE_PATHS (por defecto, todas)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--importtime", action="store_true",
+                        help="medir los imports del camino login -> menú y controlar el presupuesto")
+    for nombre, _, presupuesto in FASES:
+        parser.add_argument(f"--presupuesto-{nombre}", type=float, default=presupuesto,
+                            help=f"ms permitidos para la fase {nombre} (por defecto {presupuesto})")
+    args = parser.parse_args()
+
+    if args.importtime:
+        presupuestos = {nombre: getattr(args, f"presupuesto_{nombre}") for nombre, _, _ in FASES}
+        try:
+            correcto = medir_importtime(args.repeticiones, presupuestos)
+        except RuntimeError as e:
+            print(f"No se pudo medir el arranque: {e}")
+            sys.exit(2)
+        sys.exit(0 if correcto else 1)
+
+    modulos = args.modulos
+    if not modulos:
+        salida = _ejecutar(["-c", "import json; from views.menu import MODULE_PATHS; "
+                                  "print(json.dumps(list(MODULE_PATHS)))"], _entorno())
+        modulos = json.loads(salida.splitlines()[-1])
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = preparar_base_datos(directorio)
+        print(f"{'módulo':<26}{'importar':>10}{'controlador':>13}{'primer clic':>13}")
+        total, base = 0.0, []
+        for modulo in modulos:
+            try:
+                m = medir_modulo(modulo, ruta_db, args.repeticiones)
+            except RuntimeError as e:
+                print(f"{modulo:<26}  error: {e}")
+                continue
+            clic = m["importar_ms"] + m["controlador_ms"]
+            total += clic
+            base.append(m["base_ms"])
+            print(f"{modulo:<26}{m['importar_ms']:>8.0f} ms{m['controlador_ms']:>11.0f} ms{clic:>11.0f} ms")
+        if base:
+            print(f"\nImportar views.menu (antes de cualquier módulo): {statistics.median(base):.0f} ms")
+        print(f"Primer clic, suma de todos los módulos: {total:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
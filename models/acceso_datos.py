@@ -0,0 +1,139 @@
+# models/acceso_datos.py
+"""
+Núcleo de acceso a datos compartido por todos los modelos.
+
+Reemplaza el bucle que cada modelo repetía (cursor.description ->
+dict(zip(columnas, fila)), o conexion.row_factory = sqlite3.Row sobre la
+conexión compartida):
+
+    * El formato de las filas se elige por consulta con 'como' y se aplica al
+      leer, nunca con row_factory sobre la conexión, por lo que no se filtra a
+      otros modelos:
+          tuple  -> las tuplas de sqlite3 tal cual (sin copia, lo más rápido)
+          dict   -> un diccionario por fila (lo que esperan las vistas)
+          otro   -> cualquier objeto con el método fabrica(columnas), que
+                    devuelve la función fila -> registro (p. ej. los
+                    registros con slots de models/registros.py)
+    * La función que arma cada fila se calcula una vez por (formato, columnas)
+      y se reutiliza; por fila solo queda la construcción del objeto.
+    * Las sentencias preparadas las reutiliza la caché de sqlite3
+      (Database.CACHE_SENTENCIAS, parámetro cached_statements de connect).
+    * iterar() recorre resultados grandes con fetchmany sin cargarlos enteros.
+
+Las funciones reciben una conexión ya abierta (el modelo conserva su manejo de
+conexiones, transacciones y errores) y lanzan sqlite3.Error igual que execute().
+
+Uso:
+    with self.db.conexion() as conexion:
+        filas = consultar(conexion, "SELECT id, nombre FROM cargo ORDER BY nombre")
+        cargo = consultar_uno(conexion, "SELECT * FROM cargo WHERE id = ?", (cargo_id,))
+"""
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+TAMANO_LOTE = 500          # Filas por fetchmany en iterar()
+MAXIMO_FABRICAS = 512      # Entradas de la caché de fábricas de filas
+
+_fabricas: Dict[Tuple[Any, Tuple[str, ...]], Optional[Callable]] = {}
+_lock_fabricas = threading.Lock()
+
+
+def columnas(cursor: sqlite3.Cursor) -> Tuple[str, ...]:
+    """Nombres de las columnas del último SELECT ejecutado en el cursor."""
+    if cursor.description is None:
+        return ()
+    return tuple(descripcion[0] for descripcion in cursor.description)
+
+
+def _crear_fabrica(como, nombres: Tuple[str, ...]) -> Optional[Callable]:
+    if como is tuple:
+        return None
+    if como is dict:
+        return lambda fila: dict(zip(nombres, fila))
+    if hasattr(como, "fabrica"):
+        return como.fabrica(nombres)
+    raise TypeError(f"Formato de fila no soportado: {como!r}")
+
+
+def fabrica_filas(como, nombres: Tuple[str, ...]) -> Optional[Callable]:
+    """
+    Función fila -> objeto para el formato 'como' y esas columnas (None =
+    dejar la tupla). Se calcula una vez y queda en caché.
+    """
+    llave = (como, nombres)
+    try:
+        return _fabricas[llave]
+    except KeyError:
+        pass
+    fabrica = _crear_fabrica(como, nombres)
+    with _lock_fabricas:
+        if len(_fabricas) >= MAXIMO_FABRICAS:
+            # Consultas dinámicas con columnas variables: se reinicia la caché
+            _fabricas.clear()
+        _fabricas[llave] = fabrica
+    return fabrica
+
+
+def leer(cursor: sqlite3.Cursor, como=dict) -> List:
+    """Todas las filas pendientes de un cursor ya ejecutado, en el formato pedido."""
+    filas = cursor.fetchall()
+    fabrica = fabrica_filas(como, columnas(cursor))
+    if fabrica is None or not filas:
+        return filas
+    return [fabrica(fila) for fila in filas]
+
+
+def leer_uno(cursor: sqlite3.Cursor, como=dict):
+    """La siguiente fila de un cursor ya ejecutado (None si no hay más)."""
+    fila = cursor.fetchone()
+    if fila is None:
+        return None
+    fabrica = fabrica_filas(como, columnas(cursor))
+    return fila if fabrica is None else fabrica(fila)
+
+
+def consultar(conexion: sqlite3.Connection, sql: str, parametros: Sequence = (), como=dict) -> List:
+    """Ejecuta un SELECT y devuelve todas las filas en el formato pedido."""
+    cursor = conexion.execute(sql, parametros)
+    try:
+        return leer(cursor, como)
+    finally:
+        cursor.close()
+
+
+def consultar_uno(conexion: sqlite3.Connection, sql: str, parametros: Sequence = (), como=dict):
+    """Ejecuta un SELECT y devuelve la primera fila (o None)."""
+    cursor = conexion.execute(sql, parametros)
+    try:
+        return leer_uno(cursor, como)
+    finally:
+        cursor.close()
+
+
+def consultar_valor(conexion: sqlite3.Connection, sql: str, parametros: Sequence = (), defecto=None):
+    """Ejecuta un SELECT y devuelve la primera columna de la primera fila."""
+    fila = conexion.execute(sql, parametros).fetchone()
+    return defecto if fila is None else fila[0]
+
+
+def iterar(conexion: sqlite3.Connection, sql: str, parametros: Sequence = (), como=dict,
+           tamano_lote: int = TAMANO_LOTE) -> Iterator:
+    """
+    Recorre el resultado de a 'tamano_lote' filas con fetchmany. La conexión
+    debe seguir prestada mientras se consume el iterador.
+    """
+    cursor = conexion.execute(sql, parametros)
+    try:
+        fabrica = fabrica_filas(como, columnas(cursor))
+        while True:
+            lote = cursor.fetchmany(tamano_lote)
+            if not lote:
+                return
+            if fabrica is None:
+                yield from lote
+            else:
+                for fila in lote:
+                    yield fabrica(fila)
+    finally:
+        cursor.close()
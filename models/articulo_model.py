@@ -2,20 +2,27 @@
 """
 Módulo del modelo para la gestión de artículos (e.g., LOPNNA) en la base de datos.
 """
+import logging
 import sys
 import os
 import sqlite3
 from sqlite3 import Error
 from typing import List, Dict, Optional
 
+log = logging.getLogger(__name__)
+
 # Agregar el directorio actual al path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from database_connector import Database
+    from cache_catalogos import cache_catalogos
+    from acceso_datos import consultar, consultar_uno
 except ImportError:
     # Usar ruta relativa si el intento inicial falla (común en ciertos setups)
     from models.database_connector import Database
+    from models.cache_catalogos import cache_catalogos
+    from models.acceso_datos import consultar, consultar_uno
 
 class ArticuloModelo:
     """
@@ -37,13 +44,14 @@ class ArticuloModelo:
             cursor = conexion.cursor()
             cursor.execute(query, (codigo, articulo, descripcion))
             conexion.commit()
+            cache_catalogos.invalidar("articulos")
             return cursor.lastrowid
         # Se manejan IntegrityError (duplicado) y Error general de SQLite
         except sqlite3.IntegrityError as e:
-            print(f"Advertencia: Artículo {codigo} ya existe. {str(e)}")
+            log.warning("Artículo %s ya existe: %s", codigo, e)
             return None
         except Error as e:
-            print(f"Error al insertar artículo {codigo}: {str(e)}")
+            log.error("Error al insertar artículo %s: %s", codigo, e)
             return None
         finally:
             if conexion:
@@ -51,8 +59,11 @@ class ArticuloModelo:
 
     def obtener_todos_los_articulos(self) -> List[Dict]:
         """
-        Retorna todos los artículos para llenar la lista en la vista
+        Retorna todos los artículos para llenar la lista en la vista (cacheado)
         """
+        return cache_catalogos.obtener("articulos", self._consultar_articulos)
+
+    def _consultar_articulos(self) -> List[Dict]:
         query = """
             SELECT 
                 id,
@@ -68,15 +79,10 @@ class ArticuloModelo:
             if not conexion:
                 return []
                 
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(query)
-            resultado = cursor.fetchall()
-            return [dict(row) for row in resultado]
+            return consultar(conexion, query)
             
         except Error as e:
-            print("Ha ocurrido un error mientras se trataba de obtener todos los "
-                  f"artículos: {str(e)}")
+            log.error("Error al obtener todos los artículos: %s", e)
             return []
         finally:
             if conexion:
@@ -105,15 +111,10 @@ class ArticuloModelo:
             if not conexion:
                 return None
                 
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(query, parametros)
-            resultado = cursor.fetchone()
-            return dict(resultado) if resultado else None
+            return consultar_uno(conexion, query, parametros)
             
         except Error as e:
-            print("Ha ocurrido un error mientras se trataba de obtener el "
-                  f"articulo: {str(e)}")
+            log.error("Error al obtener el artículo: %s", e)
             return None
         finally:
             if conexion:
@@ -143,14 +144,15 @@ class ArticuloModelo:
             parametros = (nuevo_codigo, nuevo_articulo, nueva_descripcion, articulo_id)
             cursor.execute(query, parametros)
             conexion.commit()
+            if cursor.rowcount > 0:
+                cache_catalogos.invalidar("articulos")
             return cursor.rowcount > 0
                 
         except sqlite3.IntegrityError as e:
-            print(f"Error de integridad: El código {nuevo_codigo} ya existe. {str(e)}")
+            log.warning("Error de integridad: el código %s ya existe: %s", nuevo_codigo, e)
             return False
         except Error as e:
-            print("Ha ocurrido un error mientras se trataba actualizar el "
-                  f"artículo ID {articulo_id}: {str(e)}")
+            log.error("Error al actualizar el artículo ID %s: %s", articulo_id, e)
             return False
         finally:
             if conexion:
@@ -173,15 +175,15 @@ class ArticuloModelo:
             conexion.commit()
             
             if cursor.rowcount > 0:
-                print(f"Artículo ID {articulo_id} eliminado con éxito.")
+                cache_catalogos.invalidar("articulos")
+                log.info("Artículo ID %s eliminado", articulo_id)
                 return True
                 
-            print(f"Advertencia: No se encontró el artículo ID {articulo_id} para eliminar.")
+            log.warning("No se encontró el artículo ID %s para eliminar", articulo_id)
             return False
                     
         except Error as e:
-            print("Error al intentar eliminar el "
-                  f"artículo ID {articulo_id}: {str(e)}")
+            log.error("Error al eliminar el artículo ID %s: %s", articulo_id, e)
             return False
         finally:
             if conexion:
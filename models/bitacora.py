@@ -0,0 +1,140 @@
+# models/bitacora.py
+"""
+Registro de eventos (logging) de la aplicación.
+
+Los módulos no imprimen: cada uno usa su propio logger y pasa los valores como
+argumentos, de modo que el mensaje solo se arma si su nivel está activo:
+
+    log = logging.getLogger(__name__)
+    log.debug("Obtenidos %d registros de %s", len(filas), tabla)
+    log.error("Error al listar NNA: %s", e)
+
+configurar_logging(), llamada una vez al arrancar (main.py), decide a dónde van
+los mensajes. Los loggers solo encolan el evento (QueueHandler) y un hilo aparte
+(QueueListener) lo escribe, así la consola de Windows o un stdout redirigido no
+frenan la interfaz ni las operaciones masivas:
+
+    * logs/proyecto.log: una línea JSON por evento (fecha, nivel, módulo, hilo,
+      mensaje y los campos pasados con extra=), rotando cada TAMANO_MAXIMO bytes;
+    * la consola (stderr): texto legible, solo desde NIVEL_CONSOLA.
+
+Niveles: DEBUG para las rutas calientes (cada conexión, cada consulta de
+reportes), INFO para el arranque y las operaciones completadas, WARNING/ERROR
+para los fallos. La variable de entorno PROYECTO_LOG_NIVEL (p. ej. DEBUG)
+cambia el nivel general sin tocar el código.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from typing import Optional
+
+VARIABLE_NIVEL = "PROYECTO_LOG_NIVEL"
+NIVEL_POR_DEFECTO = "INFO"
+NIVEL_CONSOLA = "WARNING"
+DIRECTORIO_LOGS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+ARCHIVO_LOG = "proyecto.log"
+TAMANO_MAXIMO = 1024 * 1024     # Bytes por archivo antes de rotar
+ARCHIVOS_RESPALDO = 5           # proyecto.log.1 ... proyecto.log.5
+
+# Bibliotecas que en DEBUG escriben demasiado
+_RUIDOSAS = ("PIL", "matplotlib")
+
+# Atributos propios de LogRecord: el resto son los campos pasados con extra=
+_ATRIBUTOS_REGISTRO = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_manejador_cola: Optional[logging.handlers.QueueHandler] = None
+
+
+class FormatoJSON(logging.Formatter):
+    """Un objeto JSON por línea, fácil de filtrar o de cargar en otra herramienta."""
+
+    def format(self, registro: logging.LogRecord) -> str:
+        evento = {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(registro.created))
+                     + f".{int(registro.msecs):03d}",
+            "nivel": registro.levelname,
+            "modulo": registro.name,
+            "hilo": registro.threadName,
+            "mensaje": registro.getMessage(),
+        }
+        for clave, valor in vars(registro).items():
+            if clave not in _ATRIBUTOS_REGISTRO:
+                evento[clave] = valor
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+def _nivel(valor) -> int:
+    if isinstance(valor, int):
+        return valor
+    nivel = logging.getLevelName(str(valor).upper())
+    if not isinstance(nivel, int):
+        raise ValueError(f"Nivel de registro no válido: {valor}")
+    return nivel
+
+
+def configurar_logging(nivel=None, nivel_consola=None, directorio: str = None) -> logging.Logger:
+    """
+    Instala el registro no bloqueante sobre el logger raíz (idempotente: una
+    segunda llamada solo ajusta los niveles). Devuelve el logger raíz.
+    """
+    global _listener, _manejador_cola
+
+    raiz = logging.getLogger()
+    raiz.setLevel(_nivel(nivel or os.environ.get(VARIABLE_NIVEL) or NIVEL_POR_DEFECTO))
+    for nombre in _RUIDOSAS:
+        logging.getLogger(nombre).setLevel(max(raiz.level, logging.WARNING))
+
+    if _listener is not None:
+        if nivel_consola is not None:
+            for manejador in _listener.handlers:
+                if isinstance(manejador, logging.StreamHandler) and not isinstance(manejador, logging.FileHandler):
+                    manejador.setLevel(_nivel(nivel_consola))
+        return raiz
+
+    consola = logging.StreamHandler(sys.stderr)
+    consola.setLevel(_nivel(nivel_consola or NIVEL_CONSOLA))
+    consola.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(name)s: %(message)s",
+                                           datefmt="%H:%M:%S"))
+    manejadores = [consola]
+
+    directorio = directorio or DIRECTORIO_LOGS
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        archivo = logging.handlers.RotatingFileHandler(
+            os.path.join(directorio, ARCHIVO_LOG), maxBytes=TAMANO_MAXIMO,
+            backupCount=ARCHIVOS_RESPALDO, encoding="utf-8", delay=True)
+        archivo.setFormatter(FormatoJSON())
+        manejadores.append(archivo)
+        error_archivo = None
+    except OSError as e:
+        error_archivo = e
+
+    cola = queue.SimpleQueue()
+    _manejador_cola = logging.handlers.QueueHandler(cola)
+    raiz.addHandler(_manejador_cola)
+    _listener = logging.handlers.QueueListener(cola, *manejadores, respect_handler_level=True)
+    _listener.start()
+    atexit.register(detener_logging)
+
+    if error_archivo is not None:
+        raiz.warning("No se pudo abrir el archivo de registro en %s: %s", directorio, error_archivo)
+    return raiz
+
+
+def detener_logging():
+    """Escribe los eventos pendientes y detiene el hilo del registro (al salir)."""
+    global _listener, _manejador_cola
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_manejador_cola)
+    for manejador in _listener.handlers:
+        manejador.close()
+    _listener = None
+    _manejador_cola = None
@@ -0,0 +1,85 @@
+# models/cache_catalogos.py
+"""
+Caché en memoria, compartida por todo el proceso, para los catálogos que casi
+nunca cambian (parentesco, cargo, artículos, roles).
+
+Cada catálogo tiene un número de versión. Los modelos que escriben en un
+catálogo llaman a invalidar(), que sube la versión: la siguiente lectura vuelve
+a la base de datos y las demás son una búsqueda en un diccionario. Además cada
+entrada caduca a los TTL_POR_DEFECTO segundos, por si la tabla se modifica por
+fuera de los modelos (otro proceso, el script de creación, un editor de SQLite).
+
+Uso desde un modelo:
+    def listar_cargos(self):
+        return cache_catalogos.obtener("cargo", self._consultar_cargos)
+
+    def insertar_cargo(...):
+        ...
+        cache_catalogos.invalidar("cargo")
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+TTL_POR_DEFECTO = 300.0  # Segundos
+
+
+class CacheCatalogos:
+    """Catálogos cacheados por (catálogo, clave) con invalidación por versión y TTL."""
+
+    def __init__(self, ttl: float = TTL_POR_DEFECTO):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versiones: Dict[str, int] = {}
+        # (catálogo, clave) -> (versión del catálogo, instante de carga, valor)
+        self._entradas: Dict[Tuple[str, Hashable], Tuple[int, float, Any]] = {}
+
+    def obtener(self, catalogo: str, cargar: Callable[[], Any], clave: Hashable = None,
+                ttl: Optional[float] = None) -> Any:
+        """
+        Devuelve el catálogo desde la caché o lo carga con cargar().
+
+        'clave' distingue variantes del mismo catálogo (p. ej. distinto orden o
+        formato de filas); todas se invalidan juntas. Los resultados vacíos no se
+        guardan porque los modelos devuelven [] también cuando la consulta falla.
+        Las listas se devuelven copiadas para que el llamador pueda modificarlas.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            version = self._versiones.get(catalogo, 0)
+            entrada = self._entradas.get((catalogo, clave))
+            if entrada is not None:
+                version_entrada, cargado_en, valor = entrada
+                if version_entrada == version and time.monotonic() - cargado_en < ttl:
+                    return self._copiar(valor)
+
+        # La consulta se hace fuera del lock para no bloquear a otros catálogos
+        valor = cargar()
+        if valor:
+            with self._lock:
+                # Si alguien invalidó mientras cargábamos, el valor ya nace viejo
+                if self._versiones.get(catalogo, 0) == version:
+                    self._entradas[(catalogo, clave)] = (version, time.monotonic(), valor)
+        return self._copiar(valor)
+
+    def invalidar(self, *catalogos: str):
+        """Sube la versión de los catálogos indicados (todos si no se indica ninguno)."""
+        with self._lock:
+            nombres = catalogos or tuple({c for c, _ in self._entradas} | set(self._versiones))
+            for catalogo in nombres:
+                self._versiones[catalogo] = self._versiones.get(catalogo, 0) + 1
+                for llave in [llave for llave in self._entradas if llave[0] == catalogo]:
+                    del self._entradas[llave]
+
+    def version(self, catalogo: str) -> int:
+        """Versión actual de un catálogo (cambia con cada invalidación)."""
+        with self._lock:
+            return self._versiones.get(catalogo, 0)
+
+    @staticmethod
+    def _copiar(valor: Any) -> Any:
+        return list(valor) if isinstance(valor, list) else valor
+
+
+# Instancia única del proceso, compartida por todos los modelos
+cache_catalogos = CacheCatalogos()
@@ -1,133 +1,56 @@
+import logging
 import sqlite3
 import sys
 import os
 import random
-from sqlite3 import Row
 from typing import List, Dict, Optional
 
+log = logging.getLogger(__name__)
+
 # Añadir el path para que las importaciones relativas funcionen
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 
 try:
     from database_connector import Database  # Usamos la clase Database (Singleton)
 except ImportError:
-    print("Advertencia: No se pudo importar Database directamente. Intentando models.database_connector...")
     from models.database_connector import Database
 
+try:
+    from cache_catalogos import cache_catalogos
+except ImportError:
+    from models.cache_catalogos import cache_catalogos
+
+try:
+    from acceso_datos import consultar
+except ImportError:
+    from models.acceso_datos import consultar
+
+try:
+    import credenciales
+except ImportError:
+    from models import credenciales
+
+try:
+    import sesion
+except ImportError:
+    from models import sesion
+
 
 class ConfiguracionModel:
     def __init__(self):
         # 🚨 CAMBIO CLAVE: Inicializar self.db con la instancia Singleton de Database
         # La clase Database del archivo database_connector.py actúa como un Singleton.
         self.db = Database()
-        self._inicializar_base_datos()
-        
-        
-    
-    def _inicializar_base_datos(self) -> bool:
-        """Inicializa la base de datos con las tablas necesarias"""
-        conn = self.db.crearConexion() # Usando crearConexion en lugar de obtener_conexion
-        if conn is None:
-            return False
-        
-        try:
-            cursor = conn.cursor()
-            
-            # Tabla persona
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS persona(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    documento_identidad TEXT UNIQUE,
-                    primer_nombre TEXT NOT NULL,
-                    segundo_nombre TEXT,
-                    primer_apellido TEXT NOT NULL,
-                    segundo_apellido TEXT,
-                    genero TEXT CHECK(genero IN('M', 'F')), 
-                    direccion TEXT NOT NULL,
-                    telefono TEXT UNIQUE,
-                    fecha_registro DATE DEFAULT CURRENT_DATE
-                );
-            """)
-            
-            # Tabla rol
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS rol(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL UNIQUE,
-                    descripcion TEXT
-                );
-            """)
-
-            # Tabla persona_rol
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS persona_rol(
-                    persona_id INTEGER NOT NULL,
-                    rol_id INTEGER NOT NULL,
-                    fecha_asignacion DATE DEFAULT CURRENT_DATE,
-                    PRIMARY KEY (persona_id, rol_id),
-                    FOREIGN KEY (persona_id) 
-                        REFERENCES persona(id) ON DELETE CASCADE,
-                    FOREIGN KEY (rol_id) 
-                        REFERENCES rol(id) ON DELETE CASCADE
-                );
-            """)
-            
-            # Tabla cargo
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cargo(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT UNIQUE NOT NULL,
-                    descripcion TEXT,
-                    requiere_resolucion BOOLEAN DEFAULT FALSE
-                );
-            """)
-            
-            # Insertar cargo por defecto
-            cursor.execute(
-                "INSERT OR IGNORE INTO cargo (id, nombre) VALUES (1, 'AdministradorTemporal')"
-            )
-
-            # Tabla personal
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS personal(
-                    persona_id INTEGER NOT NULL,
-                    cargo_id INTEGER NOT NULL,
-                    resolucion TEXT UNIQUE NOT NULL,
-                    fecha_ingreso DATE NOT NULL,
-                    fecha_egreso DATE,
-                    activo BOOLEAN DEFAULT TRUE, 
-                    nombre_usuario TEXT UNIQUE NOT NULL,
-                    contraseña TEXT NOT NULL,
-                    PRIMARY KEY (persona_id, cargo_id),
-                    FOREIGN KEY (persona_id) 
-                        REFERENCES persona(id) ON DELETE CASCADE,
-                    FOREIGN KEY (cargo_id) 
-                        REFERENCES cargo(id) ON DELETE CASCADE
-                );
-            """)
-            
-            # Insertar rol por defecto
-            try:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO rol (nombre, descripcion) VALUES (?, ?)", 
-                    ('Administrador', 'Rol administrativo del sistema')
-                )
-            except sqlite3.IntegrityError:
-                pass  # Ya existe, no hacer nada
-            
-            conn.commit()
-            return True
-            
-        except sqlite3.Error as e:
-            print(f"Error al inicializar la base de datos: {e}")
-            return False
-        finally:
-            self.db.cerrarConexion(conn) # Usando cerrarConexion
+        # El esquema (rol, persona_rol, personal, usuario...) lo crean las
+        # migraciones de db_setup al arrancar; aquí no se ejecuta DDL.
     
     # --- Operaciones de Roles ---
     
-    def obtener_todos_los_roles(self) -> List[Row]:
-        """Obtiene todos los roles de la base de datos"""
+    def obtener_todos_los_roles(self) -> List[Dict]:
+        """Obtiene todos los roles de la base de datos (cacheado)"""
+        return cache_catalogos.obtener("rol", self._consultar_roles)
+
+    def _consultar_roles(self) -> List[Dict]:
         query = "SELECT id, nombre, descripcion FROM rol ORDER BY nombre"
         
         try:
@@ -135,20 +58,23 @@ class ConfiguracionModel:
             if conn is None:
                 return []
                 
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(query)
-            return cursor.fetchall()
+            return consultar(conn, query)
             
         except sqlite3.Error as e:
-            print(f"Error al obtener roles: {e}")
+            log.error("Error al obtener roles: %s", e)
             return []
         finally:
             self.db.cerrarConexion(conn) # Usando cerrarConexion
     
-    def insertar_rol(self, nombre: str, descripcion: str = "") -> Optional[int]:
-        """Inserta un nuevo rol y retorna su ID"""
+    def insertar_rol(self, nombre: str, descripcion: str = "",
+                     permisos: Optional[List[str]] = None) -> Optional[int]:
+        """
+        Inserta un nuevo rol con sus módulos permitidos y retorna su ID.
+        Sin 'permisos' recibe sesion.PERMISOS_POR_DEFECTO.
+        """
         query = "INSERT INTO rol (nombre, descripcion) VALUES (?, ?)"
+        if permisos is None:
+            permisos = sesion.PERMISOS_POR_DEFECTO
         
         try:
             conn = self.db.crearConexion() # Usando crearConexion
@@ -157,14 +83,20 @@ class ConfiguracionModel:
                 
             cursor = conn.cursor()
             cursor.execute(query, (nombre, descripcion))
+            rol_id = cursor.lastrowid
+            cursor.executemany("INSERT INTO rol_permiso (rol_id, modulo) VALUES (?, ?)",
+                               [(rol_id, modulo) for modulo in set(permisos)])
             conn.commit()
-            return cursor.lastrowid
+            cache_catalogos.invalidar("rol")
+            return rol_id
             
         except sqlite3.IntegrityError as e:
-            print(f"Error de integridad: El rol {nombre} ya existe. {e}")
+            conn.rollback()
+            log.warning("Error de integridad: el rol %s ya existe: %s", nombre, e)
             return None
         except sqlite3.Error as e:
-            print(f"Error al insertar rol {nombre}: {e}")
+            conn.rollback()
+            log.error("Error al insertar rol %s: %s", nombre, e)
             return None
         finally:
             self.db.cerrarConexion(conn) # Usando cerrarConexion
@@ -182,13 +114,16 @@ class ConfiguracionModel:
             cursor = conn.cursor()
             cursor.execute(query, (nuevo_nombre, nueva_descripcion, rol_id))
             conn.commit()
+            if cursor.rowcount > 0:
+                cache_catalogos.invalidar("rol")
+                sesion.invalidar()
             return cursor.rowcount > 0
             
         except sqlite3.IntegrityError as e:
-            print(f"Error de integridad: El rol {nuevo_nombre} ya existe. {e}")
+            log.warning("Error de integridad: el rol %s ya existe: %s", nuevo_nombre, e)
             return False
         except sqlite3.Error as e:
-            print(f"Error al modificar rol ID {rol_id}: {e}")
+            log.error("Error al modificar rol ID %s: %s", rol_id, e)
             return False
         finally:
             self.db.cerrarConexion(conn) # Usando cerrarConexion
@@ -205,17 +140,59 @@ class ConfiguracionModel:
             cursor = conn.cursor()
             cursor.execute(query, (rol_id,))
             conn.commit()
+            if cursor.rowcount > 0:
+                cache_catalogos.invalidar("rol")
+                sesion.invalidar()
             return cursor.rowcount > 0
             
         except sqlite3.Error as e:
-            print(f"Error al eliminar rol ID {rol_id}: {e}")
+            log.error("Error al eliminar rol ID %s: %s", rol_id, e)
             return False
         finally:
             self.db.cerrarConexion(conn) # Usando cerrarConexion
     
+    def obtener_permisos_rol(self, rol_id: int) -> List[str]:
+        """Módulos que concede el rol ('*' = todos)."""
+        try:
+            conn = self.db.crearConexion()
+            if conn is None:
+                return []
+            filas = consultar(conn, "SELECT modulo FROM rol_permiso WHERE rol_id = ? ORDER BY modulo",
+                              (rol_id,), como=tuple)
+            return [modulo for (modulo,) in filas]
+        except sqlite3.Error as e:
+            log.error("Error al obtener permisos del rol ID %s: %s", rol_id, e)
+            return []
+        finally:
+            self.db.cerrarConexion(conn)
+
+    def asignar_permisos_rol(self, rol_id: int, permisos: List[str]) -> bool:
+        """Reemplaza los módulos que concede el rol."""
+        desconocidos = set(permisos) - set(sesion.MODULOS) - {sesion.TODOS}
+        if desconocidos:
+            raise ValueError(f"Módulos no válidos: {', '.join(sorted(desconocidos))}")
+        try:
+            conn = self.db.crearConexion()
+            if conn is None:
+                return False
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM rol_permiso WHERE rol_id = ?", (rol_id,))
+            cursor.executemany("INSERT INTO rol_permiso (rol_id, modulo) VALUES (?, ?)",
+                               [(rol_id, modulo) for modulo in set(permisos)])
+            conn.commit()
+            # Los usuarios con este rol ven el cambio sin volver a entrar
+            sesion.invalidar()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            log.error("Error al asignar permisos al rol ID %s: %s", rol_id, e)
+            return False
+        finally:
+            self.db.cerrarConexion(conn)
+
     # --- Operaciones de Usuarios ---
     
-    def obtener_todos_los_usuarios(self) -> List[Row]:
+    def obtener_todos_los_usuarios(self) -> List[Dict]:
         """Obtiene todos los usuarios con sus datos completos"""
         query = """
             SELECT 
@@ -240,19 +217,18 @@ class ConfiguracionModel:
             if conn is None:
                 return []
                 
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(query)
-            return cursor.fetchall()
+            return consultar(conn, query)
             
         except sqlite3.Error as e:
-            print(f"Error al obtener usuarios: {e}")
+            log.error("Error al obtener usuarios: %s", e)
             return []
         finally:
             self.db.cerrarConexion(conn) # Usando cerrarConexion
     
     def insertar_usuario(self, datos_usuario: Dict) -> Optional[int]:
         """Inserta un nuevo usuario y retorna el ID de persona"""
+        # El hash (scrypt) se calcula antes de tomar la conexión del pool
+        password_hash = credenciales.generar_hash(datos_usuario.get('contraseña', 'password'))
         conn = self.db.crearConexion() # Usando crearConexion
         if conn is None:
             return None
@@ -287,26 +263,36 @@ class ConfiguracionModel:
             
             persona_id = cursor.lastrowid
             
-            # 2. Insertar en tabla personal
+            # 2. Insertar en tabla personal (cargo opcional)
             cursor.execute("""
-                INSERT INTO personal (
-                    persona_id, cargo_id, resolucion, fecha_ingreso, 
-                    nombre_usuario, contraseña
-                ) VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO personal (persona_id, cargo, resolucion, activo)
+                VALUES (?, ?, ?, TRUE)
+            """, (
+                persona_id,
+                datos_usuario.get('cargo_id'),
+                resolucion_num
+            ))
+
+            # 3. Credenciales de acceso
+            cursor.execute("""
+                INSERT INTO usuario (persona_id, nombre_usuario, password_hash)
+                VALUES (?, ?, ?)
             """, (
                 persona_id,
-                1,  # cargo_id temporal
-                resolucion_num,
-                datos_usuario.get('fecha_ingreso', '2025-01-01'),
                 datos_usuario['primer_nombre'],  # nombre_usuario
-                datos_usuario.get('contraseña', 'password')  # contraseña por defecto
+                password_hash
             ))
             
-            # 3. Asignar rol si se especifica
+            # 4. Asignar rol (sin rol, el de por defecto: un usuario sin rol no ve módulos)
             if datos_usuario.get('rol_id'):
                 cursor.execute("""
                     INSERT INTO persona_rol (persona_id, rol_id) VALUES (?, ?)
                 """, (persona_id, datos_usuario['rol_id']))
+            else:
+                cursor.execute("""
+                    INSERT INTO persona_rol (persona_id, rol_id)
+                    SELECT ?, id FROM rol WHERE nombre = ?
+                """, (persona_id, sesion.ROL_POR_DEFECTO))
             
             conn.commit()
             return persona_id
@@ -315,7 +301,7 @@ class ConfiguracionModel:
             conn.rollback()
             if "UNIQUE constraint failed: persona.documento_identidad" in str(e):
                 raise ValueError("El Documento de Identidad ya existe") from e
-            if "UNIQUE constraint failed: personal.nombre_usuario" in str(e):
+            if "UNIQUE constraint failed: usuario.nombre_usuario" in str(e):
                 raise ValueError(
                     f"El nombre de usuario '{datos_usuario['primer_nombre']}' ya existe"
                 ) from e
@@ -359,7 +345,7 @@ class ConfiguracionModel:
             if (datos_usuario.get('nombre_usuario_anterior') != 
                     datos_usuario['primer_nombre']):
                 cursor.execute("""
-                    UPDATE personal SET nombre_usuario = ? WHERE persona_id = ?
+                    UPDATE usuario SET nombre_usuario = ? WHERE persona_id = ?
                 """, (datos_usuario['primer_nombre'], datos_usuario['persona_id']))
             
             # 3. Actualizar rol
@@ -374,13 +360,15 @@ class ConfiguracionModel:
                 )
             
             conn.commit()
+            # Si es el usuario conectado, sus roles y permisos se vuelven a leer
+            sesion.invalidar(datos_usuario['persona_id'])
             return True
             
         except sqlite3.IntegrityError as e:
             conn.rollback()
             if "UNIQUE constraint failed: persona.documento_identidad" in str(e):
                 raise ValueError("El Documento de Identidad ya existe") from e
-            if "UNIQUE constraint failed: personal.nombre_usuario" in str(e):
+            if "UNIQUE constraint failed: usuario.nombre_usuario" in str(e):
                 raise ValueError("El nuevo nombre de usuario ya existe") from e
             raise ValueError(f"Error de unicidad: {e}") from e
         except sqlite3.Error as e:
@@ -401,10 +389,11 @@ class ConfiguracionModel:
             cursor = conn.cursor()
             cursor.execute(query, (persona_id,))
             conn.commit()
+            sesion.invalidar(persona_id)
             return cursor.rowcount > 0
             
         except sqlite3.Error as e:
-            print(f"Error al eliminar usuario ID {persona_id}: {e}")
+            log.error("Error al eliminar usuario ID %s: %s", persona_id, e)
             return False
         finally:
             self.db.cerrarConexion(conn) # Usando cerrarConexion
\ No newline at end of file
@@ -0,0 +1,87 @@
+# models/credenciales.py
+"""
+Hash de contraseñas con una función de derivación costosa en memoria (scrypt).
+
+El valor guardado en usuario.password_hash lleva los parámetros con los que
+se calculó:
+
+    scrypt$<n>$<r>$<p>$<sal base64>$<hash base64>
+
+Así se pueden endurecer los parámetros (SCRYPT_N, SCRYPT_R, SCRYPT_P) sin
+invalidar las contraseñas existentes: verificar() indica cuándo un hash quedó
+con parámetros viejos para recalcularlo tras un login correcto. Las
+contraseñas heredadas en texto plano (las que copió la migración 2) las
+convierte la migración 8 de db_setup; verificar() solo las acepta como
+respaldo, por si alguna se escribió por fuera de los modelos.
+
+Con los valores por defecto cada cálculo usa 128 * n * r bytes = 16 MiB y
+tarda decenas de milisegundos: se debe llamar fuera del hilo de la interfaz
+(ver LoginController).
+"""
+import base64
+import hashlib
+import hmac
+import logging
+import os
+from typing import Tuple
+
+ALGORITMO = "scrypt"
+SCRYPT_N = 2 ** 14      # Costo de CPU/memoria (potencia de 2)
+SCRYPT_R = 8            # Tamaño de bloque
+SCRYPT_P = 1            # Paralelismo
+LARGO_SAL = 16
+LARGO_HASH = 32
+
+log = logging.getLogger(__name__)
+
+
+def _b64(datos: bytes) -> str:
+    return base64.b64encode(datos).decode("ascii")
+
+
+def _derivar(password: str, sal: bytes, n: int, r: int, p: int) -> bytes:
+    # maxmem con margen: OpenSSL rechaza el cálculo si supera el límite (32 MiB por defecto)
+    return hashlib.scrypt(password.encode("utf-8"), salt=sal, n=n, r=r, p=p,
+                          maxmem=256 * n * r * p + 1024 * 1024, dklen=LARGO_HASH)
+
+
+def generar_hash(password: str, n: int = None, r: int = None, p: int = None) -> str:
+    """Hash nuevo (con sal aleatoria) listo para guardar en usuario.password_hash."""
+    n, r, p = n or SCRYPT_N, r or SCRYPT_R, p or SCRYPT_P
+    sal = os.urandom(LARGO_SAL)
+    return f"{ALGORITMO}${n}${r}${p}${_b64(sal)}${_b64(_derivar(password, sal, n, r, p))}"
+
+
+def es_hash(valor: str) -> bool:
+    """True si el valor guardado ya es un hash (y no una contraseña en texto plano)."""
+    return isinstance(valor, str) and valor.startswith(ALGORITMO + "$")
+
+
+def verificar(password: str, almacenado: str) -> Tuple[bool, bool]:
+    """
+    Compara la contraseña con el valor guardado en tiempo constante.
+    Devuelve (correcta, necesita_rehash).
+    """
+    if not almacenado:
+        return False, False
+    if not es_hash(almacenado):
+        # Respaldo: texto plano que no pasó por la migración 8; se migra al entrar
+        log.warning("Contraseña en texto plano en usuario.password_hash; se recalcula tras el login")
+        correcta = hmac.compare_digest(password.encode("utf-8"), str(almacenado).encode("utf-8"))
+        return correcta, correcta
+    try:
+        _, n, r, p, sal, esperado = almacenado.split("$")
+        n, r, p = int(n), int(r), int(p)
+        calculado = _derivar(password, base64.b64decode(sal), n, r, p)
+        correcta = hmac.compare_digest(calculado, base64.b64decode(esperado))
+    except (ValueError, TypeError):
+        return False, False
+    return correcta, correcta and (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+def verificar_ficticio(password: str):
+    """
+    Mismo costo que verificar() para un usuario inexistente: la respuesta no
+    revela, por el tiempo que tarda, si el nombre de usuario existe.
+    """
+    _derivar(password, b"\0" * LARGO_SAL, SCRYPT_N, SCRYPT_R, SCRYPT_P)
@@ -1,66 +1,344 @@
 # models/database_connector.py
+import logging
 import sqlite3
 from sqlite3 import Error
 import os
+import queue
+import threading
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# Un único módulo con ambos nombres y, por lo tanto, un único Singleton (y un único pool)
+try:
+    import modulo_unico
+except ImportError:
+    from models import modulo_unico
+modulo_unico.registrar(__name__)
+
+try:
+    from perfilador import ConexionPerfilada, perfilador
+except ImportError:
+    from models.perfilador import ConexionPerfilada, perfilador
+
+
+# Perfil de PRAGMAs que se aplica a TODAS las conexiones (pool y CreateDatabase).
+# - journal_mode=WAL: los lectores (reportes) no se bloquean mientras se escribe.
+# - synchronous=NORMAL: en WAL es seguro ante caídas de la aplicación y evita un
+#   fsync por cada commit (solo se sincroniza en los checkpoints).
+# - cache_size negativo = tamaño en KiB; mmap_size en bytes.
+PERFIL_CONEXION = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,        # ~16 MB de caché de páginas
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,        # ms de espera ante un bloqueo antes de fallar
+    "foreign_keys": "ON",
+}
+
+
+def aplicar_perfil(conexion, perfil: dict = None):
+    """Aplica el perfil de PRAGMAs a una conexión recién abierta."""
+    for pragma, valor in (perfil or PERFIL_CONEXION).items():
+        conexion.execute(f"PRAGMA {pragma} = {valor}")
+    return conexion
+
+
+class PoolAgotadoError(sqlite3.OperationalError):
+    """Se lanza cuando no se obtiene una conexión del pool antes del timeout."""
+
 
 class Database:
     """
     Clase para manejar la conexión a la base de datos SQLite (SINGLETON)
+
+    Mantiene un pool de conexiones "calientes": cada hilo recibe su propia
+    conexión mientras la tenga prestada y, al devolverla con cerrarConexion(),
+    vuelve al pool en lugar de cerrarse. El tamaño máximo del pool y el tiempo
+    de espera son configurables con configurarPool().
     """
     # 1. Almacena la instancia única
-    _instance = None 
-    
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # Parámetros por defecto del pool
+    POOL_MAX_CONEXIONES = 5
+    POOL_TIMEOUT = 5.0  # Segundos de espera cuando el pool está agotado
+    # Sentencias preparadas que sqlite3 conserva por conexión (por defecto 128).
+    # Entre todos los modelos hay más consultas distintas que eso; con una caché
+    # chica las del listado se vuelven a compilar en cada uso.
+    CACHE_SENTENCIAS = 256
+
     # 2. El método __new__ controla la creación de la instancia
     def __new__(cls):
-        if cls._instance is None:
-            # Crear la instancia si no existe
-            cls._instance = super(Database, cls).__new__(cls)
-            
-            # Inicializar atributos (ejecutado solo en la primera creación)
-            cls._instance.database_path = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)), "Proyecto_ultima.db"
-            )
-            # Aseguramos que la conexión inicie como None
-            cls._instance.connection = None 
-            print("[SINGLETON] Instancia de Database creada y lista.")
-            
+        with cls._instance_lock:
+            if cls._instance is None:
+                # Crear la instancia si no existe
+                cls._instance = super(Database, cls).__new__(cls)
+
+                # Inicializar atributos (ejecutado solo en la primera creación)
+                cls._instance.database_path = os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)), "Proyecto_ultima.db"
+                )
+                cls._instance._inicializar_pool()
+                log.debug("Instancia de Database creada (%s)", cls._instance.database_path)
+
         return cls._instance
-    
-    def crearConexion(self):
-        """Establece conexión con la base de datos SQLite"""
+
+    def _inicializar_pool(self):
+        """Prepara las estructuras internas del pool (idempotente en cada arranque)."""
+        self.max_conexiones = self.POOL_MAX_CONEXIONES
+        self.timeout = self.POOL_TIMEOUT
+        self.perfil = dict(PERFIL_CONEXION)
+        self._disponibles = queue.LifoQueue()  # LIFO: reutiliza la conexión más reciente (más "caliente")
+        self._conexiones_creadas = 0
+        self._del_pool = {}  # Conexión física del pool -> versión del perfil aplicada
+        self._version_perfil = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        """Conexión prestada actualmente al hilo que llama (None si no tiene)."""
+        return getattr(self._local, "conexion", None)
+
+    def configurarPool(self, max_conexiones: int = None, timeout: float = None):
+        """Ajusta el tamaño máximo del pool y el tiempo de espera (en segundos)."""
+        if max_conexiones is not None:
+            if max_conexiones < 1:
+                raise ValueError("El pool necesita al menos una conexión")
+            self.max_conexiones = max_conexiones
+        if timeout is not None:
+            self.timeout = timeout
+
+    def configurarPerfilado(self, activo: bool = None, umbral_ms: float = None):
+        """
+        Activa o desactiva la medición de sentencias y fija el umbral (ms) a
+        partir del cual una sentencia va al registro de consultas lentas.
+        """
+        perfilador.configurar(activo=activo, umbral_ms=umbral_ms)
+
+    def configurarPerfil(self, **pragmas):
+        """
+        Modifica el perfil de PRAGMAs (p. ej. synchronous="FULL", cache_size=-32000).
+
+        El cambio se aplica a las conexiones nuevas y a las que están libres en
+        el pool; las prestadas lo reciben en su siguiente uso tras volver al pool.
+        """
+        with self._lock:
+            self.perfil.update(pragmas)
+            self._version_perfil += 1
+        libres = []
+        while True:
+            try:
+                libres.append(self._disponibles.get_nowait())
+            except queue.Empty:
+                break
+        for conexion in libres:
+            self._actualizar_perfil(conexion)
+            self._disponibles.put(conexion)
+
+    def _actualizar_perfil(self, conexion):
+        """Reaplica el perfil si la conexión tiene una versión anterior."""
+        version = self._version_perfil
+        if self._del_pool.get(conexion) == version:
+            return
         try:
-            # En SQLite, para reutilizar, verificamos si la conexión está viva con un simple chequeo.
-            # No hay un atributo 'closed' directo. Intentamos devolver la existente.
-            if self.connection:
-                try:
-                    # Intenta ejecutar una consulta simple para verificar si está activa
-                    self.connection.execute("SELECT 1").close() 
-                    print("Conexión existente reutilizada")
-                    return self.connection
-                except Exception:
-                    # Si falla (conexión cerrada, rota, etc.), la cerramos y la re-creamos.
-                    self.connection = None
-            
-            # Si no hay conexión o falló el chequeo, la creamos
-            self.connection = sqlite3.connect(self.database_path)
-            # Habilitar claves foráneas
-            self.connection.execute("PRAGMA foreign_keys = ON")
-            print("Conexión a la base de datos SQLite establecida")
-            return self.connection
+            aplicar_perfil(conexion, self.perfil)
+            self._del_pool[conexion] = version
         except Error as e:
-            print(f"Error conectando a la base de datos: {e}")
-            self.connection = None # Asegurar que la conexión es None si falla
+            log.error("Error al aplicar el perfil de conexión: %s", e)
+
+    def _nueva_conexion(self):
+        """Abre una conexión física nueva y aplica la configuración inicial."""
+        # check_same_thread=False: la conexión puede cambiar de hilo al volver al pool,
+        # pero nunca la usan dos hilos a la vez.
+        # ConexionPerfilada mide cada sentencia (ver models/perfilador.py).
+        conexion = sqlite3.connect(self.database_path, check_same_thread=False,
+                                   cached_statements=self.CACHE_SENTENCIAS,
+                                   factory=ConexionPerfilada)
+        # WAL, caché, claves foráneas, etc. (ver PERFIL_CONEXION)
+        aplicar_perfil(conexion, self.perfil)
+        with self._lock:
+            self._del_pool[conexion] = self._version_perfil
+        log.debug("Conexión nueva del pool a %s", self.database_path)
+        return conexion
+
+    def _adquirir(self, timeout: float = None):
+        """Toma una conexión libre del pool, crea una nueva o espera hasta el timeout."""
+        try:
+            return self._disponibles.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            puede_crear = self._conexiones_creadas < self.max_conexiones
+            if puede_crear:
+                self._conexiones_creadas += 1
+
+        if puede_crear:
+            try:
+                return self._nueva_conexion()
+            except Error:
+                with self._lock:
+                    self._conexiones_creadas -= 1
+                raise
+
+        espera = self.timeout if timeout is None else timeout
+        try:
+            return self._disponibles.get(timeout=espera)
+        except queue.Empty:
+            raise PoolAgotadoError(
+                f"No hay conexiones libres en el pool tras esperar {espera} s "
+                f"(máximo {self.max_conexiones})"
+            ) from None
+
+    def _liberar(self, conexion):
+        """Limpia el estado de la conexión y la devuelve al pool."""
+        try:
+            if conexion.in_transaction:
+                conexion.rollback()
+            # Evita que el row_factory de un modelo se filtre al siguiente
+            conexion.row_factory = None
+            self._actualizar_perfil(conexion)
+        except Error:
+            # Conexión rota: se descarta y se libera su cupo
+            self._descartar(conexion)
+            return
+        self._disponibles.put(conexion)
+
+    def _descartar(self, conexion):
+        """Cierra definitivamente una conexión del pool."""
+        try:
+            conexion.close()
+        except Error:
+            pass
+        with self._lock:
+            self._conexiones_creadas -= 1
+            self._del_pool.pop(conexion, None)
+
+    def crearConexion(self, timeout: float = None):
+        """
+        Entrega la conexión del hilo actual.
+
+        Si el hilo ya tiene una conexión prestada se reutiliza (llamadas anidadas);
+        si no, se toma del pool. Devuelve None si no fue posible obtenerla.
+        """
+        conexion = self.connection
+        if conexion is not None:
+            self._local.usos += 1
+            return conexion
+
+        try:
+            conexion = self._adquirir(timeout)
+        except Error as e:
+            log.error("Error conectando a la base de datos: %s", e)
             return None
-    
+
+        self._local.conexion = conexion
+        self._local.usos = 1
+        return conexion
+
     def cerrarConexion(self, conexion=None):
-        """Cierra la conexión con la base de datos"""
-        connection_to_close = conexion or self.connection
-        if connection_to_close:
+        """
+        Devuelve al pool la conexión del hilo actual.
+
+        La conexión física no se cierra: queda disponible para la siguiente
+        operación. Una conexión ajena al pool se cierra normalmente.
+        """
+        propia = self.connection
+        if conexion is not None and conexion is not propia:
+            if conexion in self._del_pool:
+                # Ya fue devuelta al pool (cierre repetido): no hay nada que hacer
+                return
             try:
-                connection_to_close.close()
-                # Restablecer la conexión del Singleton a None si cerramos la conexión principal
-                if connection_to_close is self.connection: 
-                     self.connection = None
-                print("Conexión a la base de datos cerrada")
+                conexion.close()
+                log.debug("Conexión ajena al pool cerrada")
             except Error as e:
-                 print(f"Error al cerrar la conexión: {e}")
\ No newline at end of file
+                log.error("Error al cerrar la conexión: %s", e)
+            return
+
+        if propia is None:
+            return
+
+        self._local.usos -= 1
+        if self._local.usos > 0:
+            return
+
+        self._local.conexion = None
+        self._liberar(propia)
+
+    @contextmanager
+    def conexion(self, timeout: float = None):
+        """
+        Context manager que presta una conexión del pool y la devuelve al salir.
+
+        Uso:
+            with self.db.conexion() as conn:
+                conn.execute(...)
+
+        Lanza PoolAgotadoError si no se consigue una conexión antes del timeout.
+        """
+        conn = self.connection
+        if conn is not None:
+            self._local.usos += 1
+        else:
+            conn = self._adquirir(timeout)
+            self._local.conexion = conn
+            self._local.usos = 1
+        try:
+            yield conn
+        finally:
+            self.cerrarConexion(conn)
+
+    def checkpoint(self, modo: str = "PASSIVE"):
+        """
+        Ejecuta un checkpoint del WAL sobre el archivo principal.
+
+        PASSIVE no bloquea a nadie (uso periódico); TRUNCATE además vacía el
+        archivo -wal (uso al cerrar la aplicación). Devuelve la tupla
+        (ocupado, páginas_wal, páginas_copiadas) o None si falla.
+        """
+        modo = modo.upper()
+        if modo not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Modo de checkpoint no válido: {modo}")
+        conexion = self.crearConexion()
+        if conexion is None:
+            return None
+        try:
+            return conexion.execute(f"PRAGMA wal_checkpoint({modo})").fetchone()
+        except Error as e:
+            log.error("Error al ejecutar el checkpoint del WAL: %s", e)
+            return None
+        finally:
+            self.cerrarConexion(conexion)
+
+    def cerrarPool(self):
+        """Cierra todas las conexiones libres del pool (p. ej. al salir de la aplicación)."""
+        while True:
+            try:
+                conexion = self._disponibles.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conexion)
+        perfilador.cerrar()
+        log.info("Pool de conexiones cerrado")
+
+    def estadoPool(self) -> dict:
+        """Resumen del estado actual del pool (útil para diagnóstico)."""
+        with self._lock:
+            creadas = self._conexiones_creadas
+        libres = self._disponibles.qsize()
+        return {
+            "max_conexiones": self.max_conexiones,
+            "creadas": creadas,
+            "libres": libres,
+            "en_uso": creadas - libres,
+            "timeout": self.timeout,
+        }
+
+
+# Instancia compartida para los módulos que importan `database` directamente
+# (relacion_model, tercero_model).
+database = Database()
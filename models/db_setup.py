@@ -1,71 +1,28 @@
+import logging
 import sqlite3
 import os
+import sys
 from sqlite3 import Error
 
-class CreateDatabase:
+log = logging.getLogger(__name__)
 
-    def __init__(self, db_archivo=None):
-        
-        # Si no se especifica archivo, usar la carpeta models
-        if db_archivo is None:
-            # Obtener el directorio actual del archivo
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Crear la ruta completa
-            db_archivo = os.path.join(current_dir, "Proyecto_ultima.db")
-        
-        self.db_archivo = db_archivo
-        self.conexion = None
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-        
-        # Crear la carpeta si no existe
-        os.makedirs(os.path.dirname(self.db_archivo), exist_ok=True)
-        
-        # Verificar e inicializar la base de datos automáticamente
-        self._inicializar_base_datos()
+try:
+    from database_connector import aplicar_perfil
+    from migraciones import aplicar_migraciones, version_actual, ultima_version
+    import credenciales
+except ImportError:
+    from models.database_connector import aplicar_perfil
+    from models.migraciones import aplicar_migraciones, version_actual, ultima_version
+    from models import credenciales
 
-    def _inicializar_base_datos(self):
-        """
-        Verifica si las tablas existen y las crea si es necesario
-        """
-        try:
-            print(f"[INFO] Usando base de datos: {self.db_archivo}")
-            
-            temp_conn = sqlite3.connect(self.db_archivo)
-            cursor = temp_conn.cursor()
-            
-            # 1. Verificar existencia de la tabla 'cargo'
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cargo'")
-            tabla_catalogo_existe = cursor.fetchone()
-            
-            # 2. Verificar si hay datos en la tabla de catálogo (si existe)
-            datos_catalogo_existen = False
-            if tabla_catalogo_existe:
-                cursor.execute("SELECT COUNT(*) FROM cargo")
-                if cursor.fetchone()[0] > 0:
-                    datos_catalogo_existen = True
-            
-            temp_conn.close()
-            
-            # El sistema se inicializa solo si NO existe la tabla o si la tabla existe pero está vacía
-            if not tabla_catalogo_existe or not datos_catalogo_existen:
-                print("[INIT] Inicializando base de datos por primera vez o re-insertando catálogo...")
-                self._crear_tablas()
-                self._insertar_datos_catalogo()
-                print("[OK] Base de datos inicializada correctamente")
-            else:
-                print("[OK] Base de datos ya está inicializada (se encontró catálogo con datos)")
-                
-        except Error as e:
-            print(f"[ERROR] Error al verificar/inicializar base de datos: {e}")
-
-    def _crear_tablas(self):
-        """
-        Crea todas las tablas del sistema
-        """
-        SQL_SCRIPT_CREACION = """
--- Habilitar la integridad referencial
-PRAGMA foreign_keys = ON;
+# ----------------------------------------------------------------------
+# SQL de las migraciones. Lo ya publicado no se edita: los cambios de esquema
+# se agregan como una migración nueva al final de MIGRACIONES.
+# ----------------------------------------------------------------------
 
+SQL_ESQUEMA_BASE = """
 ---------------------------------
 -- TABLA BASE
 ---------------------------------
@@ -126,6 +83,21 @@ CREATE TABLE IF NOT EXISTS usuario(
     FOREIGN KEY (persona_id) REFERENCES persona(id) ON DELETE CASCADE
 );
 
+CREATE TABLE IF NOT EXISTS rol(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL UNIQUE,
+    descripcion TEXT
+);
+
+CREATE TABLE IF NOT EXISTS persona_rol(
+    persona_id INTEGER NOT NULL,
+    rol_id INTEGER NOT NULL,
+    fecha_asignacion DATE DEFAULT CURRENT_DATE,
+    PRIMARY KEY (persona_id, rol_id),
+    FOREIGN KEY (persona_id) REFERENCES persona(id) ON DELETE CASCADE,
+    FOREIGN KEY (rol_id) REFERENCES rol(id) ON DELETE CASCADE
+);
+
 ---------------------------------
 -- TABLAS DE RELACIONES
 ---------------------------------
@@ -253,78 +225,580 @@ CREATE TABLE IF NOT EXISTS cargo(
     requiere_resolucion BOOLEAN DEFAULT FALSE
 );
 """
-        conn = None
-        try:
-            conn = self.crearConexion()
-            if conn:
-                conn.executescript(SQL_SCRIPT_CREACION)
-                print("[OK] Tablas creadas exitosamente")
-        except Error as e:
-            print(f"[ERROR] Error al crear tablas: {e}")
-        finally:
-            if conn:
-                self.cerrarConexion()
 
-    def _insertar_datos_catalogo(self):
+SQL_DATOS_CATALOGO = """
+INSERT OR IGNORE INTO parentesco (nombre, descripcion) VALUES
+    ('Padre', 'Parentesco paterno'),
+    ('Madre', 'Parentesco materno'),
+    ('Hermano/a', 'Parentesco fraternal'),
+    ('Tío/a', 'Parentesco de tío'),
+    ('Abuelo/a', 'Parentesco de abuelo'),
+    ('Primo/a', 'Parentesco de primo'),
+    ('Otro', 'Otro tipo de parentesco');
+
+INSERT OR IGNORE INTO cargo (nombre, requiere_resolucion) VALUES
+    ('Consejero', TRUE),
+    ('Coordinador', FALSE),
+    ('Psicólogo', FALSE),
+    ('Abogado', FALSE),
+    ('Asistente Social', FALSE);
+
+INSERT OR IGNORE INTO articulos (codigo, articulo, descripcion) VALUES
+    ('ART001', 'Protección Integral', 'Medidas de protección integral para NNA'),
+    ('ART002', 'Derecho a la Educación', 'Garantizar el acceso a la educación'),
+    ('ART003', 'Derecho a la Salud', 'Acceso a servicios de salud'),
+    ('ART004', 'Protección contra Violencia', 'Protección contra toda forma de violencia');
+
+INSERT OR IGNORE INTO rol (nombre, descripcion) VALUES
+    ('Administrador', 'Rol administrativo del sistema');
+"""
+
+# ConfiguracionModel creaba su propia tabla personal (clave compuesta con
+# cargo_id y credenciales en la misma fila). Se pasa al esquema común:
+# personal(persona_id, cargo, resolucion, activo) + usuario(credenciales).
+SQL_RECONCILIAR_PERSONAL = """
+PRAGMA defer_foreign_keys = ON;
+
+CREATE TABLE personal_nueva(
+    persona_id INTEGER PRIMARY KEY,
+    cargo INTEGER,
+    resolucion TEXT, -- Unicamente para consejeros
+    activo BOOLEAN DEFAULT TRUE,
+    FOREIGN KEY (persona_id) REFERENCES persona(id) ON DELETE CASCADE,
+    FOREIGN KEY (cargo) REFERENCES cargo(id)
+);
+
+INSERT OR IGNORE INTO personal_nueva (persona_id, cargo, resolucion, activo)
+SELECT persona_id, cargo_id, resolucion, activo FROM personal ORDER BY persona_id;
+
+INSERT OR IGNORE INTO usuario (persona_id, nombre_usuario, password_hash)
+SELECT persona_id, nombre_usuario, "contraseña" FROM personal;
+
+DROP TABLE personal;
+ALTER TABLE personal_nueva RENAME TO personal;
+"""
+
+SQL_INDICES_PERSONA = """
+-- Búsqueda exacta por nombre y apellido (NNAModel.obtener_por_nombre, FamiliarModel.buscar_familiar)
+CREATE INDEX IF NOT EXISTS idx_persona_nombre_apellido
+    ON persona(primer_nombre, primer_apellido);
+
+-- Búsquedas y ordenamientos sin distinguir mayúsculas/minúsculas
+CREATE INDEX IF NOT EXISTS idx_persona_apellido_nombre_nocase
+    ON persona(primer_apellido COLLATE NOCASE, primer_nombre COLLATE NOCASE);
+"""
+
+SQL_FTS_PERSONA = """
+-- Índice de texto completo con contenido externo (no duplica los datos de persona)
+CREATE VIRTUAL TABLE IF NOT EXISTS persona_fts USING fts5(
+    documento_identidad,
+    primer_nombre,
+    segundo_nombre,
+    primer_apellido,
+    segundo_apellido,
+    content='persona',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS persona_fts_ai AFTER INSERT ON persona BEGIN
+    INSERT INTO persona_fts(rowid, documento_identidad, primer_nombre, segundo_nombre,
+                            primer_apellido, segundo_apellido)
+    VALUES (new.id, new.documento_identidad, new.primer_nombre, new.segundo_nombre,
+            new.primer_apellido, new.segundo_apellido);
+END;
+
+CREATE TRIGGER IF NOT EXISTS persona_fts_ad AFTER DELETE ON persona BEGIN
+    INSERT INTO persona_fts(persona_fts, rowid, documento_identidad, primer_nombre,
+                            segundo_nombre, primer_apellido, segundo_apellido)
+    VALUES ('delete', old.id, old.documento_identidad, old.primer_nombre,
+            old.segundo_nombre, old.primer_apellido, old.segundo_apellido);
+END;
+
+CREATE TRIGGER IF NOT EXISTS persona_fts_au AFTER UPDATE OF
+    documento_identidad, primer_nombre, segundo_nombre, primer_apellido, segundo_apellido
+ON persona BEGIN
+    INSERT INTO persona_fts(persona_fts, rowid, documento_identidad, primer_nombre,
+                            segundo_nombre, primer_apellido, segundo_apellido)
+    VALUES ('delete', old.id, old.documento_identidad, old.primer_nombre,
+            old.segundo_nombre, old.primer_apellido, old.segundo_apellido);
+    INSERT INTO persona_fts(rowid, documento_identidad, primer_nombre, segundo_nombre,
+                            primer_apellido, segundo_apellido)
+    VALUES (new.id, new.documento_identidad, new.primer_nombre, new.segundo_nombre,
+            new.primer_apellido, new.segundo_apellido);
+END;
+"""
+
+# Índice propio (no de contenido externo): combina datos de tres tablas y
+# guarda el texto para poder generar snippet() en el listado.
+SQL_FTS_DENUNCIA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS denuncia_fts USING fts5(
+    descripcion,
+    declaraciones,
+    consejero,
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS denuncia_fts_ai AFTER INSERT ON denuncia BEGIN
+    INSERT INTO denuncia_fts(rowid, descripcion, declaraciones, consejero)
+    VALUES (
+        new.id,
+        new.descripcion,
+        (SELECT group_concat(declaracion, ' ') FROM denunciante WHERE denuncia_id = new.id),
+        (SELECT primer_nombre || ' ' || primer_apellido FROM persona WHERE id = new.consejero_id)
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS denuncia_fts_au AFTER UPDATE OF descripcion, consejero_id ON denuncia BEGIN
+    UPDATE denuncia_fts SET
+        descripcion = new.descripcion,
+        consejero = (SELECT primer_nombre || ' ' || primer_apellido FROM persona WHERE id = new.consejero_id)
+    WHERE rowid = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS denuncia_fts_ad AFTER DELETE ON denuncia BEGIN
+    DELETE FROM denuncia_fts WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS denunciante_fts_ai AFTER INSERT ON denunciante BEGIN
+    UPDATE denuncia_fts SET declaraciones =
+        (SELECT group_concat(declaracion, ' ') FROM denunciante WHERE denuncia_id = new.denuncia_id)
+    WHERE rowid = new.denuncia_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS denunciante_fts_au AFTER UPDATE OF declaracion ON denunciante BEGIN
+    UPDATE denuncia_fts SET declaraciones =
+        (SELECT group_concat(declaracion, ' ') FROM denunciante WHERE denuncia_id = new.denuncia_id)
+    WHERE rowid = new.denuncia_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS denunciante_fts_ad AFTER DELETE ON denunciante BEGIN
+    UPDATE denuncia_fts SET declaraciones =
+        (SELECT group_concat(declaracion, ' ') FROM denunciante WHERE denuncia_id = old.denuncia_id)
+    WHERE rowid = old.denuncia_id;
+END;
+
+-- Si cambia el nombre de un consejero, se actualizan sus denuncias
+CREATE TRIGGER IF NOT EXISTS consejero_fts_au AFTER UPDATE OF primer_nombre, primer_apellido ON persona BEGIN
+    UPDATE denuncia_fts SET consejero = new.primer_nombre || ' ' || new.primer_apellido
+    WHERE rowid IN (SELECT id FROM denuncia WHERE consejero_id = new.id);
+END;
+"""
+
+# Carga inicial de los índices de texto con los registros existentes
+SQL_CARGA_FTS = """
+INSERT INTO persona_fts(persona_fts) VALUES ('rebuild');
+
+DELETE FROM denuncia_fts;
+INSERT INTO denuncia_fts(rowid, descripcion, declaraciones, consejero)
+SELECT
+    d.id,
+    d.descripcion,
+    (SELECT group_concat(declaracion, ' ') FROM denunciante WHERE denuncia_id = d.id),
+    (SELECT primer_nombre || ' ' || primer_apellido FROM persona WHERE id = d.consejero_id)
+FROM denuncia d;
+"""
+
+SQL_TABLAS_RESUMEN = """
+-- Totales globales del panel (lectura O(1))
+CREATE TABLE IF NOT EXISTS resumen_contador(
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL DEFAULT 0
+);
+
+-- NNA activos por género ('' = sin dato) y fecha de nacimiento
+CREATE TABLE IF NOT EXISTS resumen_nna(
+    genero TEXT NOT NULL,
+    fecha_nacimiento DATE NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (genero, fecha_nacimiento)
+) WITHOUT ROWID;
+
+-- Denuncias abiertas (estado = TRUE) y cerradas por mes de la denuncia ('YYYY-MM')
+CREATE TABLE IF NOT EXISTS resumen_denuncia_mes(
+    mes TEXT PRIMARY KEY,
+    abiertas INTEGER NOT NULL DEFAULT 0,
+    cerradas INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS resumen_matricula_unidad(
+    unidad_id INTEGER PRIMARY KEY,
+    activas INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS resumen_seguimiento(
+    expediente_id INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    ultima_fecha DATE
+);
+
+-- Recalcular la última fecha al borrar/mover un seguimiento
+CREATE INDEX IF NOT EXISTS idx_seguimiento_expediente_fecha
+    ON seguimiento(expediente_id, fecha);
+"""
+
+SQL_TRIGGERS_RESUMEN = """
+-- NNA: altas, bajas y cambios de fecha de nacimiento
+CREATE TRIGGER IF NOT EXISTS resumen_nna_ai AFTER INSERT ON nna BEGIN
+    INSERT INTO resumen_nna(genero, fecha_nacimiento, total)
+    SELECT IFNULL(p.genero, ''), new.fecha_nacimiento, 1
+    FROM persona p WHERE p.id = new.persona_id AND p.activo IS TRUE
+    ON CONFLICT(genero, fecha_nacimiento) DO UPDATE SET total = total + 1;
+    UPDATE resumen_contador SET valor = valor + 1
+    WHERE clave = 'nna_activos'
+      AND EXISTS (SELECT 1 FROM persona WHERE id = new.persona_id AND activo IS TRUE);
+END;
+
+-- Si la baja viene en cascada desde persona, resumen_persona_bd ya la descontó
+-- y aquí la persona ya no existe, por lo que no se descuenta dos veces
+CREATE TRIGGER IF NOT EXISTS resumen_nna_ad AFTER DELETE ON nna BEGIN
+    UPDATE resumen_nna SET total = total - 1
+    WHERE (genero, fecha_nacimiento) = (
+        SELECT IFNULL(p.genero, ''), old.fecha_nacimiento
+        FROM persona p WHERE p.id = old.persona_id AND p.activo IS TRUE);
+    UPDATE resumen_contador SET valor = valor - 1
+    WHERE clave = 'nna_activos'
+      AND EXISTS (SELECT 1 FROM persona WHERE id = old.persona_id AND activo IS TRUE);
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_nna_au AFTER UPDATE OF persona_id, fecha_nacimiento ON nna BEGIN
+    UPDATE resumen_nna SET total = total - 1
+    WHERE (genero, fecha_nacimiento) = (
+        SELECT IFNULL(p.genero, ''), old.fecha_nacimiento
+        FROM persona p WHERE p.id = old.persona_id AND p.activo IS TRUE);
+    INSERT INTO resumen_nna(genero, fecha_nacimiento, total)
+    SELECT IFNULL(p.genero, ''), new.fecha_nacimiento, 1
+    FROM persona p WHERE p.id = new.persona_id AND p.activo IS TRUE
+    ON CONFLICT(genero, fecha_nacimiento) DO UPDATE SET total = total + 1;
+    UPDATE resumen_contador SET valor = valor
+        + EXISTS (SELECT 1 FROM persona WHERE id = new.persona_id AND activo IS TRUE)
+        - EXISTS (SELECT 1 FROM persona WHERE id = old.persona_id AND activo IS TRUE)
+    WHERE clave = 'nna_activos';
+END;
+
+-- Persona de un NNA: cambio de género o baja lógica (activo = FALSE)
+CREATE TRIGGER IF NOT EXISTS resumen_persona_au AFTER UPDATE OF genero, activo ON persona
+WHEN EXISTS (SELECT 1 FROM nna WHERE persona_id = new.id) BEGIN
+    UPDATE resumen_nna SET total = total - 1
+    WHERE old.activo IS TRUE
+      AND genero = IFNULL(old.genero, '')
+      AND fecha_nacimiento = (SELECT fecha_nacimiento FROM nna WHERE persona_id = new.id);
+    INSERT INTO resumen_nna(genero, fecha_nacimiento, total)
+    SELECT IFNULL(new.genero, ''), n.fecha_nacimiento, 1
+    FROM nna n WHERE n.persona_id = new.id AND new.activo IS TRUE
+    ON CONFLICT(genero, fecha_nacimiento) DO UPDATE SET total = total + 1;
+    UPDATE resumen_contador SET valor = valor + (new.activo IS TRUE) - (old.activo IS TRUE)
+    WHERE clave = 'nna_activos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_persona_bd BEFORE DELETE ON persona
+WHEN old.activo IS TRUE AND EXISTS (SELECT 1 FROM nna WHERE persona_id = old.id) BEGIN
+    UPDATE resumen_nna SET total = total - 1
+    WHERE genero = IFNULL(old.genero, '')
+      AND fecha_nacimiento = (SELECT fecha_nacimiento FROM nna WHERE persona_id = old.id);
+    UPDATE resumen_contador SET valor = valor - 1 WHERE clave = 'nna_activos';
+END;
+
+-- Denuncias abiertas/cerradas por mes
+CREATE TRIGGER IF NOT EXISTS resumen_denuncia_ai AFTER INSERT ON denuncia BEGIN
+    INSERT INTO resumen_denuncia_mes(mes, abiertas, cerradas)
+    VALUES (IFNULL(strftime('%Y-%m', new.fecha_denuncia), ''),
+            new.estado IS TRUE, new.estado IS NOT TRUE)
+    ON CONFLICT(mes) DO UPDATE SET abiertas = abiertas + excluded.abiertas,
+                                   cerradas = cerradas + excluded.cerradas;
+    UPDATE resumen_contador SET valor = valor + (new.estado IS TRUE)
+    WHERE clave = 'denuncias_abiertas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_denuncia_ad AFTER DELETE ON denuncia BEGIN
+    UPDATE resumen_denuncia_mes
+    SET abiertas = abiertas - (old.estado IS TRUE),
+        cerradas = cerradas - (old.estado IS NOT TRUE)
+    WHERE mes = IFNULL(strftime('%Y-%m', old.fecha_denuncia), '');
+    UPDATE resumen_contador SET valor = valor - (old.estado IS TRUE)
+    WHERE clave = 'denuncias_abiertas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_denuncia_au AFTER UPDATE OF estado, fecha_denuncia ON denuncia BEGIN
+    UPDATE resumen_denuncia_mes
+    SET abiertas = abiertas - (old.estado IS TRUE),
+        cerradas = cerradas - (old.estado IS NOT TRUE)
+    WHERE mes = IFNULL(strftime('%Y-%m', old.fecha_denuncia), '');
+    INSERT INTO resumen_denuncia_mes(mes, abiertas, cerradas)
+    VALUES (IFNULL(strftime('%Y-%m', new.fecha_denuncia), ''),
+            new.estado IS TRUE, new.estado IS NOT TRUE)
+    ON CONFLICT(mes) DO UPDATE SET abiertas = abiertas + excluded.abiertas,
+                                   cerradas = cerradas + excluded.cerradas;
+    UPDATE resumen_contador SET valor = valor + (new.estado IS TRUE) - (old.estado IS TRUE)
+    WHERE clave = 'denuncias_abiertas';
+END;
+
+-- Matrículas por unidad educativa
+CREATE TRIGGER IF NOT EXISTS resumen_matricula_ai AFTER INSERT ON matricula_educativa BEGIN
+    INSERT INTO resumen_matricula_unidad(unidad_id, activas, total)
+    VALUES (new.unidad_id, new.activa IS TRUE, 1)
+    ON CONFLICT(unidad_id) DO UPDATE SET activas = activas + excluded.activas,
+                                         total = total + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_matricula_ad AFTER DELETE ON matricula_educativa BEGIN
+    UPDATE resumen_matricula_unidad
+    SET activas = activas - (old.activa IS TRUE), total = total - 1
+    WHERE unidad_id = old.unidad_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_matricula_au AFTER UPDATE OF unidad_id, activa ON matricula_educativa BEGIN
+    UPDATE resumen_matricula_unidad
+    SET activas = activas - (old.activa IS TRUE), total = total - 1
+    WHERE unidad_id = old.unidad_id;
+    INSERT INTO resumen_matricula_unidad(unidad_id, activas, total)
+    VALUES (new.unidad_id, new.activa IS TRUE, 1)
+    ON CONFLICT(unidad_id) DO UPDATE SET activas = activas + excluded.activas,
+                                         total = total + 1;
+END;
+
+-- Seguimientos por expediente
+CREATE TRIGGER IF NOT EXISTS resumen_seguimiento_ai AFTER INSERT ON seguimiento BEGIN
+    INSERT INTO resumen_seguimiento(expediente_id, total, ultima_fecha)
+    VALUES (new.expediente_id, 1, new.fecha)
+    ON CONFLICT(expediente_id) DO UPDATE SET
+        total = total + 1,
+        ultima_fecha = CASE WHEN ultima_fecha IS NULL OR excluded.ultima_fecha > ultima_fecha
+                            THEN excluded.ultima_fecha ELSE ultima_fecha END;
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_seguimiento_ad AFTER DELETE ON seguimiento BEGIN
+    UPDATE resumen_seguimiento
+    SET total = total - 1,
+        ultima_fecha = (SELECT MAX(fecha) FROM seguimiento WHERE expediente_id = old.expediente_id)
+    WHERE expediente_id = old.expediente_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_seguimiento_au AFTER UPDATE OF expediente_id, fecha ON seguimiento BEGIN
+    UPDATE resumen_seguimiento
+    SET total = total - 1,
+        ultima_fecha = (SELECT MAX(fecha) FROM seguimiento WHERE expediente_id = old.expediente_id)
+    WHERE expediente_id = old.expediente_id;
+    INSERT INTO resumen_seguimiento(expediente_id, total, ultima_fecha)
+    VALUES (new.expediente_id, 1, new.fecha)
+    ON CONFLICT(expediente_id) DO UPDATE SET
+        total = total + 1,
+        ultima_fecha = (SELECT MAX(fecha) FROM seguimiento WHERE expediente_id = new.expediente_id);
+END;
+"""
+
+# Carga completa desde las tablas base
+SQL_CARGA_RESUMEN = """
+DELETE FROM resumen_contador;
+DELETE FROM resumen_nna;
+DELETE FROM resumen_denuncia_mes;
+DELETE FROM resumen_matricula_unidad;
+DELETE FROM resumen_seguimiento;
+
+INSERT INTO resumen_nna(genero, fecha_nacimiento, total)
+SELECT IFNULL(p.genero, ''), n.fecha_nacimiento, COUNT(*)
+FROM nna n JOIN persona p ON p.id = n.persona_id
+WHERE p.activo IS TRUE
+GROUP BY IFNULL(p.genero, ''), n.fecha_nacimiento;
+
+INSERT INTO resumen_denuncia_mes(mes, abiertas, cerradas)
+SELECT IFNULL(strftime('%Y-%m', fecha_denuncia), ''),
+       SUM(estado IS TRUE), SUM(estado IS NOT TRUE)
+FROM denuncia
+GROUP BY IFNULL(strftime('%Y-%m', fecha_denuncia), '');
+
+INSERT INTO resumen_matricula_unidad(unidad_id, activas, total)
+SELECT unidad_id, SUM(activa IS TRUE), COUNT(*)
+FROM matricula_educativa GROUP BY unidad_id;
+
+INSERT INTO resumen_seguimiento(expediente_id, total, ultima_fecha)
+SELECT expediente_id, COUNT(*), MAX(fecha)
+FROM seguimiento GROUP BY expediente_id;
+
+INSERT INTO resumen_contador(clave, valor)
+SELECT 'nna_activos', IFNULL(SUM(total), 0) FROM resumen_nna;
+INSERT INTO resumen_contador(clave, valor)
+SELECT 'denuncias_abiertas', IFNULL(SUM(abiertas), 0) FROM resumen_denuncia_mes;
+"""
+
+
+def _columnas(conexion, tabla: str) -> set:
+    """Columnas actuales de una tabla (vacío si no existe)."""
+    return {fila[1] for fila in conexion.execute(
+        "SELECT * FROM pragma_table_info(?)", (tabla,)).fetchall()}
+
+
+def _fts5_disponible(conexion) -> bool:
+    try:
+        conexion.execute("CREATE VIRTUAL TABLE temp.prueba_fts5 USING fts5(x)")
+        conexion.execute("DROP TABLE temp.prueba_fts5")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _reconciliar_configuracion(conexion) -> str:
+    """
+    Lleva al esquema común las tablas que ConfiguracionModel creaba por su
+    cuenta (persona sin 'activo', personal con cargo_id y contraseña) y hace
+    único el nombre de usuario.
+    """
+    sql = []
+    columnas_persona = _columnas(conexion, "persona")
+    if columnas_persona and "activo" not in columnas_persona:
+        sql.append("ALTER TABLE persona ADD COLUMN activo BOOLEAN DEFAULT TRUE;")
+
+    duplicados = []
+    if _columnas(conexion, "usuario"):
+        duplicados = conexion.execute(
+            "SELECT nombre_usuario FROM usuario GROUP BY nombre_usuario HAVING COUNT(*) > 1"
+        ).fetchall()
+    if duplicados:
+        log.warning("Hay nombres de usuario repetidos; no se crea el índice único: %s",
+                    ", ".join(str(fila[0]) for fila in duplicados))
+    else:
+        sql.append("CREATE UNIQUE INDEX IF NOT EXISTS idx_usuario_nombre ON usuario(nombre_usuario);")
+
+    if "cargo_id" in _columnas(conexion, "personal"):
+        sql.append(SQL_RECONCILIAR_PERSONAL)
+    return "\n".join(sql)
+
+
+def _indices_busqueda(conexion) -> str:
+    """
+    Índices secundarios de persona y tablas FTS5 'persona_fts' (nombres y
+    documento) y 'denuncia_fts' (descripción, declaraciones y consejero),
+    sincronizadas con triggers.
+    """
+    if not _fts5_disponible(conexion):
+        # SQLite compilado sin FTS5: los modelos usan búsquedas con LIKE
+        log.warning("FTS5 no disponible, se omiten los índices de texto")
+        return SQL_INDICES_PERSONA
+    return "\n".join([SQL_INDICES_PERSONA, SQL_FTS_PERSONA, SQL_FTS_DENUNCIA, SQL_CARGA_FTS])
+
+
+# Tablas de resumen del panel de reportes: se mantienen con triggers en cada
+# INSERT/UPDATE/DELETE de nna, persona, denuncia, matricula_educativa y
+# seguimiento. Las edades no se guardan (cambian con el tiempo): resumen_nna
+# cuenta por género y fecha de nacimiento, y los rangos se calculan al leer.
+SQL_RESUMENES = "\n".join([SQL_TABLAS_RESUMEN, SQL_TRIGGERS_RESUMEN, SQL_CARGA_RESUMEN])
+
+# Buscador de unidades educativas de MatriculaView (prefijo sin distinguir mayúsculas)
+SQL_INDICE_UNIDAD_EDUCATIVA = """
+CREATE INDEX IF NOT EXISTS idx_unidad_educativa_nombre_nocase
+    ON unidad_educativa(nombre COLLATE NOCASE);
+"""
+
+# Permisos por módulo del menú (las claves de MODULE_PATHS en views/menu.py).
+# '*' da acceso a todos. El rol 'Usuario', que recibe quien se registra desde
+# el login, tiene todos los módulos de gestión salvo la configuración.
+SQL_PERMISOS_ROL = """
+CREATE TABLE IF NOT EXISTS rol_permiso(
+    rol_id INTEGER NOT NULL,
+    modulo TEXT NOT NULL,
+    PRIMARY KEY (rol_id, modulo),
+    FOREIGN KEY (rol_id) REFERENCES rol(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO rol (nombre, descripcion) VALUES
+    ('Usuario', 'Acceso a los módulos de gestión');
+
+INSERT OR IGNORE INTO rol_permiso (rol_id, modulo)
+SELECT id, '*' FROM rol WHERE nombre = 'Administrador';
+
+INSERT OR IGNORE INTO rol_permiso (rol_id, modulo)
+SELECT r.id, m.modulo FROM rol r, (
+    SELECT 'gestion_nna' AS modulo UNION ALL SELECT 'gestion_familiares'
+    UNION ALL SELECT 'gestion_ue' UNION ALL SELECT 'gestion_matriculas'
+    UNION ALL SELECT 'gestion_articulos' UNION ALL SELECT 'gestion_personal'
+    UNION ALL SELECT 'seguimiento_expedientes' UNION ALL SELECT 'gestion_denuncias'
+    UNION ALL SELECT 'reportes'
+) m
+WHERE r.nombre = 'Usuario';
+"""
+
+# Aperturas de cada módulo por usuario: decide qué vistas precarga MenuApp
+SQL_USO_MODULO = """
+CREATE TABLE IF NOT EXISTS uso_modulo(
+    persona_id INTEGER NOT NULL,   -- 0 = sin sesión
+    modulo TEXT NOT NULL,
+    aperturas INTEGER NOT NULL DEFAULT 0,
+    ultima_apertura TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (persona_id, modulo)
+) WITHOUT ROWID;
+"""
+
+def _hashear_contrasenas(conexion) -> str:
+    """
+    Reemplaza por su hash scrypt toda contraseña guardada en texto plano en
+    usuario.password_hash (las que copió la migración 2 desde personal).
+    El UPDATE corre dentro del script de migraciones, después de la 2, con
+    credenciales.generar_hash registrada como función de SQLite.
+    """
+    conexion.create_function("generar_hash", 1, credenciales.generar_hash)
+    return f"""
+UPDATE usuario SET password_hash = generar_hash(password_hash)
+WHERE password_hash IS NOT NULL AND password_hash <> ''
+  AND password_hash NOT LIKE '{credenciales.ALGORITMO}$%';
+"""
+
+
+# (versión, descripción, script): ver models/migraciones.py
+MIGRACIONES = [
+    (1, "Esquema base y datos de catálogo", SQL_ESQUEMA_BASE + SQL_DATOS_CATALOGO),
+    (2, "Unificar personal/usuario con el esquema de ConfiguracionModel", _reconciliar_configuracion),
+    (3, "Índices de búsqueda y texto completo", _indices_busqueda),
+    (4, "Tablas de resumen de reportes", SQL_RESUMENES),
+    (5, "Índice de búsqueda de unidades educativas", SQL_INDICE_UNIDAD_EDUCATIVA),
+    (6, "Permisos de módulos por rol", SQL_PERMISOS_ROL),
+    (7, "Estadísticas de uso de módulos", SQL_USO_MODULO),
+    (8, "Hash scrypt de las contraseñas en texto plano", _hashear_contrasenas),
+]
+
+
+class CreateDatabase:
+
+    def __init__(self, db_archivo=None):
+        
+        # Si no se especifica archivo, usar la carpeta models
+        if db_archivo is None:
+            # Obtener el directorio actual del archivo
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            # Crear la ruta completa
+            db_archivo = os.path.join(current_dir, "Proyecto_ultima.db")
+        
+        self.db_archivo = db_archivo
+        self.conexion = None
+
+        
+        # Crear la carpeta si no existe
+        os.makedirs(os.path.dirname(self.db_archivo), exist_ok=True)
+        
+        # Verificar e inicializar la base de datos automáticamente
+        self._inicializar_base_datos()
+
+    def _inicializar_base_datos(self):
         """
-        Inserta datos básicos en las tablas de catálogo
+        Aplica las migraciones pendientes. Con el esquema al día solo se lee
+        PRAGMA user_version: no se ejecuta ningún DDL.
         """
         conn = None
         try:
+            log.info("Usando base de datos: %s", self.db_archivo)
             conn = self.crearConexion()
             if not conn:
                 return
 
-            cursor = conn.cursor()
-            
-            # Insertar parentescos básicos
-            parentescos = [
-                ('Padre', 'Parentesco paterno'),
-                ('Madre', 'Parentesco materno'),
-                ('Hermano/a', 'Parentesco fraternal'),
-                ('Tío/a', 'Parentesco de tío'),
-                ('Abuelo/a', 'Parentesco de abuelo'),
-                ('Primo/a', 'Parentesco de primo'),
-                ('Otro', 'Otro tipo de parentesco')
-            ]
-            
-            cursor.executemany(
-                "INSERT OR IGNORE INTO parentesco (nombre, descripcion) VALUES (?, ?)",
-                parentescos
-            )
-            
-            # Insertar cargos básicos
-            cargos = [
-                ('Consejero', True),
-                ('Coordinador', False),
-                ('Psicólogo', False),
-                ('Abogado', False),
-                ('Asistente Social', False)
-            ]
-            
-            cursor.executemany(
-                "INSERT OR IGNORE INTO cargo (nombre, requiere_resolucion) VALUES (?, ?)",
-                cargos
-            )
-            
-            # Insertar artículos básicos
-            articulos = [
-                ('ART001', 'Protección Integral', 'Medidas de protección integral para NNA'),
-                ('ART002', 'Derecho a la Educación', 'Garantizar el acceso a la educación'),
-                ('ART003', 'Derecho a la Salud', 'Acceso a servicios de salud'),
-                ('ART004', 'Protección contra Violencia', 'Protección contra toda forma de violencia')
-            ]
-            
-            cursor.executemany(
-                "INSERT OR IGNORE INTO articulos (codigo, articulo, descripcion) VALUES (?, ?, ?)",
-                articulos
-            )
-            
-            conn.commit()
-            print("[OK] Datos de catálogo insertados correctamente")
-            
+            if aplicar_migraciones(conn, MIGRACIONES):
+                log.info("Esquema actualizado a la versión %s", version_actual(conn))
+            else:
+                log.info("Esquema al día (versión %s)", ultima_version(MIGRACIONES))
+                
         except Error as e:
-            print(f"[ERROR] Error al insertar datos de catálogo: {e}")
+            log.error("Error al verificar/inicializar base de datos: %s", e)
         finally:
             if conn:
                 self.cerrarConexion()
@@ -337,12 +811,12 @@ CREATE TABLE IF NOT EXISTS cargo(
                 return self.conexion
             
             self.conexion = sqlite3.connect(self.db_archivo)
-            # Habilitar claves foráneas
-            self.conexion.execute("PRAGMA foreign_keys = ON")
+            # Mismo perfil que el pool (WAL, claves foráneas, caché...)
+            aplicar_perfil(self.conexion)
             return self.conexion
         
         except Error as e:
-            print(f"[ERROR] {e}. Al tratar de conectar a la base de datos")
+            log.error("Error al conectar a la base de datos: %s", e)
             return None
     
     # Se define la función que cierra la conexión con la base de datos
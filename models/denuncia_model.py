@@ -1,8 +1,12 @@
+import logging
 import sys
 import os
+import re
 from sqlite3 import Error, IntegrityError
 from typing import Dict, List, Optional
 
+log = logging.getLogger(__name__)
+
 # [CORRECCIÓN 1] Se elimina la manipulación de sys.path que es innecesaria.
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
@@ -10,6 +14,8 @@ if current_dir not in sys.path:
 
 # Asumiendo que 'database_connector' está en una ubicación accesible
 from database_connector import Database
+from acceso_datos import consultar
+from registros import RegistroDenuncia
 
 class DenunciaModel:
 
@@ -17,9 +23,10 @@ class DenunciaModel:
         # Se asume que 'Database' es un conector existente
         self.db = Database() 
 
-    def _ejecutar_consulta(self, sql: str, params: tuple) -> Optional[List[Dict]]:
+    def _ejecutar_consulta(self, sql: str, params: tuple, como=dict) -> Optional[List[Dict]]:
         """
-        Método auxiliar para ejecutar consultas SELECT y mapear a lista de diccionarios.
+        Método auxiliar para ejecutar consultas SELECT y mapear a lista de diccionarios
+        (o de registros, p. ej. como=RegistroDenuncia para el listado).
         
         Se asegura el patrón de abrir y cerrar conexión en cada operación.
         """
@@ -27,15 +34,9 @@ class DenunciaModel:
         if conn is None:
             return []
         try:
-            cursor = conn.cursor()
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            if rows:
-                columnas = [desc[0] for desc in cursor.description]
-                return [dict(zip(columnas, row)) for row in rows] 
-            return []
+            return consultar(conn, sql, params, como=como)
         except Error as e:
-            print(f"[ERROR_CONSULTA] Error al ejecutar consulta: {e}")
+            log.error("Error al ejecutar consulta: %s", e)
             return None
         finally:
             if conn:
@@ -55,53 +56,134 @@ class DenunciaModel:
             return True, "Operación exitosa."
         except Error as e:
             conn.rollback()
-            print(f"[ERROR_TRANSACCION] Error al ejecutar transacción: {e}")
+            log.error("Error al ejecutar transacción: %s", e)
             return False, f"Error: {e}"
         finally:
             if conn:
                 self.db.cerrarConexion()
 
-    def obtener_listado_denuncias_filtrado(self, texto_busqueda: str = '', estado: str = 'Todos') -> List[Dict]:
-        """
-        Implementa la lógica de filtrado de denuncias para la tabla de la vista.
-        """
-        sql = """
-            SELECT 
-                d.id, d.fecha_denuncia, d.fecha_hechos, 
-                SUBSTR(d.descripcion, 1, 50) || '...' AS titulo, 
-                d.estado, 
-                CASE d.estado 
-                    WHEN 1 THEN 'Pendiente' 
-                    ELSE 'Resuelto'       
+    # Columnas comunes del listado (el título se define en cada consulta)
+    _COLUMNAS_LISTADO = """
+                d.id, d.fecha_denuncia, d.fecha_hechos,
+                {titulo} AS titulo,
+                d.estado,
+                CASE d.estado
+                    WHEN 1 THEN 'Pendiente'
+                    ELSE 'Resuelto'
                 END AS estado_str,
                 p_con.primer_nombre || ' ' || p_con.primer_apellido AS nombre_consejero
-            FROM denuncia d
+    """
+
+    _TITULO_CORTO = "SUBSTR(d.descripcion, 1, 50) || '...'"
+
+    _JOINS_LISTADO = """
             LEFT JOIN personal per ON d.consejero_id = per.persona_id
             LEFT JOIN persona p_con ON per.persona_id = p_con.id
+    """
+
+    def _fts_disponible(self) -> bool:
+        """Indica si existe el índice 'denuncia_fts' (se consulta una sola vez)."""
+        if getattr(self, "_hay_fts", None) is None:
+            filas = self._ejecutar_consulta(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='denuncia_fts'", ()
+            )
+            self._hay_fts = bool(filas)
+        return self._hay_fts
+
+    def _condicion_estado(self, estado: str) -> Optional[str]:
+        """Mapeo del estado de la vista al valor booleano de la DB."""
+        if estado in ["Pendiente", "En Revisión"]:
+            return "d.estado = 1"
+        if estado in ["Resuelto", "Rechazado"]:
+            return "d.estado = 0"
+        return None
+
+    def _paginar(self, sql: str, params: list, limite: Optional[int], desplazamiento: int) -> str:
+        """Agrega LIMIT/OFFSET a la consulta si se pidió una página."""
+        if limite is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limite, max(desplazamiento, 0)])
+        return sql
+
+    def obtener_listado_denuncias_filtrado(self, texto_busqueda: str = '', estado: str = 'Todos',
+                                           limite: Optional[int] = None,
+                                           desplazamiento: int = 0) -> List[Dict]:
         """
-        
-        condiciones = []
-        params = []
-        
-        # 1. Filtro de Texto (Busca en ID, Descripción o Consejero)
-        if texto_busqueda:
-            texto_like = f'%{texto_busqueda}%'
-            condiciones.append("(CAST(d.id AS TEXT) LIKE ? OR d.descripcion LIKE ? OR nombre_consejero LIKE ?)")
-            params.extend([texto_like, texto_like, texto_like])
-            
-        # 2. Filtro de Estado (Mapeo de string de la vista a valor booleano de la DB)
-        if estado != 'Todos':
-            if estado in ["Pendiente", "En Revisión"]:
-                 condiciones.append("d.estado = 1") 
-            elif estado in ["Resuelto", "Rechazado"]:
-                 condiciones.append("d.estado = 0")
-        
-        if condiciones:
-            sql += " WHERE " + " AND ".join(condiciones)
-            
-        sql += " ORDER BY d.fecha_denuncia DESC;"
-            
-        return self._ejecutar_consulta(sql, tuple(params)) or []
+        Implementa la lógica de filtrado de denuncias para la tabla de la vista.
+
+        Con texto de búsqueda se usa el índice FTS5 'denuncia_fts' (descripción,
+        declaraciones de los denunciantes y nombre del consejero): los resultados
+        se ordenan por relevancia y el 'titulo' es un fragmento del texto donde
+        aparece la coincidencia. Si el texto es un número, la denuncia con ese ID
+        se incluye primero (en el ORDER BY, igual en todas las páginas).
+        'limite' y 'desplazamiento' permiten paginar.
+        """
+        terminos = re.sub(r"[^\w]+", " ", texto_busqueda or "").split()
+        condicion_estado = self._condicion_estado(estado)
+
+        if not terminos:
+            sql = f"SELECT {self._COLUMNAS_LISTADO.format(titulo=self._TITULO_CORTO)}"
+            sql += f" FROM denuncia d {self._JOINS_LISTADO}"
+            params = []
+            if condicion_estado:
+                sql += " WHERE " + condicion_estado
+            sql += " ORDER BY d.fecha_denuncia DESC"
+            sql = self._paginar(sql, params, limite, desplazamiento)
+            return self._ejecutar_consulta(sql, tuple(params), como=RegistroDenuncia) or []
+
+        if not self._fts_disponible():
+            return self._listado_con_like(texto_busqueda, condicion_estado, limite, desplazamiento)
+
+        # Búsqueda por prefijos: todos los términos deben aparecer
+        consulta = " ".join(f'"{termino}"*' for termino in terminos)
+        titulo = "snippet(denuncia_fts, -1, '', '', '...', 8)"
+        # Pesos bm25: descripción, declaraciones, consejero
+        rango = "bm25(denuncia_fts, 3.0, 1.0, 2.0)"
+        params = [consulta]
+
+        if texto_busqueda.strip().isdigit():
+            # Búsqueda por número de denuncia: ese ID entra aunque su texto no
+            # coincida y va primero. El orden sale de una sola consulta, así cada
+            # página sigue donde terminó la anterior sin saltarse resultados.
+            denuncia_id = int(texto_busqueda.strip())
+            sql = (f"WITH coincidencias AS ("
+                   f"SELECT rowid AS id, {rango} AS rango, {titulo} AS fragmento"
+                   f" FROM denuncia_fts WHERE denuncia_fts MATCH ?"
+                   f" UNION ALL SELECT ?, NULL, NULL)")
+            sql += f" SELECT {self._COLUMNAS_LISTADO.format(titulo=f'COALESCE(c.fragmento, {self._TITULO_CORTO})')}"
+            sql += (" FROM (SELECT id, MIN(rango) AS rango, MAX(fragmento) AS fragmento"
+                    " FROM coincidencias GROUP BY id) c")
+            sql += f" INNER JOIN denuncia d ON d.id = c.id {self._JOINS_LISTADO}"
+            params.append(denuncia_id)
+            if condicion_estado:
+                sql += " WHERE " + condicion_estado
+            sql += " ORDER BY (d.id = ?) DESC, c.rango, d.fecha_denuncia DESC"
+            params.append(denuncia_id)
+        else:
+            sql = f"SELECT {self._COLUMNAS_LISTADO.format(titulo=titulo)}"
+            sql += f" FROM denuncia_fts INNER JOIN denuncia d ON d.id = denuncia_fts.rowid {self._JOINS_LISTADO}"
+            sql += " WHERE denuncia_fts MATCH ?"
+            if condicion_estado:
+                sql += " AND " + condicion_estado
+            sql += f" ORDER BY {rango}, d.fecha_denuncia DESC"
+
+        sql = self._paginar(sql, params, limite, desplazamiento)
+        return self._ejecutar_consulta(sql, tuple(params), como=RegistroDenuncia) or []
+
+    def _listado_con_like(self, texto_busqueda: str, condicion_estado: Optional[str],
+                          limite: Optional[int], desplazamiento: int) -> List[Dict]:
+        """Alternativa sin FTS5: busca con LIKE en ID, descripción y consejero."""
+        sql = f"SELECT {self._COLUMNAS_LISTADO.format(titulo=self._TITULO_CORTO)}"
+        sql += f" FROM denuncia d {self._JOINS_LISTADO}"
+        texto_like = f'%{texto_busqueda}%'
+        condiciones = ["(CAST(d.id AS TEXT) LIKE ? OR d.descripcion LIKE ? OR nombre_consejero LIKE ?)"]
+        params = [texto_like, texto_like, texto_like]
+        if condicion_estado:
+            condiciones.append(condicion_estado)
+        sql += " WHERE " + " AND ".join(condiciones)
+        sql += " ORDER BY d.fecha_denuncia DESC"
+        sql = self._paginar(sql, params, limite, desplazamiento)
+        return self._ejecutar_consulta(sql, tuple(params), como=RegistroDenuncia) or []
 
     def crear_denuncia_completa(self, datos_denuncia: Dict, nna_involucrados: List[Dict], denunciantes: List[Dict], denunciados: List[int]) -> tuple[Optional[int], str]:
         """
@@ -153,7 +235,7 @@ class DenunciaModel:
             return None, f"Error de integridad (FK/Unique Constraint) al registrar la denuncia: {e}"
         except Error as e:
             conn.rollback()
-            print(f"[ERROR_DENUNCIA] Error al crear denuncia: {e}")
+            log.error("Error al crear denuncia: %s", e)
             return None, f"Error interno al crear denuncia: {e}"
         finally:
             if conn:
@@ -176,7 +258,7 @@ class DenunciaModel:
             return True, "Denuncia actualizada exitosamente."
         except Error as e:
             conn.rollback()
-            print(f"[ERROR_UPDATE] Error al actualizar denuncia ID {denuncia_id}: {e}")
+            log.error("Error al actualizar denuncia ID %s: %s", denuncia_id, e)
             return False, f"Error al actualizar denuncia: {e}"
         finally:
             if conn:
@@ -0,0 +1,97 @@
+# models/dependencias.py
+"""
+Carga diferida de las bibliotecas pesadas (pandas, matplotlib, reportlab, PIL).
+
+Importarlas al cargar un módulo cuesta cientos de milisegundos que la ventana
+de login o el menú pagarían aunque el usuario nunca pida un reporte. Los
+módulos declaran la dependencia y esta se importa en el primer uso:
+
+    pd = perezoso("pandas")          # nada se importa todavía
+    ...
+    df = pd.DataFrame(datos)         # aquí se importa pandas
+
+    if disponible("matplotlib"):     # no importa: solo busca el paquete
+        plt = cargar("matplotlib.pyplot")
+
+Las anotaciones de tipo que usan la dependencia van entre comillas
+(-> "pd.DataFrame") para no importarla al definir la función.
+"""
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from types import ModuleType
+
+log = logging.getLogger(__name__)
+
+# Un único módulo (y un único lock) con ambos nombres
+try:
+    import modulo_unico
+except ImportError:
+    from models import modulo_unico
+modulo_unico.registrar(__name__)
+
+_lock = threading.Lock()
+_disponibles = {}
+
+
+def disponible(nombre: str) -> bool:
+    """True si el paquete está instalado, sin importarlo."""
+    try:
+        return _disponibles[nombre]
+    except KeyError:
+        pass
+    try:
+        encontrado = nombre in sys.modules or importlib.util.find_spec(nombre) is not None
+    except (ImportError, ValueError):
+        encontrado = False
+    _disponibles[nombre] = encontrado
+    return encontrado
+
+
+def cargar(nombre: str) -> ModuleType:
+    """Importa el módulo (una sola vez) y registra cuánto tardó la primera carga."""
+    modulo = sys.modules.get(nombre)
+    if modulo is not None:
+        return modulo
+    # Un solo hilo importa: la precarga de vistas y un clic pueden coincidir
+    with _lock:
+        inicio = time.perf_counter()
+        # __import__ y no importlib.import_module: así la carga aparece en
+        # "python -X importtime" (medir_arranque.py --importtime)
+        __import__(nombre)
+        modulo = sys.modules[nombre]
+    log.info("Dependencia %s cargada en %.0f ms", nombre, (time.perf_counter() - inicio) * 1000)
+    return modulo
+
+
+class ModuloPerezoso(ModuleType):
+    """Representa un módulo que se importa al acceder a su primer atributo."""
+
+    def __init__(self, nombre: str):
+        super().__init__(nombre)
+        self.__dict__["_modulo"] = None
+
+    def _cargar(self) -> ModuleType:
+        modulo = self.__dict__["_modulo"]
+        if modulo is None:
+            modulo = cargar(self.__name__)
+            self.__dict__["_modulo"] = modulo
+        return modulo
+
+    def __getattr__(self, atributo):
+        # Solo se llama para lo que no está en __dict__ (todo salvo _modulo y __name__)
+        return getattr(self._cargar(), atributo)
+
+    def __dir__(self):
+        return dir(self._cargar())
+
+    def __repr__(self):
+        estado = "cargado" if self.__dict__["_modulo"] is not None else "sin cargar"
+        return f"<módulo perezoso {self.__name__!r} ({estado})>"
+
+
+def perezoso(nombre: str) -> ModuleType:
+    """Módulo que se importará en el primer uso (ver ModuloPerezoso)."""
+    return sys.modules.get(nombre) or ModuloPerezoso(nombre)
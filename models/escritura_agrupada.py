@@ -0,0 +1,126 @@
+# models/escritura_agrupada.py
+"""
+Escritor con "group commit": agrupa escrituras concurrentes en una sola
+transacción.
+
+Cada commit de SQLite paga una sincronización a disco. Cuando varias
+llamadas llegan casi a la vez (p. ej. un registrador cargando las notas del
+día), el escritor espera unos milisegundos (VENTANA_MS) a que lleguen más y las
+confirma todas con un único COMMIT. Cada escritura va en su propio SAVEPOINT:
+si una falla, solo esa recibe el error y las demás se confirman igual.
+
+El llamador queda bloqueado hasta que su escritura se confirma, por lo que la
+semántica es la misma que la de un execute() + commit() normal.
+
+Uso:
+    escritor = EscritorAgrupado(Database())
+    nuevo_id = escritor.ejecutar("INSERT INTO seguimiento (...) VALUES (?, ?, ?)", params)
+    escritor.cerrar()
+"""
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Sequence
+
+VENTANA_MS = 5       # Espera máxima por más escrituras antes de confirmar
+MAXIMO_LOTE = 200    # Escrituras por transacción como máximo
+
+
+class EscritorAgrupado:
+    """Hilo escritor que confirma en lote las escrituras encoladas."""
+
+    def __init__(self, db, ventana_ms: float = VENTANA_MS, maximo_lote: int = MAXIMO_LOTE):
+        self.db = db
+        self.ventana = ventana_ms / 1000.0
+        self.maximo_lote = maximo_lote
+        self._cola = queue.Queue()
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._bucle, name="escritor-agrupado", daemon=True)
+        self._hilo.start()
+
+    def ejecutar(self, sql: str, parametros: Sequence = (), timeout: Optional[float] = None) -> int:
+        """
+        Encola una sentencia de escritura y espera su confirmación.
+        Devuelve el lastrowid; relanza el error de SQLite si falló.
+        """
+        return self.enviar(sql, parametros).result(timeout)
+
+    def enviar(self, sql: str, parametros: Sequence = ()) -> Future:
+        """Versión sin espera: devuelve un Future con el lastrowid."""
+        futuro = Future()
+        if self._cerrado:
+            futuro.set_exception(RuntimeError("El escritor agrupado está cerrado"))
+            return futuro
+        self._cola.put((sql, tuple(parametros), futuro))
+        return futuro
+
+    def cerrar(self, timeout: float = 5.0):
+        """Confirma lo pendiente y detiene el hilo."""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._cola.put(None)
+        self._hilo.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Hilo escritor
+    # ------------------------------------------------------------------
+
+    def _bucle(self):
+        while True:
+            primero = self._cola.get()
+            if primero is None:
+                return
+            lote = [primero]
+            fin = False
+            # Juntar lo que llegue dentro de la ventana, contada desde la primera
+            # escritura (sin pasar el máximo)
+            limite = time.monotonic() + self.ventana
+            while len(lote) < self.maximo_lote:
+                restante = limite - time.monotonic()
+                try:
+                    siguiente = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is None:
+                    fin = True
+                    break
+                lote.append(siguiente)
+            self._confirmar(lote)
+            if fin:
+                return
+
+    def _confirmar(self, lote):
+        resultados = []
+        try:
+            with self.db.conexion() as conexion:
+                conexion.execute("BEGIN IMMEDIATE")
+                try:
+                    for sql, parametros, futuro in lote:
+                        conexion.execute("SAVEPOINT escritura")
+                        try:
+                            cursor = conexion.execute(sql, parametros)
+                            conexion.execute("RELEASE escritura")
+                            resultados.append((futuro, cursor.lastrowid, None))
+                        except sqlite3.Error as e:
+                            conexion.execute("ROLLBACK TO escritura")
+                            conexion.execute("RELEASE escritura")
+                            resultados.append((futuro, None, e))
+                    conexion.commit()
+                except sqlite3.Error:
+                    conexion.rollback()
+                    raise
+        except sqlite3.Error as e:
+            # Falló la transacción completa (BD bloqueada, disco...): nadie quedó guardado
+            for _sql, _parametros, futuro in lote:
+                futuro.set_exception(e)
+            return
+
+        # Se avisa a los llamadores solo después del COMMIT
+        for futuro, lastrowid, error in resultados:
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(lastrowid)
@@ -1,18 +1,46 @@
 # models/familiar_model.py
+import logging
 import sys
 import os
 import sqlite3
 
+log = logging.getLogger(__name__)
+
 # Añadir el path para que las importaciones relativas funcionen
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 
 try:
     from database_connector import Database  # Usamos la clase Database (Singleton)
 except ImportError:
-    print("Advertencia: No se pudo importar Database directamente. Intentando models.database_connector...")
     from models.database_connector import Database
 
+try:
+    from paginacion import listar_pagina
+except ImportError:
+    from models.paginacion import listar_pagina
+
+try:
+    from cache_catalogos import cache_catalogos
+except ImportError:
+    from models.cache_catalogos import cache_catalogos
+
+try:
+    from acceso_datos import leer
+    from registros import RegistroFamiliar
+except ImportError:
+    from models.acceso_datos import leer
+    from models.registros import RegistroFamiliar
+
 class FamiliarModel:
+    # Órdenes admitidos por listar_pagina(); la última clave desempata (única)
+    ORDENES_LISTADO = {
+        "apellido": [("p.primer_apellido COLLATE NOCASE", "ASC"),
+                     ("p.primer_nombre COLLATE NOCASE", "ASC"),
+                     ("p.id", "ASC")],
+        "id": [("p.id", "ASC")],
+        "recientes": [("p.id", "DESC")],
+    }
+
     def __init__(self):
         self.db = Database()
 
@@ -117,14 +145,10 @@ class FamiliarModel:
             else:
                 return {"error": "Se necesita ID o nombre y apellido", "status": "error"}
                 
-            rows = cursor.fetchall()
-            if not rows:
+            result = leer(cursor, como=RegistroFamiliar)
+            if not result:
                 return {"error": "No se encontraron registros", "status": "error"}
             
-            # Convertir a lista de diccionarios
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
-            
             return {"data": result, "status": "success"}
         except Exception as e:
             return {"error": str(e), "status": "error"}
@@ -235,7 +259,10 @@ class FamiliarModel:
                 self.db.cerrarConexion(conn)
                 
     def obtener_parentescos(self):
-        # El código es correcto. No se requiere modificación.
+        """Catálogo de parentescos ordenado por nombre (cacheado)."""
+        return cache_catalogos.obtener("parentesco", self._consultar_parentescos, clave="familiar")
+
+    def _consultar_parentescos(self):
         conn = None
         try:
             conn = self.db.crearConexion()
@@ -245,14 +272,9 @@ class FamiliarModel:
             cursor = conn.cursor()
             cursor.execute('SELECT id, nombre FROM parentesco ORDER BY nombre')
             
-            rows = cursor.fetchall()
-            
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
-            
-            return result # Devolver la lista de diccionarios
+            return leer(cursor) # Devolver la lista de diccionarios
         except Exception as e:
-            print(f"Error al obtener parentescos: {str(e)}")
+            log.error("Error al obtener parentescos: %s", e)
             return []
         finally:
             if conn:
@@ -278,15 +300,30 @@ class FamiliarModel:
                 ORDER BY p.primer_apellido, p.primer_nombre
             ''')
             
-            rows = cursor.fetchall()
-            
-            # Convertir a lista de diccionarios
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
+            result = leer(cursor, como=RegistroFamiliar)
             
             return {"data": result, "status": "success"}
         except Exception as e:
             return {"error": str(e), "status": "error"}
         finally:
             if conn:
-                self.db.cerrarConexion(conn)
\ No newline at end of file
+                self.db.cerrarConexion(conn)
+
+    def listar_pagina(self, tamano=None, continuacion=None, orden="apellido"):
+        """
+        Obtiene los familiares de a una página (paginación por clave).
+        Incluye parentesco_desc. Para la página siguiente se pasa el
+        'continuacion' de la respuesta anterior (ver models/paginacion.py).
+        """
+        return listar_pagina(
+            self.db,
+            columnas="p.*, f.tutor, f.parentesco_id, pa.nombre AS parentesco_desc",
+            origen="""persona p 
+                JOIN familiar f ON p.id = f.persona_id 
+                LEFT JOIN parentesco pa ON f.parentesco_id = pa.id""",
+            ordenes=self.ORDENES_LISTADO,
+            orden=orden,
+            tamano=tamano,
+            continuacion=continuacion,
+            como=RegistroFamiliar,
+        )
@@ -0,0 +1,394 @@
+# models/importacion.py
+"""
+Importación masiva de NNA, familiares y unidades educativas desde CSV o XLSX.
+
+El archivo se lee fila a fila (nunca completo en memoria) y se procesa en
+lotes de TAMANO_LOTE filas:
+
+    1. Validación del lote con las mismas reglas de los modelos
+       (NNAModel._validar_datos_formato, _validar_telefono...) más una consulta
+       por lote para detectar teléfonos/documentos ya registrados.
+    2. Inserción de las filas válidas con executemany() en UNA transacción.
+       Si aun así el lote falla (p. ej. una restricción de la BD), se repite
+       fila por fila con SAVEPOINT para guardar las buenas y reportar las malas.
+
+El resultado informa los errores por número de fila y 'ultima_fila', la
+última fila confirmada: si la importación se corta, se retoma con
+importar(..., desde_fila=resultado["ultima_fila"]).
+
+Uso:
+    importador = ImportadorMasivo()
+    resultado = importador.importar("matricula_escuela.xlsx", "nna")
+
+Columnas esperadas (los encabezados no distinguen mayúsculas ni acentos):
+    nna:              primer_nombre, segundo_nombre, primer_apellido,
+                      segundo_apellido, documento_identidad, genero, direccion,
+                      telefono, fecha_nacimiento (YYYY-MM-DD)
+    familiar:         primer_nombre, segundo_nombre, primer_apellido,
+                      segundo_apellido, direccion, telefono, parentesco
+                      (id o nombre), tutor (si/no), genero (opcional)
+    unidad_educativa: nombre, director, tipo (PUBLICA/PRIVADA), telefono,
+                      direccion
+"""
+import logging
+import csv
+import datetime
+import os
+import sys
+import time
+import unicodedata
+from itertools import islice
+from sqlite3 import Error, IntegrityError
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from database_connector import Database
+    from nna_model import NNAModel
+    from familiar_model import FamiliarModel
+    from unidad_educativa_model import UnidadEducativaModel
+except ImportError:
+    from models.database_connector import Database
+    from models.nna_model import NNAModel
+    from models.familiar_model import FamiliarModel
+    from models.unidad_educativa_model import UnidadEducativaModel
+
+TAMANO_LOTE = 500
+VALORES_SI = {"si", "s", "true", "1", "x", "verdadero"}
+
+# Encabezados habituales en las planillas -> nombre de la columna en la BD
+ALIAS_COLUMNAS = {
+    "fecha_de_nacimiento": "fecha_nacimiento",
+    "documento_de_identidad": "documento_identidad",
+    "documento": "documento_identidad",
+    "cedula": "documento_identidad",
+    "sexo": "genero",
+    "tipo_de_unidad": "tipo",
+}
+
+Fila = Tuple[int, Dict[str, Any]]  # (número de fila en el archivo, datos)
+
+
+# ----------------------------------------------------------------------
+# Lectura del archivo
+# ----------------------------------------------------------------------
+
+def normalizar_encabezado(texto: Any) -> str:
+    """'Fecha de Nacimiento' -> 'fecha_nacimiento', 'Género' -> 'genero' (ver ALIAS_COLUMNAS)."""
+    texto = unicodedata.normalize("NFKD", str(texto or "").strip().lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = "_".join(texto.replace("-", " ").split())
+    return ALIAS_COLUMNAS.get(texto, texto)
+
+
+def _normalizar_valor(valor: Any) -> Optional[str]:
+    """Celdas a texto: vacías -> None, fechas -> YYYY-MM-DD, 4121234567.0 -> '4121234567'."""
+    if valor is None:
+        return None
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return valor.isoformat()[:10]
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    texto = str(valor).strip()
+    return texto or None
+
+
+def leer_filas(ruta: str, hoja: Optional[str] = None) -> Iterator[Fila]:
+    """
+    Recorre un CSV o XLSX fila a fila. La primera fila son los encabezados;
+    los números de fila coinciden con los de la hoja de cálculo (datos desde 2).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        yield from _leer_csv(ruta)
+    elif extension in (".xlsx", ".xlsm"):
+        yield from _leer_xlsx(ruta, hoja)
+    else:
+        raise ValueError(f"Formato no soportado: {extension} (use .csv o .xlsx)")
+
+
+def _leer_csv(ruta: str) -> Iterator[Fila]:
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        muestra = archivo.read(4096)
+        archivo.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        lector = csv.reader(archivo, dialecto)
+        encabezados = [normalizar_encabezado(h) for h in next(lector, [])]
+        for numero, valores in enumerate(lector, start=2):
+            fila = {col: _normalizar_valor(v) for col, v in zip(encabezados, valores)}
+            if any(v is not None for v in fila.values()):
+                yield numero, fila
+
+
+def _leer_xlsx(ruta: str, hoja: Optional[str]) -> Iterator[Fila]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Para importar archivos XLSX se necesita el paquete 'openpyxl'") from None
+
+    # read_only: las filas se leen bajo demanda, sin cargar la hoja completa
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja_datos = libro[hoja] if hoja else libro.active
+        filas = hoja_datos.iter_rows(values_only=True)
+        encabezados = [normalizar_encabezado(h) for h in next(filas, ())]
+        for numero, valores in enumerate(filas, start=2):
+            fila = {col: _normalizar_valor(v) for col, v in zip(encabezados, valores) if col}
+            if any(v is not None for v in fila.values()):
+                yield numero, fila
+    finally:
+        libro.close()
+
+
+# ----------------------------------------------------------------------
+# Importador
+# ----------------------------------------------------------------------
+
+class ImportadorMasivo:
+    """Carga masiva con validación por lotes e inserción con executemany."""
+
+    ENTIDADES = ("nna", "familiar", "unidad_educativa")
+
+    def __init__(self):
+        self.db = Database()
+        self.nna_model = NNAModel()
+        self.familiar_model = FamiliarModel()
+        self.unidad_model = UnidadEducativaModel()
+
+    def importar(self, ruta: str, entidad: str, desde_fila: int = 0,
+                 tamano_lote: Optional[int] = None, hoja: Optional[str] = None,
+                 al_progresar: Optional[Callable[[int, int, int], None]] = None) -> dict:
+        """
+        Importa el archivo 'ruta' como registros de 'entidad'.
+
+        desde_fila:   omite las filas hasta ese número inclusive (para reanudar).
+        al_progresar: callback(procesadas, insertadas, errores) tras cada lote.
+
+        Devuelve {"status", "insertadas", "procesadas", "errores": [{"fila", "error"}],
+                  "ultima_fila", "segundos", "filas_por_segundo"}.
+        """
+        if entidad not in self.ENTIDADES:
+            return {"status": "error", "error": f"Entidad no válida: {entidad}"}
+        tamano_lote = max(1, tamano_lote or TAMANO_LOTE)
+        preparar = getattr(self, f"_preparar_{entidad}")
+        sentencias = getattr(self, f"_sentencias_{entidad}")()
+        contexto = self._contexto(entidad)
+
+        resultado = {"status": "success", "insertadas": 0, "procesadas": 0,
+                     "errores": [], "ultima_fila": desde_fila}
+        inicio = time.perf_counter()
+
+        try:
+            filas = (f for f in leer_filas(ruta, hoja) if f[0] > desde_fila)
+            for lote in iter(lambda: list(islice(filas, tamano_lote)), []):
+                validos, errores = self._validar_lote(entidad, lote, preparar, contexto)
+                insertadas, errores_bd = self._insertar_lote(sentencias, validos)
+
+                resultado["insertadas"] += insertadas
+                resultado["procesadas"] += len(lote)
+                resultado["errores"].extend(sorted(errores + errores_bd, key=lambda e: e["fila"]))
+                resultado["ultima_fila"] = lote[-1][0]
+                if al_progresar:
+                    al_progresar(resultado["procesadas"], resultado["insertadas"],
+                                 len(resultado["errores"]))
+        except (OSError, ValueError, ImportError, Error) as e:
+            # Lo confirmado hasta 'ultima_fila' queda guardado; se puede reanudar
+            resultado["status"] = "error"
+            resultado["error"] = str(e)
+            log.error("Importación de %s detenida tras la fila %s: %s",
+                      entidad, resultado['ultima_fila'], e)
+
+        segundos = time.perf_counter() - inicio
+        resultado["segundos"] = round(segundos, 3)
+        resultado["filas_por_segundo"] = round(resultado["procesadas"] / segundos, 1) if segundos else 0.0
+        log.info("Importación de %s: %s insertadas, %s con errores, %s filas/s",
+                 entidad, resultado['insertadas'], len(resultado['errores']), resultado['filas_por_segundo'],
+                 extra={"entidad": entidad, "insertadas": resultado['insertadas'],
+                        "filas_por_segundo": resultado['filas_por_segundo']})
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Validación por lote
+    # ------------------------------------------------------------------
+
+    def _contexto(self, entidad: str) -> dict:
+        """Datos de apoyo que se consultan una vez por importación (catálogos)."""
+        if entidad != "familiar":
+            return {}
+        parentescos = {}
+        for p in self.familiar_model.obtener_parentescos():
+            parentescos[str(p["id"])] = p["id"]
+            parentescos[normalizar_encabezado(p["nombre"])] = p["id"]
+        return {"parentescos": parentescos}
+
+    def _validar_lote(self, entidad: str, lote: List[Fila], preparar: Callable,
+                      contexto: dict) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+        """Aplica las reglas de formato y descarta duplicados (en el lote y en la BD)."""
+        validos, errores = [], []
+        for numero, fila in lote:
+            registro, error = preparar(fila, contexto)
+            if error:
+                errores.append({"fila": numero, "error": error})
+            else:
+                validos.append((numero, registro))
+
+        # Campos únicos: una consulta por lote y por campo, no por fila
+        tabla = "unidad_educativa" if entidad == "unidad_educativa" else "persona"
+        campos = ["telefono"] if tabla == "unidad_educativa" else ["telefono", "documento_identidad"]
+        for campo in campos:
+            valores = [r[campo] for _, r in validos if r.get(campo)]
+            existentes = self._valores_existentes(tabla, campo, valores)
+            vistos = set()
+            depurados = []
+            for numero, registro in validos:
+                valor = registro.get(campo)
+                if valor and (valor in existentes or valor in vistos):
+                    errores.append({"fila": numero, "error": f"{campo} '{valor}' ya está registrado"})
+                    continue
+                if valor:
+                    vistos.add(valor)
+                depurados.append((numero, registro))
+            validos = depurados
+        return validos, errores
+
+    def _valores_existentes(self, tabla: str, campo: str, valores: List[str]) -> set:
+        if not valores:
+            return set()
+        marcadores = ", ".join("?" * len(valores))
+        with self.db.conexion() as conexion:
+            cursor = conexion.execute(
+                f"SELECT {campo} FROM {tabla} WHERE {campo} IN ({marcadores})", valores
+            )
+            return {fila[0] for fila in cursor.fetchall()}
+
+    @staticmethod
+    def _faltantes(fila: dict, campos: Iterable[str]) -> Optional[str]:
+        faltan = [c for c in campos if not fila.get(c)]
+        return f"Faltan campos obligatorios: {', '.join(faltan)}" if faltan else None
+
+    def _preparar_nna(self, fila: dict, _contexto: dict) -> Tuple[Optional[dict], Optional[str]]:
+        error = self._faltantes(fila, ("primer_nombre", "primer_apellido", "genero",
+                                       "direccion", "telefono", "fecha_nacimiento"))
+        if error:
+            return None, error
+        error_formato = self.nna_model._validar_datos_formato(fila)
+        if error_formato:
+            return None, error_formato["error"]
+        return dict(fila, genero=fila["genero"].upper()), None
+
+    def _preparar_familiar(self, fila: dict, contexto: dict) -> Tuple[Optional[dict], Optional[str]]:
+        if not self.familiar_model._validar_campos_obligatorios(fila.get("primer_nombre"),
+                                                                fila.get("primer_apellido")):
+            return None, "Nombre y apellido son obligatorios"
+        if not fila.get("direccion"):
+            return None, "Dirección es obligatoria"
+        parentesco_id = contexto["parentescos"].get(normalizar_encabezado(fila.get("parentesco")))
+        if not parentesco_id:
+            return None, f"Parentesco no reconocido: {fila.get('parentesco')}"
+        if not self.familiar_model._validar_telefono(fila.get("telefono")):
+            return None, "Teléfono debe tener 11 dígitos"
+        return dict(fila,
+                    parentesco_id=parentesco_id,
+                    tutor=1 if normalizar_encabezado(fila.get("tutor")) in VALORES_SI else 0,
+                    # Mismo valor por defecto que FamiliarModel.crear_familiar
+                    genero=(fila.get("genero") or "F").upper()), None
+
+    def _preparar_unidad_educativa(self, fila: dict, _contexto: dict) -> Tuple[Optional[dict], Optional[str]]:
+        campos = [fila.get(c) for c in ("nombre", "director", "tipo", "telefono", "direccion")]
+        if not self.unidad_model._validar_campos_obligatorios(*campos):
+            return None, "Todos los campos son obligatorios"
+        if not self.unidad_model._validar_tipo(fila["tipo"]):
+            return None, "Tipo debe ser PUBLICA o PRIVADA"
+        if not self.unidad_model._validar_telefono(fila["telefono"]):
+            return None, "Teléfono debe tener 11 dígitos"
+        return dict(fila, tipo=fila["tipo"].upper()), None
+
+    # ------------------------------------------------------------------
+    # Inserción
+    # ------------------------------------------------------------------
+    # Cada entidad define una lista de (sql, parámetros(registro)). Las tablas
+    # hijas encuentran su persona por el teléfono (UNIQUE en persona), lo que
+    # permite insertar el lote completo con executemany sin leer los id.
+
+    @staticmethod
+    def _parametros_persona(r: dict) -> tuple:
+        return (r.get("documento_identidad"), r["primer_nombre"], r.get("segundo_nombre"),
+                r["primer_apellido"], r.get("segundo_apellido"), r["genero"],
+                r["direccion"], r["telefono"])
+
+    _SQL_PERSONA = """
+        INSERT INTO persona (
+            documento_identidad, primer_nombre, segundo_nombre,
+            primer_apellido, segundo_apellido, genero, direccion, telefono, activo
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, TRUE)
+    """
+
+    def _sentencias_nna(self):
+        return [
+            (self._SQL_PERSONA, self._parametros_persona),
+            ("""INSERT INTO nna (persona_id, fecha_nacimiento)
+                SELECT id, ? FROM persona WHERE telefono = ?""",
+             lambda r: (r["fecha_nacimiento"], r["telefono"])),
+        ]
+
+    def _sentencias_familiar(self):
+        return [
+            (self._SQL_PERSONA, self._parametros_persona),
+            ("""INSERT INTO familiar (persona_id, tutor, parentesco_id)
+                SELECT id, ?, ? FROM persona WHERE telefono = ?""",
+             lambda r: (r["tutor"], r["parentesco_id"], r["telefono"])),
+        ]
+
+    def _sentencias_unidad_educativa(self):
+        return [
+            ("""INSERT INTO unidad_educativa (nombre, director, tipo, telefono, direccion)
+                VALUES (?, ?, ?, ?, ?)""",
+             lambda r: (r["nombre"], r["director"], r["tipo"], r["telefono"], r["direccion"])),
+        ]
+
+    def _insertar_lote(self, sentencias, validos: List[Tuple[int, dict]]) -> Tuple[int, List[dict]]:
+        """Inserta el lote en una transacción; si falla, lo reintenta fila por fila."""
+        if not validos:
+            return 0, []
+        with self.db.conexion() as conexion:
+            try:
+                conexion.execute("BEGIN IMMEDIATE")
+                for sql, parametros in sentencias:
+                    conexion.executemany(sql, [parametros(r) for _, r in validos])
+                conexion.commit()
+                return len(validos), []
+            except IntegrityError:
+                conexion.rollback()
+            except Error:
+                conexion.rollback()
+                raise
+            return self._insertar_fila_por_fila(conexion, sentencias, validos)
+
+    @staticmethod
+    def _insertar_fila_por_fila(conexion, sentencias, validos) -> Tuple[int, List[dict]]:
+        insertadas, errores = 0, []
+        try:
+            conexion.execute("BEGIN IMMEDIATE")
+            for numero, registro in validos:
+                conexion.execute("SAVEPOINT fila")
+                try:
+                    for sql, parametros in sentencias:
+                        conexion.execute(sql, parametros(registro))
+                    conexion.execute("RELEASE fila")
+                    insertadas += 1
+                except IntegrityError as e:
+                    conexion.execute("ROLLBACK TO fila")
+                    conexion.execute("RELEASE fila")
+                    errores.append({"fila": numero, "error": f"Error de integridad: {e}"})
+            conexion.commit()
+        except Error:
+            conexion.rollback()
+            raise
+        return insertadas, errores
@@ -1,27 +1,212 @@
-import json
-
-class UserModel:
-    def __init__(self, db_path="users.json"):
-        self.db_path = db_path
-        self.load_users()
-
-    def load_users(self):
-        try:
-            with open(self.db_path, "r") as f:
-                self.users = json.load(f)
-        except FileNotFoundError:
-            self.users = {}
-
-    def save_users(self):
-        with open(self.db_path, "w") as f:
-            json.dump(self.users, f, indent=4)
-
-    def validate_user(self, username, password):
-        user = self.users.get(username)
-        if user and user["password"] == password:
-            return user["role"]
-        return None
-
-    def add_user(self, username, password, role):
-        self.users[username] = {"password": password, "role": role}
-        self.save_users()
+import json
+import logging
+import os
+import sqlite3
+import sys
+from typing import Dict, Optional
+
+log = logging.getLogger(__name__)
+
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+try:
+    from database_connector import Database
+except ImportError:
+    from models.database_connector import Database
+
+try:
+    from acceso_datos import consultar_uno, consultar_valor
+except ImportError:
+    from models.acceso_datos import consultar_uno, consultar_valor
+
+try:
+    import credenciales
+except ImportError:
+    from models import credenciales
+
+try:
+    from sesion import Sesion
+except ImportError:
+    from models.sesion import Sesion
+
+
+class UserModel:
+    """
+    Credenciales de acceso guardadas en la tabla 'usuario' (antes users.json).
+
+    La búsqueda por nombre usa el índice único idx_usuario_nombre y registrar
+    un usuario son unos pocos INSERT: no se carga ni se reescribe ningún
+    archivo. Las contraseñas se guardan con scrypt (models/credenciales.py);
+    authenticate() y add_user() calculan el hash, que es costoso a propósito,
+    así que el controlador los llama fuera del hilo de la interfaz.
+    """
+
+    ROL_ADMINISTRADOR = "Administrador"
+    # Roles de users.json -> nombre en la tabla rol
+    ROLES_JSON = {"admin": "Administrador", "user": "Usuario"}
+
+    def __init__(self):
+        self.db = Database()
+
+    # --- Autenticación ---
+
+    def authenticate(self, username: str, password: str) -> Optional[Sesion]:
+        """
+        Verifica usuario y contraseña. Devuelve la Sesion del usuario (persona,
+        cargo, roles y permisos) o None si las credenciales no son válidas.
+        """
+        fila = self._buscar_credenciales(username)
+        # La conexión ya volvió al pool: el KDF no la retiene mientras calcula
+        if fila is None:
+            credenciales.verificar_ficticio(password)
+            return None
+
+        correcta, necesita_rehash = credenciales.verificar(password, fila["password_hash"])
+        if not correcta:
+            return None
+        if necesita_rehash:
+            self._actualizar_hash(fila["persona_id"], credenciales.generar_hash(password))
+        return Sesion.cargar(fila["persona_id"])
+
+    def validate_user(self, username: str, password: str) -> Optional[str]:
+        """Compatibilidad con la interfaz anterior: devuelve solo el rol (o None)."""
+        sesion = self.authenticate(username, password)
+        return sesion.rol if sesion else None
+
+    def _buscar_credenciales(self, username: str) -> Optional[Dict]:
+        conn = self.db.crearConexion()
+        if conn is None:
+            return None
+        try:
+            return consultar_uno(conn, """
+                SELECT u.persona_id, u.nombre_usuario, u.password_hash
+                FROM usuario u
+                JOIN persona p ON p.id = u.persona_id
+                WHERE u.nombre_usuario = ? AND COALESCE(p.activo, 1) = 1
+            """, (username,))
+        except sqlite3.Error as e:
+            log.error("Error al buscar el usuario: %s", e)
+            return None
+        finally:
+            self.db.cerrarConexion(conn)
+
+    def _actualizar_hash(self, persona_id: int, password_hash: str):
+        """Guarda el hash recalculado (contraseña heredada o parámetros viejos)."""
+        conn = self.db.crearConexion()
+        if conn is None:
+            return
+        try:
+            conn.execute("UPDATE usuario SET password_hash = ? WHERE persona_id = ?",
+                         (password_hash, persona_id))
+            conn.commit()
+            log.info("Hash de contraseña actualizado para la persona %s", persona_id)
+        except sqlite3.Error as e:
+            conn.rollback()
+            log.error("Error al actualizar el hash de la contraseña: %s", e)
+        finally:
+            self.db.cerrarConexion(conn)
+
+    # --- Registro ---
+
+    def existe_usuario(self, username: str) -> bool:
+        conn = self.db.crearConexion()
+        if conn is None:
+            return False
+        try:
+            return consultar_valor(conn, "SELECT 1 FROM usuario WHERE nombre_usuario = ?",
+                                   (username,)) is not None
+        finally:
+            self.db.cerrarConexion(conn)
+
+    def add_user(self, username: str, password: str, role: str = None,
+                 password_hash: str = None) -> int:
+        """
+        Registra un usuario nuevo y devuelve su persona_id.
+
+        Crea una persona mínima (el nombre de usuario como nombre) con su fila
+        en 'usuario' y, si existe un rol con ese nombre, la asignación en
+        persona_rol. Nunca se asigna Administrador por descarte: el registro
+        desde el login pasa el rol Usuario y el primer administrador se crea
+        con crear_administrador.py.
+        Lanza ValueError si el nombre de usuario ya existe.
+        """
+        if password_hash is None:
+            # Antes de tomar la conexión: el KDF tarda y no debe retener el pool
+            password_hash = credenciales.generar_hash(password)
+
+        conn = self.db.crearConexion()
+        if conn is None:
+            raise sqlite3.OperationalError("No hay conexión a la base de datos")
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            # El índice único lo garantiza; la consulta cubre bases antiguas sin él
+            if cursor.execute("SELECT 1 FROM usuario WHERE nombre_usuario = ?",
+                              (username,)).fetchone():
+                raise ValueError(f"El nombre de usuario '{username}' ya existe")
+
+            cursor.execute("""
+                INSERT INTO persona (primer_nombre, primer_apellido, direccion, telefono)
+                VALUES (?, '', '', ?)
+            """, (username, f"usuario:{username}"))  # telefono es UNIQUE NOT NULL
+            persona_id = cursor.lastrowid
+
+            cursor.execute("""
+                INSERT INTO usuario (persona_id, nombre_usuario, password_hash)
+                VALUES (?, ?, ?)
+            """, (persona_id, username, password_hash))
+
+            if role:
+                cursor.execute("""
+                    INSERT INTO persona_rol (persona_id, rol_id)
+                    SELECT ?, id FROM rol WHERE nombre = ?
+                """, (persona_id, role))
+
+            conn.commit()
+            log.info("Usuario '%s' registrado (persona %s)", username, persona_id)
+            return persona_id
+        except sqlite3.IntegrityError as e:
+            conn.rollback()
+            if "usuario.nombre_usuario" in str(e):
+                raise ValueError(f"El nombre de usuario '{username}' ya existe") from e
+            raise ValueError(f"Error de unicidad: {e}") from e
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db.cerrarConexion(conn)
+
+    # --- Migración desde users.json ---
+
+    def importar_usuarios_json(self, ruta: str = "users.json") -> int:
+        """
+        Pasa a la base de datos los usuarios de un users.json heredado que aún
+        no existan y renombra el archivo a '<ruta>.importado' para no repetir
+        la importación. Devuelve cuántos usuarios se agregaron.
+        """
+        if not os.path.exists(ruta):
+            return 0
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                usuarios = json.load(f)
+        except (OSError, ValueError) as e:
+            log.error("No se pudo leer %s: %s", ruta, e)
+            return 0
+
+        importados = 0
+        for nombre, datos in usuarios.items():
+            if self.existe_usuario(nombre):
+                continue
+            try:
+                rol = self.ROLES_JSON.get(datos.get("role"), datos.get("role"))
+                self.add_user(nombre, datos.get("password", ""), rol)
+                importados += 1
+            except (ValueError, sqlite3.Error) as e:
+                log.error("No se pudo importar el usuario '%s': %s", nombre, e)
+
+        try:
+            os.replace(ruta, ruta + ".importado")
+        except OSError as e:
+            log.warning("No se pudo renombrar %s: %s", ruta, e)
+        log.info("Importados %d usuarios desde %s", importados, ruta)
+        return importados
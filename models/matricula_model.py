@@ -1,9 +1,12 @@
 # models/matricula_model.py
+import logging
 import sys
 import os
 import sqlite3
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
 # Asumiendo que 'database_connector' es accesible o se debe importar
 current_dir = os.path.dirname(os.path.abspath(__file__))
 # Asumiendo que database_connector.py está en el directorio superior (ej. al nivel de 'models')
@@ -15,12 +18,35 @@ except ImportError:
     class Database:
         def crearConexion(self): 
              # Simulación de error de conexión si no existe
-             print("ADVERTENCIA: No se pudo importar Database. Las operaciones de BD fallarán.")
+             log.warning("No se pudo importar Database. Las operaciones de BD fallarán.")
              return None 
         def cerrarConexion(self, conn): pass
 
+try:
+    from paginacion import listar_pagina
+except ImportError:
+    from models.paginacion import listar_pagina
+
+try:
+    from acceso_datos import leer, consultar
+    from persona_model import PersonaModel
+except ImportError:
+    from models.acceso_datos import leer, consultar
+    from models.persona_model import PersonaModel
+
 
 class MatriculaModel:
+    # Órdenes admitidos por listar_pagina(); (nna_id, unidad_id) desempata
+    ORDENES_LISTADO = {
+        "unidad": [("ue.nombre", "ASC"), ("p.primer_apellido", "ASC"),
+                   ("me.nna_id", "ASC"), ("me.unidad_id", "ASC")],
+        "recientes": [("IFNULL(me.fecha_matricula, '')", "DESC"),
+                      ("me.nna_id", "DESC"), ("me.unidad_id", "DESC")],
+    }
+
+    # Sugerencias devueltas como máximo por los buscadores de la vista
+    LIMITE_SUGERENCIAS = 10
+
     def __init__(self):
         self.db = Database()
     
@@ -58,7 +84,57 @@ class MatriculaModel:
                 
             return result
         except Exception as e:
-            print(f"Error al obtener NNA: {str(e)}")
+            log.error("Error al obtener NNA: %s", e)
+            return []
+        finally:
+            if conn:
+                self.db.cerrarConexion(conn)
+
+    @staticmethod
+    def _nombre_completo(fila) -> str:
+        """Nombre para mostrar: nombres y apellidos (y la cédula, si tiene)."""
+        partes = [fila.get("primer_nombre"), fila.get("segundo_nombre"),
+                  fila.get("primer_apellido"), fila.get("segundo_apellido")]
+        nombre = " ".join(parte for parte in partes if parte)
+        documento = fila.get("documento_identidad")
+        return f"{nombre} ({documento})" if documento else nombre
+
+    def buscar_nna(self, texto: str, limite: int = None) -> list:
+        """
+        Sugerencias de NNA para el buscador de la vista: los que tengan un
+        nombre, apellido o documento que empiece con lo escrito (índice de
+        texto completo persona_fts). Devuelve [{id, nombre_completo}], como
+        mucho 'limite' filas.
+        """
+        limite = self.LIMITE_SUGERENCIAS if limite is None else limite
+        filas = PersonaModel().buscar_persona(texto, limite=limite, tipo="nna")
+        return [{"id": fila["id"], "nombre_completo": self._nombre_completo(fila)} for fila in filas]
+
+    def buscar_unidades_educativas(self, texto: str, limite: int = None) -> list:
+        """
+        Sugerencias de unidades educativas cuyo nombre empieza con lo escrito
+        (sin distinguir mayúsculas). El rango sobre idx_unidad_educativa_nombre_nocase
+        evita recorrer la tabla. Devuelve [{id, nombre}].
+        """
+        limite = self.LIMITE_SUGERENCIAS if limite is None else limite
+        prefijo = (texto or "").strip()
+        if not prefijo or limite <= 0:
+            return []
+
+        conn = None
+        try:
+            conn = self.db.crearConexion()
+            if not conn:
+                return []
+            # [prefijo, prefijo + U+10FFFF) abarca todos los nombres que empiezan con el prefijo
+            return consultar(conn, '''
+                SELECT id, nombre FROM unidad_educativa
+                WHERE nombre COLLATE NOCASE >= ? AND nombre COLLATE NOCASE < ?
+                ORDER BY nombre COLLATE NOCASE
+                LIMIT ?
+            ''', (prefijo, prefijo + "\U0010ffff", limite))
+        except Exception as e:
+            log.error("Error al buscar Unidades Educativas: %s", e)
             return []
         finally:
             if conn:
@@ -77,15 +153,12 @@ class MatriculaModel:
             cursor = conn.cursor()
             cursor.execute('SELECT id, nombre, codigo FROM unidad_educativa ORDER BY nombre')
             
-            rows = cursor.fetchall()
-            
             # Formatear el resultado (id, nombre, codigo)
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
+            result = leer(cursor)
                 
             return result
         except Exception as e:
-            print(f"Error al obtener Unidades Educativas: {str(e)}")
+            log.error("Error al obtener Unidades Educativas: %s", e)
             return []
         finally:
             if conn:
@@ -220,14 +293,10 @@ class MatriculaModel:
             else:
                 return {"error": "Se necesita nna_id y/o unidad_id", "status": "error"}
             
-            rows = cursor.fetchall()
-            if not rows:
+            result = leer(cursor)
+            if not result:
                 return {"data": [], "status": "success", "message": "No se encontraron registros"}
             
-            # Convertir a lista de diccionarios
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
-            
             return {"data": result, "status": "success"}
         except Exception as e:
             return {"error": str(e), "status": "error"}
@@ -342,11 +411,7 @@ class MatriculaModel:
                 ORDER BY ue.nombre, p.primer_apellido
             ''')
             
-            rows = cursor.fetchall()
-            
-            # Convertir a lista de diccionarios
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
+            result = leer(cursor)
             
             return {"data": result, "status": "success"}
         except Exception as e:
@@ -355,6 +420,25 @@ class MatriculaModel:
             if conn:
                 self.db.cerrarConexion(conn)
     
+    def listar_pagina(self, tamano=None, continuacion=None, orden="unidad"):
+        """
+        Obtiene las matrículas activas de a una página (paginación por clave).
+        Para la página siguiente se pasa el 'continuacion' de la respuesta
+        anterior (ver models/paginacion.py).
+        """
+        return listar_pagina(
+            self.db,
+            columnas="me.*, p.primer_nombre, p.primer_apellido, ue.nombre as unidad_nombre",
+            origen="""matricula_educativa me
+                JOIN persona p ON me.nna_id = p.id
+                JOIN unidad_educativa ue ON me.unidad_id = ue.id""",
+            filtro="me.activa = 1",
+            ordenes=self.ORDENES_LISTADO,
+            orden=orden,
+            tamano=tamano,
+            continuacion=continuacion,
+        )
+    
     def obtener_matricula_por_nna(self, nna_id):
         """
         Obtiene todas las matrículas de un NNA específico
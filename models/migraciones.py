@@ -0,0 +1,97 @@
+# models/migraciones.py
+"""
+Motor de migraciones del esquema de la base de datos.
+
+La versión del esquema se guarda en PRAGMA user_version (cabecera del archivo
+SQLite, sin tablas auxiliares). Al arrancar:
+
+    * Si la versión ya es la última, no se ejecuta ningún DDL: el costo es
+      leer un PRAGMA.
+    * Si no, las migraciones pendientes se aplican en orden dentro de UNA
+      transacción, junto con el nuevo user_version. Si una falla, no queda
+      ninguna aplicada.
+
+Cada migración es una tupla (versión, descripción, script):
+    versión:     entero consecutivo desde 1.
+    script:      SQL (str) o una función script(conexion) -> str, para las
+                 migraciones que dependen del estado de la BD (columnas
+                 heredadas, módulos de SQLite disponibles...). Las funciones se
+                 evalúan antes de abrir la transacción, por lo que solo deben
+                 leer el esquema, nunca modificarlo.
+
+Las migraciones ya publicadas no se editan: los cambios van en una nueva.
+"""
+import logging
+import sqlite3
+from typing import Callable, List, Sequence, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+Script = Union[str, Callable[[sqlite3.Connection], str]]
+Migracion = Tuple[int, str, Script]
+
+
+class MigracionError(sqlite3.DatabaseError):
+    """Una migración falló; la base de datos quedó en la versión anterior."""
+
+
+def version_actual(conexion: sqlite3.Connection) -> int:
+    """Versión del esquema registrada en la base de datos (0 = sin migrar)."""
+    return conexion.execute("PRAGMA user_version").fetchone()[0]
+
+
+def ultima_version(migraciones: Sequence[Migracion]) -> int:
+    return migraciones[-1][0] if migraciones else 0
+
+
+def validar_migraciones(migraciones: Sequence[Migracion]):
+    """Las versiones deben ser 1, 2, 3... sin huecos ni repetidos."""
+    for esperada, (version, descripcion, _script) in enumerate(migraciones, start=1):
+        if version != esperada:
+            raise ValueError(
+                f"Migración '{descripcion}': versión {version}, se esperaba {esperada}"
+            )
+
+
+def pendientes(conexion: sqlite3.Connection, migraciones: Sequence[Migracion]) -> List[Migracion]:
+    """Migraciones que aún no se aplicaron en esta base de datos."""
+    actual = version_actual(conexion)
+    return [m for m in migraciones if m[0] > actual]
+
+
+def aplicar_migraciones(conexion: sqlite3.Connection, migraciones: Sequence[Migracion]) -> int:
+    """
+    Lleva la base de datos a la última versión. Devuelve cuántas migraciones
+    se aplicaron (0 en un arranque con el esquema al día).
+    """
+    validar_migraciones(migraciones)
+    actual = version_actual(conexion)
+    ultima = ultima_version(migraciones)
+
+    if actual >= ultima:
+        if actual > ultima:
+            log.warning("La base de datos (versión %s) es más nueva que la aplicación "
+                        "(versión %s); no se modifica el esquema", actual, ultima)
+        return 0
+
+    a_aplicar = [m for m in migraciones if m[0] > actual]
+    partes = ["BEGIN IMMEDIATE;"]
+    for version, descripcion, script in a_aplicar:
+        sql = script(conexion) if callable(script) else script
+        partes.append(f"-- Migración {version}: {descripcion}\n{sql}")
+    partes.append(f"PRAGMA user_version = {int(ultima)};")
+    partes.append("COMMIT;")
+
+    try:
+        # executescript ejecuta todo el bloque: BEGIN ... user_version ... COMMIT
+        conexion.executescript("\n".join(partes))
+    except sqlite3.Error as e:
+        if conexion.in_transaction:
+            conexion.rollback()
+        raise MigracionError(
+            f"Error al migrar de la versión {actual} a la {ultima}: {e}"
+        ) from e
+
+    for version, descripcion, _script in a_aplicar:
+        log.info("Migración %s aplicada: %s", version, descripcion)
+    return len(a_aplicar)
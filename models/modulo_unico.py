@@ -0,0 +1,24 @@
+# models/modulo_unico.py
+"""
+Un único módulo aunque se importe con dos nombres.
+
+Los modelos agregan models/ a sys.path e importan a sus vecinos como
+'database_connector'; las vistas y los controladores los importan como
+'models.database_connector'. Python los trataría como dos módulos distintos,
+cada uno con su propio estado (Singleton y pool de conexiones, perfilador,
+sesión activa, lock de dependencias). Los módulos con estado llaman a
+registrar(__name__) al cargarse y el segundo import reutiliza el primero.
+
+Este módulo no guarda estado, así que no importa si se carga dos veces.
+"""
+import sys
+
+PAQUETE = "models"
+
+
+def registrar(nombre: str) -> None:
+    """Registra el módulo 'nombre' (ya cargado) con y sin el prefijo 'models.'."""
+    modulo = sys.modules[nombre]
+    corto = nombre.rpartition(".")[2]
+    sys.modules.setdefault(corto, modulo)
+    sys.modules.setdefault(f"{PAQUETE}.{corto}", modulo)
@@ -1,11 +1,13 @@
 # models/nna_model.py
+import logging
 import sys
 import os
-import sqlite3
 import datetime
 from sqlite3 import Error, IntegrityError
 from typing import List, Dict, Optional
 
+log = logging.getLogger(__name__)
+
 # Agregar el directorio actual al path para importar database_connector
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -15,12 +17,30 @@ except ImportError:
     # Asume que database_connector.py está en el mismo nivel
     from models.database_connector import Database
 
+try:
+    from paginacion import listar_pagina
+    from acceso_datos import consultar, consultar_uno
+    from registros import RegistroNNA
+except ImportError:
+    from models.paginacion import listar_pagina
+    from models.acceso_datos import consultar, consultar_uno
+    from models.registros import RegistroNNA
+
 class NNAModel:
     """Modelo para gestionar las operaciones de NNA (Niños, Niñas y Adolescentes) en la base de datos"""
     
     # Géneros fijos para la lógica de negocio/validación
     GENEROS_DISPONIBLES = ["M", "F", "OTRO"] 
 
+    # Órdenes admitidos por listar_pagina(); la última clave desempata (única)
+    ORDENES_LISTADO = {
+        "apellido": [("p.primer_apellido COLLATE NOCASE", "ASC"),
+                     ("p.primer_nombre COLLATE NOCASE", "ASC"),
+                     ("p.id", "ASC")],
+        "id": [("p.id", "ASC")],
+        "recientes": [("p.id", "DESC")],
+    }
+
     def __init__(self):
         self.db = Database()
 
@@ -52,24 +72,6 @@ class NNAModel:
         """Retorna la lista de géneros disponibles (para la vista/combobox)."""
         return self.GENEROS_DISPONIBLES
 
-    def _mapear_nna(self, fila: dict) -> dict:
-        """Función interna para mapear una fila de la BD a un diccionario."""
-        if not fila:
-            return None
-        return {
-            "id": fila.get("id"),
-            "documento_identidad": fila.get("documento_identidad"),
-            "primer_nombre": fila.get("primer_nombre"),
-            "segundo_nombre": fila.get("segundo_nombre"),
-            "primer_apellido": fila.get("primer_apellido"),
-            "segundo_apellido": fila.get("segundo_apellido"),
-            "genero": fila.get("genero"),
-            "direccion": fila.get("direccion"),
-            "telefono": fila.get("telefono"),
-            "fecha_nacimiento": fila.get("fecha_nacimiento"),
-            "activo": bool(fila.get("activo"))
-        }
-
     def crear_nna(self, datos: dict) -> dict:
         """Crea un nuevo registro de NNA en la base de datos"""
         
@@ -130,7 +132,7 @@ class NNAModel:
             if conexion:
                 self.db.cerrarConexion(conexion)
 
-    def obtener_por_id(self, persona_id: int) -> Optional[dict]:
+    def obtener_por_id(self, persona_id: int) -> Optional[RegistroNNA]:
         """Busca un registro de NNA por su ID"""
         sql = """
         SELECT 
@@ -146,19 +148,15 @@ class NNAModel:
             return None
 
         try:
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(sql, (persona_id,))
-            fila = cursor.fetchone()
-            return self._mapear_nna(dict(fila)) if fila else None
+            return consultar_uno(conexion, sql, (persona_id,), como=RegistroNNA)
         except Error as e:
-            print(f"Error al obtener NNA por ID: {e}")
+            log.error("Error al obtener NNA por ID: %s", e)
             return None
         finally:
             if conexion:
                 self.db.cerrarConexion(conexion)
 
-    def obtener_por_nombre(self, primer_nombre: str, primer_apellido: str) -> List[dict]:
+    def obtener_por_nombre(self, primer_nombre: str, primer_apellido: str) -> List[RegistroNNA]:
         """Busca registros de NNA por nombre y apellido"""
         sql = """
         SELECT 
@@ -174,19 +172,15 @@ class NNAModel:
             return []
 
         try:
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(sql, (primer_nombre, primer_apellido))
-            filas = cursor.fetchall()
-            return [self._mapear_nna(dict(fila)) for fila in filas]
+            return consultar(conexion, sql, (primer_nombre, primer_apellido), como=RegistroNNA)
         except Error as e:
-            print(f"Error al obtener NNA por nombre: {e}")
+            log.error("Error al obtener NNA por nombre: %s", e)
             return []
         finally:
             if conexion:
                 self.db.cerrarConexion(conexion)
 
-    def listar_todos(self) -> List[dict]:
+    def listar_todos(self) -> List[RegistroNNA]:
         """Lista todos los registros de NNA activos"""
         sql = """
         SELECT 
@@ -202,18 +196,37 @@ class NNAModel:
             return []
 
         try:
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(sql)
-            filas = cursor.fetchall()
-            return [self._mapear_nna(dict(fila)) for fila in filas]
+            return consultar(conexion, sql, como=RegistroNNA)
         except Error as e:
-            print(f"Error al listar NNA: {e}")
+            log.error("Error al listar NNA: %s", e)
             return []
         finally:
             if conexion:
                 self.db.cerrarConexion(conexion)
 
+    def listar_pagina(self, tamano: int = None, continuacion: str = None,
+                      orden: str = "apellido") -> dict:
+        """
+        Lista los NNA activos de a una página (paginación por clave).
+
+        Para la página siguiente se pasa el 'continuacion' de la respuesta
+        anterior. Ver models/paginacion.py para el formato de la respuesta.
+        """
+        return listar_pagina(
+            self.db,
+            columnas="""
+            p.id, p.documento_identidad, p.primer_nombre, p.segundo_nombre,
+            p.primer_apellido, p.segundo_apellido, p.genero, p.direccion, 
+            p.telefono, n.fecha_nacimiento, p.activo""",
+            origen="persona p INNER JOIN nna n ON p.id = n.persona_id",
+            filtro="p.activo = TRUE",
+            ordenes=self.ORDENES_LISTADO,
+            orden=orden,
+            tamano=tamano,
+            continuacion=continuacion,
+            como=RegistroNNA,
+        )
+
     def actualizar_nna(self, persona_id: int, datos: dict) -> dict:
         """Actualiza los datos de un NNA"""
         
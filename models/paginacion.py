@@ -0,0 +1,172 @@
+# models/paginacion.py
+"""
+Paginación por clave (keyset) para los listados de los modelos.
+
+En lugar de OFFSET, cada página continúa a partir de los valores de orden de
+la última fila entregada, por lo que pedir la página 1 o la 500 cuesta lo mismo
+si el orden está respaldado por un índice. El estado viaja en un token opaco
+(base64) que la vista solo debe devolver tal cual para pedir la página siguiente.
+
+Contrato de respuesta de todos los métodos listar_pagina():
+    {
+        "status": "success",
+        "data": [...],                 # filas de la página (dicts)
+        "continuacion": "eyJv..."|None, # None cuando no hay más páginas
+        "total_estimado": 1234,        # calculado en la primera página
+        "orden": "apellido",
+    }
+"""
+import logging
+import base64
+import binascii
+import json
+import os
+import sys
+from sqlite3 import Error
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from acceso_datos import columnas as columnas_cursor, fabrica_filas
+except ImportError:
+    from models.acceso_datos import columnas as columnas_cursor, fabrica_filas
+
+TAMANO_PAGINA_POR_DEFECTO = 50
+TAMANO_PAGINA_MAXIMO = 500
+
+# Clave de orden: (expresión SQL, "ASC" | "DESC"). La última clave de cada orden
+# debe ser única (normalmente el id) y ninguna puede ser NULL.
+ClaveOrden = Tuple[str, str]
+
+
+class TokenContinuacionError(ValueError):
+    """El token de continuación está corrupto o no corresponde al listado."""
+
+
+def codificar_token(orden: str, valores: Sequence, total: Optional[int]) -> str:
+    """Empaqueta el punto de continuación en un token opaco."""
+    datos = json.dumps({"o": orden, "v": list(valores), "t": total}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(datos.encode("utf-8")).decode("ascii")
+
+
+def decodificar_token(token: str, orden: str, num_claves: int) -> Tuple[list, Optional[int]]:
+    """Devuelve (valores de la última fila, total estimado) de un token."""
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        valores, total = datos["v"], datos.get("t")
+        orden_token = datos["o"]
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise TokenContinuacionError(f"Token de continuación no válido: {e}") from None
+    if orden_token != orden or not isinstance(valores, list) or len(valores) != num_claves:
+        raise TokenContinuacionError("El token de continuación no corresponde a este listado")
+    return valores, total
+
+
+def condicion_keyset(claves: Sequence[ClaveOrden]) -> str:
+    """
+    Condición "fila posterior a la última entregada" para un orden con
+    direcciones mixtas: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+    """
+    alternativas = []
+    for i, (expresion, direccion) in enumerate(claves):
+        operador = "<" if direccion.upper() == "DESC" else ">"
+        iguales = [f"{expr} = ?" for expr, _ in claves[:i]]
+        alternativas.append("(" + " AND ".join(iguales + [f"{expresion} {operador} ?"]) + ")")
+    return "(" + " OR ".join(alternativas) + ")"
+
+
+def parametros_keyset(valores: Sequence) -> list:
+    """Parámetros en el orden que espera condicion_keyset()."""
+    params = []
+    for i in range(len(valores)):
+        params.extend(valores[:i])
+        params.append(valores[i])
+    return params
+
+
+def validar_tamano(tamano: Optional[int]) -> int:
+    """Normaliza el tamaño de página solicitado."""
+    if tamano is None:
+        return TAMANO_PAGINA_POR_DEFECTO
+    return max(1, min(int(tamano), TAMANO_PAGINA_MAXIMO))
+
+
+def listar_pagina(db, columnas: str, origen: str, ordenes: Dict[str, List[ClaveOrden]],
+                  orden: str, filtro: str = "", params: Sequence = (),
+                  tamano: Optional[int] = None, continuacion: Optional[str] = None,
+                  mapear: Optional[Callable[[dict], dict]] = None, como=dict) -> dict:
+    """
+    Ejecuta una consulta paginada por clave y arma la respuesta común.
+
+    columnas: lista del SELECT (sin la palabra SELECT).
+    origen:   FROM ... JOIN ... (sin WHERE).
+    filtro:   condición fija del listado (p. ej. "p.activo = TRUE"), opcional.
+    ordenes:  órdenes admitidos por el modelo; 'orden' elige uno de ellos.
+    como:     formato de las filas (ver acceso_datos); por defecto dict.
+    mapear:   función aplicada a cada fila ya armada, opcional.
+    """
+    if orden not in ordenes:
+        return {"status": "error", "error": f"Orden no válido: {orden}"}
+    claves = ordenes[orden]
+    tamano = validar_tamano(tamano)
+
+    total = None
+    valores = None
+    if continuacion:
+        try:
+            valores, total = decodificar_token(continuacion, orden, len(claves))
+        except TokenContinuacionError as e:
+            return {"status": "error", "error": str(e)}
+
+    condiciones = [filtro] if filtro else []
+    params_pagina = list(params)
+    if valores is not None:
+        condiciones.append(condicion_keyset(claves))
+        params_pagina.extend(parametros_keyset(valores))
+    where = (" WHERE " + " AND ".join(condiciones)) if condiciones else ""
+
+    seleccion_claves = ", ".join(f"{expr} AS _clave_{i}" for i, (expr, _) in enumerate(claves))
+    order_by = ", ".join(f"{expr} {direccion}" for expr, direccion in claves)
+    sql = f"SELECT {columnas}, {seleccion_claves} FROM {origen}{where} ORDER BY {order_by} LIMIT ?"
+    params_pagina.append(tamano + 1)  # Una fila extra indica si hay más páginas
+
+    conexion = db.crearConexion()
+    if conexion is None:
+        return {"status": "error", "error": "No se pudo conectar a la base de datos"}
+    try:
+        cursor = conexion.cursor()
+        if total is None:
+            # Solo en la primera página; las siguientes lo heredan del token
+            filtro_conteo = f" WHERE {filtro}" if filtro else ""
+            cursor.execute(f"SELECT COUNT(*) FROM {origen}{filtro_conteo}", tuple(params))
+            total = cursor.fetchone()[0]
+        cursor.execute(sql, tuple(params_pagina))
+        filas = cursor.fetchall()
+        # Las columnas _clave_i van al final: se leen de la tupla y no llegan al registro
+        nombres = columnas_cursor(cursor)[:-len(claves)]
+    except Error as e:
+        log.error("Error al listar página: %s", e)
+        return {"status": "error", "error": str(e)}
+    finally:
+        db.cerrarConexion(conexion)
+
+    siguiente = None
+    if len(filas) > tamano:
+        filas = filas[:tamano]
+        siguiente = codificar_token(orden, list(filas[-1][-len(claves):]), total)
+
+    fabrica = fabrica_filas(como, nombres)
+    datos = [fabrica(fila[:len(nombres)]) for fila in filas] if fabrica else [fila[:len(nombres)] for fila in filas]
+    if mapear:
+        datos = [mapear(fila) for fila in datos]
+
+    return {
+        "status": "success",
+        "data": datos,
+        "continuacion": siguiente,
+        "total_estimado": total,
+        "orden": orden,
+    }
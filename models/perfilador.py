@@ -0,0 +1,474 @@
+# models/perfilador.py
+"""
+Perfilado de consultas a nivel de conexión.
+
+Database abre todas las conexiones del pool con ConexionPerfilada, cuyos
+cursores (CursorPerfilado) miden cada sentencia: tiempo de execute() más el de
+leer las filas, cantidad de filas (devueltas en un SELECT, afectadas en un
+INSERT/UPDATE/DELETE) y el método del modelo que la ejecutó (p. ej.
+"NNAModel.listar_pagina"). Los modelos no cambian.
+
+Con cada medición el perfilador (la instancia 'perfilador' de este módulo):
+    * acumula estadísticas por sentencia (ejecuciones, tiempo total, máximo,
+      filas, métodos que la usan) y guarda las últimas VENTANA_MUESTRAS
+      latencias para calcular percentiles móviles (p50/p95/p99);
+    * registra las sentencias que superan umbral_ms junto con su
+      EXPLAIN QUERY PLAN (se calcula una vez por sentencia distinta, con una
+      conexión de solo lectura propia para no tocar la del modelo).
+
+El módulo sqlite3 no informa tiempos en set_trace_callback, por eso la medición
+se hace envolviendo los cursores. Con 'activo' en False los cursores solo
+agregan una comprobación por llamada.
+
+Uso:
+    from models.perfilador import perfilador
+    perfilador.resumen(limite=10)        # sentencias con más tiempo acumulado
+    perfilador.consultas_lentas()        # registro de lentas, con su plan
+    perfilador.percentiles()             # {"p50": ..., "p95": ..., "p99": ...}
+"""
+import logging
+import math
+import os
+import pathlib
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+# Un único módulo (y un único perfilador) con ambos nombres
+try:
+    import modulo_unico
+except ImportError:
+    from models import modulo_unico
+modulo_unico.registrar(__name__)
+
+UMBRAL_LENTA_MS = 100.0     # Sentencias más lentas que esto van al registro
+VENTANA_MUESTRAS = 500      # Latencias recientes por sentencia (percentiles)
+VENTANA_GLOBAL = 5000       # Latencias recientes de todas las sentencias
+MAXIMO_LENTAS = 100         # Entradas del registro de consultas lentas
+MAXIMO_SENTENCIAS = 1000    # Sentencias distintas con estadísticas propias
+OTRAS_SENTENCIAS = "(otras sentencias)"
+
+# Módulos de infraestructura: al buscar quién ejecutó la sentencia se saltan
+_INFRAESTRUCTURA = {
+    os.path.normcase(os.path.abspath(__file__)).rsplit(".", 1)[0],
+}
+for _modulo in ("database_connector", "acceso_datos", "paginacion", "escritura_agrupada",
+                "registros", "migraciones"):
+    _INFRAESTRUCTURA.add(os.path.normcase(os.path.join(os.path.dirname(os.path.abspath(__file__)), _modulo)))
+
+# Sentencias para las que tiene sentido pedir EXPLAIN QUERY PLAN
+_EXPLICABLES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def _normalizar(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _percentil(ordenadas: List[float], p: float) -> Optional[float]:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenadas:
+        return None
+    indice = max(0, math.ceil(p / 100.0 * len(ordenadas)) - 1)
+    return ordenadas[indice]
+
+
+def _llamador() -> str:
+    """'Clase.metodo' (o 'modulo.funcion') del primer marco fuera de la infraestructura."""
+    marco = sys._getframe(2)
+    while marco is not None:
+        archivo = os.path.normcase(marco.f_code.co_filename).rsplit(".", 1)[0]
+        if archivo not in _INFRAESTRUCTURA:
+            instancia = marco.f_locals.get("self")
+            if instancia is not None:
+                return f"{type(instancia).__name__}.{marco.f_code.co_name}"
+            return f"{os.path.basename(archivo)}.{marco.f_code.co_name}"
+        marco = marco.f_back
+    return "?"
+
+
+class _Estadistica:
+    """Acumulado de una sentencia."""
+    __slots__ = ("ejecuciones", "total", "maximo", "filas", "muestras", "llamadores", "parametros")
+
+    def __init__(self):
+        self.ejecuciones = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.filas = 0
+        self.muestras = deque(maxlen=VENTANA_MUESTRAS)
+        self.llamadores = Counter()
+        self.parametros = None  # Últimos parámetros usados (para EXPLAIN desde el diagnóstico)
+
+
+class PerfiladorConsultas:
+    """Estadísticas de las sentencias ejecutadas por las conexiones perfiladas."""
+
+    def __init__(self, umbral_ms: float = UMBRAL_LENTA_MS):
+        self.activo = True
+        self.umbral_ms = umbral_ms
+        self._lock = threading.Lock()
+        self._estadisticas: Dict[str, _Estadistica] = {}
+        self._muestras = deque(maxlen=VENTANA_GLOBAL)
+        self._lentas = deque(maxlen=MAXIMO_LENTAS)
+        self._planes: Dict[str, List[str]] = {}
+        self._lock_planes = threading.Lock()
+        self._conexiones_plan: Dict[str, sqlite3.Connection] = {}
+        self._ruta: Optional[str] = None
+        self._inicio = time.time()
+
+    def configurar(self, activo: bool = None, umbral_ms: float = None):
+        if activo is not None:
+            self.activo = activo
+        if umbral_ms is not None:
+            if umbral_ms < 0:
+                raise ValueError("El umbral de consultas lentas no puede ser negativo")
+            self.umbral_ms = umbral_ms
+
+    def reiniciar(self):
+        """Descarta las estadísticas y el registro de lentas (no los planes)."""
+        with self._lock:
+            self._estadisticas.clear()
+            self._muestras.clear()
+            self._lentas.clear()
+            self._inicio = time.time()
+
+    # ------------------------------------------------------------------
+    # Registro (lo llaman los cursores)
+    # ------------------------------------------------------------------
+
+    def registrar(self, sql: str, segundos: float, filas: int, llamador: str,
+                  ruta: str = None, parametros: Sequence = None, error: str = None):
+        ms = segundos * 1000.0
+        clave = texto = _normalizar(sql)
+        with self._lock:
+            estadistica = self._estadisticas.get(clave)
+            if estadistica is None:
+                if len(self._estadisticas) >= MAXIMO_SENTENCIAS:
+                    # SQL armado dinámicamente: el resto se acumula en una sola entrada
+                    clave = OTRAS_SENTENCIAS
+                    estadistica = self._estadisticas.get(clave)
+                if estadistica is None:
+                    estadistica = self._estadisticas[clave] = _Estadistica()
+            estadistica.ejecuciones += 1
+            estadistica.total += ms
+            estadistica.filas += max(filas, 0)
+            if ms > estadistica.maximo:
+                estadistica.maximo = ms
+            estadistica.muestras.append(ms)
+            estadistica.llamadores[llamador] += 1
+            if parametros is not None:
+                estadistica.parametros = parametros
+            if ruta is not None:
+                self._ruta = ruta
+            self._muestras.append(ms)
+
+        if ms >= self.umbral_ms:
+            self._registrar_lenta(texto, ms, filas, llamador, ruta, parametros, error)
+
+    def _registrar_lenta(self, sql, ms, filas, llamador, ruta, parametros, error):
+        plan = self.plan(sql, parametros, ruta)
+        entrada = {
+            "hora": time.strftime("%H:%M:%S"),
+            "duracion_ms": round(ms, 1),
+            "filas": filas,
+            "llamador": llamador,
+            "sql": sql,
+            "plan": plan,
+            "error": error,
+        }
+        with self._lock:
+            self._lentas.append(entrada)
+        log.warning("Consulta lenta: %.1f ms, %s filas en %s%s\n    %s\n    PLAN:\n%s",
+                    ms, filas, llamador, f" ({error})" if error else "", sql,
+                    "\n".join(f"      {linea}" for linea in plan) or "      (sin plan)",
+                    extra={"duracion_ms": round(ms, 1), "llamador": llamador})
+
+    # ------------------------------------------------------------------
+    # EXPLAIN QUERY PLAN
+    # ------------------------------------------------------------------
+
+    def plan(self, sql: str, parametros: Sequence = None, ruta: str = None) -> List[str]:
+        """
+        Líneas de EXPLAIN QUERY PLAN de la sentencia (en caché por sentencia).
+        Usa una conexión de solo lectura aparte: la del modelo puede estar a
+        mitad de una lectura o de una transacción.
+        """
+        clave = _normalizar(sql)
+        if clave in self._planes:
+            return self._planes[clave]
+        if ruta is None or not clave.upper().startswith(_EXPLICABLES):
+            return []
+        with self._lock_planes:
+            try:
+                conexion = self._conexiones_plan.get(ruta)
+                if conexion is None:
+                    uri = pathlib.Path(ruta).resolve().as_uri() + "?mode=ro"
+                    conexion = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                    self._conexiones_plan[ruta] = conexion
+                cursor = sqlite3.Cursor(conexion)
+                try:
+                    filas = cursor.execute(f"EXPLAIN QUERY PLAN {sql}",
+                                           parametros if parametros is not None else ()).fetchall()
+                finally:
+                    cursor.close()
+            except (sqlite3.Error, ValueError) as e:
+                # No se guarda en caché: con otros parámetros puede funcionar
+                return [f"(no se pudo obtener el plan: {e})"]
+            plan = self._formatear_plan(filas)
+            if len(self._planes) >= MAXIMO_SENTENCIAS:
+                self._planes.clear()
+            self._planes[clave] = plan
+        return plan
+
+    def explicar(self, sql: str) -> List[str]:
+        """Plan de una sentencia ya medida, con los últimos parámetros que usó."""
+        with self._lock:
+            estadistica = self._estadisticas.get(_normalizar(sql))
+            parametros = estadistica.parametros if estadistica else None
+            ruta = self._ruta
+        return self.plan(sql, parametros, ruta)
+
+    @staticmethod
+    def _formatear_plan(filas) -> List[str]:
+        """Filas (id, padre, _, detalle) -> líneas sangradas según el árbol."""
+        niveles = {0: -1}
+        lineas = []
+        for id_nodo, padre, _, detalle in filas:
+            nivel = niveles.get(padre, -1) + 1
+            niveles[id_nodo] = nivel
+            lineas.append("  " * nivel + detalle)
+        return lineas
+
+    def cerrar(self):
+        """Cierra las conexiones usadas para los planes."""
+        with self._lock_planes:
+            for conexion in self._conexiones_plan.values():
+                try:
+                    conexion.close()
+                except sqlite3.Error:
+                    pass
+            self._conexiones_plan.clear()
+
+    # ------------------------------------------------------------------
+    # Consultas (diagnóstico)
+    # ------------------------------------------------------------------
+
+    def percentiles(self, sql: str = None, ps: Sequence[float] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+        """Percentiles de latencia (ms) de las mediciones recientes, globales o de una sentencia."""
+        with self._lock:
+            if sql is None:
+                muestras = list(self._muestras)
+            else:
+                estadistica = self._estadisticas.get(_normalizar(sql))
+                muestras = list(estadistica.muestras) if estadistica else []
+        muestras.sort()
+        return {f"p{p:g}": _percentil(muestras, p) for p in ps}
+
+    def resumen(self, limite: int = 10, orden: str = "total") -> List[Dict[str, Any]]:
+        """
+        Las 'limite' sentencias que más pesan. 'orden': "total" (tiempo
+        acumulado), "p95", "maximo", "promedio" o "ejecuciones".
+        """
+        with self._lock:
+            copia = [(sql, e.ejecuciones, e.total, e.maximo, e.filas, sorted(e.muestras),
+                      e.llamadores.most_common(1)[0][0] if e.llamadores else "?")
+                     for sql, e in self._estadisticas.items()]
+        filas = []
+        for sql, ejecuciones, total, maximo, cantidad, muestras, llamador in copia:
+            filas.append({
+                "llamador": llamador,
+                "sql": sql,
+                "ejecuciones": ejecuciones,
+                "total_ms": round(total, 1),
+                "promedio_ms": round(total / ejecuciones, 2),
+                "p50_ms": round(_percentil(muestras, 50), 2),
+                "p95_ms": round(_percentil(muestras, 95), 2),
+                "p99_ms": round(_percentil(muestras, 99), 2),
+                "maximo_ms": round(maximo, 1),
+                "filas": cantidad,
+            })
+        claves = {"total": "total_ms", "p95": "p95_ms", "maximo": "maximo_ms",
+                  "promedio": "promedio_ms", "ejecuciones": "ejecuciones"}
+        if orden not in claves:
+            raise ValueError(f"Orden no válido: {orden}")
+        filas.sort(key=lambda fila: fila[claves[orden]], reverse=True)
+        return filas[:limite]
+
+    def consultas_lentas(self) -> List[Dict[str, Any]]:
+        """Registro de consultas lentas, de la más reciente a la más antigua."""
+        with self._lock:
+            return list(reversed(self._lentas))
+
+    def estado(self) -> Dict[str, Any]:
+        """Totales generales para la cabecera del diagnóstico."""
+        with self._lock:
+            ejecuciones = sum(e.ejecuciones for e in self._estadisticas.values())
+            sentencias = len(self._estadisticas)
+            lentas = len(self._lentas)
+            desde = self._inicio
+        return {
+            "activo": self.activo,
+            "umbral_ms": self.umbral_ms,
+            "ejecuciones": ejecuciones,
+            "sentencias": sentencias,
+            "lentas": lentas,
+            "desde": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(desde)),
+            **{p: (None if valor is None else round(valor, 2)) for p, valor in self.percentiles().items()},
+        }
+
+
+perfilador = PerfiladorConsultas()
+
+
+class CursorPerfilado(sqlite3.Cursor):
+    """
+    Cursor que mide cada sentencia. En un SELECT la medición sigue abierta
+    mientras se leen las filas y se cierra al agotarse el resultado, al
+    ejecutar otra sentencia, al cerrar el cursor o al liberarlo.
+    """
+
+    def __init__(self, conexion):
+        super().__init__(conexion)
+        self._medicion = None  # [sql, parametros, llamador, segundos, filas]
+
+    def execute(self, sql, parametros=()):
+        if self._medicion is not None:
+            self._finalizar()
+        if not perfilador.activo:
+            return super().execute(sql, parametros)
+        llamador = _llamador()
+        inicio = time.perf_counter()
+        try:
+            super().execute(sql, parametros)
+        except sqlite3.Error as e:
+            self._medicion = [sql, parametros, llamador, time.perf_counter() - inicio, 0]
+            self._finalizar(error=type(e).__name__)
+            raise
+        self._medicion = [sql, parametros, llamador, time.perf_counter() - inicio, 0]
+        if self.description is None:
+            # Sin filas que leer (INSERT/UPDATE/DELETE, DDL, PRAGMA de escritura)
+            self._medicion[4] = max(self.rowcount, 0)
+            self._finalizar()
+        return self
+
+    def executemany(self, sql, secuencia):
+        if self._medicion is not None:
+            self._finalizar()
+        if not perfilador.activo:
+            return super().executemany(sql, secuencia)
+        llamador = _llamador()
+        inicio = time.perf_counter()
+        try:
+            super().executemany(sql, secuencia)
+        finally:
+            self._medicion = [sql, None, llamador, time.perf_counter() - inicio, max(self.rowcount, 0)]
+            self._finalizar()
+        return self
+
+    def executescript(self, script):
+        if self._medicion is not None:
+            self._finalizar()
+        if not perfilador.activo:
+            return super().executescript(script)
+        llamador = _llamador()
+        inicio = time.perf_counter()
+        try:
+            super().executescript(script)
+        finally:
+            self._medicion = [script, None, llamador, time.perf_counter() - inicio, 0]
+            self._finalizar()
+        return self
+
+    def fetchone(self):
+        if self._medicion is None:
+            return super().fetchone()
+        inicio = time.perf_counter()
+        fila = super().fetchone()
+        self._medicion[3] += time.perf_counter() - inicio
+        if fila is None:
+            self._finalizar()
+        else:
+            self._medicion[4] += 1
+        return fila
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        if self._medicion is None:
+            return super().fetchmany(size)
+        inicio = time.perf_counter()
+        filas = super().fetchmany(size)
+        self._medicion[3] += time.perf_counter() - inicio
+        self._medicion[4] += len(filas)
+        if len(filas) < size:
+            self._finalizar()
+        return filas
+
+    def fetchall(self):
+        if self._medicion is None:
+            return super().fetchall()
+        inicio = time.perf_counter()
+        filas = super().fetchall()
+        self._medicion[3] += time.perf_counter() - inicio
+        self._medicion[4] += len(filas)
+        self._finalizar()
+        return filas
+
+    def __next__(self):
+        if self._medicion is None:
+            return super().__next__()
+        inicio = time.perf_counter()
+        try:
+            fila = super().__next__()
+        except StopIteration:
+            self._medicion[3] += time.perf_counter() - inicio
+            self._finalizar()
+            raise
+        self._medicion[3] += time.perf_counter() - inicio
+        self._medicion[4] += 1
+        return fila
+
+    def close(self):
+        if self._medicion is not None:
+            self._finalizar()
+        super().close()
+
+    def __del__(self):
+        if getattr(self, "_medicion", None) is not None:
+            self._finalizar()
+
+    def _finalizar(self, error: str = None):
+        sql, parametros, llamador, segundos, filas = self._medicion
+        self._medicion = None
+        try:
+            perfilador.registrar(sql, segundos, filas, llamador,
+                                 getattr(self.connection, "ruta", None), parametros, error)
+        except Exception as e:
+            # El perfilado nunca debe romper la consulta del modelo
+            log.error("Error al registrar la medición de la consulta: %s", e)
+
+
+class ConexionPerfilada(sqlite3.Connection):
+    """Conexión cuyos cursores (también los de execute() directo) son CursorPerfilado."""
+
+    def __init__(self, ruta, *args, **kwargs):
+        super().__init__(ruta, *args, **kwargs)
+        self.ruta = ruta
+
+    def cursor(self, factory=CursorPerfilado):
+        return super().cursor(factory)
+
+    # sqlite3 no pasa por cursor() en estos atajos: se redirigen a mano
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, secuencia):
+        return self.cursor().executemany(sql, secuencia)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
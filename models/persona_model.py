@@ -0,0 +1,128 @@
+# models/persona_model.py
+import logging
+import sys
+import os
+import re
+import sqlite3
+from sqlite3 import Error
+from typing import List, Optional
+
+log = logging.getLogger(__name__)
+
+# Agregar el directorio actual al path para importar database_connector
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from database_connector import Database
+    from acceso_datos import leer
+except ImportError:
+    from models.database_connector import Database
+    from models.acceso_datos import leer
+
+
+class PersonaModel:
+    """
+    Búsqueda unificada sobre la tabla persona (NNA, familiares, personal y terceros).
+    Usa el índice de texto completo 'persona_fts' creado en db_setup.
+    """
+
+    # Tabla especializada que identifica cada tipo de persona
+    TIPOS_PERSONA = {
+        "nna": "nna",
+        "familiar": "familiar",
+        "personal": "personal",
+        "tercero": "tercero",
+    }
+
+    LIMITE_POR_DEFECTO = 20
+
+    def __init__(self):
+        self.db = Database()
+
+    def _terminos(self, texto: str) -> List[str]:
+        """Separa el texto en términos alfanuméricos (sin sintaxis de FTS5)."""
+        return re.sub(r"[^\w]+", " ", texto or "").split()
+
+    def _consulta_fts(self, terminos: List[str]) -> str:
+        """Construye una consulta MATCH de prefijos: todos los términos deben aparecer."""
+        return " ".join(f'"{termino}"*' for termino in terminos)
+
+    def _filtro_tipo(self, tipo: Optional[str]) -> str:
+        """Condición adicional para restringir la búsqueda a un tipo de persona."""
+        if not tipo:
+            return ""
+        tabla = self.TIPOS_PERSONA.get(tipo.lower())
+        if tabla is None:
+            raise ValueError(f"Tipo de persona no válido: {tipo}")
+        return f" AND EXISTS (SELECT 1 FROM {tabla} t WHERE t.persona_id = p.id)"
+
+    def buscar_persona(self, texto: str, limite: int = LIMITE_POR_DEFECTO,
+                       tipo: Optional[str] = None) -> List[dict]:
+        """
+        Busca personas activas cuyo nombre, apellido o documento comiencen con
+        los términos escritos (p. ej. "mar gon" encuentra "María González").
+
+        Los resultados vienen ordenados por relevancia (bm25). El parámetro
+        'tipo' ('nna', 'familiar', 'personal' o 'tercero') limita la búsqueda.
+        """
+        terminos = self._terminos(texto)
+        if not terminos or limite <= 0:
+            return []
+
+        filtro_tipo = self._filtro_tipo(tipo)
+        sql = f"""
+        SELECT
+            p.id, p.documento_identidad, p.primer_nombre, p.segundo_nombre,
+            p.primer_apellido, p.segundo_apellido, p.genero, p.telefono,
+            bm25(persona_fts, 10.0, 5.0, 1.0, 5.0, 1.0) AS rango
+        FROM persona_fts
+        INNER JOIN persona p ON p.id = persona_fts.rowid
+        WHERE persona_fts MATCH ? AND p.activo = TRUE{filtro_tipo}
+        ORDER BY rango
+        LIMIT ?;
+        """
+        conexion = self.db.crearConexion()
+        if conexion is None:
+            return []
+
+        try:
+            cursor = conexion.cursor()
+            try:
+                cursor.execute(sql, (self._consulta_fts(terminos), limite))
+            except sqlite3.OperationalError as e:
+                if "persona_fts" not in str(e):
+                    raise
+                # Sin índice FTS5: búsqueda por prefijo sobre los índices NOCASE
+                return self._buscar_por_prefijo(cursor, terminos, limite, filtro_tipo)
+            return leer(cursor)
+        except Error as e:
+            log.error("Error al buscar persona: %s", e)
+            return []
+        finally:
+            if conexion:
+                self.db.cerrarConexion(conexion)
+
+    def _buscar_por_prefijo(self, cursor, terminos: List[str], limite: int,
+                            filtro_tipo: str) -> List[dict]:
+        """Alternativa sin FTS5: cada término debe ser prefijo de algún campo."""
+        condiciones = []
+        params = []
+        for termino in terminos:
+            condiciones.append(
+                "(p.primer_nombre LIKE ? OR p.primer_apellido LIKE ? "
+                "OR p.segundo_apellido LIKE ? OR p.documento_identidad LIKE ?)"
+            )
+            params.extend([f"{termino}%"] * 4)
+        params.append(limite)
+
+        cursor.execute(f"""
+        SELECT
+            p.id, p.documento_identidad, p.primer_nombre, p.segundo_nombre,
+            p.primer_apellido, p.segundo_apellido, p.genero, p.telefono,
+            0 AS rango
+        FROM persona p
+        WHERE {" AND ".join(condiciones)} AND p.activo = TRUE{filtro_tipo}
+        ORDER BY p.primer_apellido COLLATE NOCASE, p.primer_nombre COLLATE NOCASE
+        LIMIT ?;
+        """, params)
+        return leer(cursor)
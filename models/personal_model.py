@@ -1,10 +1,12 @@
 # models/personal_model.py
+import logging
 import sys
 import os
-import sqlite3
 from sqlite3 import Error, IntegrityError
 from typing import List, Dict, Optional
 
+log = logging.getLogger(__name__)
+
 # Agregar el directorio actual al path para importar database_connector
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -18,34 +20,37 @@ except ImportError:
     # Importar el módulo real si está disponible
     from models.database_connector import Database
 
+try:
+    from paginacion import listar_pagina
+except ImportError:
+    from models.paginacion import listar_pagina
+
+try:
+    from cache_catalogos import cache_catalogos
+except ImportError:
+    from models.cache_catalogos import cache_catalogos
+
+try:
+    from acceso_datos import consultar, consultar_uno
+    from registros import RegistroPersonal
+except ImportError:
+    from models.acceso_datos import consultar, consultar_uno
+    from models.registros import RegistroPersonal
+
 class PersonalModel:
     """Modelo para gestionar las operaciones de Personal en la base de datos"""
+    # Órdenes admitidos por listar_pagina(); la última clave desempata (única)
+    ORDENES_LISTADO = {
+        "apellido": [("p.primer_apellido COLLATE NOCASE", "ASC"),
+                     ("p.primer_nombre COLLATE NOCASE", "ASC"),
+                     ("p.id", "ASC")],
+        "id": [("p.id", "ASC")],
+        "recientes": [("p.id", "DESC")],
+    }
 
     def __init__(self):
         self.db = Database()
         
-    def _mapear_personal(self, fila: dict) -> dict:
-        """Función interna para mapear una fila de la BD a un diccionario.
-           Añadidos campos faltantes de persona y usuario.
-        """
-        if not fila:
-            return None
-        return {
-            "persona_id": fila["id"],
-            "documento_identidad": fila["documento_identidad"],
-            "primer_nombre": fila["primer_nombre"],
-            "segundo_nombre": fila.get("segundo_nombre"), 
-            "primer_apellido": fila["primer_apellido"],
-            "segundo_apellido": fila.get("segundo_apellido"), 
-            "telefono": fila["telefono"],
-            "direccion": fila.get("direccion"), 
-            "genero": fila.get("genero"), 
-            "cargo": fila["cargo"],
-            "resolucion": fila["resolucion"],
-            "nombre_usuario": fila.get("nombre_usuario"), 
-            "activo": bool(fila["activo"])
-        }
-
     def agregar_personal(self, datos: dict) -> int:
         """Inserta un nuevo registro en Persona, Personal y Usuario dentro de una transacción."""
         
@@ -114,7 +119,7 @@ class PersonalModel:
             if conexion:
                 self.db.cerrarConexion(conexion)
 
-    def obtener_por_id(self, persona_id: int) -> Optional[dict]:
+    def obtener_por_id(self, persona_id: int) -> Optional[RegistroPersonal]:
         """Busca un registro de Personal por su ID, incluyendo todos los campos y el usuario."""
         sql = """
         SELECT 
@@ -132,19 +137,15 @@ class PersonalModel:
             return None
 
         try:
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(sql, (persona_id,))
-            fila = cursor.fetchone()
-            return self._mapear_personal(dict(fila)) if fila else None
+            return consultar_uno(conexion, sql, (persona_id,), como=RegistroPersonal)
         except Error as e:
-            print(f"Error al obtener personal por ID: {e}")
+            log.error("Error al obtener personal por ID: %s", e)
             return None
         finally:
             if conexion:
                 self.db.cerrarConexion(conexion)
                 
-    def obtener_por_cedula(self, documento_identidad: str) -> Optional[dict]:
+    def obtener_por_cedula(self, documento_identidad: str) -> Optional[RegistroPersonal]:
         """Busca un registro de Personal por su Cédula/Documento de Identidad, incluyendo todos los campos y el usuario."""
         sql = """
         SELECT 
@@ -162,19 +163,15 @@ class PersonalModel:
             return None
 
         try:
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(sql, (documento_identidad,))
-            fila = cursor.fetchone()
-            return self._mapear_personal(dict(fila)) if fila else None
+            return consultar_uno(conexion, sql, (documento_identidad,), como=RegistroPersonal)
         except Error as e:
-            print(f"Error al obtener personal por Cédula: {e}")
+            log.error("Error al obtener personal por Cédula: %s", e)
             return None
         finally:
             if conexion:
                 self.db.cerrarConexion(conexion)
 
-    def listar_todo(self) -> List[dict]:
+    def listar_todo(self) -> List[RegistroPersonal]:
         """Lista todos los registros de Personal activos, incluyendo todos los campos y el usuario."""
         sql = """
         SELECT 
@@ -192,18 +189,40 @@ class PersonalModel:
             return []
 
         try:
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(sql)
-            filas = cursor.fetchall()
-            return [self._mapear_personal(dict(fila)) for fila in filas]
+            return consultar(conexion, sql, como=RegistroPersonal)
         except Error as e:
-            print(f"Error al listar personal: {e}")
+            log.error("Error al listar personal: %s", e)
             return []
         finally:
             if conexion:
                 self.db.cerrarConexion(conexion)
 
+    def listar_pagina(self, tamano: int = None, continuacion: str = None,
+                      orden: str = "apellido") -> dict:
+        """
+        Lista el personal activo de a una página (paginación por clave).
+
+        Para la página siguiente se pasa el 'continuacion' de la respuesta
+        anterior. Ver models/paginacion.py para el formato de la respuesta.
+        """
+        return listar_pagina(
+            self.db,
+            columnas="""
+            p.id, p.documento_identidad, p.primer_nombre, p.segundo_nombre, p.primer_apellido, 
+            p.segundo_apellido, p.telefono, p.direccion, p.genero,
+            pe.cargo, pe.resolucion, p.activo,
+            u.nombre_usuario""",
+            origen="""persona p
+            INNER JOIN personal pe ON p.id = pe.persona_id
+            LEFT JOIN usuario u ON p.id = u.persona_id""",
+            filtro="p.activo = TRUE",
+            ordenes=self.ORDENES_LISTADO,
+            orden=orden,
+            tamano=tamano,
+            continuacion=continuacion,
+            como=RegistroPersonal,
+        )
+
     def actualizar_personal(self, datos: dict) -> bool:
         """Actualiza los datos del Personal en Persona, Personal y Usuario (opcionalmente la contraseña)."""
         
@@ -307,7 +326,10 @@ class PersonalModel:
         return None
     
     def listar_cargos(self) -> List[dict]:
-        """Lista todos los registros de cargos disponibles."""
+        """Lista todos los registros de cargos disponibles (cacheado)."""
+        return cache_catalogos.obtener("cargo", self._consultar_cargos)
+
+    def _consultar_cargos(self) -> List[dict]:
         sql = "SELECT id, nombre, requiere_resolucion FROM cargo ORDER BY nombre;"
         
         conexion = self.db.crearConexion()
@@ -315,14 +337,10 @@ class PersonalModel:
             return []
 
         try:
-            conexion.row_factory = sqlite3.Row
-            cursor = conexion.cursor()
-            cursor.execute(sql)
-            filas = cursor.fetchall()
-            # Mapear las filas a un diccionario simple para el controlador
-            return [dict(fila) for fila in filas]
+            # Lista de diccionarios simples para el controlador
+            return consultar(conexion, sql)
         except Error as e:
-            print(f"Error al listar cargos: {e}")
+            log.error("Error al listar cargos: %s", e)
             return []
         finally:
             if conexion:
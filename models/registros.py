@@ -0,0 +1,182 @@
+# models/registros.py
+"""
+Registros compactos (con __slots__) para las filas de las entidades principales.
+
+Un dict por fila cuesta ~600 bytes más las claves; un registro con slots guarda
+solo los valores (8 bytes por campo más la cabecera del objeto). Los listados
+grandes (combos, reportes, paginación) pasan a devolver estos registros.
+
+Se comportan como un diccionario para que las vistas y controladores no
+cambien: registro["primer_nombre"], registro.get("segundo_nombre"), .items(),
+dict(registro), "clave" in registro, registro == {...}. Además se puede leer
+como atributo (registro.primer_nombre). Las claves que no son campos (p. ej. las
+que agrega un controlador, como 'cargo_nombre') se guardan en un dict aparte
+que solo se crea cuando hace falta.
+
+Cada clase declara:
+    __slots__   campos en el orden del SELECT habitual.
+    RENOMBRAR   columna de la consulta -> campo (p. ej. id -> persona_id).
+    CONVERTIR   campo -> función aplicada al leer (p. ej. activo -> bool).
+
+Se usan como formato de acceso_datos: consultar(conexion, sql, como=RegistroNNA).
+"""
+import keyword
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Tuple
+
+
+def _generar_init(campos: Tuple[str, ...]) -> Callable:
+    """
+    __init__(self, campo1=None, campo2=None, ..., **extras) con una asignación
+    directa por campo (como hace dataclasses): un bucle con setattr() triplica
+    el costo de crear cada registro.
+    """
+    for campo in campos:
+        if not campo.isidentifier() or keyword.iskeyword(campo):
+            raise TypeError(f"Nombre de campo no válido: {campo!r}")
+    parametros = ", ".join(f"{campo}=None" for campo in campos)
+    cuerpo = "\n".join(f"    self.{campo} = {campo}" for campo in campos)
+    codigo = (f"def __init__(self, {parametros}, **extras):\n"
+              f"    self._extra = None\n{cuerpo}\n"
+              f"    for clave, valor in extras.items():\n"
+              f"        self[clave] = valor\n")
+    espacio = {}
+    exec(codigo, {}, espacio)
+    return espacio["__init__"]
+
+
+class Registro(MutableMapping):
+    """Base de los registros: slots + interfaz de diccionario."""
+
+    __slots__ = ("_extra",)
+
+    CAMPOS: Tuple[str, ...] = ()
+    RENOMBRAR: Dict[str, str] = {}
+    CONVERTIR: Dict[str, Callable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Campos propios y heredados (una subclase puede agregar slots)
+        cls.CAMPOS = tuple(campo for clase in reversed(cls.__mro__)
+                           if isinstance(clase, type) and issubclass(clase, Registro) and clase is not Registro
+                           for campo in clase.__dict__.get("__slots__", ()))
+        ocupados = [campo for campo in cls.CAMPOS if hasattr(Registro, campo)]
+        if ocupados:
+            raise TypeError(f"{cls.__name__}: campos que tapan métodos del registro: {ocupados}")
+        cls._POSICION = {campo: i for i, campo in enumerate(cls.CAMPOS)}
+        cls.__init__ = _generar_init(cls.CAMPOS)
+
+    @classmethod
+    def fabrica(cls, nombres: Tuple[str, ...]) -> Callable:
+        """
+        Función fila -> registro para una consulta con esas columnas (la usa
+        acceso_datos una vez por consulta). Las columnas que no son campos van
+        al dict de extras; los campos que la consulta no trae quedan en None.
+        """
+        claves = tuple(cls.RENOMBRAR.get(nombre, nombre) for nombre in nombres)
+        if claves == cls.CAMPOS:
+            # Caso habitual: el SELECT trae exactamente los campos, en orden
+            convertir = [(campo, funcion) for campo, funcion in cls.CONVERTIR.items()]
+            if not convertir:
+                return lambda fila: cls(*fila)
+
+            def crear_directo(fila):
+                registro = cls(*fila)
+                for campo, funcion in convertir:
+                    setattr(registro, campo, funcion(getattr(registro, campo)))
+                return registro
+            return crear_directo
+
+        posiciones = [claves.index(campo) if campo in claves else None for campo in cls.CAMPOS]
+        conversiones = [(cls._POSICION[campo], funcion) for campo, funcion in cls.CONVERTIR.items()
+                        if campo in claves]
+        extras = [(i, clave) for i, clave in enumerate(claves) if clave not in cls._POSICION]
+
+        def crear(fila):
+            valores = [None if posicion is None else fila[posicion] for posicion in posiciones]
+            for posicion, funcion in conversiones:
+                valores[posicion] = funcion(valores[posicion])
+            registro = cls(*valores)
+            if extras:
+                registro._extra = {clave: fila[i] for i, clave in extras}
+            return registro
+        return crear
+
+    # ------------------------------------------------------------------
+    # Interfaz de diccionario
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, clave):
+        if clave in self._POSICION:
+            return getattr(self, clave)
+        if self._extra is not None and clave in self._extra:
+            return self._extra[clave]
+        raise KeyError(clave)
+
+    def __setitem__(self, clave, valor):
+        if clave in self._POSICION:
+            setattr(self, clave, valor)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[clave] = valor
+
+    def __delitem__(self, clave):
+        if clave in self._POSICION:
+            raise TypeError(f"No se puede eliminar el campo '{clave}' de {type(self).__name__}")
+        if self._extra is None or clave not in self._extra:
+            raise KeyError(clave)
+        del self._extra[clave]
+
+    def __iter__(self):
+        yield from self.CAMPOS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return len(self.CAMPOS) + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, clave):
+        return clave in self._POSICION or (self._extra is not None and clave in self._extra)
+
+    def get(self, clave, defecto=None):
+        if clave in self._POSICION:
+            return getattr(self, clave)
+        if self._extra is not None:
+            return self._extra.get(clave, defecto)
+        return defecto
+
+    def __repr__(self):
+        campos = ", ".join(f"{clave}={valor!r}" for clave, valor in self.items())
+        return f"{type(self).__name__}({campos})"
+
+
+class RegistroNNA(Registro):
+    """Fila de NNA (persona + nna)."""
+    __slots__ = ("id", "documento_identidad", "primer_nombre", "segundo_nombre",
+                 "primer_apellido", "segundo_apellido", "genero", "direccion",
+                 "telefono", "fecha_nacimiento", "activo")
+    CONVERTIR = {"activo": bool}
+
+
+class RegistroPersonal(Registro):
+    """Fila de personal (persona + personal + usuario); el id se expone como persona_id."""
+    __slots__ = ("persona_id", "documento_identidad", "primer_nombre", "segundo_nombre",
+                 "primer_apellido", "segundo_apellido", "telefono", "direccion", "genero",
+                 "cargo", "resolucion", "activo", "nombre_usuario")
+    RENOMBRAR = {"id": "persona_id"}
+    CONVERTIR = {"activo": bool}
+
+
+class RegistroFamiliar(Registro):
+    """Fila de familiar (persona + familiar + descripción del parentesco)."""
+    __slots__ = ("id", "documento_identidad", "primer_nombre", "segundo_nombre",
+                 "primer_apellido", "segundo_apellido", "genero", "direccion",
+                 "telefono", "fecha_registro", "activo", "tutor", "parentesco_id",
+                 "parentesco_desc")
+
+
+class RegistroDenuncia(Registro):
+    """Fila del listado de denuncias."""
+    __slots__ = ("id", "fecha_denuncia", "fecha_hechos", "titulo", "estado",
+                 "estado_str", "nombre_consejero")
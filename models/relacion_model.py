@@ -1,8 +1,13 @@
 # relacion_model.py
 
+import logging
 from database_connector import database
+from cache_catalogos import cache_catalogos
+from acceso_datos import consultar
 from sqlite3 import Error
 
+log = logging.getLogger(__name__)
+
 class RelacionNNAFamiliarModel:
     """
     Modelo para gestionar las relaciones (vínculos) entre NNA y Familiares.
@@ -38,17 +43,10 @@ class RelacionNNAFamiliarModel:
         if conn is None:
             return []
         try:
-            cursor = conn.cursor()
-            cursor.execute(sql, (nna_id,))
-            
-            # Obtener nombres de columnas
-            columnas = [desc[0] for desc in cursor.description]
-            
-            # Mapear resultados a lista de diccionarios
-            relaciones = [dict(zip(columnas, row)) for row in cursor.fetchall()]
-            return relaciones
+            # Lista de diccionarios
+            return consultar(conn, sql, (nna_id,))
         except Error as e:
-            print(f"[ERROR_RELACION] Error al obtener relaciones: {e}")
+            log.error("Error al obtener relaciones: %s", e)
             return []
         finally:
             self.db.cerrarConexion()
@@ -80,8 +78,11 @@ class RelacionNNAFamiliarModel:
     # Métodos de utilidad
     def obtener_parentescos(self):
         """
-        Recupera todos los tipos de parentesco (Catálogo).
+        Recupera todos los tipos de parentesco (Catálogo, cacheado).
         """
+        return cache_catalogos.obtener("parentesco", self._consultar_parentescos, clave="relacion")
+
+    def _consultar_parentescos(self):
         sql = "SELECT id, nombre FROM parentesco;"
         conn = self.db.crearConexion()
         if conn is None:
@@ -91,7 +92,7 @@ class RelacionNNAFamiliarModel:
             cursor.execute(sql)
             return cursor.fetchall()  # Retorna lista de tuplas (id, nombre)
         except Error as e:
-            print(f"[ERROR_RELACION] Error al obtener parentescos: {e}")
+            log.error("Error al obtener parentescos: %s", e)
             return []
         finally:
             self.db.cerrarConexion()
\ No newline at end of file
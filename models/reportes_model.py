@@ -1,19 +1,30 @@
 # En models/reportes_model.py - Actualizar la clase ExportadorService
+import logging
 import sys
 import os
+import csv
 import sqlite3
 from sqlite3 import Error
-from typing import List, Dict, Optional, Any
-import pandas as pd
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Dict, Optional, Any, Callable, Iterator, Tuple
 from datetime import datetime
+from xml.sax.saxutils import escape
+
+log = logging.getLogger(__name__)
 
 # Agregar el directorio actual al path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from database_connector import Database
+    from dependencias import perezoso
 except ImportError:
     from models.database_connector import Database
+    from models.dependencias import perezoso
+
+# pandas solo se importa si se pide un DataFrame (ver models/dependencias.py)
+pd = perezoso("pandas")
 
 class ReportesModel:
     """
@@ -24,9 +35,9 @@ class ReportesModel:
         """Inicializa el modelo con la conexión a la base de datos"""
         try:
             self.db = Database()
-            print("[OK] ReportesModel inicializado correctamente")
+            log.debug("ReportesModel inicializado")
         except Exception as e:
-            print(f"[ERROR] Error al inicializar ReportesModel: {e}")
+            log.error("Error al inicializar ReportesModel: %s", e)
             self.db = None
     
     def obtener_todos_los_datos(self, tabla: str) -> List[Dict[str, Any]]:
@@ -41,16 +52,16 @@ class ReportesModel:
         """
         try:
             if not self.db:
-                print("[ERROR] No hay conexión a la base de datos")
+                log.error("No hay conexión a la base de datos")
                 return []
                 
             query = f"SELECT * FROM {tabla}"
             resultados = self.db.fetch_all(query)
-            print(f"[OK] Obtenidos {len(resultados)} registros de la tabla {tabla}")
+            log.debug("Obtenidos %d registros de la tabla %s", len(resultados), tabla)
             return resultados
             
         except Exception as e:
-            print(f"[ERROR] Error al obtener datos de {tabla}: {e}")
+            log.error("Error al obtener datos de %s: %s", tabla, e)
             return []
     
     def obtener_datos_con_filtros(self, tabla: str, filtros: Dict[str, Any] = None) -> List[Dict[str, Any]]:
@@ -66,7 +77,7 @@ class ReportesModel:
         """
         try:
             if not self.db:
-                print("[ERROR] No hay conexión a la base de datos")
+                log.error("No hay conexión a la base de datos")
                 return []
                 
             if not filtros:
@@ -84,11 +95,11 @@ class ReportesModel:
             query = f"SELECT * FROM {tabla} WHERE {where_clause}"
             
             resultados = self.db.fetch_all(query, parametros)
-            print(f"[OK] Obtenidos {len(resultados)} registros filtrados de {tabla}")
+            log.debug("Obtenidos %d registros filtrados de %s", len(resultados), tabla)
             return resultados
             
         except Exception as e:
-            print(f"[ERROR] Error al obtener datos filtrados de {tabla}: {e}")
+            log.error("Error al obtener datos filtrados de %s: %s", tabla, e)
             return []
     
     def obtener_estadisticas_basicas(self, tabla: str) -> Dict[str, Any]:
@@ -123,7 +134,7 @@ class ReportesModel:
             }
             
         except Exception as e:
-            print(f"[ERROR] Error al obtener estadísticas de {tabla}: {e}")
+            log.error("Error al obtener estadísticas de %s: %s", tabla, e)
             return {"error": str(e)}
     
     def obtener_tablas_disponibles(self) -> List[str]:
@@ -140,129 +151,553 @@ class ReportesModel:
             query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
             resultados = self.db.fetch_all(query)
             tablas = [tabla['name'] for tabla in resultados]
-            print(f"[OK] Tablas disponibles: {tablas}")
+            log.debug("Tablas disponibles: %s", tablas)
             return tablas
             
         except Exception as e:
-            print(f"[ERROR] Error al obtener tablas disponibles: {e}")
+            log.error("Error al obtener tablas disponibles: %s", e)
             return []
 
+    @contextmanager
+    def cursor_datos(self, tabla: str, filtros: Dict[str, Any] = None):
+        """
+        Cursor abierto sobre una tabla (con filtros opcionales) para recorrerla
+        por lotes sin cargarla entera en memoria, p. ej. para exportarla.
+
+        Uso:
+            with modelo.cursor_datos("persona") as cursor:
+                ExportadorService.exportar_csv_streaming(cursor, "persona.csv")
+        """
+        if not self.db:
+            raise Error("No hay conexión a la base de datos")
+
+        with self.db.conexion() as conexion:
+            # Validar tabla y columnas: se interpolan en el SQL
+            columnas_tabla = [fila[1] for fila in conexion.execute(
+                "SELECT * FROM pragma_table_info(?)", (tabla,)
+            ).fetchall()]
+            if not columnas_tabla:
+                raise ValueError(f"La tabla '{tabla}' no existe")
+
+            query = f'SELECT * FROM "{tabla}"'
+            parametros = []
+            if filtros:
+                desconocidas = [campo for campo in filtros if campo not in columnas_tabla]
+                if desconocidas:
+                    raise ValueError(f"Columnas no válidas para {tabla}: {desconocidas}")
+                query += " WHERE " + " AND ".join(f'"{campo}" = ?' for campo in filtros)
+                parametros = list(filtros.values())
+
+            cursor = conexion.execute(query, parametros)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    # ------------------------------------------------------------------
+    # Agregaciones en SQL para el panel de reportes: la BD devuelve solo los
+    # conteos, nunca las tablas completas. Si existen las tablas resumen_*
+    # (migración 4 de db_setup, mantenidas por triggers) se
+    # leen de ahí; si no, se agrupan las tablas base.
+    # ------------------------------------------------------------------
+
+    # Rangos de edad (años cumplidos) para contar_nna_por_rango_edad(); None = sin tope
+    RANGOS_EDAD = [(0, 5), (6, 11), (12, 17), (18, None)]
+
+    # Edad en años cumplidos calculada en SQLite a partir de una fecha de nacimiento
+    _SQL_EDAD = """(CAST(strftime('%Y', 'now') AS INTEGER) - CAST(strftime('%Y', {fecha}) AS INTEGER)
+                 - (strftime('%m-%d', 'now') < strftime('%m-%d', {fecha})))"""
+
+    def _resumenes_disponibles(self) -> bool:
+        """Indica si existen las tablas de resumen (se consulta una sola vez)."""
+        if getattr(self, "_hay_resumenes", None) is None:
+            filas = self._agregar(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='resumen_contador'"
+            )
+            self._hay_resumenes = bool(filas)
+        return self._hay_resumenes
+
+    def _contador(self, clave: str) -> Optional[int]:
+        """Valor de resumen_contador (None si no hay tablas de resumen)."""
+        if not self._resumenes_disponibles():
+            return None
+        filas = self._agregar("SELECT valor FROM resumen_contador WHERE clave = ?", (clave,))
+        return filas[0][0] if filas else 0
+
+    def _agregar(self, query: str, parametros: tuple = ()) -> List[tuple]:
+        """Ejecuta una consulta de agregación y devuelve sus filas (tuplas)."""
+        if not self.db:
+            log.error("No hay conexión a la base de datos")
+            return []
+        try:
+            with self.db.conexion() as conexion:
+                return conexion.execute(query, parametros).fetchall()
+        except Error as e:
+            log.error("Error en consulta de agregación: %s", e)
+            return []
+
+    def _conteo_por_grupo(self, query: str, parametros: tuple = ()) -> Dict[str, int]:
+        """Convierte filas (grupo, total) en un diccionario ordenado."""
+        return {str(grupo) if grupo is not None else "Sin dato": total
+                for grupo, total in self._agregar(query, parametros)}
+
+    @staticmethod
+    def _filtro_fechas(campo: str, desde: Optional[str], hasta: Optional[str]) -> Tuple[str, list]:
+        """Condición opcional por rango de fechas (YYYY-MM-DD, inclusivo)."""
+        condiciones, parametros = [], []
+        if desde:
+            condiciones.append(f"{campo} >= ?")
+            parametros.append(desde)
+        if hasta:
+            condiciones.append(f"{campo} <= ?")
+            parametros.append(hasta)
+        return (" AND " + " AND ".join(condiciones)) if condiciones else "", parametros
+
+    def contar_nna(self) -> int:
+        """Total de NNA activos."""
+        total = self._contador("nna_activos")
+        if total is not None:
+            return total
+        filas = self._agregar("""
+            SELECT COUNT(*) FROM nna n JOIN persona p ON p.id = n.persona_id
+            WHERE p.activo = TRUE
+        """)
+        return filas[0][0] if filas else 0
+
+    def contar_nna_por_genero(self) -> Dict[str, int]:
+        """NNA activos por género."""
+        if self._resumenes_disponibles():
+            return self._conteo_por_grupo("""
+                SELECT NULLIF(genero, ''), SUM(total) FROM resumen_nna
+                GROUP BY genero HAVING SUM(total) > 0 ORDER BY genero
+            """)
+        return self._conteo_por_grupo("""
+            SELECT p.genero, COUNT(*) FROM nna n JOIN persona p ON p.id = n.persona_id
+            WHERE p.activo = TRUE
+            GROUP BY p.genero ORDER BY p.genero
+        """)
+
+    def contar_nna_por_rango_edad(self) -> Dict[str, int]:
+        """NNA activos por rango de edad (ver RANGOS_EDAD); incluye rangos en cero."""
+        casos, etiquetas = [], []
+        for minimo, maximo in self.RANGOS_EDAD:
+            etiqueta = f"{minimo}-{maximo}" if maximo is not None else f"{minimo}+"
+            etiquetas.append(etiqueta)
+            if maximo is not None:
+                casos.append(f"WHEN edad <= {int(maximo)} THEN '{etiqueta}'")
+        ultimo = etiquetas[-1]
+        if self._resumenes_disponibles():
+            # Una fila por (género, fecha de nacimiento): la edad se calcula hoy
+            origen = f"""
+                SELECT {self._SQL_EDAD.format(fecha='fecha_nacimiento')} AS edad, total
+                FROM resumen_nna"""
+        else:
+            origen = f"""
+                SELECT {self._SQL_EDAD.format(fecha='n.fecha_nacimiento')} AS edad, 1 AS total
+                FROM nna n JOIN persona p ON p.id = n.persona_id
+                WHERE p.activo = TRUE"""
+        conteo = self._conteo_por_grupo(f"""
+            SELECT CASE {' '.join(casos)} ELSE '{ultimo}' END AS rango, SUM(total)
+            FROM ({origen})
+            GROUP BY rango
+        """)
+        return {etiqueta: conteo.get(etiqueta, 0) for etiqueta in etiquetas}
+
+    def contar_denuncias_abiertas(self) -> int:
+        """Denuncias abiertas (estado Pendiente)."""
+        total = self._contador("denuncias_abiertas")
+        if total is not None:
+            return total
+        return self.contar_denuncias_por_estado()["Pendiente"]
+
+    def contar_denuncias_por_estado(self, desde: str = None, hasta: str = None) -> Dict[str, int]:
+        """Denuncias abiertas (Pendiente) y cerradas (Resuelto)."""
+        if not desde and not hasta and self._resumenes_disponibles():
+            filas = self._agregar(
+                "SELECT IFNULL(SUM(abiertas), 0), IFNULL(SUM(cerradas), 0) FROM resumen_denuncia_mes"
+            )
+            abiertas, cerradas = filas[0] if filas else (0, 0)
+            return {"Pendiente": abiertas, "Resuelto": cerradas}
+        filtro, parametros = self._filtro_fechas("fecha_denuncia", desde, hasta)
+        conteo = self._conteo_por_grupo(f"""
+            SELECT CASE estado WHEN 1 THEN 'Pendiente' ELSE 'Resuelto' END AS estado_str, COUNT(*)
+            FROM denuncia WHERE 1 = 1{filtro}
+            GROUP BY estado_str
+        """, tuple(parametros))
+        return {"Pendiente": conteo.get("Pendiente", 0), "Resuelto": conteo.get("Resuelto", 0)}
+
+    def contar_denuncias_por_mes(self, desde: str = None, hasta: str = None) -> Dict[str, int]:
+        """Denuncias recibidas por mes ('YYYY-MM'), en orden cronológico."""
+        return {fila["mes"]: fila["abiertas"] + fila["cerradas"]
+                for fila in self.contar_denuncias_abiertas_por_mes(desde, hasta)}
+
+    def contar_denuncias_abiertas_por_mes(self, desde: str = None, hasta: str = None) -> List[Dict[str, Any]]:
+        """Denuncias abiertas y cerradas por mes: [{'mes', 'abiertas', 'cerradas'}, ...]."""
+        if not desde and not hasta and self._resumenes_disponibles():
+            filas = self._agregar("""
+                SELECT NULLIF(mes, ''), abiertas, cerradas FROM resumen_denuncia_mes
+                WHERE abiertas + cerradas > 0 ORDER BY mes
+            """)
+        else:
+            filtro, parametros = self._filtro_fechas("fecha_denuncia", desde, hasta)
+            filas = self._agregar(f"""
+                SELECT strftime('%Y-%m', fecha_denuncia) AS mes,
+                       SUM(estado IS TRUE), SUM(estado IS NOT TRUE)
+                FROM denuncia WHERE 1 = 1{filtro}
+                GROUP BY mes ORDER BY mes
+            """, tuple(parametros))
+        return [{"mes": mes if mes is not None else "Sin dato", "abiertas": abiertas, "cerradas": cerradas}
+                for mes, abiertas, cerradas in filas]
+
+    def contar_denuncias_por_consejero(self, desde: str = None, hasta: str = None) -> Dict[str, int]:
+        """Denuncias asignadas a cada consejero (nombre y apellido)."""
+        filtro, parametros = self._filtro_fechas("d.fecha_denuncia", desde, hasta)
+        return self._conteo_por_grupo(f"""
+            SELECT p_con.primer_nombre || ' ' || p_con.primer_apellido AS consejero, COUNT(*) AS total
+            FROM denuncia d
+            LEFT JOIN persona p_con ON p_con.id = d.consejero_id
+            WHERE 1 = 1{filtro}
+            GROUP BY d.consejero_id ORDER BY total DESC
+        """, tuple(parametros))
+
+    def contar_matriculas_por_unidad(self, solo_activas: bool = True) -> Dict[str, int]:
+        """Matrículas por unidad educativa."""
+        if self._resumenes_disponibles():
+            columna = "r.activas" if solo_activas else "r.total"
+            return self._conteo_por_grupo(f"""
+                SELECT ue.nombre, {columna} AS total
+                FROM resumen_matricula_unidad r
+                JOIN unidad_educativa ue ON ue.id = r.unidad_id
+                WHERE {columna} > 0 ORDER BY total DESC
+            """)
+        filtro = " WHERE me.activa = 1" if solo_activas else ""
+        return self._conteo_por_grupo(f"""
+            SELECT ue.nombre, COUNT(*) AS total
+            FROM matricula_educativa me
+            JOIN unidad_educativa ue ON ue.id = me.unidad_id{filtro}
+            GROUP BY me.unidad_id ORDER BY total DESC
+        """)
+
+    def contar_seguimientos_por_expediente(self) -> List[Dict[str, Any]]:
+        """Seguimientos por expediente: [{'expediente_id', 'total', 'ultima_fecha'}, ...]."""
+        if self._resumenes_disponibles():
+            query = """
+                SELECT expediente_id, total, ultima_fecha FROM resumen_seguimiento
+                WHERE total > 0 ORDER BY total DESC, expediente_id
+            """
+        else:
+            query = """
+                SELECT expediente_id, COUNT(*) AS total, MAX(fecha) AS ultima_fecha
+                FROM seguimiento GROUP BY expediente_id ORDER BY total DESC, expediente_id
+            """
+        return [{"expediente_id": expediente_id, "total": total, "ultima_fecha": ultima_fecha}
+                for expediente_id, total, ultima_fecha in self._agregar(query)]
+
+    # ------------------------------------------------------------------
+    # Listados tabulares del panel de reportes
+    # ------------------------------------------------------------------
+
+    def obtener_datos_nna(self) -> List[Dict[str, Any]]:
+        """NNA activos: [{'id', 'nombre', 'genero', 'edad', 'alerta_activa'}, ...]."""
+        filas = self._agregar(f"""
+            SELECT p.id, p.primer_nombre || ' ' || p.primer_apellido,
+                   CASE p.genero WHEN 'F' THEN 'Femenino' WHEN 'M' THEN 'Masculino' END,
+                   {self._SQL_EDAD.format(fecha='n.fecha_nacimiento')},
+                   EXISTS (SELECT 1 FROM nna_involucrado ni
+                           JOIN denuncia d ON d.id = ni.denuncia_id
+                           WHERE ni.nna_id = n.persona_id AND d.estado = 1)
+            FROM nna n JOIN persona p ON p.id = n.persona_id
+            WHERE p.activo = TRUE
+            ORDER BY p.primer_apellido, p.primer_nombre
+        """)
+        return [{"id": id_, "nombre": nombre, "genero": genero or "Sin dato", "edad": edad,
+                 "alerta_activa": bool(alerta)}
+                for id_, nombre, genero, edad, alerta in filas]
+
+    def obtener_datos_alertas(self, solo_abiertas: bool = False) -> List[Dict[str, Any]]:
+        """
+        Denuncias y el NNA involucrado en cada una:
+        [{'id', 'nna_id', 'tipo', 'estado'}, ...]; 'tipo' es el rol del NNA.
+        """
+        filtro = " WHERE d.estado = 1" if solo_abiertas else ""
+        filas = self._agregar(f"""
+            SELECT d.id, ni.nna_id, ni.rol,
+                   CASE d.estado WHEN 1 THEN 'Abierto' ELSE 'Cerrado' END
+            FROM denuncia d
+            LEFT JOIN nna_involucrado ni ON ni.denuncia_id = d.id{filtro}
+            ORDER BY d.id DESC, ni.nna_id
+        """)
+        return [{"id": id_, "nna_id": nna_id, "tipo": tipo or "Sin dato", "estado": estado}
+                for id_, nna_id, tipo, estado in filas]
+
 class ExportadorService:
     """
     Servicio para exportar datos a diferentes formatos
     """
+
+    # Filas que se leen y escriben por vez en las exportaciones por lotes
+    TAMANO_LOTE = 1000
+
+    @staticmethod
+    def _preparar_directorio(nombre_archivo: str):
+        """Crea el directorio de destino si no existe."""
+        directorio = os.path.dirname(nombre_archivo)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+
+    @staticmethod
+    def _lotes(origen, columnas: Optional[List[str]] = None,
+               tamano_lote: int = None) -> Tuple[List[str], Iterator[List[list]]]:
+        """
+        Normaliza el origen de datos a (columnas, iterador de lotes de filas).
+
+        'origen' puede ser un cursor de sqlite3 (se lee con fetchmany) o
+        cualquier iterable de diccionarios / sqlite3.Row / secuencias.
+        """
+        tamano_lote = tamano_lote or ExportadorService.TAMANO_LOTE
+
+        if hasattr(origen, "fetchmany") and hasattr(origen, "description"):
+            columnas = columnas or [desc[0] for desc in origen.description]
+
+            def lotes_cursor():
+                while True:
+                    filas = origen.fetchmany(tamano_lote)
+                    if not filas:
+                        break
+                    yield filas
+            return columnas, lotes_cursor()
+
+        iterador = iter(origen)
+        primera = next(iterador, None)
+        if primera is None:
+            return columnas or [], iter(())
+
+        es_mapeo = hasattr(primera, "keys")
+        if columnas is None:
+            if not es_mapeo:
+                raise ValueError("Se requieren los nombres de columna para filas sin claves")
+            columnas = list(primera.keys())
+        # dict admite claves faltantes; sqlite3.Row se indexa por nombre
+        valor = (lambda fila, c: fila.get(c)) if isinstance(primera, dict) else (lambda fila, c: fila[c])
+
+        def lotes_iterable():
+            pendiente = [primera]
+            while True:
+                pendiente.extend(islice(iterador, tamano_lote - len(pendiente)))
+                if not pendiente:
+                    break
+                if es_mapeo:
+                    yield [[valor(fila, c) for c in columnas] for fila in pendiente]
+                else:
+                    yield pendiente
+                pendiente = []
+        return columnas, lotes_iterable()
+
+    @staticmethod
+    def exportar_csv_streaming(origen, nombre_archivo: str, columnas: List[str] = None,
+                               tamano_lote: int = None,
+                               al_progresar: Callable[[int], None] = None) -> bool:
+        """
+        Exporta a CSV escribiendo por lotes: la memoria usada no depende del
+        total de filas. 'al_progresar' recibe las filas escritas tras cada lote.
+        """
+        try:
+            log.debug("Exportando a CSV por lotes: %s", nombre_archivo)
+            columnas, lotes = ExportadorService._lotes(origen, columnas, tamano_lote)
+            if not columnas:
+                log.warning("No hay datos para exportar a CSV")
+                return False
+
+            ExportadorService._preparar_directorio(nombre_archivo)
+            escritas = 0
+            with open(nombre_archivo, "w", newline="", encoding="utf-8-sig") as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(columnas)
+                for lote in lotes:
+                    escritor.writerows(lote)
+                    escritas += len(lote)
+                    if al_progresar:
+                        al_progresar(escritas)
+
+            log.info("CSV exportado (%d filas): %s", escritas, nombre_archivo)
+            return True
+
+        except Exception as e:
+            log.error("Error al exportar a CSV: %s", e)
+            return False
+
+    @staticmethod
+    def exportar_excel_streaming(origen, nombre_archivo: str, columnas: List[str] = None,
+                                 tamano_lote: int = None,
+                                 al_progresar: Callable[[int], None] = None) -> bool:
+        """
+        Exporta a Excel con un escritor de memoria constante: xlsxwriter en modo
+        'constant_memory' u, opcionalmente, openpyxl en modo 'write_only'.
+        """
+        try:
+            log.debug("Exportando a Excel por lotes: %s", nombre_archivo)
+            columnas, lotes = ExportadorService._lotes(origen, columnas, tamano_lote)
+            if not columnas:
+                log.warning("No hay datos para exportar a Excel")
+                return False
+
+            ExportadorService._preparar_directorio(nombre_archivo)
+            escritas = 0
+            try:
+                import xlsxwriter
+            except ImportError:
+                xlsxwriter = None
+
+            if xlsxwriter is not None:
+                libro = xlsxwriter.Workbook(nombre_archivo, {"constant_memory": True})
+                try:
+                    hoja = libro.add_worksheet("Datos")
+                    hoja.write_row(0, 0, columnas)
+                    for lote in lotes:
+                        for fila in lote:
+                            escritas += 1
+                            hoja.write_row(escritas, 0, list(fila))
+                        if al_progresar:
+                            al_progresar(escritas)
+                finally:
+                    libro.close()
+            else:
+                try:
+                    from openpyxl import Workbook
+                except ImportError as e:
+                    log.error("Se necesita xlsxwriter u openpyxl (pip install xlsxwriter): %s", e)
+                    return False
+                libro = Workbook(write_only=True)
+                hoja = libro.create_sheet("Datos")
+                hoja.append(columnas)
+                for lote in lotes:
+                    for fila in lote:
+                        hoja.append(list(fila))
+                    escritas += len(lote)
+                    if al_progresar:
+                        al_progresar(escritas)
+                libro.save(nombre_archivo)
+
+            log.info("Excel exportado (%d filas): %s", escritas, nombre_archivo)
+            return True
+
+        except Exception as e:
+            log.error("Error general al exportar a Excel: %s", e)
+            return False
+
+    @staticmethod
+    def exportar_tabla(modelo: "ReportesModel", tabla: str, nombre_archivo: str,
+                       formato: str = "csv", filtros: Dict[str, Any] = None,
+                       tamano_lote: int = None,
+                       al_progresar: Callable[[int], None] = None) -> bool:
+        """Exporta una tabla completa (p. ej. persona o denuncia) directo desde la BD."""
+        exportadores = {
+            "csv": ExportadorService.exportar_csv_streaming,
+            "excel": ExportadorService.exportar_excel_streaming,
+            "xlsx": ExportadorService.exportar_excel_streaming,
+            "pdf": lambda origen, nombre, tamano_lote=None, al_progresar=None:
+                ExportadorService.exportar_a_pdf(origen, nombre, titulo=f"Reporte de {tabla}",
+                                                 al_progresar=al_progresar),
+        }
+        exportar = exportadores.get(formato.lower())
+        if exportar is None:
+            log.error("Formato de exportación no soportado: %s", formato)
+            return False
+        try:
+            with modelo.cursor_datos(tabla, filtros) as cursor:
+                return exportar(cursor, nombre_archivo, tamano_lote=tamano_lote,
+                                al_progresar=al_progresar)
+        except (Error, ValueError) as e:
+            log.error("Error al exportar la tabla %s: %s", tabla, e)
+            return False
     
     @staticmethod
-    def exportar_a_dataframe(datos: List[Dict]) -> pd.DataFrame:
+    def exportar_a_dataframe(datos: List[Dict]) -> "pd.DataFrame":
         """Convierte datos a DataFrame de pandas"""
         if not datos:
-            print("[ADVERTENCIA] No hay datos para exportar")
+            log.warning("No hay datos para exportar")
             return pd.DataFrame()
         
         try:
             df = pd.DataFrame(datos)
-            print(f"[OK] DataFrame creado con {len(df)} filas y {len(df.columns)} columnas")
-            print(f"[INFO] Columnas: {list(df.columns)}")
+            log.debug("DataFrame creado con %d filas y columnas %s", len(df), list(df.columns))
             return df
         except Exception as e:
-            print(f"[ERROR] Error al crear DataFrame: {e}")
+            log.error("Error al crear DataFrame: %s", e)
             return pd.DataFrame()
     
     @staticmethod
     def exportar_a_excel(datos: List[Dict], nombre_archivo: str) -> bool:
         """Exporta datos a archivo Excel"""
-        try:
-            print(f"[PROCESANDO] Intentando exportar a Excel: {nombre_archivo}")
-            df = ExportadorService.exportar_a_dataframe(datos)
-            
-            if df.empty:
-                print("[ERROR] DataFrame vacío, no se puede exportar")
-                return False
-            
-            # Verificar que el directorio existe
-            directorio = os.path.dirname(nombre_archivo)
-            if directorio and not os.path.exists(directorio):
-                os.makedirs(directorio)
-            
-            # Intentar con diferentes motores
-            try:
-                df.to_excel(nombre_archivo, index=False, engine='openpyxl')
-                print(f"[OK] Excel exportado exitosamente con openpyxl: {nombre_archivo}")
-                return True
-            except Exception as e1:
-                print(f"[ADVERTENCIA] Error con openpyxl: {e1}. Intentando con xlsxwriter...")
-                try:
-                    df.to_excel(nombre_archivo, index=False, engine='xlsxwriter')
-                    print(f"[OK] Excel exportado exitosamente con xlsxwriter: {nombre_archivo}")
-                    return True
-                except Exception as e2:
-                    print(f"[ERROR] Error con xlsxwriter: {e2}")
-                    return False
-                    
-        except Exception as e:
-            print(f"[ERROR] Error general al exportar a Excel: {e}")
+        if not datos:
+            log.warning("No hay datos, no se puede exportar")
             return False
+        # Se escribe directo desde la lista, sin copiarla a un DataFrame
+        return ExportadorService.exportar_excel_streaming(datos, nombre_archivo)
     
     @staticmethod
     def exportar_a_csv(datos: List[Dict], nombre_archivo: str) -> bool:
         """Exporta datos a archivo CSV"""
-        try:
-            print(f"[PROCESANDO] Intentando exportar a CSV: {nombre_archivo}")
-            df = ExportadorService.exportar_a_dataframe(datos)
-            
-            if df.empty:
-                return False
-            
-            # Verificar que el directorio existe
-            directorio = os.path.dirname(nombre_archivo)
-            if directorio and not os.path.exists(directorio):
-                os.makedirs(directorio)
-                
-            df.to_csv(nombre_archivo, index=False, encoding='utf-8-sig')
-            print(f"[OK] CSV exportado exitosamente: {nombre_archivo}")
-            return True
-            
-        except Exception as e:
-            print(f"[ERROR] Error al exportar a CSV: {e}")
+        if not datos:
             return False
+        return ExportadorService.exportar_csv_streaming(datos, nombre_archivo)
     
+    # Filas por tabla del PDF: con celdas de una línea, un bloque ocupa una página A4
+    FILAS_POR_TABLA_PDF = 32
+
+    @staticmethod
+    def _celdas_texto(lote: List[list], celda: Callable[[str], Any]) -> List[list]:
+        """
+        Convierte un lote completo en celdas (una sola pasada, sin iterrows).
+        'celda' crea el Paragraph de cada valor: el texto largo se ajusta en
+        varias líneas dentro del ancho de la columna, sin recortarse.
+        """
+        return [[celda(escape("" if valor is None else str(valor))) for valor in fila] for fila in lote]
+
     @staticmethod
-    def exportar_a_pdf(datos: List[Dict], nombre_archivo: str, titulo: str = "Reporte") -> bool:
-        """Exporta datos a archivo PDF"""
+    def exportar_a_pdf(datos, nombre_archivo: str, titulo: str = "Reporte",
+                       columnas: List[str] = None, filas_por_tabla: int = None,
+                       al_progresar: Callable[[int], None] = None) -> bool:
+        """
+        Exporta datos a archivo PDF
+
+        'datos' puede ser una lista de diccionarios o un cursor (ver
+        ReportesModel.cursor_datos). Las filas se reparten en tablas del tamaño
+        de una página que repiten la cabecera y comparten un único TableStyle
+        con ROWBACKGROUNDS para el rayado, en lugar de una tabla gigante con un
+        comando de estilo por fila (que ReportLab re-mide en cada salto de página).
+        """
         try:
-            print(f"[PROCESANDO] Intentando exportar a PDF: {nombre_archivo}")
+            log.debug("Exportando a PDF: %s", nombre_archivo)
             
             # Verificar si reportlab está instalado
             try:
-                from reportlab.lib.pagesizes import letter, A4
+                from reportlab.lib.pagesizes import A4
                 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-                from reportlab.lib.styles import getSampleStyleSheet
+                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
                 from reportlab.lib import colors
-                from reportlab.pdfbase import pdfmetrics
-                from reportlab.pdfbase.ttfonts import TTFont
             except ImportError as e:
-                print(f"[ERROR] ReportLab no está instalado: {e}")
-                print("[INFO] Instálelo con: pip install reportlab")
+                log.error("ReportLab no está instalado (pip install reportlab): %s", e)
                 return False
             
-            df = ExportadorService.exportar_a_dataframe(datos)
-            if df.empty:
-                print("[ERROR] No hay datos para exportar a PDF")
+            filas_por_tabla = filas_por_tabla or ExportadorService.FILAS_POR_TABLA_PDF
+            columnas, lotes = ExportadorService._lotes(datos, columnas, filas_por_tabla)
+            if not columnas:
+                log.warning("No hay datos para exportar a PDF")
                 return False
             
             # Verificar que el directorio existe
-            directorio = os.path.dirname(nombre_archivo)
-            if directorio and not os.path.exists(directorio):
-                os.makedirs(directorio)
+            ExportadorService._preparar_directorio(nombre_archivo)
             
             # Crear documento PDF
+            margen = 40
             doc = SimpleDocTemplate(
                 nombre_archivo,
                 pagesize=A4,
-                rightMargin=40,
-                leftMargin=40,
-                topMargin=40,
-                bottomMargin=40
+                rightMargin=margen,
+                leftMargin=margen,
+                topMargin=margen,
+                bottomMargin=margen
             )
             
             story = []
@@ -281,17 +716,16 @@ class ExportadorService:
             story.append(Paragraph(f"<b>Generado el:</b> {fecha_str}", fecha_style))
             story.append(Spacer(1, 30))
             
-            # Preparar datos para la tabla
-            # Convertir DataFrame a lista de listas
-            datos_tabla = [df.columns.tolist()]  # Encabezados
-            
-            for _, fila in df.iterrows():
-                datos_tabla.append([str(valor) for valor in fila.values])
-            
-            # Crear tabla
-            tabla = Table(datos_tabla, repeatRows=1)
+            # Anchos fijos: ReportLab no tiene que medir cada celda y todas las
+            # tablas quedan alineadas. El texto largo se ajusta en varias líneas.
+            ancho_columna = (A4[0] - 2 * margen) / len(columnas)
+            # Estilo compartido por todas las celdas de datos (una sola instancia)
+            estilo_celda = ParagraphStyle("CeldaReporte", parent=styles["Normal"],
+                                          fontName="Helvetica", fontSize=8, leading=10,
+                                          textColor=colors.black, alignment=0)
+            celda = lambda texto: Paragraph(texto, estilo_celda)
             
-            # Estilo de la tabla
+            # Estilo compartido por todas las tablas (una sola instancia)
             estilo_tabla = TableStyle([
                 # Encabezados
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2C3E50')),
@@ -301,12 +735,9 @@ class ExportadorService:
                 ('FONTSIZE', (0, 0), (-1, 0), 10),
                 ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
                 
-                # Filas de datos
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ECF0F1')),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                # Filas de datos (rayado alternado)
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#ECF0F1'), colors.HexColor('#F8F9FA')]),
+                # (fuente y color de los datos: estilo_celda)
                 ('TOPPADDING', (0, 1), (-1, -1), 6),
                 ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
                 
@@ -315,28 +746,33 @@ class ExportadorService:
                 ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ])
             
-            # Aplicar estilo alternado a las filas
-            for i in range(1, len(datos_tabla)):
-                if i % 2 == 0:
-                    estilo_tabla.add('BACKGROUND', (0, i), (-1, i), colors.HexColor('#F8F9FA'))
+            encabezados = [str(columna) for columna in columnas]
+            total_registros = 0
+            for lote in lotes:
+                datos_tabla = [encabezados] + ExportadorService._celdas_texto(lote, celda)
+                tabla = Table(datos_tabla, colWidths=[ancho_columna] * len(columnas), repeatRows=1)
+                tabla.setStyle(estilo_tabla)
+                story.append(tabla)
+                total_registros += len(lote)
+                if al_progresar:
+                    al_progresar(total_registros)
+
+            if total_registros == 0:
+                log.warning("No hay datos para exportar a PDF")
+                return False
             
-            tabla.setStyle(estilo_tabla)
-            story.append(tabla)
             story.append(Spacer(1, 20))
             
             # Resumen
-            total_registros = len(df)
             resumen_style = styles["Normal"]
             resumen_style.alignment = 1
             story.append(Paragraph(f"<b>Total de registros:</b> {total_registros}", resumen_style))
             
             # Generar PDF
             doc.build(story)
-            print(f"[OK] PDF exportado exitosamente: {nombre_archivo}")
+            log.info("PDF exportado: %s", nombre_archivo)
             return True
             
         except Exception as e:
-            print(f"[ERROR] Error al exportar a PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
\ No newline at end of file
+            log.exception("Error al exportar a PDF: %s", e)
+            return False
@@ -1,20 +1,66 @@
 # File: seguimiento_expedientes_models.py
+import logging
 import os
 import sys
 from datetime import datetime, date
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Sequence, Tuple
+import atexit
 import sqlite3 # Reemplazo de psycopg2
+import threading
+
+log = logging.getLogger(__name__)
 
 # Agregar el directorio actual al path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from database_connector import Database
+    from escritura_agrupada import EscritorAgrupado, VENTANA_MS
+    from acceso_datos import consultar
 except ImportError:
     from models.database_connector import Database
+    from models.escritura_agrupada import EscritorAgrupado, VENTANA_MS
+    from models.acceso_datos import consultar
+
+INSERT_SEGUIMIENTO = "INSERT INTO seguimiento (expediente_id, fecha, comentario) VALUES (?, ?, ?);"
+
+
+def _normalizar_fecha(fecha: Optional[str]) -> str:
+    """Devuelve la fecha como 'YYYY-MM-DD' (hoy si viene vacía); ValueError si es inválida."""
+    if fecha and str(fecha).strip():
+        try:
+            return datetime.strptime(str(fecha).strip(), "%Y-%m-%d").date().strftime("%Y-%m-%d")
+        except ValueError:
+            raise ValueError("Formato de fecha inválido. Use YYYY-MM-DD.")
+    return date.today().strftime("%Y-%m-%d")
+
 
 class SeguimientoModel:
-    
+
+    # Escritor compartido para el "group commit" (desactivado por defecto)
+    _escritor: Optional[EscritorAgrupado] = None
+    _lock_escritor = threading.Lock()
+
+    @classmethod
+    def activar_commit_agrupado(cls, ventana_ms: float = VENTANA_MS):
+        """
+        Hace que registrar_seguimiento encole sus INSERT en un escritor que
+        confirma juntas las llamadas concurrentes que llegan dentro de
+        'ventana_ms' milisegundos (un COMMIT por grupo en vez de uno por nota).
+        """
+        with cls._lock_escritor:
+            if cls._escritor is None:
+                cls._escritor = EscritorAgrupado(Database(), ventana_ms=ventana_ms)
+                atexit.register(cls.desactivar_commit_agrupado)
+
+    @classmethod
+    def desactivar_commit_agrupado(cls):
+        """Confirma lo pendiente y vuelve al commit por llamada."""
+        with cls._lock_escritor:
+            escritor, cls._escritor = cls._escritor, None
+        if escritor is not None:
+            escritor.cerrar()
+
     def __init__(self):
         # Inicializa la instancia del Singleton de Database
         self.db_connector = Database() 
@@ -35,39 +81,34 @@ class SeguimientoModel:
         if conn is None:
             return []
             
-        cur = None
         try:
-            # Configurar el cursor para retornar resultados como diccionario (Row object)
-            conn.row_factory = sqlite3.Row
-            
-            cur = conn.cursor()
-            cur.execute(query)
-            
-            # Convertir sqlite3.Row a dict
-            rows = [dict(r) for r in cur.fetchall()]
-            return rows
+            # Lista de diccionarios (id, titulo, estado)
+            return consultar(conn, query)
         
         except sqlite3.Error as e:
-            print(f"AVISO: Error al listar expedientes: {e}. Retornando lista vacía.")
+            log.warning("Error al listar expedientes: %s. Se devuelve una lista vacía.", e)
             return []
         
         finally:
-            # Asegurar que el cursor se cierre
-            if cur:
-                cur.close()
-            # La conexión no se cierra aquí, ya que la gestiona el Singleton de Database
+            # Devolver la conexión al pool del Singleton de Database
+            self.db_connector.cerrarConexion(conn)
             
     def registrar_seguimiento(self, expediente_id: int, comentario: str, fecha: Optional[str] = None) -> Dict:
         """Registra un nuevo seguimiento y devuelve un dict con el status."""
-        if fecha and fecha.strip():
+        try:
+            fecha_txt = _normalizar_fecha(fecha)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+        escritor = SeguimientoModel._escritor
+        if escritor is not None:
+            # Group commit: se espera a que el grupo completo quede confirmado
             try:
-                fecha_obj = datetime.strptime(fecha, "%Y-%m-%d").date()
-            except Exception as e:
-                return {"status": "error", "message": "Formato de fecha inválido. Use YYYY-MM-DD."}
-        else:
-            fecha_obj = date.today()
+                new_id = escritor.ejecutar(INSERT_SEGUIMIENTO, (expediente_id, fecha_txt, comentario))
+                return {"status": "success", "id": new_id}
+            except (sqlite3.Error, RuntimeError) as e:
+                return {"status": "error", "message": f"Error al insertar seguimiento: {str(e)}"}
 
-        insert_sql = "INSERT INTO seguimiento (expediente_id, fecha, comentario) VALUES (?, ?, ?);"
         conn = self._get_conn()
         
         if conn is None:
@@ -76,7 +117,7 @@ class SeguimientoModel:
         cur = None
         try:
             cur = conn.cursor()
-            cur.execute(insert_sql, (expediente_id, fecha_obj.strftime("%Y-%m-%d"), comentario))
+            cur.execute(INSERT_SEGUIMIENTO, (expediente_id, fecha_txt, comentario))
             
             # Es necesario hacer commit explícito para persistir los cambios en SQLite
             conn.commit()
@@ -91,6 +132,69 @@ class SeguimientoModel:
         finally:
             if cur:
                 cur.close()
+            self.db_connector.cerrarConexion(conn)
+
+    def registrar_seguimientos(self, entradas: Sequence[Tuple[int, Optional[str], str]]) -> Dict:
+        """
+        Registra varios seguimientos en una sola transacción.
+
+        'entradas' es una lista de (expediente_id, fecha, comentario). Primero se
+        validan todas las fechas (cada fecha distinta se interpreta una sola vez);
+        si alguna entrada es inválida no se inserta ninguna. Devuelve
+        {"status": "success", "ids": [...]} con los ids en el orden de entrada, o
+        {"status": "error", "message": ..., "errores": [{"indice", "error"}]}.
+        """
+        fechas: Dict[Optional[str], str] = {}
+        filas = []
+        errores = []
+        for indice, entrada in enumerate(entradas):
+            try:
+                expediente_id, fecha, comentario = entrada
+            except (TypeError, ValueError):
+                errores.append({"indice": indice, "error": "Se esperaba (expediente_id, fecha, comentario)."})
+                continue
+            if fecha not in fechas:
+                try:
+                    fechas[fecha] = _normalizar_fecha(fecha)
+                except ValueError as e:
+                    fechas[fecha] = None
+                    errores.append({"indice": indice, "error": str(e)})
+                    continue
+            elif fechas[fecha] is None:
+                errores.append({"indice": indice, "error": "Formato de fecha inválido. Use YYYY-MM-DD."})
+                continue
+            filas.append((expediente_id, fechas[fecha], comentario))
+
+        if errores:
+            return {"status": "error", "message": f"{len(errores)} entrada(s) inválida(s); no se registró ninguna.",
+                    "errores": errores}
+        if not filas:
+            return {"status": "success", "ids": []}
+
+        conn = self._get_conn()
+        if conn is None:
+            return {"status": "error", "message": "No se pudo establecer conexión con la base de datos."}
+
+        cur = None
+        try:
+            cur = conn.cursor()
+            # Un único COMMIT para todo el lote
+            cur.execute("BEGIN IMMEDIATE")
+            ids = []
+            for fila in filas:
+                cur.execute(INSERT_SEGUIMIENTO, fila)
+                ids.append(cur.lastrowid)
+            conn.commit()
+            return {"status": "success", "ids": ids}
+
+        except sqlite3.Error as e:
+            conn.rollback()
+            return {"status": "error", "message": f"Error al insertar seguimientos: {str(e)}"}
+
+        finally:
+            if cur:
+                cur.close()
+            self.db_connector.cerrarConexion(conn)
 
 
     def obtener_seguimientos(self, expediente_id: Optional[int] = None, desde: Optional[str] = None, hasta: Optional[str] = None) -> List[Dict]:
@@ -120,21 +224,15 @@ class SeguimientoModel:
         if conn is None:
             return []
             
-        cur = None
         try:
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute(query, tuple(params))
-            rows = [dict(r) for r in cur.fetchall()]
-            return rows
+            return consultar(conn, query, tuple(params))
             
         except sqlite3.Error as e:
-            print(f"Error al obtener seguimientos: {e}")
+            log.error("Error al obtener seguimientos: %s", e)
             return []
             
         finally:
-            if cur:
-                cur.close()
+            self.db_connector.cerrarConexion(conn)
 
 
     def obtener_historial_por_expediente(self, expediente_id: int) -> List[Dict]:
@@ -0,0 +1,187 @@
+# models/sesion.py
+"""
+Sesión del usuario conectado: persona, cargo, roles y permisos por módulo.
+
+Se resuelve una vez, al iniciar sesión, con una sola consulta y queda en
+memoria para todo el proceso. El menú y los controladores preguntan con
+puede("gestion_nna") sin volver a la base de datos.
+
+Cuando ConfiguracionModel modifica un usuario o un rol llama a invalidar():
+la sesión se vuelve a cargar en el siguiente acceso y su 'version' cambia,
+así quien haya armado algo a partir de ella (p. ej. el menú lateral) sabe
+que debe rehacerlo.
+"""
+import logging
+import sqlite3
+import threading
+from typing import FrozenSet, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Un único módulo con ambos nombres: una única sesión activa
+try:
+    import modulo_unico
+except ImportError:
+    from models import modulo_unico
+modulo_unico.registrar(__name__)
+
+try:
+    from database_connector import Database
+except ImportError:
+    from models.database_connector import Database
+
+TODOS = "*"                  # Permiso comodín (rol Administrador)
+MODULOS_LIBRES = frozenset({"menu_inicio"})
+ROL_POR_DEFECTO = "Usuario"
+# Módulos que se conceden por rol (rol_permiso.modulo) y su nombre en pantalla
+MODULOS = {
+    "gestion_nna": "Gestión de NNA",
+    "gestion_familiares": "Gestión de Familiares",
+    "gestion_ue": "Unidades Educativas",
+    "gestion_matriculas": "Gestión de Matrículas",
+    "gestion_articulos": "Gestión de Artículos",
+    "gestion_personal": "Gestión de Personal",
+    "seguimiento_expedientes": "Seguimiento Expedientes",
+    "gestion_denuncias": "Gestión de Denuncias",
+    "reportes": "Reportes y Estadísticas",
+    "configuracion": "Configuración del Sistema",
+}
+# Permisos de un rol nuevo: los mismos que ROL_POR_DEFECTO (migración 6)
+PERMISOS_POR_DEFECTO = tuple(m for m in MODULOS if m != "configuracion")
+
+SQL_SESION = """
+    SELECT p.id, u.nombre_usuario,
+           TRIM(p.primer_nombre || ' ' || p.primer_apellido),
+           c.nombre, r.nombre, rp.modulo
+    FROM usuario u
+    JOIN persona p ON p.id = u.persona_id
+    LEFT JOIN personal pe ON pe.persona_id = p.id
+    LEFT JOIN cargo c ON c.id = pe.cargo
+    LEFT JOIN persona_rol pr ON pr.persona_id = p.id
+    LEFT JOIN rol r ON r.id = pr.rol_id
+    LEFT JOIN rol_permiso rp ON rp.rol_id = r.id
+    WHERE u.persona_id = ? AND COALESCE(p.activo, 1) = 1
+    ORDER BY r.id
+"""
+
+
+class Sesion:
+    """Datos del usuario conectado, de solo lectura."""
+
+    __slots__ = ("persona_id", "nombre_usuario", "nombre", "cargo", "roles", "permisos")
+
+    def __init__(self, persona_id: int, nombre_usuario: str, nombre: str = "",
+                 cargo: Optional[str] = None, roles: Tuple[str, ...] = (),
+                 permisos: FrozenSet[str] = frozenset()):
+        self.persona_id = persona_id
+        self.nombre_usuario = nombre_usuario
+        self.nombre = nombre
+        self.cargo = cargo
+        self.roles = roles
+        self.permisos = permisos
+
+    @property
+    def rol(self) -> str:
+        """Rol principal (el primero asignado), para mostrar."""
+        return self.roles[0] if self.roles else ROL_POR_DEFECTO
+
+    def puede(self, modulo: str) -> bool:
+        return modulo in MODULOS_LIBRES or TODOS in self.permisos or modulo in self.permisos
+
+    @classmethod
+    def cargar(cls, persona_id: int) -> Optional["Sesion"]:
+        """Resuelve la sesión con una consulta (None si el usuario no existe)."""
+        db = Database()
+        conn = db.crearConexion()
+        if conn is None:
+            return None
+        try:
+            filas = conn.execute(SQL_SESION, (persona_id,)).fetchall()
+        except sqlite3.Error as e:
+            log.error("Error al cargar la sesión de la persona %s: %s", persona_id, e)
+            return None
+        finally:
+            db.cerrarConexion(conn)
+        if not filas:
+            return None
+
+        _, nombre_usuario, nombre, cargo = filas[0][:4]
+        # dict.fromkeys: roles sin repetir y en el orden de asignación
+        roles = tuple(dict.fromkeys(fila[4] for fila in filas if fila[4]))
+        permisos = frozenset(fila[5] for fila in filas if fila[5])
+        return cls(persona_id, nombre_usuario, nombre, cargo, roles, permisos)
+
+    def __repr__(self):
+        return f"Sesion({self.nombre_usuario!r}, roles={self.roles!r}, permisos={sorted(self.permisos)!r})"
+
+
+_lock = threading.Lock()
+_actual: Optional[Sesion] = None
+_vigente = True
+_version = 0
+
+
+def iniciar(nueva: Sesion) -> Sesion:
+    """Deja activa la sesión del usuario que acaba de autenticarse."""
+    global _actual, _vigente, _version
+    with _lock:
+        _actual = nueva
+        _vigente = True
+        _version += 1
+    log.info("Sesión iniciada: %s (%s)", nueva.nombre_usuario, ", ".join(nueva.roles) or "sin rol")
+    return nueva
+
+
+def actual() -> Optional[Sesion]:
+    """Sesión activa (None si nadie inició sesión). Se recarga si fue invalidada."""
+    global _actual, _vigente
+    with _lock:
+        sesion, vigente = _actual, _vigente
+    if sesion is None or vigente:
+        return sesion
+
+    nueva = Sesion.cargar(sesion.persona_id)
+    if nueva is None:
+        # Usuario eliminado o desactivado mientras estaba conectado: sin permisos
+        nueva = Sesion(sesion.persona_id, sesion.nombre_usuario, sesion.nombre)
+    with _lock:
+        if _actual is sesion and not _vigente:
+            _actual = nueva
+            _vigente = True
+        return _actual
+
+
+def version() -> int:
+    """Cambia cada vez que la sesión se inicia, se cierra o se invalida."""
+    with _lock:
+        return _version
+
+
+def invalidar(persona_id: int = None):
+    """
+    Marca la sesión para recargarla. Con persona_id solo si es la del usuario
+    conectado (cambió su usuario); sin él, siempre (cambió un rol).
+    """
+    global _vigente, _version
+    with _lock:
+        if _actual is None or (persona_id is not None and persona_id != _actual.persona_id):
+            return
+        _vigente = False
+        _version += 1
+    log.debug("Sesión invalidada (persona %s)", persona_id)
+
+
+def cerrar():
+    global _actual, _version
+    with _lock:
+        _actual = None
+        _version += 1
+
+
+def puede(modulo: str) -> bool:
+    """
+    ¿El usuario conectado tiene acceso al módulo? Sin sesión (vistas abiertas
+    por separado, sin pasar por el login) no se restringe nada.
+    """
+    sesion = actual()
+    return sesion is None or sesion.puede(modulo)
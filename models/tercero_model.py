@@ -1,8 +1,12 @@
 # tercero_model.py
 
+import logging
 from database_connector import database
+from acceso_datos import consultar
 from sqlite3 import Error
 
+log = logging.getLogger(__name__)
+
 class TerceroModel:
     """
     Modelo para gestionar la información de terceros (Vecinos, Docentes, Entidades, etc.).
@@ -56,7 +60,7 @@ class TerceroModel:
         
         except Error as e:
             conn.rollback()
-            print(f"[ERROR_TERCERO] Error al crear tercero: {e}")
+            log.error("Error al crear tercero: %s", e)
             return None, f"Error al crear tercero: {e}"
         finally:
             self.db.cerrarConexion()
@@ -77,14 +81,9 @@ class TerceroModel:
         if conn is None:
             return []
         try:
-            cursor = conn.cursor()
-            cursor.execute(sql)
-            
-            columnas = [desc[0] for desc in cursor.description]
-            terceros = [dict(zip(columnas, row)) for row in cursor.fetchall()]
-            return terceros
+            return consultar(conn, sql)
         except Error as e:
-            print(f"[ERROR_TERCERO] Error al obtener terceros: {e}")
+            log.error("Error al obtener terceros: %s", e)
             return []
         finally:
             self.db.cerrarConexion()
\ No newline at end of file
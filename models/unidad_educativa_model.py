@@ -10,7 +10,23 @@ if current_dir not in sys.path:
 
 from database_connector import Database
 
+try:
+    from paginacion import listar_pagina
+except ImportError:
+    from models.paginacion import listar_pagina
+
+try:
+    from acceso_datos import leer
+except ImportError:
+    from models.acceso_datos import leer
+
 class UnidadEducativaModel:
+    # Órdenes admitidos por listar_pagina(); la última clave desempata (única)
+    ORDENES_LISTADO = {
+        "nombre": [("ue.nombre COLLATE NOCASE", "ASC"), ("ue.id", "ASC")],
+        "id": [("ue.id", "ASC")],
+    }
+
     def __init__(self):
         self.db = Database()
     
@@ -98,14 +114,10 @@ class UnidadEducativaModel:
             else:
                 return {"error": "Se necesita ID, nombre o nombre y tipo", "status": "error"}
             
-            rows = cursor.fetchall()
-            if not rows:
+            result = leer(cursor)
+            if not result:
                 return {"error": "No se encontraron registros", "status": "error"}
             
-            # Convertir a lista de diccionarios
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
-            
             return {"data": result, "status": "success"}
         except Exception as e:
             return {"error": str(e), "status": "error"}
@@ -219,15 +231,27 @@ class UnidadEducativaModel:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM unidad_educativa ORDER BY nombre')
             
-            rows = cursor.fetchall()
-            
-            # Convertir a lista de diccionarios
-            columns = [description[0] for description in cursor.description]
-            result = [dict(zip(columns, row)) for row in rows]
+            result = leer(cursor)
             
             return {"data": result, "status": "success"}
         except Exception as e:
             return {"error": str(e), "status": "error"}
         finally:
             if conn:
-                self.db.cerrarConexion(conn)
\ No newline at end of file
+                self.db.cerrarConexion(conn)
+
+    def listar_pagina(self, tamano=None, continuacion=None, orden="nombre"):
+        """
+        Obtiene las unidades educativas de a una página (paginación por clave).
+        Para la página siguiente se pasa el 'continuacion' de la respuesta
+        anterior (ver models/paginacion.py).
+        """
+        return listar_pagina(
+            self.db,
+            columnas="ue.*",
+            origen="unidad_educativa ue",
+            ordenes=self.ORDENES_LISTADO,
+            orden=orden,
+            tamano=tamano,
+            continuacion=continuacion,
+        )
@@ -0,0 +1,70 @@
+# models/uso_modulo_model.py
+"""
+Estadísticas de uso de los módulos del menú (tabla uso_modulo).
+
+MenuApp registra cada apertura y la precarga de vistas (views/precarga_vistas.py)
+pide los módulos más usados por el usuario para prepararlos tras el login.
+"""
+import logging
+import os
+import sqlite3
+import sys
+from typing import List
+
+log = logging.getLogger(__name__)
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from database_connector import Database
+    from acceso_datos import consultar
+except ImportError:
+    from models.database_connector import Database
+    from models.acceso_datos import consultar
+
+
+class UsoModuloModel:
+    """Cuenta las aperturas de cada módulo por usuario."""
+
+    def __init__(self):
+        self.db = Database()
+
+    def registrar_apertura(self, persona_id: int, modulo: str) -> bool:
+        """Suma una apertura del módulo (un solo UPSERT)."""
+        conn = self.db.crearConexion()
+        if conn is None:
+            return False
+        try:
+            conn.execute("""
+                INSERT INTO uso_modulo (persona_id, modulo, aperturas) VALUES (?, ?, 1)
+                ON CONFLICT(persona_id, modulo) DO UPDATE SET
+                    aperturas = aperturas + 1,
+                    ultima_apertura = CURRENT_TIMESTAMP
+            """, (persona_id or 0, modulo))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            log.error("Error al registrar la apertura de %s: %s", modulo, e)
+            return False
+        finally:
+            self.db.cerrarConexion(conn)
+
+    def mas_usados(self, persona_id: int, limite: int = 5) -> List[str]:
+        """Módulos del usuario ordenados por aperturas (y los más recientes primero)."""
+        conn = self.db.crearConexion()
+        if conn is None:
+            return []
+        try:
+            filas = consultar(conn, """
+                SELECT modulo FROM uso_modulo
+                WHERE persona_id = ?
+                ORDER BY aperturas DESC, ultima_apertura DESC
+                LIMIT ?
+            """, (persona_id or 0, limite), como=tuple)
+            return [fila[0] for fila in filas]
+        except sqlite3.Error as e:
+            log.error("Error al obtener los módulos más usados: %s", e)
+            return []
+        finally:
+            self.db.cerrarConexion(conn)
@@ -0,0 +1,260 @@
+# views/ciclo_vistas.py
+"""
+Ciclo de vida de los frames de los módulos del menú.
+
+MenuApp conservaba vivo cada frame abierto durante toda la sesión (el de
+reportes con su tabla y su gráfico de matplotlib incluidos). CicloVidaVistas
+guarda como mucho 'maximo' frames vivos, en orden LRU: al pasar el límite se
+destruye el usado hace más tiempo, y antes se toma una foto del estado de su
+formulario que se restaura cuando el usuario vuelve al módulo.
+
+Foto del formulario: se recorren los widgets del frame y se guarda el valor de
+entradas, textos, combos, casillas, interruptores y pestañas, identificados por
+su ruta relativa dentro del frame (la misma al reconstruirlo, porque la vista
+crea sus widgets siempre en el mismo orden). Un widget con obtener_estado() /
+restaurar_estado() (p. ej. SelectorBusqueda) guarda su propio estado y no se
+recorre por dentro; un frame con esos métodos puede agregar lo que el
+recorrido no ve: las vistas CRUD guardan así el registro cargado y el modo
+edición de sus botones (ver views/formulario_edicion.py).
+
+La foto se repone cuando la vista ya no tiene tareas del ejecutor pendientes:
+show() lanza la carga inicial en segundo plano y, si se repusiera antes, esa
+carga (combos, listas, valores por defecto) pisaría los valores repuestos.
+
+Nunca se desalojan los módulos fijos (menu_inicio), el visible ni uno con
+tareas del ejecutor pendientes (ejecutor.pendientes(frame): su resultado aún
+debe llegar a la vista).
+
+Al desalojar un frame se llama a su liberar() y al de su controlador, si lo
+tienen (cerrar figuras de matplotlib, soltar datos y cachés de reportes), y el
+controlador deja de apuntarle para que la memoria se libere de verdad.
+"""
+import logging
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List
+
+import customtkinter as ctk
+
+log = logging.getLogger(__name__)
+
+# Tipos cuyo valor se lee con get() y se repone con set()
+_CON_SET = (ctk.CTkComboBox, ctk.CTkOptionMenu, ctk.CTkSegmentedButton, ctk.CTkTabview)
+_CASILLAS = (ctk.CTkCheckBox, ctk.CTkSwitch)
+# Atributos que se miran al estimar la memoria de datos (los de Tk no cuentan)
+_CONTENEDORES = (list, dict, tuple, set)
+_ATRIBUTOS_TK = frozenset(("children", "_last_child_ids", "_tclCommands"))
+
+
+class CicloVidaVistas:
+    """
+    Frames vivos de MenuApp con desalojo LRU. Se usa como el diccionario
+    MenuApp._frames (in, [], get, values) más tocar(), restaurar() y
+    reporte_memoria().
+    """
+
+    MAXIMO_VIVAS = 4
+    ESPERA_CARGA_MS = 50   # Cada cuánto se revisa si terminó la carga antes de restaurar
+
+    def __init__(self, app, maximo: int = None, fijas=("menu_inicio",)):
+        self.app = app
+        self.maximo = self.MAXIMO_VIVAS if maximo is None else maximo
+        self.fijas = set(fijas)       # Nunca se desalojan
+        self._frames: "OrderedDict[str, Any]" = OrderedDict()
+        self._fotos: Dict[str, Dict[str, Any]] = {}
+        self._construidos: Dict[str, float] = {}   # módulo -> instante de creación
+        self.visible = None
+        self.desalojos = 0
+
+    # --- Interfaz de diccionario ---
+
+    def __contains__(self, modulo) -> bool:
+        return modulo in self._frames
+
+    def __getitem__(self, modulo):
+        return self._frames[modulo]
+
+    def get(self, modulo, defecto=None):
+        return self._frames.get(modulo, defecto)
+
+    def values(self):
+        return list(self._frames.values())
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __setitem__(self, modulo, frame):
+        """Registra un frame recién construido y desaloja si se pasa del límite."""
+        self._frames[modulo] = frame
+        self._frames.move_to_end(modulo)
+        self._construidos[modulo] = time.monotonic()
+        self._desalojar_sobrantes(protegido=modulo)
+
+    # --- Ciclo de vida ---
+
+    def tocar(self, modulo: str):
+        """Marca el módulo como el visible y el usado más recientemente."""
+        self.visible = modulo
+        if modulo in self._frames:
+            self._frames.move_to_end(modulo)
+
+    def libres(self) -> int:
+        """Frames que se pueden construir sin desalojar ninguno (para la precarga)."""
+        return max(0, self.maximo - len(set(self._frames) - self.fijas))
+
+    def restaurar(self, modulo: str) -> bool:
+        """
+        Repone la foto del formulario guardada al desalojar el módulo (una vez).
+        Si la vista aún espera tareas del ejecutor (la carga de show()), se
+        repone cuando terminen.
+        """
+        frame = self._frames.get(modulo)
+        if modulo not in self._fotos or frame is None:
+            return False
+        if self.app.ejecutor.pendientes(frame):
+            self.app.after(self.ESPERA_CARGA_MS, self.restaurar, modulo)
+            return True
+        foto = self._fotos.pop(modulo)
+        restaurados = 0
+        for ruta, widget in self._widgets(frame):
+            if ruta in foto:
+                restaurados += self._restaurar_widget(widget, foto[ruta])
+        if "" in foto and hasattr(frame, "restaurar_estado"):
+            frame.restaurar_estado(foto[""])
+        log.debug("Estado de %s restaurado (%d campos)", modulo, restaurados)
+        return True
+
+    def desalojar(self, modulo: str) -> bool:
+        """Destruye el frame del módulo guardando antes su estado."""
+        frame = self._frames.pop(modulo, None)
+        if frame is None:
+            return False
+        uso = self._medir(modulo, frame)
+        try:
+            foto = self._foto(frame)
+            if foto:
+                # Una foto aún sin reponer (carga en curso) es la que vale
+                self._fotos.setdefault(modulo, foto)
+        except Exception as e:
+            log.warning("No se pudo guardar el estado de %s: %s", modulo, e)
+        # El controlador sobrevive: que no retenga el frame destruido ni sus datos
+        controlador = self.app._controllers.get(modulo)
+        for objeto in (frame, controlador):
+            if hasattr(objeto, "liberar"):
+                try:
+                    objeto.liberar()
+                except Exception as e:
+                    log.warning("Error al liberar los recursos de %s: %s", modulo, e)
+        for atributo in ("vista", "view"):
+            if controlador is not None and getattr(controlador, atributo, None) is frame:
+                setattr(controlador, atributo, None)
+
+        frame.destroy()
+        self._construidos.pop(modulo, None)
+        self.desalojos += 1
+        log.info("Vista %s desalojada (%d widgets, ~%.0f KB de datos)",
+                 modulo, uso["widgets"], uso["datos_kb"])
+        return True
+
+    def reporte_memoria(self) -> List[Dict[str, Any]]:
+        """
+        Por cada frame vivo (del usado hace más tiempo al más reciente): widgets
+        de Tk, estimación de los datos que retienen sus widgets y su controlador,
+        y segundos desde su construcción.
+        """
+        return [self._medir(modulo, frame) for modulo, frame in self._frames.items()]
+
+    # --- Internos ---
+
+    def _desalojar_sobrantes(self, protegido: str):
+        sobrantes = len(self._frames) - len(self.fijas & set(self._frames)) - self.maximo
+        candidatos = [m for m, frame in self._frames.items()
+                      if m not in self.fijas and m not in (protegido, self.visible)
+                      and not self.app.ejecutor.pendientes(frame)]
+        for modulo in candidatos[:max(0, sobrantes)]:
+            self.desalojar(modulo)
+
+    @staticmethod
+    def _widgets(frame) -> Iterator:
+        """(ruta relativa, widget) de los widgets con estado, en orden de creación."""
+        base = str(frame)
+        pendientes = list(reversed(frame.winfo_children()))
+        while pendientes:
+            widget = pendientes.pop()
+            yield str(widget)[len(base):], widget
+            if hasattr(widget, "obtener_estado"):
+                continue  # Guarda su propio estado, incluido el de sus hijos
+            pendientes.extend(reversed(widget.winfo_children()))
+
+    def _foto(self, frame) -> Dict[str, Any]:
+        foto = {}
+        for ruta, widget in self._widgets(frame):
+            try:
+                if hasattr(widget, "obtener_estado"):
+                    foto[ruta] = widget.obtener_estado()
+                elif isinstance(widget, ctk.CTkTextbox):
+                    foto[ruta] = widget.get("1.0", "end-1c")
+                elif isinstance(widget, (ctk.CTkEntry,) + _CON_SET + _CASILLAS):
+                    foto[ruta] = widget.get()
+            except Exception:
+                continue  # Un widget a medio destruir no impide guardar el resto
+        if hasattr(frame, "obtener_estado"):
+            foto[""] = frame.obtener_estado()
+        return {ruta: valor for ruta, valor in foto.items() if valor not in ("", None)}
+
+    @staticmethod
+    def _restaurar_widget(widget, valor) -> int:
+        try:
+            if hasattr(widget, "restaurar_estado"):
+                widget.restaurar_estado(valor)
+            elif isinstance(widget, ctk.CTkTextbox):
+                widget.delete("1.0", "end")
+                widget.insert("1.0", valor)
+            elif isinstance(widget, ctk.CTkEntry):
+                widget.delete(0, "end")
+                widget.insert(0, valor)
+            elif isinstance(widget, _CASILLAS):
+                widget.select() if valor else widget.deselect()
+            elif isinstance(widget, _CON_SET):
+                widget.set(valor)
+            else:
+                return 0
+            return 1
+        except Exception as e:
+            # Un valor que ya no existe (p. ej. una opción borrada) se omite
+            log.debug("No se pudo restaurar %s: %s", widget, e)
+            return 0
+
+    def _medir(self, modulo: str, frame) -> Dict[str, Any]:
+        # Los datos grandes pueden colgar de un widget hijo (p. ej. TablaVirtual._datos)
+        widgets, datos = 0, self._tamano_datos(self.app._controllers.get(modulo))
+        pendientes = [frame]
+        while pendientes:
+            widget = pendientes.pop()
+            widgets += 1
+            datos += self._tamano_datos(widget)
+            try:
+                pendientes.extend(widget.winfo_children())
+            except Exception:
+                pass
+        creado = self._construidos.get(modulo)
+        return {
+            "modulo": modulo,
+            "widgets": widgets,
+            "datos_kb": datos / 1024,
+            "vivo_s": time.monotonic() - creado if creado else 0.0,
+        }
+
+    @staticmethod
+    def _tamano_datos(objeto) -> int:
+        """Bytes aproximados de las colecciones que cuelgan del objeto (dos niveles)."""
+        if objeto is None:
+            return 0
+        total = 0
+        for nombre, valor in list(vars(objeto).items()):
+            if isinstance(valor, _CONTENEDORES) and valor and nombre not in _ATRIBUTOS_TK:
+                total += sys.getsizeof(valor)
+                elementos = valor.values() if isinstance(valor, dict) else valor
+                total += sum(sys.getsizeof(elemento) for elemento in elementos)
+        return total
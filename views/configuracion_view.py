@@ -2,8 +2,13 @@ import customtkinter as ctk
 from tkinter import messagebox
 from typing import List, Dict, Any, Optional
 from controllers.configuracion_controller import ConfiguracionControlador
+from views.tabla_virtual import TablaVirtual
+from views.vista_ocupable import VistaOcupable
 
-class ConfiguracionViewFrame(ctk.CTkFrame):
+class ConfiguracionViewFrame(VistaOcupable, ctk.CTkFrame):
+
+    BOTONES_OCUPABLES = ("btn_rol_crear_guardar", "btn_rol_eliminar",
+                         "btn_usuario_crear_guardar", "btn_usuario_eliminar")
     
     def __init__(self, master, controller: ConfiguracionControlador):
         super().__init__(master, corner_radius=0, fg_color="transparent") 
@@ -18,6 +23,8 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         self.rol_id_var: Optional[int] = None
         self.rol_nombre_var = ctk.StringVar(self, value="")
         self.rol_desc_var = ctk.StringVar(self, value="")
+        # Permisos del rol: clave de módulo (o '*') -> casilla marcada
+        self.rol_permiso_vars: Dict[str, ctk.BooleanVar] = {}
         
         # --- Variables de Estado de Usuarios ---
         self.usuario_id_var: Optional[int] = None
@@ -41,6 +48,11 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         self.btn_usuario_crear_guardar: Optional[ctk.CTkButton] = None
         self.btn_usuario_cancelar: Optional[ctk.CTkButton] = None
         self.btn_usuario_eliminar: Optional[ctk.CTkButton] = None
+
+        self.diag_estado_label: Optional[ctk.CTkLabel] = None
+        self.diag_sentencias_tabla: Optional[TablaVirtual] = None
+        self.diag_lentas_tabla: Optional[TablaVirtual] = None
+        self.diag_detalle_text: Optional[ctk.CTkTextbox] = None
         
         self._configurar_interfaz()
 
@@ -60,16 +72,18 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
                                           text_color="yellow")
         self.message_label.grid(row=0, column=0, pady=(60, 0), padx=20, sticky="n")
 
-        # Frame principal con las dos pestañas (Roles y Usuarios)
+        # Frame principal con las pestañas (Roles, Usuarios y Diagnóstico)
         main_tabview = ctk.CTkTabview(self, fg_color="transparent")
         main_tabview.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
         
         main_tabview.add("👤 Roles")
         main_tabview.add("👥 Usuarios")
+        main_tabview.add("🩺 Diagnóstico")
         
         # Configurar las pestañas
         self._configurar_tab_roles(main_tabview.tab("👤 Roles"))
         self._configurar_tab_usuarios(main_tabview.tab("👥 Usuarios"))
+        self._configurar_tab_diagnostico(main_tabview.tab("🩺 Diagnóstico"))
 
     # ======================================================================
     # PESTAÑA DE ROLES
@@ -82,11 +96,14 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         tab_frame.rowconfigure(0, weight=1)
 
         # 1. Lista de Roles Existentes
-        self.rol_list_frame = ctk.CTkScrollableFrame(tab_frame, 
-                                                     label_text="Roles Existentes", 
-                                                     fg_color="#2e2e2e")
+        self.rol_list_frame = TablaVirtual(tab_frame, 
+                                           titulo="Roles Existentes", 
+                                           encabezados={"id": "ID", "nombre": "Nombre", 
+                                                        "descripcion": "Descripción"}, 
+                                           al_seleccionar=self._cargar_rol_para_edicion, 
+                                           texto_accion="Editar", 
+                                           mensaje_vacio="No hay roles registrados.")
         self.rol_list_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.rol_list_frame.columnconfigure(0, weight=1)
 
         # 2. Formulario de Creación/Edición de Roles
         self.rol_form_frame = ctk.CTkFrame(tab_frame, fg_color="#111111", 
@@ -113,6 +130,21 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
                                                                               pady=(0, 20), 
                                                                               fill="x")
 
+        # Módulos que concede el rol (tabla rol_permiso)
+        ctk.CTkLabel(self.rol_form_frame, text="Módulos permitidos:").pack(padx=20, 
+                                                                           pady=(0, 5), 
+                                                                           fill="x")
+        permisos_frame = ctk.CTkFrame(self.rol_form_frame, fg_color="transparent")
+        permisos_frame.pack(padx=20, pady=(0, 10), fill="x")
+        permisos_frame.columnconfigure((0, 1), weight=1)
+        modulos = [("*", "Todos los módulos")] + list(self.controller.modulos_permisibles().items())
+        for i, (modulo, texto) in enumerate(modulos):
+            variable = ctk.BooleanVar(self, value=False)
+            self.rol_permiso_vars[modulo] = variable
+            ctk.CTkCheckBox(permisos_frame, text=texto, variable=variable).grid(
+                row=i // 2, column=i % 2, padx=5, pady=3, sticky="w")
+        self._marcar_permisos(self.controller.permisos_por_defecto())
+
         # Botones de Acción
         btn_frame = ctk.CTkFrame(self.rol_form_frame, fg_color="transparent")
         btn_frame.pack(padx=20, pady=(10, 20), fill="x")
@@ -147,10 +179,6 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         Carga los roles en el marco de lista y prepara las opciones de ComboBox.
         """
         
-        # Limpiar lista de roles
-        for widget in self.rol_list_frame.winfo_children():
-            widget.destroy()
-            
         # Preparar opciones para ComboBox de Usuarios
         rol_options = ["Seleccionar Rol"]
         # Mapeo de ID a Nombre/Desc para uso interno. Inicializado en __init__.
@@ -165,20 +193,8 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
             rol_options.append(rol_str)
             self.rol_map[rol['id']] = rol_str
 
-            # Crear elemento en la lista (visualización)
-            rol_frame = ctk.CTkFrame(self.rol_list_frame, fg_color="#34495e", 
-                                     corner_radius=8)
-            rol_frame.pack(fill="x", padx=10, pady=(6, 3))
-            
-            ctk.CTkLabel(rol_frame, text=rol_str, 
-                         font=ctk.CTkFont(size=14, weight="bold"), 
-                         anchor="w").pack(padx=10, pady=(5, 0), fill="x")
-            ctk.CTkLabel(rol_frame, text=rol['descripcion'], anchor="w", 
-                         wraplength=400).pack(padx=10, pady=(0, 5), fill="x")
-
-            btn_edit = ctk.CTkButton(rol_frame, text="Editar", width=60, 
-                                     command=lambda r=rol: self._cargar_rol_para_edicion(r))
-            btn_edit.pack(side="right", padx=10, pady=5)
+        # Lista de roles (visualización). Las filas se reutilizan al desplazarse.
+        self.rol_list_frame.cargar(roles, ["id", "nombre", "descripcion"])
             
         # Actualizar ComboBox de Usuarios si existe
         if self.usuario_rol_combo:
@@ -199,12 +215,15 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         self.rol_id_var = rol_data['id']
         self.rol_nombre_var.set(rol_data['nombre'])
         self.rol_desc_var.set(rol_data['descripcion'])
-        self.btn_rol_crear_guardar.configure(text="💾 Guardar Cambios", 
-                                             fg_color="#3498db", 
-                                             hover_color="#2980b9")
-        self.btn_rol_eliminar.configure(state="normal")
+        self._modo_edicion_rol(True)
+        self._marcar_permisos(self.controller.obtener_permisos_rol(rol_data['id']))
         self.display_message(f"Cargado Rol ID {rol_data['id']} para edición.", True)
 
+    def _marcar_permisos(self, permisos):
+        """Marca en el editor los módulos que concede el rol."""
+        for modulo, variable in self.rol_permiso_vars.items():
+            variable.set(modulo in permisos)
+
     def _limpiar_campos_rol(self, clear_selection: bool = False):
         """
         [MÉTODO REQUERIDO POR EL CONTROLADOR]
@@ -214,12 +233,22 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
             self.rol_id_var = None
         self.rol_nombre_var.set("")
         self.rol_desc_var.set("")
-        self.btn_rol_crear_guardar.configure(text="➕ Crear Rol", 
-                                             fg_color="#2ecc71", 
-                                             hover_color="#27ae60")
-        self.btn_rol_eliminar.configure(state="disabled")
+        self._marcar_permisos(self.controller.permisos_por_defecto())
+        self._modo_edicion_rol(False)
         self.display_message("Formulario de Rol listo para un nuevo registro.", True)
 
+    def _modo_edicion_rol(self, editando: bool):
+        """Botones del formulario de Roles según haya un rol cargado o no."""
+        if editando:
+            self.btn_rol_crear_guardar.configure(text="💾 Guardar Cambios", 
+                                                 fg_color="#3498db", 
+                                                 hover_color="#2980b9")
+        else:
+            self.btn_rol_crear_guardar.configure(text="➕ Crear Rol", 
+                                                 fg_color="#2ecc71", 
+                                                 hover_color="#27ae60")
+        self._estado_boton("btn_rol_eliminar", "normal" if editando else "disabled")
+
 
     # --- Handlers de Rol ---
     
@@ -228,7 +257,8 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         data = {
             'id': self.rol_id_var, # Será None si es creación
             'nombre': self.rol_nombre_var.get().strip(),
-            'descripcion': self.rol_desc_var.get().strip()
+            'descripcion': self.rol_desc_var.get().strip(),
+            'permisos': [modulo for modulo, variable in self.rol_permiso_vars.items() if variable.get()]
         }
 
         if data['id'] is None:
@@ -260,11 +290,17 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         tab_frame.rowconfigure(0, weight=1)
 
         # 1. Lista de Usuarios Existentes
-        self.usuario_list_frame = ctk.CTkScrollableFrame(tab_frame, 
-                                                         label_text="Usuarios Existentes", 
-                                                         fg_color="#2e2e2e")
+        self.usuario_list_frame = TablaVirtual(tab_frame, 
+                                               titulo="Usuarios Existentes", 
+                                               encabezados={"persona_id": "ID", 
+                                                            "nombre_usuario": "Nombre", 
+                                                            "primer_apellido": "Apellido", 
+                                                            "rol_nombre": "Rol", 
+                                                            "documento_identidad": "Documento"}, 
+                                               al_seleccionar=self._editar_usuario_de_lista, 
+                                               texto_accion="Editar", 
+                                               mensaje_vacio="No hay usuarios registrados.")
         self.usuario_list_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.usuario_list_frame.columnconfigure(0, weight=1)
 
         # 2. Formulario de Creación/Edición de Usuarios
         self.usuario_form_frame = ctk.CTkFrame(tab_frame, fg_color="#111111", 
@@ -342,52 +378,31 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
     def _cargar_usuarios(self, usuarios: List[Dict[str, Any]]):
         """
         [MÉTODO REQUERIDO POR EL CONTROLADOR]
-        Carga los usuarios en el marco de lista.
+        Carga los usuarios en la lista (tabla virtual).
         """
-        
-        # Limpiar lista de usuarios
-        for widget in self.usuario_list_frame.winfo_children():
-            widget.destroy()
-            
-        for usuario in usuarios:
-            # Crear elemento en la lista (visualización)
-            user_frame = ctk.CTkFrame(self.usuario_list_frame, fg_color="#34495e", 
-                                     corner_radius=8)
-            user_frame.pack(fill="x", padx=10, pady=(6, 3))
-            
-            # Nota: El controlador trae 'nombre_usuario' (que es primer_nombre) y 'primer_apellido'
-            # del modelo real.
-            nombre_completo = f"{usuario['nombre_usuario']} {usuario['primer_apellido']} ({usuario['rol_nombre']})"
-            
-            ctk.CTkLabel(user_frame, 
-                         text=nombre_completo, 
-                         font=ctk.CTkFont(size=14, weight="bold"), 
-                         anchor="w").pack(padx=10, pady=(5, 0), fill="x")
-            
-            ctk.CTkLabel(user_frame, 
-                         text=f"Doc: {usuario['documento_identidad']} | ID: {usuario['persona_id']}", 
-                         anchor="w", text_color="#bdc3c7").pack(padx=10, pady=(0, 5), fill="x")
-
-            btn_edit = ctk.CTkButton(user_frame, text="Editar", width=60, 
-                                     # Se ajustan las claves para coincidir con lo que trae el modelo
-                                     command=lambda u=usuario: self._cargar_usuario_para_edicion({
-                                         'id': u['persona_id'], # El ID de la persona
-                                         'documento': u['documento_identidad'],
-                                         'primer_nombre': u['nombre_usuario'], # Es el primer_nombre
-                                         'apellido': u['primer_apellido'],
-                                         'rol_id': u['rol_id'],
-                                         'rol_nombre': u['rol_nombre']
-                                     }))
-            btn_edit.pack(side="right", padx=10, pady=5)
+        # Nota: El controlador trae 'nombre_usuario' (que es primer_nombre) y 'primer_apellido'
+        # del modelo real.
+        self.usuario_list_frame.cargar(usuarios, ["persona_id", "nombre_usuario", "primer_apellido", 
+                                                  "rol_nombre", "documento_identidad"])
+
+    def _editar_usuario_de_lista(self, u: Dict[str, Any]):
+        """Botón 'Editar' de la lista de usuarios."""
+        # Se ajustan las claves para coincidir con lo que trae el modelo
+        self._cargar_usuario_para_edicion({
+            'id': u['persona_id'], # El ID de la persona
+            'documento': u['documento_identidad'],
+            'primer_nombre': u['nombre_usuario'], # Es el primer_nombre
+            'apellido': u['primer_apellido'],
+            'rol_id': u['rol_id'],
+            'rol_nombre': u['rol_nombre']
+        })
 
 
     def _cargar_usuario_para_edicion(self, usuario_data: Dict[str, Any]):
         """Carga los datos de un usuario en el formulario para edición."""
         self.usuario_id_var = usuario_data['id']
-        
-        # El documento se debe deshabilitar en edición si se usa como ID único
+
         self.usuario_doc_var.set(usuario_data['documento'])
-        self.usuario_doc_entry.configure(state="disabled") 
         
         self.usuario_nombre_var.set(usuario_data['primer_nombre'])
         self.usuario_apellido_var.set(usuario_data['apellido'])
@@ -407,10 +422,7 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
             default_value = combo_values[0] if combo_values else "Seleccionar Rol"
             self.usuario_rol_var.set(default_value)
 
-        self.btn_usuario_crear_guardar.configure(text="💾 Guardar Cambios", 
-                                                 fg_color="#3498db", 
-                                                 hover_color="#2980b9")
-        self.btn_usuario_eliminar.configure(state="normal")
+        self._modo_edicion_usuario(True)
         self.display_message(f"Cargado Usuario ID {usuario_data['id']} para edición.", 
                              True)
 
@@ -422,9 +434,6 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         if clear_selection:
             self.usuario_id_var = None
         self.usuario_doc_var.set("")
-        if self.usuario_doc_entry: # Comprobación de seguridad
-            # Habilitar Documento para nuevo registro
-            self.usuario_doc_entry.configure(state="normal") 
         self.usuario_nombre_var.set("")
         self.usuario_apellido_var.set("")
         
@@ -433,12 +442,37 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
         default_value = combo_values[0] if combo_values else "Seleccionar Rol"
         self.usuario_rol_var.set(default_value)
         
-        self.btn_usuario_crear_guardar.configure(text="➕ Crear Usuario", 
-                                                 fg_color="#2ecc71", 
-                                                 hover_color="#27ae60")
-        self.btn_usuario_eliminar.configure(state="disabled")
+        self._modo_edicion_usuario(False)
         self.display_message("Formulario de Usuario listo para un nuevo registro.", True)
 
+    def _modo_edicion_usuario(self, editando: bool):
+        """Documento y botones del formulario de Usuarios según haya un usuario cargado o no."""
+        if self.usuario_doc_entry: # Comprobación de seguridad
+            # El documento se deshabilita en edición (se usa como ID único)
+            self.usuario_doc_entry.configure(state="disabled" if editando else "normal")
+        if editando:
+            self.btn_usuario_crear_guardar.configure(text="💾 Guardar Cambios", 
+                                                     fg_color="#3498db", 
+                                                     hover_color="#2980b9")
+        else:
+            self.btn_usuario_crear_guardar.configure(text="➕ Crear Usuario", 
+                                                     fg_color="#2ecc71", 
+                                                     hover_color="#27ae60")
+        self._estado_boton("btn_usuario_eliminar", "normal" if editando else "disabled")
+
+    def obtener_estado(self) -> Optional[Dict[str, Any]]:
+        """Rol y usuario cargados para edición (MenuApp los guarda al desalojar la vista)."""
+        if self.rol_id_var is None and self.usuario_id_var is None:
+            return None
+        return {"rol_id": self.rol_id_var, "usuario_id": self.usuario_id_var}
+
+    def restaurar_estado(self, estado: Dict[str, Any]):
+        """Vuelve al modo edición del rol y del usuario devueltos por obtener_estado()."""
+        self.rol_id_var = estado.get("rol_id")
+        self._modo_edicion_rol(self.rol_id_var is not None)
+        self.usuario_id_var = estado.get("usuario_id")
+        self._modo_edicion_usuario(self.usuario_id_var is not None)
+
 
     # --- Handlers de Usuario ---
     
@@ -475,6 +509,102 @@ class ConfiguracionViewFrame(ctk.CTkFrame):
                                  is_success=False)
 
 
+    # ======================================================================
+    # PESTAÑA DE DIAGNÓSTICO
+    # ======================================================================
+
+    def _configurar_tab_diagnostico(self, tab_frame: ctk.CTkFrame):
+        """Configura la pestaña con las estadísticas de las consultas a la base de datos."""
+        tab_frame.columnconfigure(0, weight=1)
+        tab_frame.columnconfigure(1, weight=1)
+        tab_frame.rowconfigure(1, weight=1)
+
+        # 1. Totales y acciones
+        barra = ctk.CTkFrame(tab_frame, fg_color="transparent")
+        barra.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(10, 0))
+        barra.columnconfigure(0, weight=1)
+
+        self.diag_estado_label = ctk.CTkLabel(barra, text="", anchor="w", justify="left")
+        self.diag_estado_label.grid(row=0, column=0, sticky="ew")
+        ctk.CTkButton(barra, text="🔄 Actualizar", command=self.controller.cargar_diagnostico,
+                      height=35, width=130).grid(row=0, column=1, padx=5)
+        ctk.CTkButton(barra, text="🧹 Reiniciar", command=self.controller.handle_reiniciar_diagnostico,
+                      fg_color="#95a5a6", hover_color="#7f8c8d",
+                      height=35, width=130).grid(row=0, column=2, padx=(5, 0))
+
+        # 2. Sentencias con más tiempo acumulado
+        self.diag_sentencias_tabla = TablaVirtual(tab_frame,
+                                                  titulo="Sentencias con más tiempo acumulado",
+                                                  encabezados={"llamador": "Método", "sentencia": "Sentencia",
+                                                               "ejecuciones": "Veces", "total_ms": "Total ms",
+                                                               "p95_ms": "p95 ms", "maximo_ms": "Máx ms"},
+                                                  al_seleccionar=self._mostrar_detalle_sentencia,
+                                                  texto_accion="Ver",
+                                                  mensaje_vacio="Aún no hay consultas medidas.")
+        self.diag_sentencias_tabla.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+
+        # 3. Registro de consultas lentas
+        self.diag_lentas_tabla = TablaVirtual(tab_frame,
+                                              titulo="Consultas lentas",
+                                              encabezados={"hora": "Hora", "duracion_ms": "ms",
+                                                           "llamador": "Método", "sentencia": "Sentencia"},
+                                              al_seleccionar=self._mostrar_detalle_lenta,
+                                              texto_accion="Ver",
+                                              mensaje_vacio="No hubo consultas sobre el umbral.")
+        self.diag_lentas_tabla.grid(row=1, column=1, sticky="nsew", padx=10, pady=10)
+
+        # 4. Detalle (SQL completo y EXPLAIN QUERY PLAN)
+        self.diag_detalle_text = ctk.CTkTextbox(tab_frame, height=160, font=("Courier New", 12))
+        self.diag_detalle_text.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
+        self._mostrar_detalle("Seleccione una sentencia para ver el SQL completo y su plan de ejecución.")
+
+    def _cargar_diagnostico(self, estado: Dict[str, Any], sentencias: List[Dict[str, Any]],
+                            lentas: List[Dict[str, Any]]):
+        """
+        [MÉTODO REQUERIDO POR EL CONTROLADOR]
+        Muestra los totales del perfilador, las sentencias que más pesan y las consultas lentas.
+        """
+        def ms(valor):
+            return "-" if valor is None else f"{valor:.2f}"
+
+        self.diag_estado_label.configure(
+            text=(f"{estado['ejecuciones']} ejecuciones de {estado['sentencias']} sentencias desde {estado['desde']}"
+                  f"  ·  p50 {ms(estado['p50'])} ms  ·  p95 {ms(estado['p95'])} ms  ·  p99 {ms(estado['p99'])} ms"
+                  f"  ·  {estado['lentas']} lentas (umbral {estado['umbral_ms']:g} ms)"
+                  f"{'' if estado['activo'] else '  ·  PERFILADO DESACTIVADO'}"))
+        self.diag_sentencias_tabla.cargar(
+            [{**s, "sentencia": self._abreviar(s["sql"])} for s in sentencias],
+            ["llamador", "sentencia", "ejecuciones", "total_ms", "p95_ms", "maximo_ms"])
+        self.diag_lentas_tabla.cargar(
+            [{**l, "sentencia": self._abreviar(l["sql"])} for l in lentas],
+            ["hora", "duracion_ms", "llamador", "sentencia"])
+
+    @staticmethod
+    def _abreviar(sql: str, largo: int = 60) -> str:
+        return sql if len(sql) <= largo else sql[:largo - 1] + "…"
+
+    def _mostrar_detalle_sentencia(self, s: Dict[str, Any]):
+        """Botón 'Ver' de la tabla de sentencias."""
+        self._mostrar_detalle(
+            f"{s['llamador']}: {s['ejecuciones']} ejecuciones, {s['filas']} filas en total\n"
+            f"promedio {s['promedio_ms']} ms · p50 {s['p50_ms']} · p95 {s['p95_ms']} · "
+            f"p99 {s['p99_ms']} · máx {s['maximo_ms']} ms\n\n"
+            f"{s['sql']}\n\nPLAN:\n{self.controller.obtener_plan(s['sql'])}")
+
+    def _mostrar_detalle_lenta(self, l: Dict[str, Any]):
+        """Botón 'Ver' del registro de consultas lentas."""
+        error = f" · error: {l['error']}" if l.get("error") else ""
+        plan = "\n".join(l["plan"]) or "(sin plan)"
+        self._mostrar_detalle(
+            f"{l['hora']} · {l['llamador']}: {l['duracion_ms']} ms, {l['filas']} filas{error}\n\n"
+            f"{l['sql']}\n\nPLAN:\n{plan}")
+
+    def _mostrar_detalle(self, texto: str):
+        self.diag_detalle_text.configure(state="normal")
+        self.diag_detalle_text.delete("1.0", "end")
+        self.diag_detalle_text.insert("1.0", texto)
+        self.diag_detalle_text.configure(state="disabled")
+
     # ======================================================================
     # MÉTODO DE UTILIDAD
     # ======================================================================
@@ -0,0 +1,33 @@
+# views/formulario_edicion.py
+from typing import Any, Dict, Optional
+
+
+class FormularioEdicion:
+    """
+    Mixin para las vistas CRUD con un registro cargado para edición.
+
+    CicloVidaVistas guarda los valores de los campos al desalojar la vista, pero
+    el registro cargado vive en un atributo (nna_id_cargado, ue_id_cargada...)
+    y el modo edición en los botones. obtener_estado() / restaurar_estado()
+    los guardan y los reponen; sin ellos la vista volvería con los datos del
+    registro en modo creación.
+
+    La vista indica en ID_CARGADO el atributo del registro cargado y, si el modo
+    edición cambia algo más que Modificar/Eliminar, redefine _modo_edicion().
+    """
+
+    ID_CARGADO = "id_cargado"
+
+    def obtener_estado(self) -> Optional[Dict[str, Any]]:
+        """Registro cargado para edición, o None en modo creación."""
+        cargado = getattr(self, self.ID_CARGADO, None)
+        return None if cargado is None else {"id_cargado": cargado}
+
+    def restaurar_estado(self, estado: Dict[str, Any]):
+        """Vuelve a cargar para edición el registro devuelto por obtener_estado()."""
+        setattr(self, self.ID_CARGADO, estado.get("id_cargado"))
+        self._modo_edicion(estado.get("id_cargado") is not None)
+
+    def _modo_edicion(self, editando: bool):
+        """Habilita Modificar/Eliminar solo con un registro cargado."""
+        self._set_btn_state("normal" if editando else "disabled")
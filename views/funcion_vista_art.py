@@ -1,16 +1,20 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from controllers.articulo_controller import ArticuloControlador 
+from views.vista_ocupable import VistaOcupable
+from views.formulario_edicion import FormularioEdicion
 
 # ----------------------------------------------------------------------
 # CLASE DE VISTA ADAPTADA
 # ----------------------------------------------------------------------
 
-class ArticuloViewFrame(ctk.CTkFrame):
+class ArticuloViewFrame(VistaOcupable, FormularioEdicion, ctk.CTkFrame):
     """
     Vista para el módulo de gestión de Artículos LOPNNA. 
     Hereda de CTkFrame para ser cargado en el panel de contenido de MenuApp.
     """
+
+    ID_CARGADO = "articulo_id_cargado"
     
     # MODIFICACIÓN CLAVE: Recibir el master y el controller
     def __init__(self, master, controller: ArticuloControlador):
@@ -171,11 +175,6 @@ class ArticuloViewFrame(ctk.CTkFrame):
         self.articulo_id_cargado = data.get("id")
         self._set_btn_state("normal")
         
-    def _set_btn_state(self, state):
-        """Habilita o deshabilita los botones de Modificar/Eliminar."""
-        self.btn_modificar.configure(state=state)
-        self.btn_eliminar.configure(state=state)
-        
     def display_message(self, message: str, is_success: bool = True):
         """Muestra un mensaje de estado en la interfaz."""
         color = "#2ecc71" if is_success else "#e74c3c"
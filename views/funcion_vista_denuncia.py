@@ -1,12 +1,16 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from controllers.denuncia_controller import DenunciaController 
+from views.vista_ocupable import VistaOcupable
+from views.formulario_edicion import FormularioEdicion
 
 # ----------------------------------------------------------------------
 # CLASE DE VISTA ADAPTADA (Estructura de ArticuloViewFrame)
 # ----------------------------------------------------------------------
 
-class FuncionVistaDenuncia(ctk.CTkFrame):
+class FuncionVistaDenuncia(VistaOcupable, FormularioEdicion, ctk.CTkFrame):
+
+    ID_CARGADO = "denuncia_id_cargada"
 
     def __init__(self, master, controller: DenunciaController):
         super().__init__(master, corner_radius=0, fg_color="transparent") 
@@ -189,11 +193,6 @@ class FuncionVistaDenuncia(ctk.CTkFrame):
         self.denuncia_id_cargada = data.get("id")
         self._set_btn_state("normal")
         
-    def _set_btn_state(self, state):
-        """Habilita o deshabilita los botones de Modificar/Eliminar."""
-        self.btn_modificar.configure(state=state)
-        self.btn_eliminar.configure(state=state)
-        
     def display_message(self, message: str, is_success: bool = True):
         """Muestra un mensaje de estado en la interfaz (Similar a ArticuloViewFrame)."""
         color = "#2ecc71" if is_success else "#e74c3c"
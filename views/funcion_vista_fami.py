@@ -7,12 +7,16 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__))) 
 
 from controllers.familiar_controller import FamiliarControlador 
+from views.vista_ocupable import VistaOcupable
+from views.formulario_edicion import FormularioEdicion
 
-class FamiliarViewFrame(ctk.CTkFrame):
+class FamiliarViewFrame(VistaOcupable, FormularioEdicion, ctk.CTkFrame):
     """
     Vista para el módulo de gestión de Familiares. 
     Hereda de CTkFrame para ser cargado en el panel de contenido de MenuApp.
     """
+
+    ID_CARGADO = "familiar_id_cargado"
     
     def __init__(self, master, controller: FamiliarControlador):
         super().__init__(master, corner_radius=0, fg_color="transparent") 
@@ -227,11 +231,6 @@ class FamiliarViewFrame(ctk.CTkFrame):
         if nombres:
              self.parentesco_var.set(nombres[0])
         
-    def _set_btn_state(self, state):
-        """Habilita o deshabilita los botones de Modificar/Eliminar."""
-        self.btn_modificar.configure(state=state)
-        self.btn_eliminar.configure(state=state)
-        
     def display_message(self, message: str, is_success: bool = True):
         """Muestra un mensaje de estado en la interfaz."""
         color = "#2ecc71" if is_success else "#e74c3c"
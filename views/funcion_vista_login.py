@@ -2,6 +2,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 import sys
 import os
+from views.vista_ocupable import VistaOcupable
 # from controllers.login_controllers import LoginController  <--- ¡LÍNEA ELIMINADA PARA ROMPER LA IMPORTACIÓN CIRCULAR!
 
 ctk.set_appearance_mode("dark")
@@ -11,9 +12,12 @@ ctk.set_default_color_theme("blue")
 # CLASE VISTA (LoginView)
 # ----------------------------------------------------------------------
 
-class LoginView(ctk.CTk):
+class LoginView(VistaOcupable, ctk.CTk):
     """La interfaz gráfica de la ventana de Login, que interactúa con LoginController."""
 
+    # Deshabilitado mientras el controlador verifica la contraseña
+    BOTONES_OCUPABLES = ("button",)
+
     # Se elimina el valor por defecto 'controller=LoginController' para forzar la asignación externa.
     def __init__(self, controller=None): 
         super().__init__()
@@ -110,13 +114,20 @@ class LoginView(ctk.CTk):
                 messagebox.showerror("Error de Registro", "Las contraseñas no coinciden.", parent=register_window)
                 return
             
-            # Llama al controlador para registrar el usuario (self.controller ahora es una instancia)
-            if self.controller.handle_registration(usuario, password):
-                messagebox.showinfo("Éxito", f"Usuario '{usuario}' registrado correctamente.", parent=register_window)
+            # El controlador calcula el hash en segundo plano y avisa al terminar
+            register_button.configure(state="disabled")
+            self.controller.handle_registration(usuario, password, al_terminar=registro_terminado)
+
+        def registro_terminado(ok, mensaje):
+            if not register_window.winfo_exists():
+                return
+            if ok:
+                messagebox.showinfo("Éxito", mensaje, parent=register_window)
                 register_window.destroy()
             else:
-                messagebox.showerror("Error de Registro", f"El usuario '{usuario}' ya existe o hubo un error al guardar.", parent=register_window)
+                register_button.configure(state="normal")
+                messagebox.showerror("Error de Registro", mensaje, parent=register_window)
 
 
         register_button = ctk.CTkButton(master=frame, text='Registrar', command=registrar)
-        register_button.pack(pady=20, padx=10)
\ No newline at end of file
+        register_button.pack(pady=20, padx=10)
\ No newline at end of file
@@ -6,12 +6,17 @@ import datetime
 # Se importa la clase real del controlador para la vista.
 # Se asume que matricula_controller.py está en la carpeta 'controllers'
 from controllers.matricula_controller import MatriculaControlador 
+from views.selector_busqueda import SelectorBusqueda
+from views.vista_ocupable import VistaOcupable
+from views.formulario_edicion import FormularioEdicion
 
 # ----------------------------------------------------------------------
 # CLASE DE VISTA ADAPTADA
 # ----------------------------------------------------------------------
 
-class MatriculaViewFrame(ctk.CTkFrame):
+class MatriculaViewFrame(VistaOcupable, FormularioEdicion, ctk.CTkFrame):
+
+    ID_CARGADO = "matricula_cargada_id"
 
     def __init__(self, master, controller: MatriculaControlador):
         super().__init__(master, corner_radius=0, fg_color="transparent") 
@@ -19,13 +24,7 @@ class MatriculaViewFrame(ctk.CTkFrame):
         self.controller = controller 
         self.controller.set_view(self) 
         
-        # Mapeos
-        self.nna_map: Dict[str, int] = {} # Nombre NNA -> ID
-        self.unidad_map: Dict[str, int] = {} # Nombre Unidad -> ID
-        
-        # Variables de control
-        self.nna_var = ctk.StringVar(self, value="Seleccionar NNA")
-        self.unidad_var = ctk.StringVar(self, value="Seleccionar Unidad")
+        # Variables de control (NNA y Unidad se eligen con SelectorBusqueda)
         self.grado_var = ctk.StringVar(self, value="Seleccionar Grado")
         self.fecha_matricula_var = ctk.StringVar(self, value=datetime.date.today().isoformat())
         self.activa_var = ctk.BooleanVar(self, value=True)
@@ -61,13 +60,17 @@ class MatriculaViewFrame(ctk.CTkFrame):
         
         current_row = 0
         
-        # --- Sección de Búsqueda (Implícita por Comboboxes) ---
-        # Fila 0: NNA (Combobox)
-        self._add_field(scroll_frame, current_row, 0, "NNA (Niño/a o Adolescente):", self.nna_var, is_combo="nna")
+        # --- Sección de Búsqueda (sugerencias mientras se escribe) ---
+        # Fila 0: NNA
+        self.nna_selector = self._add_selector(scroll_frame, current_row, "NNA (Niño/a o Adolescente):",
+                                               buscar=self.controller.buscar_nna, campo_texto="nombre_completo",
+                                               placeholder="Escriba nombre, apellido o documento del NNA...")
         current_row += 2
         
-        # Fila 1: Unidad Educativa (Combobox)
-        self._add_field(scroll_frame, current_row, 0, "Unidad Educativa:", self.unidad_var, is_combo="unidad")
+        # Fila 1: Unidad Educativa
+        self.unidad_selector = self._add_selector(scroll_frame, current_row, "Unidad Educativa:",
+                                                  buscar=self.controller.buscar_unidades, campo_texto="nombre",
+                                                  placeholder="Escriba el nombre de la unidad educativa...")
         current_row += 2
         
         # Separador para Campos de Matrícula
@@ -111,28 +114,24 @@ class MatriculaViewFrame(ctk.CTkFrame):
         ctk.CTkLabel(parent, text=label_text, font=("Arial", 14)).grid(row=row, column=column, columnspan=columnspan, sticky="w", padx=10, pady=(10, 5))
         
         combo = None
-        if is_combo == "nna":
-            combo = ctk.CTkComboBox(parent, variable=var, values=["Cargando..."], height=40)
-            self.nna_combo = combo
-        elif is_combo == "unidad":
-            combo = ctk.CTkComboBox(parent, variable=var, values=["Cargando..."], height=40)
-            self.unidad_combo = combo
-        elif is_combo == "grado":
+        if is_combo == "grado":
             combo = ctk.CTkComboBox(parent, variable=var, values=["Cargando..."], height=40)
             self.grado_combo = combo
         
         if combo:
              combo.grid(row=row + 1, column=column, columnspan=columnspan, sticky="ew", padx=10, pady=(0, 5))
-             # Vincular al evento de cambio para NNA y Unidad para activar la búsqueda automática
-             if is_combo in ["nna", "unidad"]:
-                def _on_change(*args):
-                    if var.get() not in ["Seleccionar NNA", "Seleccionar Unidad", "Cargando..."]:
-                        self._handle_buscar_matricula()
-                var.trace_add("write", _on_change)
         else:
             show_char = "*" if is_password else None
             ctk.CTkEntry(parent, textvariable=var, height=40, show=show_char).grid(row=row + 1, column=column, columnspan=columnspan, sticky="ew", padx=10, pady=(0, 5))
 
+    def _add_selector(self, parent, row, label_text, buscar, campo_texto, placeholder):
+        """Etiqueta + SelectorBusqueda a lo ancho; al elegir un elemento se busca la matrícula."""
+        ctk.CTkLabel(parent, text=label_text, font=("Arial", 14)).grid(row=row, column=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
+        selector = SelectorBusqueda(parent, buscar=buscar, campo_texto=campo_texto, placeholder=placeholder,
+                                    al_seleccionar=lambda _item: self._handle_buscar_matricula())
+        selector.grid(row=row + 1, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 5))
+        return selector
+
     # ----------------------------------------------------------------------
     # Métodos de Eventos (Delegación al Controlador)
     # ----------------------------------------------------------------------
@@ -144,14 +143,10 @@ class MatriculaViewFrame(ctk.CTkFrame):
             
     def _handle_buscar_matricula(self):
         """Busca la matrícula basada en la selección actual de NNA y Unidad."""
-        nna_nombre = self.nna_var.get()
-        unidad_nombre = self.unidad_var.get()
-        
-        nna_id = self.nna_map.get(nna_nombre)
-        unidad_id = self.unidad_map.get(unidad_nombre)
+        nna_id, unidad_id = self._ids_seleccionados()
         
-        # Solo busca si ambos están seleccionados y son válidos
-        if nna_id and unidad_id and nna_nombre not in ["Seleccionar NNA", "Cargando..."] and unidad_nombre not in ["Seleccionar Unidad", "Cargando..."]:
+        # Solo busca si ambos están seleccionados
+        if nna_id and unidad_id:
             self.controller.handle_buscar_matricula(nna_id, unidad_id)
         else:
              self.limpiar_entradas(clean_nna_unidad=False)
@@ -186,8 +181,10 @@ class MatriculaViewFrame(ctk.CTkFrame):
         """Limpia los campos de matrícula y el estado de la matrícula cargada."""
         
         if clean_nna_unidad:
-            self.nna_var.set("Seleccionar NNA")
-            self.unidad_var.set("Seleccionar Unidad")
+            # Se limpia primero el estado: limpiar() avisa a al_seleccionar
+            self.matricula_cargada_id = None
+            self.nna_selector.limpiar()
+            self.unidad_selector.limpiar()
         
         grados_values = self.grado_combo.cget("values")
         self.grado_var.set(grados_values[0] if grados_values and grados_values[0] != "Cargando..." else "Seleccionar Grado")
@@ -202,11 +199,7 @@ class MatriculaViewFrame(ctk.CTkFrame):
 
     def _obtener_datos_formulario(self): 
         """Recolecta los datos de los campos de entrada."""
-        nna_nombre = self.nna_var.get()
-        unidad_nombre = self.unidad_var.get()
-        
-        nna_id = self.nna_map.get(nna_nombre)
-        unidad_id = self.unidad_map.get(unidad_nombre)
+        nna_id, unidad_id = self._ids_seleccionados()
         
         return {
             "nna_id": nna_id, 
@@ -216,6 +209,12 @@ class MatriculaViewFrame(ctk.CTkFrame):
             "activa": self.activa_var.get()
         }
         
+    def _ids_seleccionados(self):
+        """IDs del NNA y de la Unidad elegidos en los selectores (None si falta alguno)."""
+        nna = self.nna_selector.seleccion
+        unidad = self.unidad_selector.seleccion
+        return (nna["id"] if nna else None), (unidad["id"] if unidad else None)
+
     def _establecer_datos_formulario(self, data: dict): 
         """Establece los valores de una matrícula cargada y habilita botones."""
         
@@ -231,22 +230,9 @@ class MatriculaViewFrame(ctk.CTkFrame):
         self.matricula_cargada_id = {'nna_id': data['nna_id'], 'unidad_id': data['unidad_id']}
         self._set_btn_state("normal")
         
-    def _cargar_comboboxes(self, nna_list: List[Dict], unidad_list: List[Dict], grados_list: List[str]):
-        """Carga las opciones en los ComboBoxes de NNA, Unidad y Grado."""
-        
-        # Cargar NNA
-        nna_nombres = ["Seleccionar NNA"] + [n['nombre_completo'] for n in nna_list]
-        self.nna_map = {n['nombre_completo']: n['id'] for n in nna_list}
-        self.nna_combo.configure(values=nna_nombres)
-        self.nna_var.set(nna_nombres[0])
+    def _cargar_grados(self, grados_list: List[str]):
+        """Carga las opciones del ComboBox de Grado (NNA y Unidad se buscan al escribir)."""
         
-        # Cargar Unidades
-        unidad_nombres = ["Seleccionar Unidad"] + [u['nombre'] for u in unidad_list]
-        self.unidad_map = {u['nombre']: u['id'] for u in unidad_list}
-        self.unidad_combo.configure(values=unidad_nombres)
-        self.unidad_var.set(unidad_nombres[0])
-            
-        # Cargar Grados
         if grados_list:
             self.grado_combo.configure(values=["Seleccionar Grado"] + grados_list)
             self.grado_var.set("Seleccionar Grado")
@@ -255,11 +241,6 @@ class MatriculaViewFrame(ctk.CTkFrame):
             self.grado_var.set("Seleccionar Grado")
 
             
-    def _set_btn_state(self, state):
-        """Habilita o deshabilita los botones de Modificar/Eliminar."""
-        self.btn_modificar.configure(state=state)
-        self.btn_eliminar.configure(state=state)
-        
     def display_message(self, message: str, is_success: bool = True):
         """Muestra un mensaje de estado en la interfaz."""
         color = "#2ecc71" if is_success else "#e74c3c"
@@ -3,12 +3,16 @@ from tkinter import messagebox
 from typing import Dict, List, Optional
 import datetime
 from controllers.nna_controller import NNAControlador
+from views.vista_ocupable import VistaOcupable
+from views.formulario_edicion import FormularioEdicion
 
 # ----------------------------------------------------------------------
 # CLASE DE VISTA ADAPTADA
 # ----------------------------------------------------------------------
 
-class NNAViewFrame(ctk.CTkFrame):
+class NNAViewFrame(VistaOcupable, FormularioEdicion, ctk.CTkFrame):
+
+    ID_CARGADO = "nna_id_cargado"
     
     def __init__(self, master, controller: NNAControlador):
         super().__init__(master, corner_radius=0, fg_color="transparent") 
@@ -217,11 +221,6 @@ class NNAViewFrame(ctk.CTkFrame):
             if not self.genero_var.get():
                 self.genero_var.set(generos[0])
         
-    def _set_btn_state(self, state):
-        """Habilita o deshabilita los botones de Modificar/Eliminar."""
-        self.btn_modificar.configure(state=state)
-        self.btn_eliminar.configure(state=state)
-        
     def display_message(self, message: str, is_success: bool = True):
         """Muestra un mensaje de estado en la interfaz."""
         color = "#2ecc71" if is_success else "#e74c3c"
@@ -2,6 +2,8 @@ import customtkinter as ctk
 from tkinter import messagebox
 from typing import Dict, List, Optional
 import datetime
+from views.vista_ocupable import VistaOcupable
+from views.formulario_edicion import FormularioEdicion
 
 # IMPORTAR CONTROLADOR REAL O MOCK
 try:
@@ -62,11 +64,13 @@ except ImportError:
 # CLASE DE VISTA ADAPTADA
 # ----------------------------------------------------------------------
 
-class PersonalViewFrame(ctk.CTkFrame):
+class PersonalViewFrame(VistaOcupable, FormularioEdicion, ctk.CTkFrame):
     """
     Vista para el módulo de gestión de Personal. 
     Hereda de CTkFrame.
     """
+
+    ID_CARGADO = "personal_id_cargado"
     
     def __init__(self, master, controller: PersonalControlador):
         super().__init__(master, corner_radius=0, fg_color="transparent") 
@@ -310,11 +314,6 @@ class PersonalViewFrame(ctk.CTkFrame):
             if self.cargo_var.get() not in cargos:
                 self.cargo_var.set(cargos[0])
         
-    def _set_btn_state(self, state):
-        """Habilita o deshabilita los botones de Modificar/Eliminar."""
-        self.btn_modificar.configure(state=state)
-        self.btn_eliminar.configure(state=state)
-        
     def display_message(self, message: str, is_success: bool = True):
         """Muestra un mensaje de estado en la interfaz."""
         color = "#2ecc71" if is_success else "#e74c3c"
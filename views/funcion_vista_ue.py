@@ -1,3 +1,4 @@
+import logging
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from typing import List, Dict, Any, Optional
@@ -8,6 +9,8 @@ import os
 # 1. Importación del Controlador Real
 # ----------------------------------------------------------------------
 
+log = logging.getLogger(__name__)
+
 # Añadir el directorio superior y el actual al path para las importaciones
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
@@ -18,9 +21,12 @@ try:
     from controllers.unidad_educativa_controller import UnidadEducativaControlador
 except ImportError:
     # Si la importación falla, detener la ejecución.
-    print("Error: No se pudo importar UnidadEducativaControlador. Asegúrese de que 'unidad_educativa_controller.py' esté disponible.")
+    log.critical("No se pudo importar UnidadEducativaControlador. Asegúrese de que 'unidad_educativa_controller.py' esté disponible.")
     sys.exit(1)
 
+from views.vista_ocupable import VistaOcupable
+from views.formulario_edicion import FormularioEdicion
+
 # Asignar la clase importada al nombre usado para la anotación
 ControladorDeUnidadEducativa = UnidadEducativaControlador
 
@@ -29,11 +35,14 @@ ControladorDeUnidadEducativa = UnidadEducativaControlador
 # 2. La Vista CTkFrame
 # ----------------------------------------------------------------------
 
-class UnidadEducativaViewFrame(ctk.CTkFrame):
+class UnidadEducativaViewFrame(VistaOcupable, FormularioEdicion, ctk.CTkFrame):
     """
     Vista para el módulo de Unidades Educativas. Hereda de CTkFrame.
     Implementa la interfaz de CRUD y delega acciones al controlador.
     """
+
+    BOTONES_OCUPABLES = ("btn_crear", "btn_eliminar")
+    ID_CARGADO = "ue_id_cargada"
     
     # Usamos el nombre de la clase real en la anotación
     def __init__(self, master, controller: ControladorDeUnidadEducativa):
@@ -276,9 +285,7 @@ class UnidadEducativaViewFrame(ctk.CTkFrame):
         self.telefono_var.set(data.get("telefono", ""))
         self.direccion_var.set(data.get("direccion", ""))
         
-        # Cambiar el texto del botón y habilitar eliminar
-        self.btn_crear.configure(text="💾 Guardar Cambios", fg_color="#3498db", hover_color="#2980b9")
-        self.btn_eliminar.configure(state="normal")
+        self._modo_edicion(True)
         
     def limpiar_formulario(self):
         """Limpia todos los campos del formulario y vuelve al modo creación."""
@@ -291,11 +298,17 @@ class UnidadEducativaViewFrame(ctk.CTkFrame):
         self.buscar_id_var.set("")
         self.buscar_nombre_var.set("")
         
-        # Restaurar el texto del botón y deshabilitar eliminar
-        self.btn_crear.configure(text="➕ Registrar", fg_color="#2ecc71", hover_color="#27ae60")
-        self.btn_eliminar.configure(state="disabled")
+        self._modo_edicion(False)
         self.display_message("") # Limpiar mensaje
 
+    def _modo_edicion(self, editando: bool):
+        """Texto del botón principal y Eliminar según haya una UE cargada o no."""
+        if editando:
+            self.btn_crear.configure(text="💾 Guardar Cambios", fg_color="#3498db", hover_color="#2980b9")
+        else:
+            self.btn_crear.configure(text="➕ Registrar", fg_color="#2ecc71", hover_color="#27ae60")
+        self._estado_boton("btn_eliminar", "normal" if editando else "disabled")
+
     def display_list(self, data: List[Dict[str, Any]]):
         """Muestra la lista de Unidades Educativas en el Treeview."""
         # Limpiar tabla
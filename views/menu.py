@@ -1,15 +1,18 @@
+import logging
 import sys
 import os
 import importlib
+import time
 from tkinter import messagebox
 import customtkinter as ctk
-from PIL import Image, ImageTk 
 
 
 # ----------------------------------------------------------------------
 # Configuración de Paths y Apariencia
 # ----------------------------------------------------------------------
 
+log = logging.getLogger(__name__)
+
 # Configurar el path para importaciones
 try:
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,16 +27,27 @@ try:
     if os.path.exists(views_dir) and views_dir not in sys.path:
         sys.path.append(views_dir)
 
-    print(f"Directorio actual (views): {current_dir}")
-    print(f"Raíz del proyecto añadida a sys.path: {project_root}")
+    log.debug("Directorio actual (views): %s", current_dir)
+    log.debug("Raíz del proyecto añadida a sys.path: %s", project_root)
 
 except NameError:
     # Este bloque se mantiene para entornos donde __file__ no está definido
     pass
 
+from models.database_connector import Database
+from models.dependencias import cargar
+from models import sesion
+from models.uso_modulo_model import UsoModuloModel
+from controllers.ejecutor_tareas import EjecutorTareas
+from views.precarga_vistas import PrecargaVistas
+from views.ciclo_vistas import CicloVidaVistas
+
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Cada cuánto se ejecuta un checkpoint PASSIVE del WAL mientras la app está abierta
+INTERVALO_CHECKPOINT_MS = 5 * 60 * 1000
+
 
 # ----------------------------------------------------------------------
 # MAPPING DE VISTAS Y CONTROLADORES (Actualizado con Denuncias)
@@ -155,6 +169,7 @@ class MenuInicioFrame(BaseViewFrame):
             
             # 2. Abrir la imagen con PIL
             # Puedes ajustar el tamaño aquí (e.g., 600, 300) y usar Image.LANCZOS para calidad
+            Image = cargar("PIL.Image")
             pil_image = Image.open(image_path).resize((600, 300), Image.LANCZOS)
             
             # 3. Crear el objeto CTkImage
@@ -202,6 +217,13 @@ class MenuInicioFrame(BaseViewFrame):
 class MenuApp(ctk.CTk):
     """Clase principal de la aplicación que maneja la estructura de la ventana
     y la navegación entre vistas (Controlador principal/Maestro)."""
+
+    # Precarga de vistas tras el login (ver views/precarga_vistas.py); 0 la desactiva
+    PRECARGA_MAXIMO = 3
+    PRECARGA_RETARDO_MS = 1500
+    # Frames de módulos vivos a la vez, sin contar el inicio (ver views/ciclo_vistas.py)
+    VISTAS_VIVAS = 4
+
     def __init__(self, role=None):
         super().__init__()
         self.role = role
@@ -212,13 +234,30 @@ class MenuApp(ctk.CTk):
         self.minsize(1200, 800)
         self.center_window() # Asegura la posición inicial centrada
 
-        self._frames = {}
+        # Caché LRU de frames: desaloja los menos usados y recuerda su formulario
+        self._frames = CicloVidaVistas(self, maximo=self.VISTAS_VIVAS)
         self._controllers = {}
+        # Botones del sidebar: se rehacen si cambian los permisos de la sesión
+        self._widgets_sidebar = []
+        self._fila_espaciadora = None
+        self._version_sesion = sesion.version()
+
+        self.db = Database()
+        self._checkpoint_job = None
+        # Hilos compartidos para el trabajo de los modelos (consultas, exportaciones)
+        self.ejecutor = EjecutorTareas(self)
+        self.uso_modulos = UsoModuloModel()
 
         self.setup_main_layout()
         self.show_view("menu_inicio")
 
+        # Los módulos más usados se preparan en segundo plano tras el login
+        self.precarga = PrecargaVistas(self, maximo=self.PRECARGA_MAXIMO,
+                                       retardo_ms=self.PRECARGA_RETARDO_MS)
+        self.precarga.iniciar()
+
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self._programar_checkpoint()
 
     def setup_main_layout(self):
         """Configura el diseño principal con el sidebar y el área de contenido."""
@@ -255,7 +294,16 @@ class MenuApp(ctk.CTk):
 
 
     def create_sidebar_buttons(self):
-        """Crea y posiciona los botones de navegación en el sidebar."""
+        """
+        Crea y posiciona los botones de navegación en el sidebar. Solo se
+        muestran los módulos que permite la sesión (consulta en memoria).
+        """
+        for widget in self._widgets_sidebar:
+            widget.destroy()
+        self._widgets_sidebar = []
+        if self._fila_espaciadora is not None:
+            self.sidebar_frame.grid_rowconfigure(self._fila_espaciadora, weight=0)
+
         modules = [
             {"text": "Menú Inicio", "command": "menu_inicio", "emoji": "🏠"},
             {"text": "Gestión de NNA", "command": "gestion_nna", "emoji": "👦"},
@@ -269,6 +317,7 @@ class MenuApp(ctk.CTk):
             {"text": "Reportes y Estadísticas", "command": "reportes", "emoji": "📊"},
             {"text": "Configuración del Sistema", "command": "configuracion", "emoji": "⚙️"},
         ]
+        modules = [module for module in modules if sesion.puede(module["command"])]
 
         # Fila donde comienzan los botones de módulos (después de Título (0) y Separador (1))
         start_row = 2
@@ -287,6 +336,7 @@ class MenuApp(ctk.CTk):
             )
             # Los botones se colocan a partir de la fila 2
             button.grid(row=i + start_row, column=0, padx=15, pady=5, sticky="ew")
+            self._widgets_sidebar.append(button)
 
         # --- Ajuste para empujar los botones inferiores ---
 
@@ -295,12 +345,13 @@ class MenuApp(ctk.CTk):
 
         # Configurar esta fila para que se expanda y empuje el resto hacia abajo
         self.sidebar_frame.grid_rowconfigure(spacer_row, weight=1)
+        self._fila_espaciadora = spacer_row
 
         # Colocar los botones inferiores en las filas siguientes
         next_row = spacer_row + 1
 
         # Botón de Ayuda
-        ctk.CTkButton(
+        boton_ayuda = ctk.CTkButton(
             self.sidebar_frame,
             text="❓ Ayuda",
             command=self.mostrar_ayuda,
@@ -308,10 +359,11 @@ class MenuApp(ctk.CTk):
             fg_color="#f39c12",
             hover_color="#e67e22",
             font=("Arial", 12)
-        ).grid(row=next_row, column=0, padx=20, pady=(20, 5), sticky="s")
+        )
+        boton_ayuda.grid(row=next_row, column=0, padx=20, pady=(20, 5), sticky="s")
 
         # Botón de Salir
-        ctk.CTkButton(
+        boton_salir = ctk.CTkButton(
             self.sidebar_frame,
             text="🚪 Salir",
             command=self.on_closing,
@@ -319,7 +371,16 @@ class MenuApp(ctk.CTk):
             fg_color="#e74c3c",
             hover_color="#c0392b",
             font=("Arial", 12, "bold")
-        ).grid(row=next_row + 1, column=0, padx=20, pady=(5, 20), sticky="s")
+        )
+        boton_salir.grid(row=next_row + 1, column=0, padx=20, pady=(5, 20), sticky="s")
+        self._widgets_sidebar.extend((boton_ayuda, boton_salir))
+
+    def _verificar_sesion(self):
+        """Rehace el sidebar si la sesión fue invalidada (cambió el usuario o un rol)."""
+        version = sesion.version()
+        if version != self._version_sesion:
+            self._version_sesion = version
+            self.create_sidebar_buttons()
 
 
     def _get_module_info(self, module_name):
@@ -327,70 +388,100 @@ class MenuApp(ctk.CTk):
         return MODULE_PATHS.get(module_name, {})
 
 
+    def preparar_modulo(self, module_name):
+        """
+        Importa la vista y el controlador del módulo e instancia el controlador
+        (si aún no existe). No toca widgets: la precarga lo llama desde un hilo.
+        Devuelve (clase de la vista, controlador o None para módulos simples).
+        """
+        info = self._get_module_info(module_name)
+
+        view_module_path = info.get('view_module')
+        view_class_name = info.get('view_class')
+        controller_module_path = info.get('controller_module')
+        controller_class_name = info.get('controller_class')
+
+        if not view_module_path or not view_class_name:
+            raise ValueError(f"Falta 'view_module' o 'view_class' "
+                             f"en la configuración de {module_name}.")
+
+        # 1. Cargar el Módulo de la Vista
+        view_module = importlib.import_module(view_module_path)
+        view_class = getattr(view_module, view_class_name)
+
+        if not (controller_module_path and controller_class_name):
+            # 🟢 MÓDULO SIMPLE (MenuApp actúa como Controlador)
+            return view_class, None
+
+        # 🔴 MÓDULO MVC COMPLETO (Controlador Externo)
+        # 2. Cargar el Módulo del Controlador e instanciarlo (solo una vez)
+        controller_instance = self._controllers.get(module_name)
+        if controller_instance is None:
+            controller_module = importlib.import_module(controller_module_path)
+            controller_class = getattr(controller_module, controller_class_name)
+            controller_instance = controller_class()
+        return view_class, controller_instance
+
+    def construir_modulo(self, module_name, view_class, controller_instance):
+        """
+        Registra el controlador y crea el frame del módulo sin mostrarlo.
+        Corre en el hilo de Tk. Devuelve el frame (el existente si ya estaba).
+        """
+        if module_name in self._frames:
+            return self._frames[module_name]
+
+        if controller_instance is None:
+            frame = view_class(self.main_content_frame, self)
+        else:
+            # Si la precarga y un clic prepararon dos controladores, gana el primero
+            controller_instance = self._controllers.setdefault(module_name, controller_instance)
+            # Los controladores que lo admiten trabajan en segundo plano
+            if hasattr(controller_instance, "ejecutor"):
+                controller_instance.ejecutor = self.ejecutor
+            # Se asume que todas las vistas del MVC reciben un controlador
+            frame = view_class(self.main_content_frame, controller_instance)
+
+        # Almacenar la vista instanciada en el caché
+        self._frames[module_name] = frame
+        return frame
+
     def show_view(self, module_name):
         """Carga y muestra la vista, manejando controladores para módulos MVC completos."""
 
+        self._verificar_sesion()
+        if not sesion.puede(module_name):
+            messagebox.showwarning("🔒 Acceso denegado",
+                                   "Su usuario no tiene permiso para abrir este módulo.")
+            log.warning("Acceso denegado al módulo %s", module_name)
+            return
+
         # 1. Manejar Inicio
         if module_name == "menu_inicio":
             if module_name not in self._frames:
                 # El frame de inicio usa MenuApp como su controlador
                 frame = MenuInicioFrame(self.main_content_frame, self)
                 self._frames[module_name] = frame
+        else:
+            self._registrar_uso(module_name)
 
         # Ocultar todos los frames
         for frame_item in self._frames.values():
             frame_item.grid_forget()
+        # Visible desde ya: el frame que se construya puede desalojar al anterior
+        self._frames.tocar(module_name)
 
         if module_name not in self._frames:
-            # Intento de carga de la vista (Instanciación)
+            # Primera apertura sin precarga: importar e instanciar ahora
+            inicio = time.perf_counter()
+            info = self._get_module_info(module_name)
             try:
-                # Obtener la información completa (usando las 4 claves)
-                info = self._get_module_info(module_name)
-
-                view_module_path = info.get('view_module')
-                view_class_name = info.get('view_class')
-                controller_module_path = info.get('controller_module')
-                controller_class_name = info.get('controller_class')
-
-                if not view_module_path or not view_class_name:
-                    raise ValueError(f"Falta 'view_module' o 'view_class' "
-                                     f"en la configuración de {module_name}.")
-
-                # 1. Cargar el Módulo de la Vista
-                view_module = importlib.import_module(view_module_path)
-                view_class = getattr(view_module, view_class_name)
-
-                if controller_module_path and controller_class_name:
-                    # 🔴 MÓDULO MVC COMPLETO (Controlador Externo)
-
-                    # 2. Cargar el Módulo del Controlador
-                    controller_module = importlib.import_module(controller_module_path)
-                    controller_class = getattr(controller_module, controller_class_name)
-
-                    # 3. Instanciar el Controlador (solo una vez)
-                    if module_name not in self._controllers:
-                        controller_instance = controller_class()
-                        self._controllers[module_name] = controller_instance
-
-                    controller_instance = self._controllers[module_name]
-
-                    # 4. Instanciar la Vista, pasándole el Controlador Real
-                    # Se asume que todas las vistas del MVC reciben un controlador
-                    frame = view_class(self.main_content_frame, controller_instance)
-
-                else:
-                    # 🟢 MÓDULO SIMPLE (MenuApp actúa como Controlador)
-                    frame = view_class(self.main_content_frame, self)
-
-
-                # Almacenar la vista instanciada en el caché
-                self._frames[module_name] = frame
-                frame.grid(row=0, column=0, sticky="nsew")
+                view_class, controller_instance = self.preparar_modulo(module_name)
+                self.construir_modulo(module_name, view_class, controller_instance)
 
             except ImportError as e:
                 # Si falla, es porque la ruta del controlador/vista no se resolvió
-                controller_path_display = controller_module_path if controller_module_path else "N/A"
-                view_path_display = view_module_path if view_module_path else "N/A"
+                controller_path_display = info.get('controller_module') or "N/A"
+                view_path_display = info.get('view_module') or "N/A"
 
                 # Se corrigió la línea para evitar C0301 (Line too long)
                 msg_error = (f"No se pudo importar el módulo: {module_name}.\n"
@@ -398,16 +489,18 @@ class MenuApp(ctk.CTk):
                              f"y/o la Vista ({view_path_display}.py) y su ruta.\nError: {e}")
 
                 messagebox.showerror("❌ Error de Importación", msg_error)
-                print(f"Error de Importación del módulo {module_name}: {e}")
+                log.error("Error de importación del módulo %s: %s", module_name, e)
                 return
             except Exception as e:
                 # W0718: Se mantiene la excepción general ya que el propósito es
                 # capturar cualquier fallo de instanciación
-                msg_error = (f"Error al instanciar la clase {view_class_name} del módulo "
+                msg_error = (f"Error al instanciar la clase {info.get('view_class')} del módulo "
                              f"{module_name}. Verifique el constructor.\nError: {e}")
                 messagebox.showerror("❌ Error de Carga de Vista", msg_error)
-                print(f"Error al instanciar la vista {module_name}: {e}")
+                log.exception("Error al instanciar la vista %s: %s", module_name, e)
                 return
+            log.info("Módulo %s cargado en frío en %.0f ms", module_name,
+                     (time.perf_counter() - inicio) * 1000)
 
         # Mostrar solo el frame deseado
         current_frame = self._frames[module_name]
@@ -415,8 +508,24 @@ class MenuApp(ctk.CTk):
 
         # Llamar al método show para cargar o refrescar datos (si aplica)
         current_frame.show()
+        # Si la vista había sido desalojada, vuelve con el formulario como estaba
+        self._frames.restaurar(module_name)
+
+        log.debug("Vista cargada en panel lateral: %s", module_name)
+
+    def _registrar_uso(self, module_name):
+        """Cuenta la apertura (en segundo plano) para la precarga del próximo inicio."""
+        actual = sesion.actual()
+        self.ejecutor.enviar(self.uso_modulos.registrar_apertura,
+                             actual.persona_id if actual else 0, module_name)
 
-        print(f"Vista cargada en panel lateral: {module_name}")
+
+    def registrar_memoria(self):
+        """Escribe en el log lo que retiene cada vista viva (widgets y datos)."""
+        for uso in self._frames.reporte_memoria():
+            log.info("Vista %s: %d widgets, ~%.0f KB de datos, viva hace %.0f s",
+                     uso["modulo"], uso["widgets"], uso["datos_kb"], uso["vivo_s"])
+        log.info("Vistas desalojadas en la sesión: %d", self._frames.desalojos)
 
     def center_window(self):
         """Centra la ventana principal en la pantalla."""
@@ -451,9 +560,28 @@ Este sistema permite la administración integral de:
 """
         messagebox.showinfo("❓ Ayuda del Sistema", ayuda_texto)
 
+    def _programar_checkpoint(self):
+        """Agenda el siguiente checkpoint periódico del WAL."""
+        self._checkpoint_job = self.after(INTERVALO_CHECKPOINT_MS, self._checkpoint_periodico)
+
+    def _checkpoint_periodico(self):
+        """Copia al archivo principal las páginas del WAL sin bloquear a los lectores."""
+        self.db.checkpoint("PASSIVE")
+        self._programar_checkpoint()
+
     def on_closing(self):
         """Muestra un diálogo de confirmación antes de salir de la aplicación."""
         if messagebox.askyesno("🚪 Salir del Sistema", "¿Está seguro de que desea salir del sistema?"):
+            if self._checkpoint_job:
+                self.after_cancel(self._checkpoint_job)
+                self._checkpoint_job = None
+            self.precarga.detener()
+            self.registrar_memoria()
+            self.ejecutor.cerrar()
+            # Volcar y vaciar el WAL antes de cerrar las conexiones del pool
+            self.db.checkpoint("TRUNCATE")
+            self.db.cerrarPool()
+            sesion.cerrar()
             self.destroy()
 
 # ----------------------------------------------------------------------
@@ -463,10 +591,10 @@ Este sistema permite la administración integral de:
 def main(role=None):
     """Función principal para iniciar la aplicación."""
     try:
-        print("Iniciando aplicación en modo panel lateral...")
+        log.info("Iniciando aplicación en modo panel lateral")
         app = MenuApp(role=role)
         app.mainloop()
-        print("El sistema ha sido cerrado correctamente.")
+        log.info("El sistema ha sido cerrado correctamente")
 
     except Exception as e:
         # W0718: Se mantiene la excepción general para evitar un fallo
@@ -475,4 +603,6 @@ def main(role=None):
         sys.exit(1)
 
 if __name__ == "__main__":
+    from models.bitacora import configurar_logging
+    configurar_logging()
     main()
\ No newline at end of file
@@ -0,0 +1,143 @@
+# views/precarga_vistas.py
+"""
+Precarga de los módulos más usados después del login.
+
+La primera vez que se abre un módulo, MenuApp importa la vista y el
+controlador, instancia el controlador (que crea sus modelos) y construye el
+frame: esa primera apertura se nota. PrecargaVistas hace ese trabajo antes de
+que el usuario haga clic, en dos partes por módulo:
+
+    * en un hilo del ejecutor: imports e instancia del controlador
+      (MenuApp.preparar_modulo);
+    * en el hilo de Tk, cuando no hay eventos pendientes (after_idle):
+      construcción del frame sin mostrarlo (MenuApp.construir_modulo).
+
+Los módulos salen de las estadísticas de uso del usuario (tabla uso_modulo) y,
+si no hay suficientes, de MODULOS_POR_DEFECTO, y nunca más de los que caben
+sin desalojar otra vista (views/ciclo_vistas.py). Entre un módulo y el siguiente
+se deja una pausa para que los clics del usuario no esperen a la precarga.
+
+La variable de entorno PROYECTO_PRECARGA=0 la desactiva (p. ej. para comparar
+tiempos con medir_arranque.py).
+"""
+import logging
+import os
+import time
+from collections import deque
+
+from models import sesion
+
+log = logging.getLogger(__name__)
+
+VARIABLE_ACTIVA = "PROYECTO_PRECARGA"
+MODULOS_POR_DEFECTO = ("gestion_nna", "gestion_denuncias", "seguimiento_expedientes")
+
+
+class PrecargaVistas:
+    """Prepara en segundo plano y en tiempo ocioso las vistas que el usuario abrirá."""
+
+    RETARDO_MS = 1500       # Espera tras abrir el menú antes de empezar
+    INTERVALO_MS = 200      # Pausa entre módulos
+    MAXIMO_MODULOS = 3
+
+    def __init__(self, app, maximo: int = None, retardo_ms: int = None, activa: bool = None):
+        self.app = app
+        self.maximo = self.MAXIMO_MODULOS if maximo is None else maximo
+        self.retardo_ms = self.RETARDO_MS if retardo_ms is None else retardo_ms
+        if activa is None:
+            activa = os.environ.get(VARIABLE_ACTIVA, "1") != "0"
+        self.activa = activa and self.maximo > 0
+        # módulo -> (ms en segundo plano, ms en el hilo de Tk)
+        self.tiempos = {}
+        self._pendientes = deque()
+        self._trabajo = None
+        self._detenida = False
+
+    def iniciar(self):
+        if not self.activa:
+            log.info("Precarga de vistas desactivada")
+            return
+        self._trabajo = self.app.after(self.retardo_ms, self._planificar)
+
+    def detener(self):
+        """Cancela lo que falte (al cerrar la aplicación)."""
+        self._detenida = True
+        self._pendientes.clear()
+        if self._trabajo is not None:
+            try:
+                self.app.after_cancel(self._trabajo)
+            except Exception:
+                pass
+            self._trabajo = None
+        self.app.ejecutor.cancelar("precarga")
+
+    # ------------------------------------------------------------------
+    # Internos (hilo de Tk salvo _preparar)
+    # ------------------------------------------------------------------
+
+    def _planificar(self):
+        self._trabajo = None
+        actual = sesion.actual()
+        self.app.ejecutor.enviar(self.app.uso_modulos.mas_usados,
+                                 actual.persona_id if actual else 0, self.maximo,
+                                 al_terminar=self._encolar, al_fallar=self._fallo,
+                                 clave="precarga")
+
+    def _encolar(self, usados):
+        candidatos = list(usados) + [m for m in MODULOS_POR_DEFECTO if m not in usados]
+        elegidos = [m for m in candidatos
+                    if m not in self.app._frames and self.app._get_module_info(m) and sesion.puede(m)]
+        # La precarga solo ocupa huecos libres: no desaloja vistas que el usuario abrió
+        self._pendientes = deque(elegidos[:min(self.maximo, self.app._frames.libres())])
+        log.debug("Precarga de vistas: %s", ", ".join(self._pendientes) or "nada")
+        self._siguiente()
+
+    def _siguiente(self):
+        self._trabajo = None
+        if self._detenida:
+            return
+        while self._pendientes:
+            modulo = self._pendientes.popleft()
+            if modulo in self.app._frames:
+                continue  # El usuario ya lo abrió
+            if not self.app._frames.libres():
+                self._pendientes.clear()  # El usuario llenó los huecos mientras tanto
+                break
+            self.app.ejecutor.enviar(self._preparar, modulo,
+                                     al_terminar=self._preparado, al_fallar=self._fallo,
+                                     clave="precarga")
+            return
+        if self.tiempos:
+            log.info("Precarga terminada: %s", ", ".join(
+                f"{m} {fondo:.0f}+{tk:.0f} ms" for m, (fondo, tk) in self.tiempos.items()))
+
+    def _preparar(self, modulo):
+        """Corre en un hilo del ejecutor: imports e instancia del controlador."""
+        inicio = time.perf_counter()
+        view_class, controlador = self.app.preparar_modulo(modulo)
+        return modulo, view_class, controlador, (time.perf_counter() - inicio) * 1000
+
+    def _preparado(self, resultado):
+        if self._detenida:
+            return
+        # El frame se construye cuando Tk no tiene eventos del usuario pendientes
+        self._trabajo = self.app.after_idle(self._construir, *resultado)
+
+    def _construir(self, modulo, view_class, controlador, ms_fondo):
+        self._trabajo = None
+        if self._detenida:
+            return
+        if modulo not in self.app._frames:
+            inicio = time.perf_counter()
+            try:
+                self.app.construir_modulo(modulo, view_class, controlador)
+                self.tiempos[modulo] = (ms_fondo, (time.perf_counter() - inicio) * 1000)
+            except Exception as e:
+                # El clic del usuario lo volverá a intentar y mostrará el error
+                log.warning("No se pudo precargar %s: %s", modulo, e)
+        self._trabajo = self.app.after(self.INTERVALO_MS, self._siguiente)
+
+    def _fallo(self, error):
+        log.warning("Error en la precarga de vistas: %s", error)
+        if not self._detenida:
+            self._trabajo = self.app.after(self.INTERVALO_MS, self._siguiente)
@@ -1,19 +1,16 @@
 import customtkinter as ctk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from typing import List, Dict, Optional, Any
-# Aunque Pylance reportó un error con pandas, lo mantenemos si el plan es usarlo para exportar.
-# Si el entorno no lo tiene, solo el mock de exportación funcionará.
-try:
-    import pandas as pd
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    CAN_PLOT = True
-except ImportError:
-    # Si falta pandas o matplotlib, deshabilitamos la funcionalidad de gráfico.
-    CAN_PLOT = False
-    
 import datetime
 
+from models.dependencias import cargar, disponible
+from views.tabla_virtual import TablaVirtual
+from views.vista_ocupable import VistaOcupable
+
+# matplotlib se importa al dibujar el primer gráfico, no al abrir la vista.
+# Si no está instalado, se deshabilita la funcionalidad de gráfico.
+CAN_PLOT = disponible("matplotlib")
+
 # ======================================================================
 # MOCK del Controlador (Añadido get_expediente_id_from_str)
 # ======================================================================
@@ -70,7 +67,7 @@ class MockControlador:
         else:
             self.vista.display_message(f"Mock: Reporte '{reporte_key}' generado. (Datos no tabulares simulados)", True)
 
-    def handle_exportar_reporte(self, data, columns):
+    def handle_exportar_reporte(self, data, columns, ruta=None):
         # El Mock solo muestra un mensaje, pero el método ahora recibe los datos
         if data:
             self.vista.display_message(f"Mock: Exportando {len(data)} filas de datos...", True)
@@ -85,12 +82,14 @@ except ImportError:
     ReportesControlador = MockControlador
 
 
-class ReportesViewFrame(ctk.CTkFrame):
+class ReportesViewFrame(VistaOcupable, ctk.CTkFrame):
     """
     Vista para el módulo de Reportes.
     Hereda de CTkFrame para ser cargado en el panel de contenido.
     """
 
+    BOTONES_OCUPABLES = ("btn_generar", "btn_exportar")
+
     def __init__(self, master, controller: MockControlador):
         super().__init__(master, corner_radius=0, fg_color="transparent") 
         
@@ -108,6 +107,8 @@ class ReportesViewFrame(ctk.CTkFrame):
         
         # Almacena el widget de canvas para poder destruirlo
         self.canvas_widget: Optional[ctk.CTkWidget] = None
+        # Figura de matplotlib del gráfico actual: pyplot la retiene hasta cerrarla
+        self.figura = None
         # Almacena los últimos datos generados para la exportación
         self.last_report_data: List[Dict] = []
         self.last_report_columns: List[str] = []
@@ -168,11 +169,12 @@ class ReportesViewFrame(ctk.CTkFrame):
         btn_frame.grid(row=0, column=4, rowspan=2, padx=10, pady=5, sticky="nsew")
         btn_frame.columnconfigure((0, 1), weight=1)
 
-        ctk.CTkButton(btn_frame, text="⚙️ Generar", command=self._handle_generar_reporte, 
-                      fg_color="#3498db", hover_color="#2980b9", height=35, 
-                      font=ctk.CTkFont(size=15, weight="bold")).grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+        self.btn_generar = ctk.CTkButton(btn_frame, text="⚙️ Generar", command=self._handle_generar_reporte, 
+                                         fg_color="#3498db", hover_color="#2980b9", height=35, 
+                                         font=ctk.CTkFont(size=15, weight="bold"))
+        self.btn_generar.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
                       
-        self.btn_exportar = ctk.CTkButton(btn_frame, text="⬇️ Exportar CSV/Excel", command=self._handle_exportar_reporte, 
+        self.btn_exportar = ctk.CTkButton(btn_frame, text="⬇️ Exportar CSV/Excel/PDF", command=self._handle_exportar_reporte, 
                                           fg_color="#2ecc71", hover_color="#27ae60", height=35, 
                                           font=ctk.CTkFont(size=15, weight="bold"), state="disabled")
         self.btn_exportar.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
@@ -187,9 +189,10 @@ class ReportesViewFrame(ctk.CTkFrame):
         self.chart_frame = ctk.CTkFrame(self.resultados_tabview.tab("📊 Gráfico"), fg_color="#111111")
         self.chart_frame.pack(fill="both", expand=True)
 
-        self.table_frame = ctk.CTkScrollableFrame(self.resultados_tabview.tab("📄 Tabla de Datos"), fg_color="#2e2e2e")
+        # Tabla virtual: solo crea los widgets de las filas visibles
+        self.table_frame = TablaVirtual(self.resultados_tabview.tab("📄 Tabla de Datos"),
+                                        mensaje_vacio="No se encontraron datos para los filtros aplicados.")
         self.table_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        self.table_frame.columnconfigure(0, weight=1)
 
         # 3. Panel de Estadísticas
         self.stats_frame = ctk.CTkFrame(main_frame, fg_color="#2e2e2e")
@@ -256,8 +259,14 @@ class ReportesViewFrame(ctk.CTkFrame):
     def _handle_exportar_reporte(self):
         """Llama al controlador para exportar el último reporte generado."""
         if self.last_report_data:
-            # Pasa los datos y las columnas al controlador para que él maneje la exportación
-            self.controller.handle_exportar_reporte(self.last_report_data, self.last_report_columns)
+            ruta = filedialog.asksaveasfilename(
+                parent=self, title="Exportar reporte", defaultextension=".csv",
+                initialfile=f"Reporte_{datetime.datetime.now():%Y%m%d_%H%M%S}",
+                filetypes=[("CSV", "*.csv"), ("Excel", "*.xlsx"), ("PDF", "*.pdf")])
+            if not ruta:
+                return  # Cancelado
+            # Pasa los datos, las columnas y el archivo al controlador para que él maneje la exportación
+            self.controller.handle_exportar_reporte(self.last_report_data, self.last_report_columns, ruta)
         else:
             self.display_message("❌ Primero genere un reporte para poder exportarlo.", is_success=False)
 
@@ -295,14 +304,20 @@ class ReportesViewFrame(ctk.CTkFrame):
             else:
                 self.canvas_widget.destroy()
             self.canvas_widget = None
+        if self.figura is not None:
+            cargar("matplotlib.pyplot").close(self.figura)
+            self.figura = None
         
         # Limpiar Tabla
-        for w in self.table_frame.winfo_children():
-            w.destroy()
+        self.table_frame.limpiar()
             
         self.last_report_data = []
         self.last_report_columns = []
-        self.btn_exportar.configure(state="disabled")
+        self._estado_boton("btn_exportar", "disabled")
+
+    def liberar(self):
+        """Llamado por MenuApp al desalojar la vista: suelta el gráfico y los datos del reporte."""
+        self._limpiar_resultados()
 
     def display_results(self, data: List[Dict[str, Any]], columns: List[str], message: str):
         """Método unificado para que el controlador muestre resultados."""
@@ -317,55 +332,37 @@ class ReportesViewFrame(ctk.CTkFrame):
 
 
     def _mostrar_resultados_tabla(self, data: List[Dict[str, Any]], columnas: List[str], message: str):
-        """Muestra los resultados en formato de tabla usando CTkScrollableFrame."""
+        """Muestra los resultados en la tabla virtual (clic en una cabecera para ordenar)."""
         
         self._limpiar_resultados()
         self.display_message(message, True)
         self.resultados_tabview.set("📄 Tabla de Datos")
         
+        self.table_frame.cargar(data, columnas)
         if not data:
-            ctk.CTkLabel(self.table_frame, text="No se encontraron datos para los filtros aplicados.", 
-                         font=("Arial", 14)).pack(pady=20)
             return
 
         self.last_report_data = data
         self.last_report_columns = columnas
-        self.btn_exportar.configure(state="normal")
-
-        # Configuración de estilo de la tabla (usando etiquetas para simular Treeview)
-        # 1. Cabecera (Header)
-        header_frame = ctk.CTkFrame(self.table_frame, fg_color="#34495e")
-        header_frame.pack(fill="x", padx=5, pady=(5, 0))
-        header_frame.columnconfigure(tuple(range(len(columnas))), weight=1)
-
-        for j, col in enumerate(columnas):
-            ctk.CTkLabel(header_frame, text=col, font=("Arial", 13, "bold"), text_color="white", 
-                         padx=10, pady=8).grid(row=0, column=j, sticky="ew")
-
-        # 2. Filas de Datos
-        for i, row_data in enumerate(data):
-            row_frame = ctk.CTkFrame(self.table_frame, fg_color="#2c3e50" if i % 2 == 0 else "#111111")
-            row_frame.pack(fill="x", padx=5, pady=0)
-            row_frame.columnconfigure(tuple(range(len(columnas))), weight=1)
-            
-            for j, col in enumerate(columnas):
-                value = str(row_data.get(col, ''))
-                ctk.CTkLabel(row_frame, text=value, font=("Arial", 12), text_color="white", 
-                             padx=10, pady=5).grid(row=0, column=j, sticky="ew")
+        self._estado_boton("btn_exportar", "normal")
 
 
     def _plot_chart(self, chart_type: str, data: Dict[str, float]):
         """Dibuja un gráfico de barras o circular en el frame de resultados."""
         
         if not CAN_PLOT:
-            self.display_message("❌ Error: Las librerías 'pandas' y 'matplotlib' son necesarias para gráficos.", False)
+            self.display_message("❌ Error: La librería 'matplotlib' es necesaria para gráficos.", False)
             return
             
         self._limpiar_resultados()
         self.resultados_tabview.set("📊 Gráfico")
 
+        plt = cargar("matplotlib.pyplot")
+        FigureCanvasTkAgg = cargar("matplotlib.backends.backend_tkagg").FigureCanvasTkAgg
+
         # 1. Configurar figura y ejes
         fig, ax = plt.subplots(figsize=(6, 4))
+        self.figura = fig
         
         if chart_type == "bar_genero":
             labels = list(data.keys())
@@ -397,7 +394,7 @@ class ReportesViewFrame(ctk.CTkFrame):
         self.canvas_widget.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
         
         # Un gráfico no genera datos tabulares para exportar directamente.
-        self.btn_exportar.configure(state="disabled")
+        self._estado_boton("btn_exportar", "disabled")
 
     def display_message(self, message: str, is_success: bool = True):
         """Muestra un mensaje de estado en la interfaz."""
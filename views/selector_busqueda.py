@@ -0,0 +1,195 @@
+import customtkinter as ctk
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+class SelectorBusqueda(ctk.CTkFrame):
+    """
+    Campo de búsqueda con sugerencias (typeahead) para elegir un registro de
+    una tabla grande sin cargarla entera en un combobox.
+
+    Mientras se escribe, la búsqueda se pospone RETARDO_MS milisegundos (solo
+    se consulta cuando el usuario hace una pausa) y se piden como mucho las
+    primeras coincidencias al modelo. Las últimas consultas quedan en una caché
+    LRU en memoria: volver a escribir un texto ya buscado (p. ej. al borrar)
+    muestra las sugerencias al instante sin ir a la base de datos.
+
+    'buscar(texto, al_resultado)' lo provee el controlador: consulta en segundo
+    plano y llama a al_resultado(lista) en el hilo de Tk. Cada elemento es un
+    dict con al menos 'id' y la clave indicada en 'campo_texto'.
+
+    Uso:
+        selector = SelectorBusqueda(master, buscar=controlador.buscar_nna,
+                                    campo_texto="nombre_completo",
+                                    al_seleccionar=self._al_elegir_nna)
+        selector.seleccion  # dict elegido o None
+    """
+
+    RETARDO_MS = 250          # Pausa de escritura antes de consultar
+    MINIMO_CARACTERES = 1     # Caracteres necesarios para buscar
+    MAXIMO_CACHE = 50         # Consultas recientes conservadas (LRU)
+    MAXIMO_VISIBLES = 10      # Sugerencias mostradas a la vez
+    ALTO_SUGERENCIA = 30
+
+    def __init__(self, master, buscar: Callable[[str, Callable[[List[Dict[str, Any]]], None]], None],
+                 campo_texto: str = "nombre",
+                 al_seleccionar: Optional[Callable[[Optional[Dict[str, Any]]], None]] = None,
+                 placeholder: str = "Escriba para buscar...", height: int = 40, **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+
+        self.buscar = buscar
+        self.campo_texto = campo_texto
+        self.al_seleccionar = al_seleccionar
+        self.seleccion: Optional[Dict[str, Any]] = None
+
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._pendiente = None          # after() de la búsqueda pospuesta
+        self._consulta_actual = ""      # Texto cuya respuesta se espera
+        self._sugerencias: List[Dict[str, Any]] = []
+        self._botones: List[ctk.CTkButton] = []  # Se reutilizan entre búsquedas
+        self._ignorar_escritura = False
+
+        self.columnconfigure(0, weight=1)
+
+        self.texto_var = ctk.StringVar(self)
+        self.entrada = ctk.CTkEntry(self, textvariable=self.texto_var, height=height,
+                                    placeholder_text=placeholder)
+        self.entrada.grid(row=0, column=0, sticky="ew")
+
+        self.lista = ctk.CTkFrame(self, fg_color="#2c3e50", corner_radius=6)
+        self.lista.columnconfigure(0, weight=1)
+
+        self.texto_var.trace_add("write", self._al_escribir)
+        self.entrada.bind("<Return>", self._elegir_primera)
+        self.entrada.bind("<Escape>", lambda _e: self._ocultar_lista())
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def establecer(self, item: Optional[Dict[str, Any]]):
+        """Selecciona un elemento desde el código (None limpia el campo)."""
+        self._cancelar_pendiente()
+        self._ignorar_escritura = True
+        self.texto_var.set(item[self.campo_texto] if item else "")
+        self._ignorar_escritura = False
+        self._ocultar_lista()
+        self._cambiar_seleccion(item)
+
+    def limpiar(self):
+        self.establecer(None)
+
+    def obtener_estado(self) -> Optional[Dict[str, Any]]:
+        """Selección o texto a medio escribir (MenuApp los guarda al desalojar la vista)."""
+        if self.seleccion is not None:
+            return {"seleccion": self.seleccion}
+        texto = self.texto_var.get()
+        return {"texto": texto} if texto else None
+
+    def restaurar_estado(self, estado: Dict[str, Any]):
+        """Repone lo devuelto por obtener_estado() sin lanzar una búsqueda."""
+        if "seleccion" in estado:
+            self.establecer(estado["seleccion"])
+        else:
+            self._ignorar_escritura = True
+            self.texto_var.set(estado.get("texto", ""))
+            self._ignorar_escritura = False
+
+    def limpiar_cache(self):
+        """Descarta las consultas recientes (p. ej. tras crear o renombrar registros)."""
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------
+
+    def _al_escribir(self, *_args):
+        if self._ignorar_escritura:
+            return
+        # Lo escrito ya no corresponde a la selección anterior
+        if self.seleccion is not None:
+            self._cambiar_seleccion(None)
+        self._cancelar_pendiente()
+        texto = self._normalizar(self.texto_var.get())
+        if len(texto) < self.MINIMO_CARACTERES:
+            self._consulta_actual = ""
+            self._ocultar_lista()
+            return
+        self._consulta_actual = texto
+        if texto in self._cache:
+            self._cache.move_to_end(texto)
+            self._mostrar(self._cache[texto])
+            return
+        self._pendiente = self.after(self.RETARDO_MS, self._consultar)
+
+    def _consultar(self):
+        self._pendiente = None
+        texto = self._consulta_actual
+        if texto:
+            self.buscar(texto, lambda resultados: self._al_recibir(texto, resultados))
+
+    def _al_recibir(self, texto: str, resultados: List[Dict[str, Any]]):
+        self._cache[texto] = resultados
+        self._cache.move_to_end(texto)
+        while len(self._cache) > self.MAXIMO_CACHE:
+            self._cache.popitem(last=False)
+        # Una respuesta tardía de un texto anterior no reemplaza a la actual
+        if texto == self._consulta_actual and self.seleccion is None:
+            self._mostrar(resultados)
+
+    def _cancelar_pendiente(self):
+        if self._pendiente is not None:
+            self.after_cancel(self._pendiente)
+            self._pendiente = None
+
+    @staticmethod
+    def _normalizar(texto: str) -> str:
+        # Solo se colapsan los espacios: el texto llega al modelo tal como se
+        # escribió (COLLATE NOCASE de SQLite no iguala mayúsculas fuera de ASCII,
+        # "á" no coincide con "Á") y la caché usa esa misma clave.
+        return " ".join((texto or "").split())
+
+    # ------------------------------------------------------------------
+    # Lista de sugerencias
+    # ------------------------------------------------------------------
+
+    def _boton(self, indice: int) -> ctk.CTkButton:
+        """Botón de la fila 'indice' de la lista (se crean a medida que hacen falta)."""
+        while len(self._botones) <= indice:
+            i = len(self._botones)
+            self._botones.append(ctk.CTkButton(
+                self.lista, text="", anchor="w", height=self.ALTO_SUGERENCIA,
+                fg_color="transparent", hover_color="#34495e",
+                command=lambda i=i: self._elegir(i)))
+        return self._botones[indice]
+
+    def _mostrar(self, resultados: List[Dict[str, Any]]):
+        self._sugerencias = resultados[:self.MAXIMO_VISIBLES]
+        textos = [str(item.get(self.campo_texto, "")) for item in self._sugerencias]
+        if not textos:
+            textos = ["Sin coincidencias"]
+
+        for i, texto in enumerate(textos):
+            boton = self._boton(i)
+            boton.configure(text=texto, state="normal" if self._sugerencias else "disabled")
+            boton.grid(row=i, column=0, sticky="ew", padx=2, pady=1)
+        for boton in self._botones[len(textos):]:
+            boton.grid_remove()
+        self.lista.grid(row=1, column=0, sticky="ew", pady=(2, 0))
+
+    def _ocultar_lista(self):
+        self.lista.grid_remove()
+
+    def _elegir_primera(self, _evento=None):
+        if self._sugerencias:
+            self._elegir(0)
+
+    def _elegir(self, indice: int):
+        if 0 <= indice < len(self._sugerencias):
+            self.establecer(self._sugerencias[indice])
+
+    def _cambiar_seleccion(self, item: Optional[Dict[str, Any]]):
+        anterior, self.seleccion = self.seleccion, item
+        if self.al_seleccionar and (anterior is not None or item is not None):
+            self.al_seleccionar(item)
@@ -0,0 +1,302 @@
+import customtkinter as ctk
+from typing import Any, Callable, Dict, List, Optional
+
+
+class TablaVirtual(ctk.CTkFrame):
+    """
+    Tabla con desplazamiento virtual para listados grandes.
+
+    Solo existen los widgets de las filas visibles (según el alto disponible).
+    Al desplazarse, esas mismas filas se reutilizan cambiando su texto, por lo
+    que mostrar 5.000 filas cuesta lo mismo que mostrar 20. El orden por
+    columna se aplica sobre la lista de datos, no sobre los widgets.
+
+    Uso:
+        tabla = TablaVirtual(master, encabezados={"id": "ID"},
+                             al_seleccionar=callback, texto_accion="Editar")
+        tabla.cargar(datos, ["id", "nombre"])
+    """
+
+    ALTO_FILA = 30
+    ANCHO_ACCION = 70
+    COLOR_CABECERA = "#34495e"
+    COLORES_FILA = ("#2c3e50", "#111111")
+    PASOS_RUEDA = 3  # Filas por cada paso de la rueda del ratón
+
+    def __init__(self, master, encabezados: Optional[Dict[str, str]] = None,
+                 al_seleccionar: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 texto_accion: Optional[str] = None, titulo: Optional[str] = None,
+                 mensaje_vacio: str = "No hay datos para mostrar.", **kwargs):
+        kwargs.setdefault("fg_color", "#2e2e2e")
+        super().__init__(master, **kwargs)
+
+        self.encabezados = encabezados or {}
+        self.al_seleccionar = al_seleccionar
+        self.texto_accion = texto_accion
+        self.mensaje_vacio = mensaje_vacio
+
+        self._datos: List[Dict[str, Any]] = []
+        self._columnas: List[str] = []
+        self._inicio = 0
+        self._orden_columna: Optional[str] = None
+        self._orden_descendente = False
+        self._filas: List[Dict[str, Any]] = []  # Pool de filas recicladas
+        self._botones_cabecera: Dict[str, ctk.CTkButton] = {}
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+
+        if titulo:
+            ctk.CTkLabel(self, text=titulo, font=ctk.CTkFont(size=14, weight="bold")).grid(
+                row=0, column=0, columnspan=2, pady=(5, 5), sticky="ew")
+
+        self.cabecera = ctk.CTkFrame(self, fg_color=self.COLOR_CABECERA, corner_radius=0)
+        self.cabecera.grid(row=1, column=0, sticky="ew", padx=(5, 0), pady=(5, 0))
+
+        # El cuerpo no se ajusta al contenido: su alto decide cuántas filas se crean
+        self.cuerpo = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.cuerpo.grid(row=2, column=0, sticky="nsew", padx=(5, 0), pady=(0, 5))
+        self.cuerpo.grid_propagate(False)
+        self.cuerpo.columnconfigure(0, weight=1)
+        self.cuerpo.bind("<Configure>", self._al_redimensionar)
+
+        self.barra = ctk.CTkScrollbar(self, orientation="vertical", command=self._al_mover_barra)
+        self.barra.grid(row=2, column=1, sticky="ns", pady=(0, 5))
+
+        self.vacio_label = ctk.CTkLabel(self.cuerpo, text="", font=("Arial", 14))
+
+        self._vincular_rueda(self.cuerpo)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def cargar(self, datos: List[Dict[str, Any]], columnas: List[str],
+               mensaje_vacio: Optional[str] = None):
+        """Reemplaza los datos mostrados. La lista original no se modifica."""
+        if mensaje_vacio is not None:
+            self.mensaje_vacio = mensaje_vacio
+        if list(columnas) != self._columnas:
+            self._columnas = list(columnas)
+            self._orden_columna = None
+            self._construir_cabecera()
+            self._reconstruir_filas()
+        self._datos = list(datos)
+        if self._orden_columna:
+            self._ordenar_datos()
+        self._inicio = 0
+        self._refrescar()
+
+    def limpiar(self):
+        """Vacía la tabla conservando las columnas."""
+        self._datos = []
+        self._inicio = 0
+        self._refrescar()
+
+    def ordenar_por(self, columna: str, descendente: Optional[bool] = None):
+        """
+        Ordena los datos por una columna. Sin 'descendente', un segundo clic
+        sobre la misma columna invierte el sentido.
+        """
+        if columna not in self._columnas:
+            return
+        if descendente is None:
+            descendente = (columna == self._orden_columna and not self._orden_descendente)
+        self._orden_columna = columna
+        self._orden_descendente = descendente
+        self._ordenar_datos()
+        self._actualizar_indicadores()
+        self._inicio = 0
+        self._refrescar()
+
+    @property
+    def datos(self) -> List[Dict[str, Any]]:
+        """Datos en el orden en que se muestran."""
+        return list(self._datos)
+
+    # ------------------------------------------------------------------
+    # Construcción de widgets
+    # ------------------------------------------------------------------
+
+    def _configurar_columnas(self, frame):
+        """Mismo reparto de columnas en cabecera y filas para que queden alineadas."""
+        for j in range(len(self._columnas)):
+            frame.columnconfigure(j, weight=1, uniform="columna")
+        if self.texto_accion:
+            frame.columnconfigure(len(self._columnas), weight=0, minsize=self.ANCHO_ACCION)
+
+    def _construir_cabecera(self):
+        for widget in self.cabecera.winfo_children():
+            widget.destroy()
+        # Quitar el reparto de las columnas anteriores (si había más)
+        for j in range(self.cabecera.grid_size()[0]):
+            self.cabecera.columnconfigure(j, weight=0, uniform="", minsize=0)
+        self._botones_cabecera = {}
+        self._configurar_columnas(self.cabecera)
+
+        for j, columna in enumerate(self._columnas):
+            boton = ctk.CTkButton(self.cabecera, text=self.encabezados.get(columna, columna),
+                                  font=("Arial", 13, "bold"), text_color="white",
+                                  fg_color="transparent", hover_color="#2c3e50",
+                                  anchor="w", corner_radius=0, height=32,
+                                  command=lambda c=columna: self.ordenar_por(c))
+            boton.grid(row=0, column=j, sticky="ew")
+            self._botones_cabecera[columna] = boton
+
+    def _actualizar_indicadores(self):
+        """Marca con ▲/▼ la columna por la que está ordenada la tabla."""
+        for columna, boton in self._botones_cabecera.items():
+            texto = self.encabezados.get(columna, columna)
+            if columna == self._orden_columna:
+                texto += " ▼" if self._orden_descendente else " ▲"
+            boton.configure(text=texto)
+
+    def _reconstruir_filas(self):
+        """Descarta el pool (p. ej. al cambiar las columnas) y lo vuelve a crear."""
+        for fila in self._filas:
+            fila["frame"].destroy()
+        self._filas = []
+        self._ajustar_pool(self._filas_necesarias())
+
+    def _filas_necesarias(self) -> int:
+        alto = self.cuerpo.winfo_height()
+        if alto <= 1:  # Aún no dibujado
+            return 0
+        return alto // self.ALTO_FILA + 1
+
+    def _ajustar_pool(self, cantidad: int):
+        """Crea o destruye filas hasta tener exactamente 'cantidad'."""
+        while len(self._filas) > cantidad:
+            self._filas.pop()["frame"].destroy()
+
+        while len(self._filas) < cantidad:
+            indice = len(self._filas)
+            frame = ctk.CTkFrame(self.cuerpo, height=self.ALTO_FILA, corner_radius=0)
+            frame.grid(row=indice, column=0, sticky="ew")
+            frame.grid_propagate(False)
+            self._configurar_columnas(frame)
+            frame.rowconfigure(0, weight=1)
+
+            celdas = []
+            for j in range(len(self._columnas)):
+                celda = ctk.CTkLabel(frame, text="", font=("Arial", 12), text_color="white",
+                                     anchor="w", padx=10)
+                celda.grid(row=0, column=j, sticky="ew")
+                self._vincular_rueda(celda)
+                celdas.append(celda)
+
+            fila = {"frame": frame, "celdas": celdas, "indice": None, "boton": None}
+            if self.texto_accion:
+                fila["boton"] = ctk.CTkButton(frame, text=self.texto_accion, width=60, height=24,
+                                              command=lambda f=fila: self._seleccionar(f))
+                fila["boton"].grid(row=0, column=len(self._columnas), padx=5)
+            elif self.al_seleccionar:
+                for celda in celdas:
+                    celda.bind("<Button-1>", lambda _e, f=fila: self._seleccionar(f))
+
+            self._vincular_rueda(frame)
+            self._filas.append(fila)
+
+    # ------------------------------------------------------------------
+    # Desplazamiento y dibujo
+    # ------------------------------------------------------------------
+
+    def _filas_completas(self) -> int:
+        return max(1, self.cuerpo.winfo_height() // self.ALTO_FILA)
+
+    def _desplazar_a(self, inicio: int):
+        maximo = max(0, len(self._datos) - self._filas_completas())
+        inicio = max(0, min(int(inicio), maximo))
+        if inicio != self._inicio:
+            self._inicio = inicio
+            self._refrescar()
+
+    def _refrescar(self):
+        """Vuelca en el pool de filas la ventana de datos visible."""
+        total = len(self._datos)
+
+        if total == 0:
+            self.vacio_label.configure(text=self.mensaje_vacio)
+            self.vacio_label.place(relx=0.5, y=20, anchor="n")
+        else:
+            self.vacio_label.place_forget()
+
+        for i, fila in enumerate(self._filas):
+            indice = self._inicio + i
+            if indice >= total:
+                fila["indice"] = None
+                fila["frame"].grid_remove()
+                continue
+
+            registro = self._datos[indice]
+            fila["indice"] = indice
+            fila["frame"].configure(fg_color=self.COLORES_FILA[indice % 2])
+            for columna, celda in zip(self._columnas, fila["celdas"]):
+                valor = registro.get(columna, "")
+                celda.configure(text="" if valor is None else str(valor))
+            fila["frame"].grid()
+
+        if total:
+            primera = self._inicio / total
+            ultima = min(1.0, (self._inicio + self._filas_completas()) / total)
+            self.barra.set(primera, ultima)
+        else:
+            self.barra.set(0.0, 1.0)
+
+    def _al_redimensionar(self, _evento=None):
+        necesarias = self._filas_necesarias()
+        if necesarias != len(self._filas):
+            self._ajustar_pool(necesarias)
+            self._desplazar_a(self._inicio)
+            self._refrescar()
+
+    def _al_mover_barra(self, accion, cantidad, unidad=None):
+        """Traduce los comandos de la barra ('moveto' / 'scroll') a un índice de fila."""
+        if accion == "moveto":
+            self._desplazar_a(float(cantidad) * len(self._datos))
+        elif accion == "scroll":
+            pasos = int(cantidad)
+            if unidad == "pages":
+                pasos *= self._filas_completas()
+            self._desplazar_a(self._inicio + pasos)
+
+    def _al_girar_rueda(self, evento):
+        if getattr(evento, "num", None) == 4:
+            pasos = -self.PASOS_RUEDA
+        elif getattr(evento, "num", None) == 5:
+            pasos = self.PASOS_RUEDA
+        else:
+            pasos = -self.PASOS_RUEDA if evento.delta > 0 else self.PASOS_RUEDA
+        self._desplazar_a(self._inicio + pasos)
+
+    def _vincular_rueda(self, widget):
+        widget.bind("<MouseWheel>", self._al_girar_rueda)
+        widget.bind("<Button-4>", self._al_girar_rueda)
+        widget.bind("<Button-5>", self._al_girar_rueda)
+
+    # ------------------------------------------------------------------
+    # Orden y selección
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _es_vacio(valor) -> bool:
+        return valor is None or valor == ""
+
+    @staticmethod
+    def _clave_orden(valor):
+        """Números antes que textos; textos sin distinguir mayúsculas. Los vacíos los ubica _ordenar_datos."""
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            return (0, valor, "")
+        return (1, 0, "" if valor is None else str(valor).lower())
+
+    def _ordenar_datos(self):
+        columna = self._orden_columna
+        self._datos.sort(key=lambda registro: self._clave_orden(registro.get(columna)),
+                         reverse=self._orden_descendente)
+        # Vacíos al final en ambos sentidos: sort es estable y conserva el orden anterior
+        self._datos.sort(key=lambda registro: self._es_vacio(registro.get(columna)))
+
+    def _seleccionar(self, fila: Dict[str, Any]):
+        indice = fila["indice"]
+        if self.al_seleccionar and indice is not None and indice < len(self._datos):
+            self.al_seleccionar(self._datos[indice])
@@ -0,0 +1,58 @@
+# views/vista_ocupable.py
+from typing import Dict, Tuple
+
+
+class VistaOcupable:
+    """
+    Mixin para las vistas cuyos controladores envían trabajo al EjecutorTareas.
+
+    El ejecutor llama a marcar_ocupada(True) cuando la vista pasa a tener tareas
+    pendientes y a marcar_ocupada(False) cuando termina la última. Mientras está
+    ocupada, los botones nombrados en BOTONES_OCUPABLES quedan deshabilitados;
+    al terminar, cada uno vuelve al último estado que pidió la vista.
+
+    La vista cambia el estado de esos botones con _estado_boton() (o con
+    _set_btn_state() para Modificar/Eliminar), nunca con configure(state=...)
+    directamente, para que un cambio pedido mientras está ocupada no se pierda.
+
+    Uso:
+        class NNAViewFrame(VistaOcupable, ctk.CTkFrame):
+            BOTONES_OCUPABLES = ("btn_modificar", "btn_eliminar")
+    """
+
+    BOTONES_OCUPABLES: Tuple[str, ...] = ("btn_modificar", "btn_eliminar")
+
+    _ocupada = False
+
+    def marcar_ocupada(self, ocupada: bool):
+        """Llamado por EjecutorTareas al empezar y al terminar las tareas de la vista."""
+        if ocupada == self._ocupada:
+            return
+        if ocupada:
+            # Estado de cada botón antes de deshabilitarlo, para reponerlo al terminar
+            self._estados_pedidos: Dict[str, str] = {
+                nombre: boton.cget("state") for nombre, boton in self._botones_ocupables()}
+        self._ocupada = ocupada
+        for nombre, boton in self._botones_ocupables():
+            boton.configure(state="disabled" if ocupada else self._estados_pedidos.get(nombre, "normal"))
+
+    def _estado_boton(self, nombre: str, state: str):
+        """Aplica 'state' al botón 'nombre'; si la vista está ocupada, al terminar."""
+        boton = getattr(self, nombre, None)
+        if boton is None:
+            return
+        if self._ocupada and nombre in self.BOTONES_OCUPABLES:
+            self._estados_pedidos[nombre] = state
+        else:
+            boton.configure(state=state)
+
+    def _set_btn_state(self, state):
+        """Habilita o deshabilita los botones de Modificar/Eliminar."""
+        self._estado_boton("btn_modificar", state)
+        self._estado_boton("btn_eliminar", state)
+
+    def _botones_ocupables(self):
+        for nombre in self.BOTONES_OCUPABLES:
+            boton = getattr(self, nombre, None)
+            if boton is not None:
+                yield nombre, boton